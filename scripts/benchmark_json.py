@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+"""Benchmarks comparing the installed JSON codec backends.
+
+This script encodes and decodes payloads shaped like the documents the SDK
+exchanges with Itential Platform: an OAuth token response, a page of Gateway
+devices and a multi-megabyte job document with its tasks and variables.
+Every installed backend of ``ipsdk.codec`` is measured on every payload and
+the script prints the best mean time per call and the throughput.
+
+Usage:
+    python scripts/benchmark_json.py                  # All backends and payloads
+    python scripts/benchmark_json.py -k job           # Filter payloads by name
+    python scripts/benchmark_json.py -b orjson -b json  # Only these backends
+    python scripts/benchmark_json.py --tasks 10000    # Larger job document
+
+Exit codes:
+    0 - Benchmarks ran
+    1 - No backend or payload matched the filters
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import timeit
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ipsdk import codec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def token_response() -> dict[str, Any]:
+    """Create an OAuth token response.
+
+    Returns:
+        The decoded token response
+    """
+    return {
+        "access_token": "0123456789abcdef" * 4,
+        "token_type": "bearer",
+        "expires_in": 3600,
+    }
+
+
+def device_page(count: int = 200) -> dict[str, Any]:
+    """Create a page of Gateway devices.
+
+    Args:
+        count: Number of devices on the page
+
+    Returns:
+        The decoded page
+    """
+    return {
+        "total": count * 10,
+        "data": [
+            {
+                "name": f"router{i}",
+                "host": f"10.{i // 256}.{i % 256}.1",
+                "port": 22,
+                "os": "cisco_ios" if i % 2 else "junos",
+                "groups": ["core", "east"] if i % 3 else ["edge"],
+                "variables": {"site": f"site-{i % 17}", "rack": i % 42},
+                "reachable": i % 11 != 0,
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def job_document(tasks: int = 4000) -> dict[str, Any]:
+    """Create a job document with its tasks and variables.
+
+    Args:
+        tasks: Number of tasks in the job
+
+    Returns:
+        The decoded job document
+    """
+    return {
+        "_id": "6553f1e3c2a1b4d5e6f70819",
+        "name": "Backup / Daily",
+        "status": "complete",
+        "description": "Back up the running configuration of every device",
+        "variables": {
+            "devices": [f"router{i}" for i in range(200)],
+            "options": {"retries": 3, "timeout": 30.5, "dry_run": False},
+        },
+        "tasks": {
+            f"{i:04x}": {
+                "name": "backupDevice",
+                "summary": f"Back up router{i % 200}",
+                "app": "ConfigurationManager",
+                "type": "automatic",
+                "status": "complete",
+                "variables": {
+                    "incoming": {"device": f"router{i % 200}", "attempt": 1},
+                    "outgoing": {
+                        "config": "interface GigabitEthernet0/1\n ip address "
+                        f"10.0.{i % 256}.1 255.255.255.0\n" * 4,
+                        "changed": i % 5 == 0,
+                    },
+                },
+                "metrics": {"start_time": 1700000000000 + i, "run_time": i * 1.5},
+                "transitions": {
+                    f"{i + 1:04x}": {"type": "standard", "state": "success"}
+                },
+            }
+            for i in range(tasks)
+        },
+    }
+
+
+def measure(fn: Callable[[], object]) -> float:
+    """Measure the best mean time of a call.
+
+    Args:
+        fn: The call to measure
+
+    Returns:
+        The best mean time per call in microseconds
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main() -> int:
+    """Run the benchmarks and print the results.
+
+    Returns:
+        Exit code: 0 if benchmarks ran, 1 if nothing matched the filters
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the installed JSON codec backends"
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        action="append",
+        default=[],
+        help="Only measure this backend (repeatable)",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run payloads whose name contains this text",
+    )
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        default=4000,
+        help="Tasks in the job document (default: 4000)",
+    )
+    args = parser.parse_args()
+
+    backends = [
+        codec.load_codec(name)
+        for name in codec.BACKENDS
+        if importlib.util.find_spec(name) and (not args.backend or name in args.backend)
+    ]
+    payloads = {
+        name: payload
+        for name, payload in {
+            "token": token_response(),
+            "devices": device_page(),
+            "job": job_document(args.tasks),
+        }.items()
+        if args.filter.lower() in name.lower()
+    }
+    if not backends or not payloads:
+        print("No backend or payload matches the filters")
+        return 1
+
+    print(f"auto backend: {codec.load_codec('auto').name}")
+    print(
+        f"{'payload':<8}  {'size':>9}  {'backend':<8}  {'op':<6}  "
+        f"{'us/call':>10}  {'MB/s':>8}"
+    )
+    for name, payload in payloads.items():
+        document = codec.load_codec("json").encode(payload)
+        size = len(document)
+        for backend in backends:
+            for op, fn in (
+                ("decode", lambda b=backend, d=document: b.decode(d)),
+                ("encode", lambda b=backend, p=payload: b.encode(p)),
+            ):
+                per_call = measure(fn)
+                rate = size / per_call
+                print(
+                    f"{name:<8}  {size:>9,}  {backend.name:<8}  {op:<6}  "
+                    f"{per_call:>10.2f}  {rate:>8.1f}"
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+"""Microbenchmarks for the client-side cost of building requests.
+
+This script measures the work the SDK does before a request reaches the
+network: validating arguments, building headers and constructing the httpx
+request. No request is sent. Each benchmark reports the mean time per call
+and the number of memory blocks allocated per call.
+
+Usage:
+    python scripts/benchmark_requests.py                  # Run all benchmarks
+    python scripts/benchmark_requests.py -n 50000         # More iterations
+    python scripts/benchmark_requests.py -k prepared      # Filter by name
+
+Exit codes:
+    0 - Benchmarks ran
+    1 - No benchmark matched the filter
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ipsdk.connection import Connection
+from ipsdk.http import HTTPMethod
+from ipsdk.validation import validate_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def make_connection(validation: str = "fast") -> Connection:
+    """Create an authenticated connection that never sends a request.
+
+    Args:
+        validation: Request argument validation level of the connection
+
+    Returns:
+        An authenticated Connection with a bearer token
+    """
+    conn = Connection("platform.example.com", validation=validation)
+    conn.authenticated = True
+    conn.token = "0123456789abcdef0123456789abcdef"
+    return conn
+
+
+def build_benchmarks() -> dict[str, Callable[[], object]]:
+    """Create the benchmarked calls.
+
+    Returns:
+        A mapping of benchmark names to zero-argument callables
+    """
+    conn = make_connection()
+    get_job = conn.prepare("GET", "/operations-manager/jobs/{job_id}")
+    create_job = conn.prepare("POST", "/operations-manager/jobs")
+    body = {"name": "backup", "variables": {"device": "router1"}}
+    params = {"include": "tasks"}
+    devices = [
+        {"name": f"router{i}", "port": 22, "tags": ["core", "east"], "up": True}
+        for i in range(20)
+    ]
+    levels = {level: make_connection(level) for level in ("strict", "fast", "off")}
+
+    benchmarks: dict[str, Callable[[], object]] = {
+        "build_request GET": lambda: conn._build_request(
+            HTTPMethod.GET, "/operations-manager/jobs/1234", params
+        ),
+        "prepared GET": lambda: get_job.build_request(
+            get_job.format_path(job_id=1234), params
+        ),
+        "build_request POST": lambda: conn._build_request(
+            HTTPMethod.POST, "/operations-manager/jobs", json=body
+        ),
+        "prepared POST": lambda: create_job.build_request(create_job.path, json=body),
+    }
+
+    # Building a path with an encoded variable
+    benchmarks["path f-string + quote"] = lambda: (
+        f"/workflow_builder/workflows/{quote('Backup / Daily', safe='')}"
+    )
+    benchmarks["path template"] = lambda: conn.path(
+        "/workflow_builder/workflows/{name}", name="Backup / Daily"
+    )
+
+    # Validation levels: the whole request build on a 20-item body, and the
+    # validation step alone on the small and the 20-item bodies
+    for level, level_conn in levels.items():
+        benchmarks[f"build_request POST 20 items validation={level}"] = (
+            lambda level_conn=level_conn: level_conn._build_request(
+                HTTPMethod.POST, "/devices", json=devices, params=params
+            )
+        )
+    benchmarks["validate fast"] = lambda: conn._validate_request_args(
+        HTTPMethod.POST, "/operations-manager/jobs", params, body
+    )
+    benchmarks["validate strict (deep checks only)"] = lambda: validate_payload(
+        params, body
+    )
+    benchmarks["validate strict 20 items (deep checks only)"] = lambda: (
+        validate_payload(params, devices)
+    )
+
+    return benchmarks
+
+
+def measure(fn: Callable[[], object], number: int) -> tuple[float, float]:
+    """Measure the time and allocations of a call.
+
+    Args:
+        fn: The call to measure
+        number: Number of calls per measurement
+
+    Returns:
+        The best mean time per call in microseconds and the number of
+        memory blocks allocated per call
+    """
+    timer = timeit.Timer(fn)
+    best = min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+    calls = min(number, 1000)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [fn() for _ in range(calls)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del results
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return best, blocks / calls
+
+
+def main() -> int:
+    """Run the benchmarks and print the results.
+
+    Returns:
+        Exit code: 0 if benchmarks ran, 1 if no benchmark matched
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the client-side cost of building requests"
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=10000,
+        help="Calls per measurement (default: 10000)",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run benchmarks whose name contains this text",
+    )
+    args = parser.parse_args()
+
+    benchmarks = {
+        name: fn
+        for name, fn in build_benchmarks().items()
+        if args.filter.lower() in name.lower()
+    }
+    if not benchmarks:
+        print(f"No benchmark matches {args.filter!r}")
+        return 1
+
+    width = max(len(name) for name in benchmarks)
+    print(f"{'benchmark':<{width}}  {'us/call':>9}  {'blocks/call':>11}")
+    for name, fn in benchmarks.items():
+        per_call, blocks = measure(fn, args.number)
+        print(f"{name:<{width}}  {per_call:>9.2f}  {blocks:>11.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Synchronous facade over a background asyncio engine.
+
+This module provides a synchronous client that drives an AsyncConnection
+running on a dedicated event loop thread. Synchronous code gets the same
+blocking ``get``/``post``/``put``/``patch``/``delete`` API as Connection, plus
+``submit_*`` methods that return ``concurrent.futures.Future`` objects so that
+thousands of requests can be in flight at once from ordinary threads.
+
+All requests share a single httpx.AsyncClient connection pool and a single
+authentication state, because they all run through the same AsyncConnection.
+
+Components
+----------
+BackgroundConnection:
+    Wraps an AsyncConnection (for example AsyncPlatform or AsyncGateway) and
+    owns the event loop thread it runs on. Created by the factory functions
+    when ``want_background=True`` is passed.
+
+Examples
+--------
+Blocking and concurrent requests from synchronous code::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(
+        host="platform.example.com",
+        client_id="your-client-id",
+        client_secret="your-client-secret",
+        want_background=True,
+    )
+
+    # Blocking call, same as the sync client
+    response = platform.get("/adapters")
+
+    # Fan out without threads or async code
+    futures = [platform.submit_get(f"/workflows/{name}") for name in names]
+    responses = [f.result() for f in futures]
+
+    platform.close()
+"""
+
+import asyncio
+import threading
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import lanes
+from . import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from concurrent.futures import Future
+
+    from .connection import AsyncConnection
+    from .http import Response
+
+
+class BackgroundConnection:
+    """Synchronous client backed by an AsyncConnection on an event loop thread.
+
+    The event loop thread is started when the instance is created and runs
+    until close() is called. The thread is a daemon thread so an unclosed
+    instance does not prevent the interpreter from exiting, but close() should
+    be called to release pooled connections cleanly.
+
+    Args:
+        connection (AsyncConnection): The async connection instance that
+            performs all requests. It must not be used directly from another
+            event loop once handed to this class.
+
+    Raises:
+        None
+    """
+
+    __slots__ = ("_closed", "_connection", "_loop", "_thread")
+
+    @logging.trace
+    def __init__(self, connection: AsyncConnection) -> None:
+        self._connection = connection
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="ipsdk-background", daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        """Run the event loop forever on the background thread.
+
+        Returns:
+            None
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def connection(self) -> AsyncConnection:
+        """
+        Get the underlying async connection
+
+        Returns:
+            AsyncConnection: The connection driven by the background loop
+        """
+        return self._connection
+
+    @property
+    def closed(self) -> bool:
+        """
+        Check whether the background engine has been shut down
+
+        Returns:
+            bool: True once close() has been called
+        """
+        return self._closed
+
+    @logging.trace
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future[Any]:
+        """Schedule a coroutine on the background event loop.
+
+        This is the generic entry point used by the ``submit_*`` methods. It
+        can also be used to run any coroutine that uses ``self.connection``.
+        The coroutine runs in the priority lane of the calling context.
+
+        Args:
+            coro (Coroutine): The coroutine to run on the background loop.
+
+        Returns:
+            Future: A concurrent.futures.Future resolved with the coroutine result.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        if self._closed:
+            coro.close()
+            msg = "background connection is closed"
+            raise exceptions.IpsdkError(msg)
+
+        # Carry the caller's priority lane onto the background loop
+        lane = lanes.current_lane()
+        if lane is not None:
+            coro = lanes.run_in_lane(lane, coro)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    @logging.trace
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the background event loop and wait for the result.
+
+        Args:
+            coro (Coroutine): The coroutine to run on the background loop.
+
+        Returns:
+            Any: The value returned by the coroutine.
+
+        Raises:
+            IpsdkError: If called from the background loop thread itself, which
+                would deadlock, or if the engine has been closed.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            msg = "blocking calls cannot be made from the background loop thread"
+            raise exceptions.IpsdkError(msg)
+        return self.submit(coro).result()
+
+    @logging.trace
+    def submit_get(
+        self, path: str, params: dict[str, Any | None] | None = None
+    ) -> Future[Response]:
+        """Schedule an HTTP GET request and return immediately.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the Response.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        return self.submit(self._connection.get(path, params=params))
+
+    @logging.trace
+    def submit_delete(
+        self, path: str, params: dict[str, Any | None] | None = None
+    ) -> Future[Response]:
+        """Schedule an HTTP DELETE request and return immediately.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the Response.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        return self.submit(self._connection.delete(path, params=params))
+
+    @logging.trace
+    def submit_post(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Future[Response]:
+        """Schedule an HTTP POST request and return immediately.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the Response.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        return self.submit(self._connection.post(path, params=params, json=json))
+
+    @logging.trace
+    def submit_put(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Future[Response]:
+        """Schedule an HTTP PUT request and return immediately.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the Response.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        return self.submit(self._connection.put(path, params=params, json=json))
+
+    @logging.trace
+    def submit_patch(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Future[Response]:
+        """Schedule an HTTP PATCH request and return immediately.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the Response.
+
+        Raises:
+            IpsdkError: If the background engine has been closed.
+        """
+        return self.submit(self._connection.patch(path, params=params, json=json))
+
+    @logging.trace
+    def get(self, path: str, params: dict[str, Any | None] | None = None) -> Response:
+        """Send an HTTP GET request to the server.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.run(self._connection.get(path, params=params))
+
+    @logging.trace
+    def delete(
+        self, path: str, params: dict[str, Any | None] | None = None
+    ) -> Response:
+        """Send an HTTP DELETE request to the server.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.run(self._connection.delete(path, params=params))
+
+    @logging.trace
+    def post(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Response:
+        """Send an HTTP POST request to the server.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Response: The HTTP response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.run(self._connection.post(path, params=params, json=json))
+
+    @logging.trace
+    def put(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Response:
+        """Send an HTTP PUT request to the server.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Response: The HTTP response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.run(self._connection.put(path, params=params, json=json))
+
+    @logging.trace
+    def patch(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Response:
+        """Send an HTTP PATCH request to the server.
+
+        Args:
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Response: The HTTP response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.run(self._connection.patch(path, params=params, json=json))
+
+    @logging.trace
+    def close(self) -> None:
+        """Close the async client and stop the background event loop.
+
+        Calling close() more than once has no additional effect.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self._closed:
+            return
+
+        try:
+            self.run(self._connection.client.aclose())
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> BackgroundConnection:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @logging.trace
+    def __repr__(self) -> str:
+        """
+        String representation of the background connection
+
+        Returns:
+            str: A string representation of the background connection
+        """
+        return (
+            f"BackgroundConnection(connection={type(self._connection).__name__}, "
+            f"closed={self._closed})"
+        )
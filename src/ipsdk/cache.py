@@ -0,0 +1,847 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""HTTP response caching for the Itential Python SDK.
+
+This module provides an in-memory cache for GET responses that follows the
+HTTP caching headers returned by the server. Connections created with a
+``cache`` instance consult it before sending a GET request:
+
+- A fresh entry (within its ``Cache-Control: max-age`` or ``Expires``
+  lifetime) is returned without any network call.
+- A stale entry that carries an ``ETag`` or ``Last-Modified`` validator is
+  revalidated with ``If-None-Match`` / ``If-Modified-Since``. A ``304 Not
+  Modified`` answer is turned into a cache hit, so unchanged data costs only
+  a small round-trip.
+- Responses marked ``Cache-Control: no-store`` are never stored.
+
+Many endpoints send no useful caching headers even though their data is safe
+to reuse for a while. A CachePolicy maps path patterns to a time-to-live in
+seconds; responses to matching GET requests are stored for that long
+regardless of their headers (``no-store`` is still honored).
+
+With ``max_stale`` set, the cache also works in stale-while-revalidate mode:
+an entry that expired less than ``max_stale`` seconds ago is returned
+immediately while a single background request per key revalidates it, so
+readers never wait for the origin once an entry exists.
+
+Successful POST, PUT, PATCH and DELETE requests invalidate the cached
+entries for overlapping paths: the written path itself, any path below it
+and any path above it.
+
+The cache is bounded by the total size of the stored responses and evicts the
+least recently used entries first.
+
+Components
+----------
+RequestKey:
+    Named tuple identifying a request by method, base URL, path, normalized
+    query parameters and credential identity. Built by the connections.
+
+CachePolicy:
+    Ordered mapping of shell-style path patterns to time-to-live values.
+
+CacheEntry:
+    A stored response together with its validators and freshness lifetime.
+
+ResponseCache:
+    Thread-safe LRU cache of CacheEntry objects bounded by total bytes.
+
+NegativeCache:
+    Opt-in cache of 404 Not Found responses. A GET for a path known to be
+    missing raises HTTPStatusError without a network call until the entry
+    expires or a write to an overlapping path invalidates it.
+
+Examples
+--------
+Caching Platform GET requests::
+
+    from ipsdk import cache, platform_factory
+
+    platform = platform_factory(
+        host="platform.example.com",
+        cache=cache.ResponseCache(max_bytes=128 * 1024 * 1024),
+    )
+
+    # First call downloads the document, later calls are served from memory
+    # or revalidated with a conditional request
+    platform.get("/workflow_builder/workflows")
+
+    print(platform.cache.hits, platform.cache.misses)
+
+Reusing endpoints without caching headers for a fixed time::
+
+    policy = cache.CachePolicy({"/adapters": 300, "/applications/*": 60})
+    platform = platform_factory(cache=cache.ResponseCache(policy=policy))
+"""
+
+import email.utils
+import fnmatch
+import re
+import threading
+import time
+
+from collections import OrderedDict
+from datetime import datetime
+from datetime import timezone
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+import httpx
+
+from . import exceptions
+from . import logging
+
+if TYPE_CHECKING:
+    from .http import Response
+
+# Approximate per-entry bookkeeping overhead in bytes, used so that many tiny
+# responses still count against the size limit
+_ENTRY_OVERHEAD: int = 256
+
+# Response headers refreshed from a 304 Not Modified response
+_REFRESH_HEADERS: tuple[str, ...] = (
+    "cache-control",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+)
+
+
+class RequestKey(NamedTuple):
+    """Identifies a request for caching and coalescing.
+
+    Attributes:
+        method (str): The HTTP method name.
+        base_url (str): The connection base URL.
+        path (str): The request path appended to the base URL.
+        params (tuple): Sorted query parameter items.
+        identity (str): Opaque identifier of the credentials in use.
+    """
+
+    method: str
+    base_url: str
+    path: str
+    params: tuple
+    identity: str
+
+
+@logging.trace
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header value into a directive mapping.
+
+    Directive names are lower-cased. Directives without an argument map to
+    None and quoted arguments are unquoted.
+
+    Args:
+        value (str | None): The raw Cache-Control header value.
+
+    Returns:
+        dict[str, str | None]: The parsed directives.
+    """
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if not name:
+            continue
+        directives[name.lower()] = arg.strip().strip('"') if sep else None
+
+    return directives
+
+
+@logging.trace
+def freshness_lifetime(headers: httpx.Headers) -> float:
+    """Compute how long a response may be served without revalidation.
+
+    Uses ``Cache-Control: max-age`` when present, otherwise the difference
+    between the ``Expires`` and ``Date`` headers. ``no-cache`` always yields
+    zero so the response is revalidated on every use.
+
+    Args:
+        headers (httpx.Headers): The response headers.
+
+    Returns:
+        float: The freshness lifetime in seconds, never negative.
+    """
+    directives = parse_cache_control(headers.get("cache-control"))
+
+    if "no-cache" in directives:
+        return 0.0
+
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(float(int(max_age)), 0.0)
+        except ValueError:
+            return 0.0
+
+    expires = headers.get("expires")
+    if expires is None:
+        return 0.0
+
+    try:
+        expires_at = email.utils.parsedate_to_datetime(expires)
+        date = headers.get("date")
+        origin = (
+            email.utils.parsedate_to_datetime(date)
+            if date is not None
+            else datetime.now(timezone.utc)
+        )
+        return max((expires_at - origin).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def paths_overlap(first: str, second: str) -> bool:
+    """Check whether two request paths refer to overlapping resources.
+
+    Paths overlap when they are equal or when one is a parent of the other,
+    for example ``/devices`` and ``/devices/router1``. Trailing slashes are
+    ignored.
+
+    Args:
+        first (str): The first request path.
+        second (str): The second request path.
+
+    Returns:
+        bool: True if a write to one path may change the other.
+    """
+    first = first.rstrip("/")
+    second = second.rstrip("/")
+    if first == second:
+        return True
+    shorter, longer = sorted((first, second), key=len)
+    return longer.startswith(f"{shorter}/")
+
+
+class CachePolicy:
+    """Time-to-live rules for GET responses, selected by path pattern.
+
+    Patterns use shell-style wildcards as understood by :mod:`fnmatch`, where
+    ``*`` also matches ``/``. Rules are checked in insertion order and the
+    first matching pattern wins.
+
+    Args:
+        rules (dict[str, float]): Mapping of path patterns to the number of
+            seconds matching responses may be reused.
+
+    Raises:
+        IpsdkError: If a time-to-live is negative.
+    """
+
+    __slots__ = ("_rules",)
+
+    @logging.trace
+    def __init__(self, rules: dict[str, float]) -> None:
+        self._rules: list[tuple[str, re.Pattern[str], float]] = []
+        for pattern, ttl in rules.items():
+            if ttl < 0:
+                msg = f"ttl for path pattern {pattern!r} must not be negative"
+                raise exceptions.IpsdkError(msg)
+            self._rules.append(
+                (pattern, re.compile(fnmatch.translate(pattern)), float(ttl))
+            )
+
+    @logging.trace
+    def ttl_for(self, path: str) -> float | None:
+        """Find the time-to-live configured for a request path.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            float | None: The time-to-live in seconds, or None if no pattern
+                matches the path.
+        """
+        for _, regex, ttl in self._rules:
+            if regex.match(path):
+                return ttl
+        return None
+
+    def __repr__(self) -> str:
+        rules = ", ".join(f"{p!r}: {ttl:g}" for p, _, ttl in self._rules)
+        return f"CachePolicy({{{rules}}})"
+
+
+class CacheEntry:
+    """A cached response with its validators and freshness information.
+
+    Args:
+        key (RequestKey): The request key the entry is stored under.
+        status_code (int): The HTTP status code of the stored response.
+        headers (list[tuple[str, str]]): The stored response headers.
+        content (bytes): The stored response body.
+        expires_at (float): Epoch time after which the entry is stale.
+        stored_at (float): Epoch time the response was stored. Defaults to
+            the current time.
+
+    Wall-clock times are used so that entries can be persisted and reloaded
+    by another process.
+    """
+
+    __slots__ = (
+        "content",
+        "etag",
+        "expires_at",
+        "headers",
+        "key",
+        "last_modified",
+        "size",
+        "status_code",
+        "stored_at",
+    )
+
+    def __init__(
+        self,
+        key: RequestKey,
+        status_code: int,
+        headers: list[tuple[str, str]],
+        content: bytes,
+        expires_at: float,
+        stored_at: float | None = None,
+    ) -> None:
+        self.key = key
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires_at = expires_at
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.size = 0
+        self.update_metadata()
+
+    def update_metadata(self) -> None:
+        """Recompute validators and size from the stored headers and body.
+
+        Returns:
+            None
+        """
+        self.etag = None
+        self.last_modified = None
+        size = len(self.content) + _ENTRY_OVERHEAD
+        for name, value in self.headers:
+            lname = name.lower()
+            if lname == "etag":
+                self.etag = value
+            elif lname == "last-modified":
+                self.last_modified = value
+            size += len(name) + len(value)
+        self.size = size
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """
+        Check whether the entry can be served without revalidation
+
+        Args:
+            now (float): Epoch time to compare against. Defaults to
+                the current time.
+
+        Returns:
+            bool: True if the entry has not expired
+        """
+        return (time.time() if now is None else now) < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """
+        Get the conditional request headers for revalidating this entry
+
+        Returns:
+            dict[str, str]: If-None-Match and/or If-Modified-Since headers
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_httpx(self, request: httpx.Request) -> httpx.Response:
+        """
+        Rebuild an httpx.Response from the stored data
+
+        Args:
+            request (httpx.Request): The request to associate with the response
+
+        Returns:
+            httpx.Response: A response carrying the stored status, headers
+                and body
+        """
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheEntry(path='{self.key.path}', status_code={self.status_code}, "
+            f"size={self.size})"
+        )
+
+
+class ResponseCache:
+    """Thread-safe in-memory HTTP response cache with LRU eviction.
+
+    The cache is bounded by the approximate number of bytes held by the stored
+    responses. When a new entry would exceed the limit, the least recently
+    used entries are evicted first. Responses larger than the limit are not
+    stored.
+
+    Args:
+        max_bytes (int): Maximum total size of stored responses in bytes.
+            Defaults to 64 MiB.
+        policy (CachePolicy): Optional time-to-live rules that override the
+            freshness lifetime from the response headers for matching paths.
+            Defaults to None.
+        max_stale (float): Number of seconds after expiry during which an
+            entry is still returned while it is revalidated in the background.
+            Defaults to 0 (stale entries are revalidated before returning).
+
+    Attributes:
+        hits (int): Lookups answered from the cache, including 304 revalidations.
+        stale_hits (int): Stale entries returned while being revalidated.
+        misses (int): Lookups that required a full download.
+        revalidations (int): Stale entries confirmed by a 304 Not Modified.
+        evictions (int): Entries removed to respect the size limit.
+
+    Raises:
+        IpsdkError: If max_bytes is not a positive integer or max_stale is
+            negative.
+    """
+
+    __slots__ = (
+        "_entries",
+        "_lock",
+        "_paths",
+        "_refreshing",
+        "_size",
+        "evictions",
+        "hits",
+        "max_bytes",
+        "max_stale",
+        "misses",
+        "policy",
+        "revalidations",
+        "stale_hits",
+    )
+
+    @logging.trace
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        policy: CachePolicy | None = None,
+        max_stale: float = 0.0,
+    ) -> None:
+        if max_bytes <= 0:
+            msg = "max_bytes must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+
+        if max_stale < 0:
+            msg = "max_stale must not be negative"
+            raise exceptions.IpsdkError(msg)
+
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.max_stale = max_stale
+        self._refreshing: set[RequestKey] = set()
+        self._entries: OrderedDict[RequestKey, CacheEntry] = OrderedDict()
+        self._paths: dict[tuple[str, str], set[RequestKey]] = {}
+        self._lock = threading.Lock()
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Get the approximate number of bytes held by the cache
+
+        Returns:
+            int: The total size of all stored entries
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @logging.trace
+    def get(self, key: RequestKey) -> CacheEntry | None:
+        """Look up the entry stored for a request key.
+
+        A successful lookup marks the entry as most recently used. The entry
+        is returned whether or not it is still fresh.
+
+        Args:
+            key (RequestKey): The request key to look up.
+
+        Returns:
+            CacheEntry | None: The stored entry, or None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @logging.trace
+    def store(
+        self, key: RequestKey, response: httpx.Response | Response
+    ) -> CacheEntry | None:
+        """Store a response if its status and headers allow it.
+
+        Only 200 OK responses are stored. Responses with ``no-store`` or
+        ``Vary: *`` are skipped, as are responses that would be stale
+        immediately and carry no validator to revalidate them with. When the
+        policy has a rule for the path, its time-to-live replaces the lifetime
+        derived from the response headers.
+
+        Args:
+            key (RequestKey): The request key to store the response under.
+            response (httpx.Response | Response): The response received from
+                the server.
+
+        Returns:
+            CacheEntry | None: The new entry, or None if it was not stored.
+        """
+        if response.status_code != HTTPStatus.OK:
+            return None
+
+        headers = response.headers
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives or headers.get("vary") == "*":
+            return None
+
+        lifetime = self._lifetime(key, headers)
+        if lifetime <= 0 and "etag" not in headers and "last-modified" not in headers:
+            return None
+
+        now = time.time()
+        entry = CacheEntry(
+            key,
+            response.status_code,
+            list(headers.multi_items()),
+            response.content,
+            now + lifetime,
+            stored_at=now,
+        )
+        if entry.size > self.max_bytes:
+            return None
+
+        self._insert(entry)
+        return entry
+
+    @logging.trace
+    def refresh(
+        self, entry: CacheEntry, response: httpx.Response | Response
+    ) -> CacheEntry:
+        """Update an entry from a 304 Not Modified response.
+
+        The freshness lifetime and validator headers are taken from the 304
+        response, and the entry is counted as a hit.
+
+        Args:
+            entry (CacheEntry): The entry that was revalidated.
+            response (httpx.Response | Response): The 304 response from the
+                server.
+
+        Returns:
+            CacheEntry: The refreshed entry.
+        """
+        updates = {
+            name: value
+            for name, value in response.headers.multi_items()
+            if name.lower() in _REFRESH_HEADERS
+        }
+        if updates:
+            lowered = {name.lower() for name in updates}
+            entry.headers = [
+                (name, value)
+                for name, value in entry.headers
+                if name.lower() not in lowered
+            ] + list(updates.items())
+
+        with self._lock:
+            old_size = entry.size
+            entry.update_metadata()
+            entry.expires_at = time.time() + self._lifetime(entry.key, response.headers)
+            if self._entries.get(entry.key) is entry:
+                self._size += entry.size - old_size
+                self._entries.move_to_end(entry.key)
+            self.revalidations += 1
+            self.hits += 1
+
+        return entry
+
+    @logging.trace
+    def invalidate(self, base_url: str, path: str) -> int:
+        """Remove every entry for paths overlapping a written path.
+
+        Entries for the path itself, for paths below it and for paths above
+        it are removed, regardless of their query parameters.
+
+        Args:
+            base_url (str): The base URL of the connection that wrote to path.
+            path (str): The request path that was modified.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            scopes = [
+                scope
+                for scope in self._paths
+                if scope[0] == base_url and paths_overlap(scope[1], path)
+            ]
+            for scope in scopes:
+                for key in self._paths.pop(scope):
+                    entry = self._entries.pop(key, None)
+                    if entry is not None:
+                        self._size -= entry.size
+                        removed += 1
+        return removed
+
+    @logging.trace
+    def clear(self) -> None:
+        """Remove every entry from the cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+            self._size = 0
+
+    def _lifetime(self, key: RequestKey, headers: httpx.Headers) -> float:
+        """Compute the freshness lifetime for a response to a request.
+
+        Args:
+            key (RequestKey): The request key of the response.
+            headers (httpx.Headers): The response headers.
+
+        Returns:
+            float: The policy time-to-live for the path if there is one,
+                otherwise the lifetime from the response headers.
+        """
+        if self.policy is not None:
+            ttl = self.policy.ttl_for(key.path)
+            if ttl is not None:
+                return ttl
+        return freshness_lifetime(headers)
+
+    def _insert(self, entry: CacheEntry) -> None:
+        """Insert or replace an entry and evict entries over the size limit.
+
+        Args:
+            entry (CacheEntry): The entry to insert.
+
+        Returns:
+            None
+        """
+        key = entry.key
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+
+            self._entries[key] = entry
+            self._paths.setdefault((key.base_url, key.path), set()).add(key)
+            self._size += entry.size
+
+            while self._size > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self._discard_path(evicted_key)
+                self.evictions += 1
+
+    def _discard_path(self, key: RequestKey) -> None:
+        """Remove a key from the path index. Caller must hold the lock.
+
+        Args:
+            key (RequestKey): The key being removed from the cache.
+
+        Returns:
+            None
+        """
+        scope = (key.base_url, key.path)
+        keys = self._paths.get(scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._paths[scope]
+
+    def record_miss(self) -> None:
+        """
+        Count a lookup that required a full download
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.misses += 1
+
+    def is_servable_stale(self, entry: CacheEntry, now: float | None = None) -> bool:
+        """
+        Check whether a stale entry may be returned while it is revalidated
+
+        Args:
+            entry (CacheEntry): The entry to check.
+            now (float): Epoch time to compare against. Defaults to the
+                current time.
+
+        Returns:
+            bool: True if the entry expired less than max_stale seconds ago
+        """
+        now = time.time() if now is None else now
+        return self.max_stale > 0 and now < entry.expires_at + self.max_stale
+
+    def begin_refresh(self, key: RequestKey) -> bool:
+        """
+        Claim the background refresh of an entry
+
+        Args:
+            key (RequestKey): The key of the entry to refresh.
+
+        Returns:
+            bool: True if the caller should start the refresh, False if one
+                is already running for the key
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: RequestKey) -> None:
+        """
+        Release the background refresh claim for an entry
+
+        Args:
+            key (RequestKey): The key of the refreshed entry.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+    @property
+    def refreshing(self) -> int:
+        """
+        Get the number of background refreshes in progress
+
+        Returns:
+            int: The number of keys being refreshed
+        """
+        return len(self._refreshing)
+
+    def record_stale_hit(self) -> None:
+        """
+        Count a stale entry returned while it is revalidated
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.stale_hits += 1
+
+    def record_hit(self) -> None:
+        """
+        Count a lookup served from a fresh entry
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.hits += 1
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCache(entries={len(self._entries)}, size={self._size}, "
+            f"max_bytes={self.max_bytes})"
+        )
+
+
+class NegativeCache(ResponseCache):
+    """Remember 404 Not Found responses for a fixed time.
+
+    Only 404 responses are stored, each for ``ttl`` seconds regardless of
+    its caching headers. Entries are kept in an exact LRU bounded by total
+    bytes and are invalidated by writes to overlapping paths, like the
+    response cache.
+
+    Args:
+        ttl (float): Number of seconds a 404 response is remembered.
+            Defaults to 30.
+        max_bytes (int): Maximum total size of stored responses in bytes.
+            Defaults to 1 MiB.
+
+    Raises:
+        IpsdkError: If ttl is not positive or max_bytes is invalid.
+    """
+
+    __slots__ = ("ttl",)
+
+    @logging.trace
+    def __init__(self, ttl: float = 30.0, max_bytes: int = 1024 * 1024) -> None:
+        super().__init__(max_bytes=max_bytes)
+
+        if ttl <= 0:
+            msg = "ttl must be a positive number"
+            raise exceptions.IpsdkError(msg)
+
+        self.ttl = ttl
+
+    @logging.trace
+    def store(
+        self, key: RequestKey, response: httpx.Response | Response
+    ) -> CacheEntry | None:
+        """Store a 404 Not Found response.
+
+        Args:
+            key (RequestKey): The request key to store the response under.
+            response (httpx.Response | Response): The response received from
+                the server.
+
+        Returns:
+            CacheEntry | None: The new entry, or None if it was not stored.
+        """
+        if response.status_code != HTTPStatus.NOT_FOUND:
+            return None
+
+        now = time.time()
+        entry = CacheEntry(
+            key,
+            response.status_code,
+            list(response.headers.multi_items()),
+            response.content,
+            now + self.ttl,
+            stored_at=now,
+        )
+        if entry.size > self.max_bytes:
+            return None
+
+        self._insert(entry)
+        return entry
+
+    def __repr__(self) -> str:
+        return (
+            f"NegativeCache(entries={len(self._entries)}, ttl={self.ttl:g}, "
+            f"max_bytes={self.max_bytes})"
+        )
@@ -0,0 +1,322 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Pluggable JSON codec used for request bodies and responses.
+
+The SDK encodes request bodies, decodes responses (``Response.json()``),
+parses OAuth token responses and implements ``jsonutils`` through a single
+codec. The standard library ``"json"`` backend is used unless another one
+is selected with ``set_codec``:
+
+- ``"orjson"``
+- ``"msgspec"``
+- ``"ujson"``
+- ``"json"`` (the standard library, always available)
+- ``"auto"`` (the first installed backend in the order above)
+
+None of the fast backends is a dependency of the SDK, and installing one
+does not change what the SDK sends until it is selected, because the
+backends differ on edge cases (see below). Parsing large job and workflow
+documents is several times faster with orjson or msgspec than with the
+standard library; ``scripts/benchmark_json.py`` compares the installed
+backends on realistic payloads.
+
+Every backend encodes to compact UTF-8 ``bytes`` and decodes ``str`` or
+``bytes``. Encoding errors are raised as ``TypeError`` or ``ValueError`` and
+decoding errors as ``ValueError``, whichever backend is active. Backends
+still differ on edge cases: the standard library rejects NaN and infinite
+floats while orjson encodes them as ``null``, orjson only encodes integers
+that fit in 64 bits, and msgspec also encodes types such as ``datetime``
+and ``set`` that the others reject.
+
+Components
+----------
+JSONCodec:
+    A named pair of encode and decode functions.
+
+get_codec:
+    Returns the active codec.
+
+set_codec:
+    Selects the active codec by backend name, or restores the default.
+
+load_codec:
+    Creates the codec for a backend.
+
+encode:
+    Encodes an object to JSON bytes with the active codec.
+
+decode:
+    Decodes a JSON document with the active codec.
+
+Examples
+--------
+Checking and changing the backend::
+
+    from ipsdk import codec
+
+    codec.get_codec().name     # "json"
+
+    codec.set_codec("orjson")  # use orjson
+    codec.set_codec("auto")    # use the fastest installed backend
+    codec.set_codec()          # restore the standard library
+"""
+
+import importlib.util
+import json
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Backend names in order of preference when the "auto" codec is selected
+BACKENDS: tuple[str, ...] = ("orjson", "msgspec", "ujson", "json")
+
+
+class JSONCodec:
+    """A JSON backend's encode and decode functions.
+
+    Args:
+        name (str): The name of the backend.
+        encode (Callable[[Any], bytes]): Encodes an object to JSON bytes.
+        decode (Callable[[str | bytes], Any]): Decodes a JSON document.
+
+    Attributes:
+        name (str): The name of the backend.
+        encode (Callable[[Any], bytes]): Encodes an object to JSON bytes.
+        decode (Callable[[str | bytes], Any]): Decodes a JSON document.
+    """
+
+    __slots__ = ("decode", "encode", "name")
+
+    def __init__(
+        self,
+        name: str,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[str | bytes], Any],
+    ) -> None:
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def __repr__(self) -> str:
+        return f"JSONCodec({self.name!r})"
+
+
+def _orjson() -> JSONCodec:
+    """Create the orjson codec.
+
+    Dataclasses and datetime objects are passed through to the error
+    handling instead of being serialized, so they are rejected as they are
+    by the standard library.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ImportError: If orjson is not installed.
+    """
+    import orjson  # noqa: PLC0415
+
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def encode(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=option)
+
+    return JSONCodec("orjson", encode, orjson.loads)
+
+
+def _msgspec() -> JSONCodec:
+    """Create the msgspec codec.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ImportError: If msgspec is not installed.
+    """
+    import msgspec  # type: ignore[import-not-found]  # noqa: PLC0415
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def encode(obj: Any) -> bytes:
+        try:
+            return encoder.encode(obj)
+        except msgspec.EncodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    return JSONCodec("msgspec", encode, decoder.decode)
+
+
+def _ujson() -> JSONCodec:
+    """Create the ujson codec.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ImportError: If ujson is not installed.
+    """
+    import ujson  # type: ignore[import-untyped]  # noqa: PLC0415
+
+    def encode(obj: Any) -> bytes:
+        try:
+            return ujson.dumps(
+                obj, ensure_ascii=False, escape_forward_slashes=False
+            ).encode()
+        except OverflowError as exc:
+            # ujson reports deep nesting and circular references this way
+            raise ValueError(str(exc)) from exc
+
+    return JSONCodec("ujson", encode, ujson.loads)
+
+
+def _stdlib() -> JSONCodec:
+    """Create the standard library codec.
+
+    The encoder matches the compact output httpx produces for ``json=``
+    request bodies and is created once instead of on every call.
+
+    Returns:
+        JSONCodec: The codec.
+    """
+    encoder = json.JSONEncoder(
+        ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    )
+
+    def encode(obj: Any) -> bytes:
+        return encoder.encode(obj).encode()
+
+    return JSONCodec("json", encode, json.loads)
+
+
+_FACTORIES: dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+
+@logging.trace
+def load_codec(name: str) -> JSONCodec:
+    """Create the codec for a backend.
+
+    Args:
+        name (str): One of ``"orjson"``, ``"msgspec"``, ``"ujson"``,
+            ``"json"`` or ``"auto"`` for the first installed backend.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        IpsdkError: If the backend is unknown or not installed.
+    """
+    if name == "auto":
+        return _detect()
+
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        msg = f"JSON codec must be one of {', '.join(BACKENDS)} or auto, got {name!r}"
+        raise exceptions.IpsdkError(msg) from None
+
+    try:
+        return factory()
+    except ImportError as exc:
+        msg = f"JSON codec {name!r} is not installed"
+        raise exceptions.IpsdkError(msg) from exc
+
+
+def _detect() -> JSONCodec:
+    """Create the codec of the first installed backend.
+
+    Returns:
+        JSONCodec: The codec.
+    """
+    for name in BACKENDS[:-1]:
+        if importlib.util.find_spec(name) is not None:
+            return _FACTORIES[name]()
+    return _stdlib()
+
+
+_codec = _stdlib()
+
+
+def get_codec() -> JSONCodec:
+    """Return the active codec.
+
+    Returns:
+        JSONCodec: The codec used by the SDK.
+    """
+    return _codec
+
+
+@logging.trace
+def set_codec(codec: str | JSONCodec | None = None) -> JSONCodec:
+    """Select the codec used by the SDK.
+
+    Args:
+        codec (str | JSONCodec | None): A backend name, ``"auto"`` for the
+            first installed backend, a codec, or None to restore the
+            standard library codec. Defaults to None.
+
+    Returns:
+        JSONCodec: The active codec.
+
+    Raises:
+        IpsdkError: If the backend is unknown or not installed.
+    """
+    global _codec  # noqa: PLW0603
+    if codec is None:
+        _codec = _stdlib()
+    elif isinstance(codec, JSONCodec):
+        _codec = codec
+    else:
+        _codec = load_codec(codec)
+    return _codec
+
+
+def encode(obj: Any) -> bytes:
+    """Encode an object to JSON with the active codec.
+
+    Args:
+        obj (Any): The object to encode.
+
+    Returns:
+        bytes: The compact UTF-8 encoded JSON document.
+
+    Raises:
+        TypeError: If the object contains a value that cannot be encoded.
+        ValueError: If a value cannot be represented in JSON.
+    """
+    return _codec.encode(obj)
+
+
+def decode(data: str | bytes) -> Any:
+    """Decode a JSON document with the active codec.
+
+    Args:
+        data (str | bytes): The JSON document.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    return _codec.decode(data)
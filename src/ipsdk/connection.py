@@ -42,6 +42,10 @@ Key Features
 - Custom User-Agent header with SDK version information
 - Request validation for method, path, params, and JSON body
 - Full support for all standard HTTP methods
+- Optional single-flight coalescing of identical concurrent GET requests
+- Optional HTTP response cache honoring Cache-Control, ETag and Last-Modified
+- Optional priority lanes giving each class of traffic its own concurrency share
+- Write-behind queues for fire-and-forget writes sent in the background
 
 HTTP Methods
 ------------
@@ -130,12 +134,14 @@ Direct instantiation (advanced)::
 
 import abc
 import asyncio
+import contextvars
+import hashlib
 import threading
 import time
 import urllib.parse
 
-from datetime import datetime
-from datetime import timezone
+from contextlib import nullcontext
+from http import HTTPStatus
 from typing import Any
 
 import httpx
@@ -143,26 +149,96 @@ import httpx
 from . import exceptions
 from . import logging
 from . import metadata
+from . import validation as validation_levels
+from .cache import CacheEntry
+from .cache import NegativeCache
+from .cache import RequestKey
+from .cache import ResponseCache
+from .http import JSON_HEADERS
 from .http import HTTPMethod
 from .http import Response
+from .http import json_content
+from .lanes import AsyncLaneLimiter
+from .lanes import LaneLimiter
+from .pagination import AsyncPaginator
+from .pagination import Paginator
+from .paths import path_template
+from .prepared import AsyncPreparedRequest
+from .prepared import PreparedRequest
+from .singleflight import AsyncSingleFlight
+from .singleflight import SingleFlight
+from .timing import AsyncTraceRecorder
+from .timing import Timings
+from .timing import TraceRecorder
+from .writebehind import AsyncWriteBehind
+from .writebehind import WriteBehind
 
 
 class ConnectionBase:
     __slots__ = (
         "_auth_lock",
         "_auth_timestamp",
+        "_base_url",
+        "_identity",
+        "_refreshes",
+        "_token",
         "_ttl_enabled",
+        "_url_prefix",
         "authenticated",
+        "cache",
         "client",
         "client_id",
         "client_secret",
+        "lanes",
+        "negative_cache",
         "password",
-        "token",
+        "singleflight",
         "ttl",
         "user",
+        "validation",
     )
 
     client: httpx.Client | httpx.AsyncClient
+    singleflight: SingleFlight | AsyncSingleFlight | None
+    lanes: LaneLimiter | AsyncLaneLimiter | None
+
+    # Set by subclasses to the single-flight and lane implementations matching
+    # their concurrency model (threads or asyncio)
+    _singleflight_class: type | None = None
+    _lanes_class: type | None = None
+
+    @property
+    def base_url(self) -> str:
+        """The base URL request paths are joined to, without a trailing slash."""
+        return self._url_prefix
+
+    @property
+    def token(self) -> str | None:
+        """The bearer token sent in the Authorization header, if any."""
+        return self._token
+
+    @token.setter
+    def token(self, value: str | None) -> None:
+        """Set the bearer token and install it on the HTTP client.
+
+        The Authorization header is stored in the client's default headers so
+        requests do not rebuild it. The client gets a new headers object with
+        the header added or removed, so concurrent requests see either the
+        old or the new value, never a partial update.
+
+        Args:
+            value: The new bearer token, or None to stop sending one.
+
+        Returns:
+            None
+        """
+        headers = self.client.headers.copy()
+        if value is None:
+            headers.pop("Authorization", None)
+        else:
+            headers["Authorization"] = f"Bearer {value}"
+        self.client.headers = headers
+        self._token = value
 
     @logging.trace
     def __init__(
@@ -178,6 +254,11 @@ class ConnectionBase:
         client_secret: str | None = None,
         timeout: int = 30,
         ttl: int = 0,
+        coalesce: bool = False,
+        cache: ResponseCache | None = None,
+        negative_cache: NegativeCache | None = None,
+        lanes: dict[str, int] | None = None,
+        validation: str = validation_levels.FAST,
     ) -> None:
         """Initialize the base connection class.
 
@@ -200,34 +281,246 @@ class ConnectionBase:
             timeout: Request timeout in seconds. Defaults to 30.
             ttl: Time to live in seconds before forcing reauthentication. If 0,
                 reauthentication is disabled. Defaults to 0.
+            coalesce: Share one in-flight HTTP call between concurrent identical
+                GET requests. Defaults to False.
+            cache: Response cache consulted for GET requests and invalidated
+                by successful writes. Defaults to None (no caching).
+            negative_cache: Cache of 404 Not Found responses consulted for GET
+                requests and invalidated by successful writes. Defaults to None.
+            lanes: Maximum number of concurrent requests per priority lane,
+                keyed by lane name. Code is put in a lane with
+                ipsdk.lanes.priority(). Defaults to None (no lanes).
+            validation: Request argument validation level, one of "strict",
+                "fast" or "off". See ipsdk.validation. Defaults to "fast".
 
         Returns:
             None
 
         Raises:
-            None
+            IpsdkError: If the validation level is unknown.
         """
+        self.validation = validation_levels.check_level(validation)
+
         self.user = user
         self.password = password
 
         self.client_id = client_id
         self.client_secret = client_secret
 
-        self.token = None
+        self._token = None
 
         self.authenticated = False
         self._auth_lock: Any | None = None
         self._auth_timestamp: float | None = None
         self.ttl = ttl
         self._ttl_enabled = ttl > 0  # Cache this check for performance
+        self._identity = self._make_identity()
 
+        self.cache = cache
+        self.negative_cache = negative_cache
+        self._refreshes: set[Any] = set()
+
+        self.singleflight = None
+        if coalesce and self._singleflight_class is not None:
+            self.singleflight = self._singleflight_class()
+
+        self.lanes = None
+        if lanes is not None and self._lanes_class is not None:
+            self.lanes = self._lanes_class(lanes)
+
+        self._base_url = self._make_base_url(host, port, base_path, use_tls)
+        self._url_prefix = self._base_url.rstrip("/")
         self.client = self.__init_client__(
-            base_url=self._make_base_url(host, port, base_path, use_tls),
+            base_url=self._base_url,
             verify=verify,
             timeout=timeout,
         )
         self.client.headers["User-Agent"] = f"ipsdk/{metadata.version}"
 
+    @logging.trace
+    def _make_identity(self) -> str:
+        """Compute an opaque identifier for the configured credentials.
+
+        The identifier distinguishes requests made with different credentials
+        when building request keys, without carrying the username or client
+        ID itself.
+
+        Returns:
+            str: A short hex digest identifying the credentials in use.
+
+        Raises:
+            None
+        """
+        if self.client_id is not None:
+            principal = f"client_id:{self.client_id}"
+        elif self.user is not None:
+            principal = f"user:{self.user}"
+        else:
+            principal = ""
+        return hashlib.sha256(principal.encode()).hexdigest()[:16]
+
+    @logging.trace
+    def _request_key(
+        self,
+        method: HTTPMethod,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> RequestKey | None:
+        """Build a hashable key identifying a request.
+
+        Two requests with the same key are interchangeable: they use the same
+        method, base URL, path, query parameters and credentials. Parameter
+        order does not affect the key.
+
+        Args:
+            method: HTTP method for the request.
+            path: Resource path appended to the base URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            RequestKey | None: The request key, or None if the parameters
+                contain values that cannot be hashed.
+
+        Raises:
+            None
+        """
+        items: tuple = ()
+        if params:
+            try:
+                items = tuple(
+                    sorted(
+                        (k, tuple(v) if isinstance(v, list) else v)
+                        for k, v in params.items()
+                    )
+                )
+                hash(items)
+            except TypeError:
+                return None
+        return RequestKey(method.value, self._base_url, path, items, self._identity)
+
+    @logging.trace
+    def _make_cache_hit(
+        self,
+        entry: CacheEntry,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> Response:
+        """Build a Response for a fresh cache entry without sending a request.
+
+        Args:
+            entry: The fresh cache entry to serve.
+            path: Resource path appended to the base URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The cached response with zero elapsed time.
+
+        Raises:
+            None
+        """
+        request = self.client.build_request("GET", path, params=params)
+        return Response(entry.to_httpx(request), timing=Timings(time.time_ns()))
+
+    @logging.trace
+    def _update_cache(
+        self, key: RequestKey, entry: CacheEntry | None, res: Response
+    ) -> Response:
+        """Record the outcome of a GET request in the response cache.
+
+        A 304 Not Modified response refreshes the revalidated entry and is
+        replaced by the cached response. Any other response is counted as a
+        miss and stored when its headers allow it.
+
+        Args:
+            key: The request key of the GET request.
+            entry: The cache entry that was revalidated, if any.
+            res: The response returned by the server.
+
+        Returns:
+            Response: The response to return to the caller.
+
+        Raises:
+            None
+        """
+        if self.cache is None:
+            return res
+
+        if entry is not None and res.status_code == HTTPStatus.NOT_MODIFIED:
+            logging.debug(f"Revalidated cached response for {key.path}")
+            self.cache.refresh(entry, res)
+            return Response(entry.to_httpx(res.request), timing=res.timing)
+
+        self.cache.record_miss()
+        self.cache.store(key, res)
+        return res
+
+    @logging.trace
+    def _make_not_found(
+        self,
+        entry: CacheEntry,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> exceptions.HTTPStatusError:
+        """Build the error for a GET answered by the negative cache.
+
+        Args:
+            entry: The fresh negative cache entry for the request.
+            path: Resource path appended to the base URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            HTTPStatusError: An error carrying the remembered 404 response.
+
+        Raises:
+            None
+        """
+        request = self.client.build_request("GET", path, params=params)
+        try:
+            entry.to_httpx(request).raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            return exceptions.HTTPStatusError(exc)
+        msg = f"negative cache entry for {path} is not an error response"
+        raise exceptions.IpsdkError(msg)
+
+    @logging.trace
+    def _remember_missing(
+        self, key: RequestKey, exc: exceptions.HTTPStatusError
+    ) -> None:
+        """Store a 404 Not Found response in the negative cache.
+
+        Args:
+            key: The request key of the GET request.
+            exc: The error raised for the request.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self.negative_cache is None or exc.response is None:
+            return
+        if self.negative_cache.store(key, exc.response) is not None:
+            self.negative_cache.record_miss()
+
+    @logging.trace
+    def _invalidate(self, path: str) -> None:
+        """Drop cached and negative cache entries for paths overlapping path.
+
+        Args:
+            path: The request path that was written to.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self.cache is not None:
+            self.cache.invalidate(self._base_url, path)
+        if self.negative_cache is not None:
+            self.negative_cache.invalidate(self._base_url, path)
+
     @logging.trace
     def _make_base_url(
         self,
@@ -265,6 +558,26 @@ class ConnectionBase:
 
         return urllib.parse.urlunsplit((proto, host, base_path, None, None))
 
+    def path(self, template: str, /, **variables: Any) -> str:
+        """Build a request path from a template.
+
+        The template is parsed once and cached, and each variable value is
+        percent-encoded as a single path segment, so values containing
+        spaces, ``/``, ``?`` or ``#`` cannot change the shape of the URL.
+
+        Args:
+            template: Path with ``{name}`` placeholders, such as
+                ``"/workflow_builder/workflows/{name}"``.
+            **variables: Values of the placeholders.
+
+        Returns:
+            str: The path, to pass to get(), post() and the other methods.
+
+        Raises:
+            IpsdkError: If the template is invalid or a variable is missing.
+        """
+        return path_template(template).format(**variables)
+
     @logging.trace
     def _build_request(
         self,
@@ -272,6 +585,7 @@ class ConnectionBase:
         path: str,
         json: str | bytes | dict | list | None = None,
         params: dict[str, Any | None] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> httpx.Request:
         """Build an HTTP request object.
 
@@ -282,9 +596,13 @@ class ConnectionBase:
         Args:
             method: HTTP method for the request.
             path: Resource path appended to the base URL.
-            json: JSON body data. If dict or list, automatically serialized.
+            json: JSON body data. If dict or list, serialized with the active
+                JSON codec; if str or bytes, sent unchanged as already
+                serialized JSON.
                 Defaults to None.
             params: Query string parameters. Defaults to None.
+            headers: Additional request headers, such as conditional request
+                validators. Defaults to None.
 
         Returns:
             httpx.Request: The constructed request object ready to send.
@@ -292,36 +610,28 @@ class ConnectionBase:
         Raises:
             None
         """
-        self._validate_request_args(method, path, params, json)
-
-        headers = {}
+        if self.validation != validation_levels.OFF:
+            self._validate_request_args(method, path, params, json)
 
         # If the value of json is not None, automatically set the Content-Type
         # and Accept headers to "application/json".  Technically, httpx will do
-        # this for us but setting it here to make it very explicit.
+        # this for us but setting it here to make it very explicit.  The
+        # Authorization header is not added here; it is one of the client's
+        # default headers, installed when the token is set.
         if json is not None:
-            logging.debug("Setting Content-Type and Accept headers due to json data")
-            headers.update(
-                {
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                }
-            )
+            headers = JSON_HEADERS if headers is None else {**headers, **JSON_HEADERS}
 
-        if self.token is not None:
-            logging.debug("Adding Authorization header to request")
-            headers["Authorization"] = f"Bearer {self.token}"
+        # Paths starting with "/" are joined to the base URL here, so httpx
+        # parses one absolute URL instead of parsing the path and then merging
+        # it with its base_url.
+        url = self._url_prefix + path if path[:1] == "/" else path
 
-        # The value for the keyword `json` is passed to the httpx build_request
-        # function.  If the value is of type list or dict, it will
-        # automatically be dumped to a string value and inserted into the body
-        # of the request.
         return self.client.build_request(
             method=method.value,
-            url=path,
+            url=url,
             params=params,
             headers=headers,
-            json=json,
+            content=json_content(json),
         )
 
     @logging.trace
@@ -337,8 +647,9 @@ class ConnectionBase:
 
         This method validates that all request parameters conform to expected
         types before building and sending the HTTP request. It checks that the
-        method is a valid HTTPMethod enum, params is a dict if provided, json
-        is a dict or list if provided, and path is a string.
+        method is a valid HTTPMethod enum and path is a string, then runs the
+        checks of the connection's validation level on params and json (see
+        validation.check_arguments), which prepared requests share.
 
         Args:
             method (HTTPMethod): The HTTP method enum value to validate
@@ -350,25 +661,19 @@ class ConnectionBase:
             None
 
         Raises:
-            IpsdkError: If method is not HTTPMethod type, params is not dict,
-                json is not dict/list, or path is not string
+            IpsdkError: If method is not HTTPMethod type, path is not string,
+                or params or json fails the validation level's checks
         """
         if not isinstance(method, HTTPMethod):
             msg = "method must be of type `HTTPMethod`"
             raise exceptions.IpsdkError(msg)
 
-        if params is not None and not isinstance(params, dict):
-            msg = "params must be of type `dict`"
-            raise exceptions.IpsdkError(msg)
-
-        if json is not None and not isinstance(json, (list, dict)):
-            msg = "json must be of type `dict` or `list`"
-            raise exceptions.IpsdkError(msg)
-
         if not isinstance(path, str):
             msg = "path must be of type `str`"
             raise exceptions.IpsdkError(msg)
 
+        validation_levels.check_arguments(self.validation, params, json)
+
     @logging.trace
     def _needs_reauthentication(self) -> bool:
         """Check if reauthentication is needed based on timeout.
@@ -424,6 +729,11 @@ class ConnectionBase:
 
 class Connection(ConnectionBase):
     client: httpx.Client  # Override the Union type from base class
+    singleflight: SingleFlight | None
+    lanes: LaneLimiter | None
+
+    _singleflight_class = SingleFlight
+    _lanes_class = LaneLimiter
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -474,7 +784,10 @@ class Connection(ConnectionBase):
 
         Automatically handles authentication on first request. Sets Content-Type
         and Accept headers to application/json when JSON body is provided.
-        Supports automatic reauthentication based on ttl setting.
+        Supports automatic reauthentication based on ttl setting. GET requests
+        are served from the response and negative caches and coalesced with
+        identical in-flight requests when those features are enabled, and
+        successful writes invalidate cached entries for overlapping paths.
 
         Args:
             method: HTTP method for the request.
@@ -490,6 +803,226 @@ class Connection(ConnectionBase):
             RequestError: Network or connection errors occurred.
             HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
         """
+        if method == HTTPMethod.GET:
+            if (
+                self.cache is not None
+                or self.negative_cache is not None
+                or self.singleflight is not None
+            ):
+                key = self._request_key(method, path, params)
+                if key is not None:
+                    return self._send_get(key, path, params)
+
+        elif self.cache is not None or self.negative_cache is not None:
+            res = self._execute_request(method, path, params, json)
+            self._invalidate(path)
+            return res
+
+        return self._execute_request(method, path, params, json)
+
+    @logging.trace
+    def _send_get(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> Response:
+        """Send a GET request through the response cache and request coalescing.
+
+        A fresh cache entry is returned without any network call, and a path
+        remembered by the negative cache raises HTTPStatusError. A stale entry
+        within the cache's max_stale window is returned immediately while a
+        background request revalidates it. Otherwise
+        the request is sent, coalesced with identical in-flight requests when
+        coalescing is enabled.
+
+        Args:
+            key: The request key identifying the GET request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        if self.negative_cache is not None:
+            missing = self.negative_cache.get(key)
+            if missing is not None and missing.is_fresh():
+                logging.debug(f"Serving {path} from negative cache")
+                self.negative_cache.record_hit()
+                raise self._make_not_found(missing, path, params)
+
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None and entry.is_fresh():
+                logging.debug(f"Serving {path} from response cache")
+                self.cache.record_hit()
+                return self._make_cache_hit(entry, path, params)
+
+            if entry is not None and self.cache.is_servable_stale(entry):
+                logging.debug(f"Serving stale {path} while revalidating")
+                self.cache.record_stale_hit()
+                self._start_refresh(key, path, params)
+                return self._make_cache_hit(entry, path, params)
+
+        if self.singleflight is not None:
+            # Each caller gets its own wrapper, so the memoized JSON of the
+            # shared response is never shared between callers
+            return self.singleflight.do(
+                key, lambda: self._fetch(key, path, params)
+            ).copy()
+
+        return self._fetch(key, path, params)
+
+    @logging.trace
+    def _start_refresh(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> None:
+        """Revalidate a stale cache entry in a background thread.
+
+        At most one refresh runs per key; the call returns immediately when a
+        refresh for the key is already in progress.
+
+        Args:
+            key: The request key of the stale entry.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self.cache is None or not self.cache.begin_refresh(key):
+            return
+
+        # Revalidate in a copy of the caller's context, so the refresh runs
+        # in the caller's priority lane
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._revalidate, key, path, params),
+            name="ipsdk-revalidate",
+            daemon=True,
+        )
+        self._refreshes.add(thread)
+        thread.start()
+
+    @logging.trace
+    def _revalidate(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> None:
+        """Fetch a GET request to refresh its cache entry, logging failures.
+
+        Args:
+            key: The request key of the stale entry.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        try:
+            self._fetch(key, path, params)
+        except Exception as exc:
+            logging.warning(f"Background revalidation of {path} failed: {exc}")
+        finally:
+            if self.cache is not None:
+                self.cache.end_refresh(key)
+            self._refreshes.discard(threading.current_thread())
+
+    @logging.trace
+    def _fetch(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> Response:
+        """Send a GET request, revalidating a stale cache entry if there is one.
+
+        Args:
+            key: The request key identifying the GET request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        entry = self.cache.get(key) if self.cache is not None else None
+        headers = entry.validators() if entry is not None else None
+        try:
+            res = self._execute_request(
+                HTTPMethod.GET, path, params, headers=headers or None
+            )
+        except exceptions.HTTPStatusError as exc:
+            self._remember_missing(key, exc)
+            raise
+        return self._update_cache(key, entry, res)
+
+    @logging.trace
+    def _execute_request(
+        self,
+        method: HTTPMethod,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Authenticate if needed, then build and send a single HTTP request.
+
+        When conditional request headers are given, a 304 Not Modified answer
+        is returned to the caller instead of being raised as an error.
+
+        Args:
+            method: HTTP method for the request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+            headers: Additional request headers. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        self._ensure_authenticated()
+
+        request = self._build_request(
+            method=method,
+            path=path,
+            params=params,
+            json=json,
+            headers=headers,
+        )
+        return self._dispatch(method, path, request, conditional=headers is not None)
+
+    def _ensure_authenticated(self) -> None:
+        """Authenticate on first use and again once the ttl has expired.
+
+        Returns:
+            None
+
+        Raises:
+            IpsdkError: If the authentication lock is not initialized.
+        """
         # Check authentication status and handle TTL-based reauthentication
         if self.authenticated is False or self._ttl_enabled:
             if self._auth_lock is None:
@@ -510,19 +1043,42 @@ class Connection(ConnectionBase):
                         self.authenticated = True
                         self._auth_timestamp = time.time()
 
-        request = self._build_request(
-            method=method,
-            path=path,
-            params=params,
-            json=json,
-        )
+    def _dispatch(
+        self,
+        method: HTTPMethod,
+        path: str,
+        request: httpx.Request,
+        conditional: bool = False,
+    ) -> Response:
+        """Send a built request and wrap the server response.
+
+        Args:
+            method: HTTP method of the request, used for logging.
+            path: URI path of the request, used for logging.
+            request: The request to send.
+            conditional: Whether the request carries conditional validators,
+                in which case a 304 Not Modified answer is returned instead
+                of raised. Defaults to False.
 
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
         try:
             logging.info(f"{method.value} {path}")
-            started_at = datetime.now(timezone.utc)
-            res = self.client.send(request)
-            finished_at = datetime.now(timezone.utc)
-            res.raise_for_status()
+            lane = self.lanes.hold() if self.lanes is not None else nullcontext()
+            recorder = TraceRecorder()
+            request.extensions["trace"] = recorder
+            with lane:
+                start_ns = time.time_ns()
+                started = time.perf_counter_ns()
+                res = self.client.send(request)
+                finished = time.perf_counter_ns()
+            if not conditional or res.status_code != HTTPStatus.NOT_MODIFIED:
+                res.raise_for_status()
 
         except httpx.RequestError as exc:
             logging.exception(exc)
@@ -536,11 +1092,7 @@ class Connection(ConnectionBase):
             logging.exception(exc)
             raise
 
-        return Response(
-            res,
-            started_at=started_at.isoformat(),
-            finished_at=finished_at.isoformat(),
-        )
+        return Response(res, timing=recorder.timings(start_ns, started, finished))
 
     @logging.trace
     def get(self, path: str, params: dict[str, Any | None] | None = None) -> Response:
@@ -650,9 +1202,132 @@ class Connection(ConnectionBase):
         """
         return self._send_request(HTTPMethod.PATCH, path=path, params=params, json=json)
 
+    @logging.trace
+    def paginate(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        **kwargs: Any,
+    ) -> Paginator:
+        """Lazily iterate over the items of a paginated list endpoint.
+
+        Pages are requested with get() as the returned iterator is consumed,
+        so only one page is held in memory at a time.
+
+        Args:
+            path: URI path of the list endpoint.
+            params: Additional query parameters sent with every page.
+                Defaults to None.
+            **kwargs: Pagination options such as style, page_size,
+                limit_param, offset_param, cursor_param, items_key, total_key,
+                next_cursor_key and max_items. See pagination.PaginatorBase.
+
+        Returns:
+            Paginator: An iterator over the collection items, used with
+                ``for``.
+
+        Raises:
+            IpsdkError: If the pagination options are invalid.
+        """
+        return Paginator(self, path, params, **kwargs)
+
+    @logging.trace
+    def prepare(
+        self,
+        method: HTTPMethod | str,
+        path: str,
+        headers: dict[str, str] | None = None,
+    ) -> PreparedRequest:
+        """Prepare a request template for repeated calls.
+
+        The method, path template and static headers are validated and
+        processed once; each call of the returned request's send() only
+        fills in the path variables, query parameters and body.
+
+        Args:
+            method: HTTP method of the request.
+            path: URI path template with ``{name}`` placeholders.
+            headers: Static headers sent with every call. Defaults to None.
+
+        Returns:
+            PreparedRequest: The prepared request.
+
+        Raises:
+            IpsdkError: If the method, path template or headers are invalid.
+        """
+        return PreparedRequest(self, method, path, headers)
+
+    def send_prepared(
+        self,
+        prepared: PreparedRequest,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Response:
+        """Send one call of a prepared request.
+
+        This is the transport behind PreparedRequest.send() and is not
+        usually called directly. GET requests without static headers are
+        sent through the response cache, negative cache and request
+        coalescing when those are enabled; all other requests are built from
+        the prepared template and writes invalidate the caches.
+
+        Args:
+            prepared: The prepared request.
+            path: The request path with the variables filled in.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            IpsdkError: If params or json has the wrong type.
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        method = prepared.method
+        cached = self.cache is not None or self.negative_cache is not None
+        if method == HTTPMethod.GET:
+            if not prepared.headers and (cached or self.singleflight is not None):
+                return self._send_request(method, path, params)
+            cached = False
+
+        self._ensure_authenticated()
+        res = self._dispatch(method, path, prepared.build_request(path, params, json))
+        if cached:
+            self._invalidate(path)
+        return res
+
+    @logging.trace
+    def write_behind(self, **kwargs: Any) -> WriteBehind:
+        """Create a write-behind queue sending writes through this connection.
+
+        Writes submitted to the queue are buffered and sent by background
+        worker threads, so the caller does not wait for the network.
+
+        Args:
+            **kwargs: Queue options such as max_pending, concurrency, retries,
+                backoff, overflow and on_error. See
+                writebehind.WriteBehindBase.
+
+        Returns:
+            WriteBehind: The queue, to be closed (or used as a context
+                manager) so buffered writes are flushed on shutdown.
+
+        Raises:
+            IpsdkError: If the queue options are invalid.
+        """
+        return WriteBehind(self, **kwargs)
+
 
 class AsyncConnection(ConnectionBase):
     client: httpx.AsyncClient  # Override the Union type from base class
+    singleflight: AsyncSingleFlight | None
+    lanes: AsyncLaneLimiter | None
+
+    _singleflight_class = AsyncSingleFlight
+    _lanes_class = AsyncLaneLimiter
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -704,7 +1379,10 @@ class AsyncConnection(ConnectionBase):
 
         Automatically handles authentication on first request. Sets Content-Type
         and Accept headers to application/json when JSON body is provided.
-        Supports automatic reauthentication based on ttl setting.
+        Supports automatic reauthentication based on ttl setting. GET requests
+        are served from the response and negative caches and coalesced with
+        identical in-flight requests when those features are enabled, and
+        successful writes invalidate cached entries for overlapping paths.
 
         Args:
             method: HTTP method for the request.
@@ -720,6 +1398,221 @@ class AsyncConnection(ConnectionBase):
             RequestError: Network or connection errors occurred.
             HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
         """
+        if method == HTTPMethod.GET:
+            if (
+                self.cache is not None
+                or self.negative_cache is not None
+                or self.singleflight is not None
+            ):
+                key = self._request_key(method, path, params)
+                if key is not None:
+                    return await self._send_get(key, path, params)
+
+        elif self.cache is not None or self.negative_cache is not None:
+            res = await self._execute_request(method, path, params, json)
+            self._invalidate(path)
+            return res
+
+        return await self._execute_request(method, path, params, json)
+
+    @logging.trace
+    async def _send_get(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> Response:
+        """Send a GET request through the response cache and request coalescing.
+
+        A fresh cache entry is returned without any network call, and a path
+        remembered by the negative cache raises HTTPStatusError. A stale entry
+        within the cache's max_stale window is returned immediately while a
+        background request revalidates it. Otherwise
+        the request is sent, coalesced with identical in-flight requests when
+        coalescing is enabled.
+
+        Args:
+            key: The request key identifying the GET request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        if self.negative_cache is not None:
+            missing = self.negative_cache.get(key)
+            if missing is not None and missing.is_fresh():
+                logging.debug(f"Serving {path} from negative cache")
+                self.negative_cache.record_hit()
+                raise self._make_not_found(missing, path, params)
+
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None and entry.is_fresh():
+                logging.debug(f"Serving {path} from response cache")
+                self.cache.record_hit()
+                return self._make_cache_hit(entry, path, params)
+
+            if entry is not None and self.cache.is_servable_stale(entry):
+                logging.debug(f"Serving stale {path} while revalidating")
+                self.cache.record_stale_hit()
+                self._start_refresh(key, path, params)
+                return self._make_cache_hit(entry, path, params)
+
+        if self.singleflight is not None:
+            # Each caller gets its own wrapper, so the memoized JSON of the
+            # shared response is never shared between callers
+            res = await self.singleflight.do(
+                key, lambda: self._fetch(key, path, params)
+            )
+            return res.copy()
+
+        return await self._fetch(key, path, params)
+
+    @logging.trace
+    def _start_refresh(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> None:
+        """Revalidate a stale cache entry in a background task.
+
+        At most one refresh runs per key; the call returns immediately when a
+        refresh for the key is already in progress.
+
+        Args:
+            key: The request key of the stale entry.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self.cache is None or not self.cache.begin_refresh(key):
+            return
+
+        task = asyncio.ensure_future(self._revalidate(key, path, params))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    @logging.trace
+    async def _revalidate(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> None:
+        """Fetch a GET request to refresh its cache entry, logging failures.
+
+        Args:
+            key: The request key of the stale entry.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        try:
+            await self._fetch(key, path, params)
+        except Exception as exc:
+            logging.warning(f"Background revalidation of {path} failed: {exc}")
+        finally:
+            if self.cache is not None:
+                self.cache.end_refresh(key)
+
+    @logging.trace
+    async def _fetch(
+        self,
+        key: RequestKey,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+    ) -> Response:
+        """Send a GET request, revalidating a stale cache entry if there is one.
+
+        Args:
+            key: The request key identifying the GET request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        entry = self.cache.get(key) if self.cache is not None else None
+        headers = entry.validators() if entry is not None else None
+        try:
+            res = await self._execute_request(
+                HTTPMethod.GET, path, params, headers=headers or None
+            )
+        except exceptions.HTTPStatusError as exc:
+            self._remember_missing(key, exc)
+            raise
+        return self._update_cache(key, entry, res)
+
+    @logging.trace
+    async def _execute_request(
+        self,
+        method: HTTPMethod,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Authenticate if needed, then build and send a single HTTP request.
+
+        When conditional request headers are given, a 304 Not Modified answer
+        is returned to the caller instead of being raised as an error.
+
+        Args:
+            method: HTTP method for the request.
+            path: URI path combined with base_url to form the full resource URL.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+            headers: Additional request headers. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        await self._ensure_authenticated()
+
+        request = self._build_request(
+            method=method,
+            path=path,
+            params=params,
+            json=json,
+            headers=headers,
+        )
+        return await self._dispatch(
+            method, path, request, conditional=headers is not None
+        )
+
+    async def _ensure_authenticated(self) -> None:
+        """Authenticate on first use and again once the ttl has expired.
+
+        Returns:
+            None
+
+        Raises:
+            IpsdkError: If the authentication lock is not initialized.
+        """
         # Check authentication status and handle TTL-based reauthentication
         if self.authenticated is False or self._ttl_enabled:
             if self._auth_lock is None:
@@ -740,19 +1633,42 @@ class AsyncConnection(ConnectionBase):
                         self.authenticated = True
                         self._auth_timestamp = time.time()
 
-        request = self._build_request(
-            method=method,
-            path=path,
-            params=params,
-            json=json,
-        )
+    async def _dispatch(
+        self,
+        method: HTTPMethod,
+        path: str,
+        request: httpx.Request,
+        conditional: bool = False,
+    ) -> Response:
+        """Send a built request and wrap the server response.
+
+        Args:
+            method: HTTP method of the request, used for logging.
+            path: URI path of the request, used for logging.
+            request: The request to send.
+            conditional: Whether the request carries conditional validators,
+                in which case a 304 Not Modified answer is returned instead
+                of raised. Defaults to False.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
 
+        Raises:
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
         try:
             logging.info(f"{method.value} {path}")
-            started_at = datetime.now(timezone.utc)
-            res = await self.client.send(request)
-            finished_at = datetime.now(timezone.utc)
-            res.raise_for_status()
+            lane = self.lanes.hold() if self.lanes is not None else nullcontext()
+            recorder = AsyncTraceRecorder()
+            request.extensions["trace"] = recorder
+            async with lane:
+                start_ns = time.time_ns()
+                started = time.perf_counter_ns()
+                res = await self.client.send(request)
+                finished = time.perf_counter_ns()
+            if not conditional or res.status_code != HTTPStatus.NOT_MODIFIED:
+                res.raise_for_status()
 
         except httpx.RequestError as exc:
             logging.exception(exc)
@@ -766,11 +1682,7 @@ class AsyncConnection(ConnectionBase):
             logging.exception(exc)
             raise
 
-        return Response(
-            res,
-            started_at=started_at.isoformat(),
-            finished_at=finished_at.isoformat(),
-        )
+        return Response(res, timing=recorder.timings(start_ns, started, finished))
 
     @logging.trace
     async def get(
@@ -924,3 +1836,124 @@ class AsyncConnection(ConnectionBase):
         return await self._send_request(
             HTTPMethod.PATCH, path=path, params=params, json=json
         )
+
+    @logging.trace
+    def paginate(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        **kwargs: Any,
+    ) -> AsyncPaginator:
+        """Lazily iterate over the items of a paginated list endpoint.
+
+        Pages are requested with get() as the returned iterator is consumed,
+        so only one page is held in memory at a time.
+
+        Args:
+            path: URI path of the list endpoint.
+            params: Additional query parameters sent with every page.
+                Defaults to None.
+            **kwargs: Pagination options such as style, page_size,
+                limit_param, offset_param, cursor_param, items_key, total_key,
+                next_cursor_key and max_items. See pagination.PaginatorBase.
+
+        Returns:
+            AsyncPaginator: An iterator over the collection items, used with
+                ``async for``.
+
+        Raises:
+            IpsdkError: If the pagination options are invalid.
+        """
+        return AsyncPaginator(self, path, params, **kwargs)
+
+    @logging.trace
+    def prepare(
+        self,
+        method: HTTPMethod | str,
+        path: str,
+        headers: dict[str, str] | None = None,
+    ) -> AsyncPreparedRequest:
+        """Prepare a request template for repeated calls.
+
+        The method, path template and static headers are validated and
+        processed once; each call of the returned request's send() only
+        fills in the path variables, query parameters and body.
+
+        Args:
+            method: HTTP method of the request.
+            path: URI path template with ``{name}`` placeholders.
+            headers: Static headers sent with every call. Defaults to None.
+
+        Returns:
+            AsyncPreparedRequest: The prepared request.
+
+        Raises:
+            IpsdkError: If the method, path template or headers are invalid.
+        """
+        return AsyncPreparedRequest(self, method, path, headers)
+
+    async def send_prepared(
+        self,
+        prepared: AsyncPreparedRequest,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> Response:
+        """Send one call of a prepared request.
+
+        This is the transport behind AsyncPreparedRequest.send() and is not
+        usually called directly. GET requests without static headers are
+        sent through the response cache, negative cache and request
+        coalescing when those are enabled; all other requests are built from
+        the prepared template and writes invalidate the caches.
+
+        Args:
+            prepared: The prepared request.
+            path: The request path with the variables filled in.
+            params: Query string parameters. Defaults to None.
+            json: JSON payload for request body. Defaults to None.
+
+        Returns:
+            Response: The HTTP response wrapped in a Response object.
+
+        Raises:
+            IpsdkError: If params or json has the wrong type.
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        method = prepared.method
+        cached = self.cache is not None or self.negative_cache is not None
+        if method == HTTPMethod.GET:
+            if not prepared.headers and (cached or self.singleflight is not None):
+                return await self._send_request(method, path, params)
+            cached = False
+
+        await self._ensure_authenticated()
+        res = await self._dispatch(
+            method, path, prepared.build_request(path, params, json)
+        )
+        if cached:
+            self._invalidate(path)
+        return res
+
+    @logging.trace
+    def write_behind(self, **kwargs: Any) -> AsyncWriteBehind:
+        """Create a write-behind queue sending writes through this connection.
+
+        Writes submitted to the queue are buffered and sent by background
+        worker tasks, so the caller does not wait for the network.
+
+        Args:
+            **kwargs: Queue options such as max_pending, concurrency, retries,
+                backoff, overflow and on_error. See
+                writebehind.WriteBehindBase.
+
+        Returns:
+            AsyncWriteBehind: The queue, to be closed with aclose() (or used
+                as an async context manager) so buffered writes are flushed
+                on shutdown.
+
+        Raises:
+            IpsdkError: If the queue options are invalid.
+        """
+        return AsyncWriteBehind(self, **kwargs)
@@ -23,7 +23,11 @@ errors with a single exception handler or handle specific errors individually.
         └── IpsdkError (Base SDK exception)
             ├── RequestError (Network/connection errors)
             ├── HTTPStatusError (HTTP 4xx/5xx errors)
-            └── SerializationError (JSON serialization/deserialization errors)
+            ├── SerializationError (JSON serialization/deserialization errors)
+            │   └── SchemaError (JSON did not match a declared type)
+            ├── WaitTimeoutError (Waiting for a job exceeded its timeout)
+            ├── WaitCancelledError (Waiting for a job was cancelled)
+            └── QueueFullError (A write-behind queue had no room for a write)
 
 Exception Classes
 -----------------
@@ -44,6 +48,22 @@ SerializationError:
     Raised when JSON serialization or deserialization fails. This includes
     malformed JSON, invalid data types, and encoding/decoding errors.
 
+SchemaError:
+    Raised when a response decoded into a declared type is missing a required
+    field or has a value of the wrong type.
+
+WaitTimeoutError:
+    Raised by the job waiters when a job does not reach a final status within
+    the requested timeout.
+
+WaitCancelledError:
+    Raised by the job waiters when waiting is cancelled by the caller before
+    the job reaches a final status.
+
+QueueFullError:
+    Raised by the write-behind queues when a write cannot be buffered because
+    the buffer is full.
+
 Usage Examples
 --------------
 Catching all SDK errors::
@@ -274,3 +294,76 @@ class SerializationError(IpsdkError):
         ... except SerializationError as e:
         ...     print(f"JSON serialization failed: {e}")
     """
+
+
+class SchemaError(SerializationError):
+    """
+    Exception raised when JSON does not match the type it is decoded into.
+
+    Raised by typed decoding (see ``ipsdk.schema``) when a required field is
+    missing or a value has the wrong type. The location of the offending
+    value, such as ``json['data'][3]['port']``, is available as ``location``.
+
+    Args:
+        message (str): Human-readable error message
+        location (str | None): Location of the offending value. Defaults to
+            None.
+
+    Example:
+        >>> try:
+        ...     jobs = response.decode(JobList)
+        ... except SchemaError as e:
+        ...     print(f"Unexpected job document at {e.location}: {e}")
+    """
+
+    @logging.trace
+    def __init__(self, message: str, location: str | None = None) -> None:
+        super().__init__(message)
+        self.location = location
+
+
+class WaitTimeoutError(IpsdkError):
+    """
+    Exception raised when waiting for a job exceeds its timeout.
+
+    The job itself keeps running on the server; only the wait is abandoned.
+    The last job document received, if any, is available as ``document``.
+
+    Args:
+        message (str): Human-readable error message
+        document (Any): The last job document received. Defaults to None.
+
+    Example:
+        >>> try:
+        ...     job = waiter.wait(job_id, timeout=60)
+        ... except WaitTimeoutError as e:
+        ...     print(f"Job still {e.document['status']} after 60s")
+    """
+
+    @logging.trace
+    def __init__(self, message: str, document: Any = None) -> None:
+        super().__init__(message)
+        self.document = document
+
+
+class WaitCancelledError(IpsdkError):
+    """
+    Exception raised when waiting for a job is cancelled by the caller.
+
+    The job itself keeps running on the server; only the wait is abandoned.
+
+    Args:
+        message (str): Human-readable error message
+    """
+
+
+class QueueFullError(IpsdkError):
+    """
+    Exception raised when a write-behind queue has no room for a write.
+
+    Raised immediately with the ``"raise"`` overflow policy, or when no room
+    is made within the submit timeout with the ``"block"`` policy.
+
+    Args:
+        message (str): Human-readable error message
+    """
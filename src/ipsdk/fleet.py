@@ -0,0 +1,825 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Fan-out of requests across a fleet of Automation Gateways.
+
+This module provides executors that hold a named set of Gateway clients and
+run the same request, or the same function, against all or some of them
+concurrently. Results stream back as each gateway answers, tagged with the
+gateway name, and failures are returned as results rather than aborting the
+whole fan-out.
+
+Concurrency is limited globally (``max_concurrency`` calls across the whole
+fleet) and per gateway (``per_gateway`` calls against any one gateway), and
+the limits hold across fan-outs running at the same time. A call waiting for
+its gateway's limit does not hold one of the fleet-wide slots, so a busy
+gateway never holds up calls to the others. Per-gateway latency and error
+counts are collected in ``Fleet.stats``.
+
+Components
+----------
+FleetResult:
+    The outcome of one call against one gateway: its value or the exception
+    it raised, and how long it took.
+
+LatencyStats:
+    Call count, error count and latency summary for one gateway.
+
+Fleet:
+    Executor for synchronous Gateway clients, backed by a thread pool.
+
+AsyncFleet:
+    Executor for AsyncGateway clients, backed by asyncio tasks.
+
+Examples
+--------
+Listing devices on every gateway::
+
+    from ipsdk.fleet import Fleet
+
+    hosts = ["gw1.example.com", "gw2.example.com"]
+
+    with Fleet.connect(hosts, user="admin@itential") as fleet:
+        for result in fleet.request("get", "/devices"):
+            if result.ok:
+                print(result.name, len(result.value.json()["data"]))
+            else:
+                print(result.name, "failed:", result.error)
+
+        print(fleet.stats["gw1.example.com"].mean)
+"""
+
+import abc
+import asyncio
+import contextvars
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+from .gateway import gateway_factory
+from .http import HTTPMethod
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+
+# Number of latency samples kept per gateway for percentiles
+_SAMPLES: int = 1000
+
+# HTTP methods exposed by the Gateway clients
+_METHODS: frozenset[str] = frozenset(
+    method.value
+    for method in (
+        HTTPMethod.GET,
+        HTTPMethod.POST,
+        HTTPMethod.PUT,
+        HTTPMethod.PATCH,
+        HTTPMethod.DELETE,
+    )
+)
+
+
+class FleetResult:
+    """The outcome of one call against one gateway.
+
+    Args:
+        name (str): The gateway name.
+        value (Any): The value returned by the call, or None if it failed.
+        error (BaseException | None): The exception raised by the call, or
+            None if it succeeded.
+        elapsed (float): Duration of the call in seconds.
+    """
+
+    __slots__ = ("elapsed", "error", "name", "value")
+
+    def __init__(
+        self,
+        name: str,
+        value: Any = None,
+        error: BaseException | None = None,
+        elapsed: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check whether the call succeeded
+
+        Returns:
+            bool: True if the call did not raise an exception
+        """
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """
+        Get the value of the call, raising its exception if it failed
+
+        Returns:
+            Any: The value returned by the call
+
+        Raises:
+            Exception: The exception raised by the call
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self) -> str:
+        outcome = "ok" if self.ok else type(self.error).__name__
+        return f"FleetResult(name='{self.name}', {outcome}, elapsed={self.elapsed:.3f})"
+
+
+class LatencyStats:
+    """Call count, error count and latency summary for one gateway.
+
+    The most recent latency samples are kept for percentiles.
+
+    Attributes:
+        count (int): Number of completed calls.
+        errors (int): Number of calls that raised an exception.
+        total (float): Sum of call durations in seconds.
+        min (float): Shortest call duration in seconds.
+        max (float): Longest call duration in seconds.
+    """
+
+    __slots__ = ("_lock", "_samples", "count", "errors", "max", "min", "total")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=_SAMPLES)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed: float, *, failed: bool = False) -> None:
+        """
+        Record a completed call
+
+        Args:
+            elapsed (float): Duration of the call in seconds.
+            failed (bool): Whether the call raised an exception.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.min = elapsed if self.count == 0 else min(self.min, elapsed)
+            self.max = max(self.max, elapsed)
+            self.count += 1
+            self.total += elapsed
+            if failed:
+                self.errors += 1
+            self._samples.append(elapsed)
+
+    @property
+    def mean(self) -> float:
+        """
+        Get the mean call duration
+
+        Returns:
+            float: The mean duration in seconds, or 0 without calls
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get a latency percentile over the recent samples
+
+        Args:
+            pct (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The duration in seconds, or 0 without calls
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        index = min(int(len(samples) * pct / 100), len(samples) - 1)
+        return samples[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyStats(count={self.count}, errors={self.errors}, "
+            f"mean={self.mean:.3f}, max={self.max:.3f})"
+        )
+
+
+class _GatewaySlots:
+    """Per-gateway concurrency limit for Fleet that queues calls.
+
+    A call that finds every slot taken is queued here and started by the call
+    that releases a slot, instead of blocking a pool thread while it waits.
+
+    Args:
+        value (int): The number of calls allowed in flight.
+    """
+
+    __slots__ = ("_free", "_lock", "_waiting")
+
+    def __init__(self, value: int) -> None:
+        self._lock = threading.Lock()
+        self._free = value
+        self._waiting: deque[Callable[[], None]] = deque()
+
+    def acquire(self, start: Callable[[], None]) -> None:
+        """
+        Start a call now if a slot is free, otherwise when one is released
+
+        Args:
+            start (Callable): Starts the call, which must call release() when
+                it is done.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if not self._free:
+                self._waiting.append(start)
+                return
+            self._free -= 1
+        start()
+
+    def release(self) -> None:
+        """
+        Release a slot, handing it to the next queued call if there is one
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if not self._waiting:
+                self._free += 1
+                return
+            start = self._waiting.popleft()
+        start()
+
+
+class FleetBase(abc.ABC):
+    """Shared membership and limits for the fleet executors.
+
+    Args:
+        gateways (Mapping[str, Any]): Gateway clients keyed by name.
+        max_concurrency (int): Maximum number of calls in flight across the
+            whole fleet. Defaults to 16.
+        per_gateway (int): Maximum number of calls in flight against any one
+            gateway. Defaults to 4.
+
+    Attributes:
+        stats (dict[str, LatencyStats]): Latency statistics keyed by gateway
+            name.
+
+    Raises:
+        IpsdkError: If a limit is not positive.
+    """
+
+    __slots__ = ("_gateways", "_limits", "max_concurrency", "per_gateway", "stats")
+
+    def __init__(
+        self,
+        gateways: Mapping[str, Any],
+        max_concurrency: int = 16,
+        per_gateway: int = 4,
+    ) -> None:
+        if max_concurrency <= 0 or per_gateway <= 0:
+            msg = "max_concurrency and per_gateway must be positive integers"
+            raise exceptions.IpsdkError(msg)
+
+        self.max_concurrency = max_concurrency
+        self.per_gateway = per_gateway
+        self._gateways: dict[str, Any] = {}
+        self._limits: dict[str, Any] = {}
+        self.stats: dict[str, LatencyStats] = {}
+
+        for name, gateway in gateways.items():
+            self.add(name, gateway)
+
+    @property
+    def names(self) -> list[str]:
+        """
+        Get the names of the gateways in the fleet
+
+        Returns:
+            list[str]: The gateway names in insertion order
+        """
+        return list(self._gateways)
+
+    def __len__(self) -> int:
+        return len(self._gateways)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._gateways[name]
+
+    def add(self, name: str, gateway: Any) -> None:
+        """
+        Add a gateway client to the fleet, replacing any with the same name
+
+        Args:
+            name (str): The gateway name.
+            gateway (Gateway | AsyncGateway): The gateway client.
+
+        Returns:
+            None
+        """
+        self._gateways[name] = gateway
+        self._limits[name] = self._make_limit(self.per_gateway)
+        self.stats.setdefault(name, LatencyStats())
+
+    def remove(self, name: str) -> Any:
+        """
+        Remove a gateway client from the fleet
+
+        Args:
+            name (str): The gateway name.
+
+        Returns:
+            Gateway | AsyncGateway: The removed client.
+
+        Raises:
+            IpsdkError: If no gateway has that name.
+        """
+        if name not in self._gateways:
+            msg = f"unknown gateway {name!r}"
+            raise exceptions.IpsdkError(msg)
+        self._limits.pop(name)
+        return self._gateways.pop(name)
+
+    def _select(self, names: Iterable[str] | None) -> list[str]:
+        """Resolve the gateways targeted by a fan-out.
+
+        Args:
+            names (Iterable[str] | None): Gateway names, or None for all.
+
+        Returns:
+            list[str]: The selected gateway names.
+
+        Raises:
+            IpsdkError: If a name is not in the fleet.
+        """
+        if names is None:
+            return self.names
+        selected = list(names)
+        unknown = [name for name in selected if name not in self._gateways]
+        if unknown:
+            msg = f"unknown gateways: {', '.join(unknown)}"
+            raise exceptions.IpsdkError(msg)
+        return selected
+
+    @abc.abstractmethod
+    def _make_limit(self, value: int) -> Any:
+        """Create a semaphore matching the executor's concurrency model.
+
+        Abstract method implemented by Fleet and AsyncFleet.
+
+        Args:
+            value (int): The number of concurrent holders.
+
+        Returns:
+            Any: The semaphore.
+        """
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(gateways={len(self._gateways)}, "
+            f"max_concurrency={self.max_concurrency}, "
+            f"per_gateway={self.per_gateway})"
+        )
+
+
+def _request_call(
+    method: str,
+    path: str,
+    params: dict[str, Any] | None,
+    json: Any,
+) -> Callable[[Any], Any]:
+    """Build the function sending one request to a gateway client.
+
+    Args:
+        method (str): The HTTP method name.
+        path (str): The request path.
+        params (dict | None): Query string parameters.
+        json (Any): The request body, only allowed with POST, PUT and PATCH.
+
+    Returns:
+        Callable: A function taking a gateway client and sending the request.
+
+    Raises:
+        IpsdkError: If the method is unknown or a body is given with GET or
+            DELETE.
+    """
+    verb = method.upper()
+    if verb not in _METHODS:
+        msg = f"unsupported HTTP method {method!r}"
+        raise exceptions.IpsdkError(msg)
+
+    name = verb.lower()
+    if json is None:
+        return lambda client: getattr(client, name)(path, params=params)
+
+    if verb in (HTTPMethod.GET.value, HTTPMethod.DELETE.value):
+        msg = f"{verb} requests do not accept a body"
+        raise exceptions.IpsdkError(msg)
+    return lambda client: getattr(client, name)(path, params=params, json=json)
+
+
+class Fleet(FleetBase):
+    """Run calls concurrently across synchronous Gateway clients.
+
+    Calls run on a thread pool sized by max_concurrency, which is shared by
+    every fan-out made through the fleet. A call is only handed to the pool
+    once its gateway has a free slot, so calls queued behind a busy gateway
+    do not occupy pool threads. close() shuts the pool down and closes the
+    gateway clients.
+
+    Args:
+        gateways (Mapping[str, Gateway]): Gateway clients keyed by name.
+        max_concurrency (int): Maximum number of calls in flight across the
+            whole fleet. Defaults to 16.
+        per_gateway (int): Maximum number of calls in flight against any one
+            gateway. Defaults to 4.
+    """
+
+    __slots__ = ("_executor",)
+
+    def __init__(
+        self,
+        gateways: Mapping[str, Connection],
+        max_concurrency: int = 16,
+        per_gateway: int = 4,
+    ) -> None:
+        super().__init__(gateways, max_concurrency, per_gateway)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="ipsdk-fleet"
+        )
+
+    @classmethod
+    def connect(
+        cls,
+        hosts: Iterable[str],
+        max_concurrency: int = 16,
+        per_gateway: int = 4,
+        **kwargs: Any,
+    ) -> Fleet:
+        """Create a fleet with one Gateway client per host.
+
+        Args:
+            hosts (Iterable[str]): Gateway hostnames, also used as names.
+            max_concurrency (int): Fleet-wide concurrency limit.
+            per_gateway (int): Per-gateway concurrency limit.
+            **kwargs: Options passed to gateway_factory() for every host.
+
+        Returns:
+            Fleet: The new fleet.
+        """
+        gateways = {host: gateway_factory(host=host, **kwargs) for host in hosts}
+        return cls(gateways, max_concurrency, per_gateway)
+
+    def _make_limit(self, value: int) -> _GatewaySlots:
+        return _GatewaySlots(value)
+
+    def map(
+        self, fn: Callable[[Any], Any], names: Iterable[str] | None = None
+    ) -> Iterator[FleetResult]:
+        """Call a function with each selected gateway client concurrently.
+
+        The calls are started before this method returns. Leaving the
+        iteration early cancels the calls that have not started yet.
+
+        Args:
+            fn (Callable): Function taking a gateway client.
+            names (Iterable[str] | None): Gateways to target. Defaults to
+                None (every gateway).
+
+        Returns:
+            Iterator[FleetResult]: One result per gateway, in order of
+                completion.
+
+        Raises:
+            IpsdkError: If a name is not in the fleet.
+        """
+        futures = [self._submit(name, fn) for name in self._select(names)]
+        return self._results(futures)
+
+    @staticmethod
+    def _results(futures: list[Future[FleetResult]]) -> Iterator[FleetResult]:
+        """Yield results as calls finish, cancelling the rest on early exit.
+
+        Args:
+            futures (list[Future[FleetResult]]): The calls of a fan-out.
+
+        Yields:
+            FleetResult: One result per call, in order of completion.
+        """
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _submit(self, name: str, fn: Callable[[Any], Any]) -> Future[FleetResult]:
+        """Queue a call until its gateway has a free slot, then start it.
+
+        Args:
+            name (str): The gateway name.
+            fn (Callable): Function taking the gateway client.
+
+        Returns:
+            Future[FleetResult]: The outcome of the call.
+        """
+        future: Future[FleetResult] = Future()
+        slots = self._limits[name]
+        # Calls run in copies of the caller's context, such as its priority lane
+        context = contextvars.copy_context()
+
+        def start() -> None:
+            try:
+                self._executor.submit(context.run, self._run, name, fn, future)
+            except RuntimeError as exc:
+                # The fleet was closed while the call was queued
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(exc)
+                slots.release()
+
+        slots.acquire(start)
+        return future
+
+    def _run(
+        self, name: str, fn: Callable[[Any], Any], future: Future[FleetResult]
+    ) -> None:
+        """Run a started call on a pool thread and release its gateway slot.
+
+        Args:
+            name (str): The gateway name.
+            fn (Callable): Function taking the gateway client.
+            future (Future[FleetResult]): Receives the outcome, unless the
+                call was cancelled before it started.
+
+        Returns:
+            None
+        """
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(self._call(name, fn))
+        finally:
+            self._limits[name].release()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        names: Iterable[str] | None = None,
+    ) -> Iterator[FleetResult]:
+        """Send the same request to each selected gateway concurrently.
+
+        Args:
+            method (str): The HTTP method, for example ``"get"``.
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): Request body for POST, PUT and PATCH. Defaults to None.
+            names (Iterable[str] | None): Gateways to target. Defaults to
+                None (every gateway).
+
+        Yields:
+            FleetResult: One result per gateway, whose value is the Response,
+                in order of completion.
+
+        Raises:
+            IpsdkError: If the method or a name is invalid.
+        """
+        return self.map(_request_call(method, path, params, json), names)
+
+    def _call(self, name: str, fn: Callable[[Any], Any]) -> FleetResult:
+        """Run a call against one gateway.
+
+        Args:
+            name (str): The gateway name.
+            fn (Callable): Function taking the gateway client.
+
+        Returns:
+            FleetResult: The outcome of the call.
+        """
+        started = time.perf_counter()
+        try:
+            value = fn(self._gateways[name])
+        except Exception as exc:
+            elapsed = time.perf_counter() - started
+            logging.debug(f"Fleet call on {name} failed: {exc}")
+            self.stats[name].record(elapsed, failed=True)
+            return FleetResult(name, error=exc, elapsed=elapsed)
+
+        elapsed = time.perf_counter() - started
+        self.stats[name].record(elapsed)
+        return FleetResult(name, value=value, elapsed=elapsed)
+
+    @logging.trace
+    def close(self) -> None:
+        """Shut down the thread pool and close every gateway client.
+
+        Returns:
+            None
+        """
+        self._executor.shutdown(wait=True)
+        for gateway in self._gateways.values():
+            gateway.client.close()
+
+    def __enter__(self) -> Fleet:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class AsyncFleet(FleetBase):
+    """Run calls concurrently across AsyncGateway clients.
+
+    Args:
+        gateways (Mapping[str, AsyncGateway]): Gateway clients keyed by name.
+        max_concurrency (int): Maximum number of calls in flight across the
+            whole fleet. Defaults to 16.
+        per_gateway (int): Maximum number of calls in flight against any one
+            gateway. Defaults to 4.
+    """
+
+    __slots__ = ("_global",)
+
+    def __init__(
+        self,
+        gateways: Mapping[str, AsyncConnection],
+        max_concurrency: int = 16,
+        per_gateway: int = 4,
+    ) -> None:
+        super().__init__(gateways, max_concurrency, per_gateway)
+        self._global = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def connect(
+        cls,
+        hosts: Iterable[str],
+        max_concurrency: int = 16,
+        per_gateway: int = 4,
+        **kwargs: Any,
+    ) -> AsyncFleet:
+        """Create a fleet with one AsyncGateway client per host.
+
+        Args:
+            hosts (Iterable[str]): Gateway hostnames, also used as names.
+            max_concurrency (int): Fleet-wide concurrency limit.
+            per_gateway (int): Per-gateway concurrency limit.
+            **kwargs: Options passed to gateway_factory() for every host.
+
+        Returns:
+            AsyncFleet: The new fleet.
+        """
+        gateways = {
+            host: gateway_factory(host=host, want_async=True, **kwargs)
+            for host in hosts
+        }
+        return cls(gateways, max_concurrency, per_gateway)
+
+    def _make_limit(self, value: int) -> asyncio.Semaphore:
+        return asyncio.Semaphore(value)
+
+    def map(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        names: Iterable[str] | None = None,
+    ) -> AsyncIterator[FleetResult]:
+        """Call a coroutine function with each selected gateway concurrently.
+
+        The names are checked before this method returns and the calls start
+        when the iteration does. Leaving the iteration early cancels the calls
+        still running.
+
+        Args:
+            fn (Callable): Coroutine function taking a gateway client.
+            names (Iterable[str] | None): Gateways to target. Defaults to
+                None (every gateway).
+
+        Returns:
+            AsyncIterator[FleetResult]: One result per gateway, in order of
+                completion.
+
+        Raises:
+            IpsdkError: If a name is not in the fleet.
+        """
+        return self._results(fn, self._select(names))
+
+    async def _results(
+        self, fn: Callable[[Any], Awaitable[Any]], names: list[str]
+    ) -> AsyncIterator[FleetResult]:
+        """Run the calls of a fan-out, yielding results as they finish.
+
+        Args:
+            fn (Callable): Coroutine function taking a gateway client.
+            names (list[str]): The selected gateway names.
+
+        Yields:
+            FleetResult: One result per gateway, in order of completion.
+        """
+        tasks = [asyncio.ensure_future(self._call(name, fn)) for name in names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        names: Iterable[str] | None = None,
+    ) -> AsyncIterator[FleetResult]:
+        """Send the same request to each selected gateway concurrently.
+
+        Args:
+            method (str): The HTTP method, for example ``"get"``.
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): Request body for POST, PUT and PATCH. Defaults to None.
+            names (Iterable[str] | None): Gateways to target. Defaults to
+                None (every gateway).
+
+        Yields:
+            FleetResult: One result per gateway, whose value is the Response,
+                in order of completion.
+
+        Raises:
+            IpsdkError: If the method or a name is invalid.
+        """
+        return self.map(_request_call(method, path, params, json), names)
+
+    async def _call(
+        self, name: str, fn: Callable[[Any], Awaitable[Any]]
+    ) -> FleetResult:
+        """Run a call against one gateway under both concurrency limits.
+
+        The gateway's limit is taken first, so a call waiting for a busy
+        gateway does not hold a fleet-wide slot.
+
+        Args:
+            name (str): The gateway name.
+            fn (Callable): Coroutine function taking the gateway client.
+
+        Returns:
+            FleetResult: The outcome of the call.
+        """
+        async with self._limits[name], self._global:
+            started = time.perf_counter()
+            try:
+                value = await fn(self._gateways[name])
+            except Exception as exc:
+                elapsed = time.perf_counter() - started
+                logging.debug(f"Fleet call on {name} failed: {exc}")
+                self.stats[name].record(elapsed, failed=True)
+                return FleetResult(name, error=exc, elapsed=elapsed)
+
+        elapsed = time.perf_counter() - started
+        self.stats[name].record(elapsed)
+        return FleetResult(name, value=value, elapsed=elapsed)
+
+    @logging.trace
+    async def aclose(self) -> None:
+        """Close every gateway client.
+
+        Returns:
+            None
+        """
+        for gateway in self._gateways.values():
+            await gateway.client.aclose()
+
+    async def __aenter__(self) -> AsyncFleet:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
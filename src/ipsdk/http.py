@@ -13,15 +13,35 @@ to ensure consistent behavior across all supported Python versions.
 """
 
 from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import TypeVar
+from typing import cast
 
+from . import codec
 from . import logging
+from . import schema
 
 if TYPE_CHECKING:
     import httpx
 
+    from .timing import Timings
+
+# Marks a Response whose JSON body has not been parsed yet; None is a valid
+# parsed body
+_UNSET: Any = object()
+
+T = TypeVar("T")
+
+# Headers sent with requests that carry a JSON body
+JSON_HEADERS: dict[str, str] = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+}
+
 # Import HTTPMethod from standard library (Python 3.11+) or define fallback
 try:
     from http import HTTPMethod  # type: ignore[attr-defined]
@@ -59,6 +79,26 @@ except ImportError:
         CONNECT = "CONNECT"
 
 
+def json_content(json: str | bytes | dict | list | None) -> str | bytes | None:
+    """
+    Get the request body for the json argument of a request
+
+    A str or bytes value is JSON the caller already serialized and is sent
+    unchanged, without being parsed and dumped again. Dicts and lists are
+    encoded with the active JSON codec (see ipsdk.codec) rather than by
+    httpx, which always uses the standard library.
+
+    Args:
+        json (str | bytes | dict | list | None): The json argument
+
+    Returns:
+        str | bytes | None: The request body, or None without a body
+    """
+    if json is None or isinstance(json, (str, bytes)):
+        return json
+    return codec.encode(json)
+
+
 class Request:
     """
     Wrapper class for HTTP requests that provides a clean interface for request data
@@ -126,30 +166,77 @@ class Response:
     compatibility with the underlying httpx.Response while adding SDK-specific
     functionality.
 
+    Derived values are computed the first time they are read and then kept on
+    the response: the parsed JSON body, the elapsed time and the timestamps.
+    Responses have no instance dict, so holding many of them costs only the
+    slots below and the wrapped httpx response.
+
+    Responses sent by a connection carry monotonic ``timing`` with a
+    per-phase breakdown, and their timestamps are derived from it. Responses
+    can also be created from the two timestamps alone.
+
     Args:
         httpx_response (httpx.Response): The underlying httpx response object
+        started_at (str | None): UTC ISO 8601 timestamp when the request was
+            sent. Required without timing.
+        finished_at (str | None): UTC ISO 8601 timestamp when the response
+            was received. Required without timing.
+        timing (Timings | None): Monotonic timing of the request.
 
     Raises:
-        ValueError: If the httpx_response is None or invalid
+        ValueError: If the httpx_response is None or invalid, or if neither
+            timing nor both timestamps are given
     """
 
-    __slots__ = ("_finished_at", "_response", "_started_at")
+    __slots__ = (
+        "_elapsed_ms",
+        "_finished_at",
+        "_json",
+        "_response",
+        "_started_at",
+        "_timing",
+    )
 
-    @logging.trace
     def __init__(
         self,
         httpx_response: httpx.Response,
         *,
-        started_at: str,
-        finished_at: str,
+        started_at: str | None = None,
+        finished_at: str | None = None,
+        timing: Timings | None = None,
     ) -> None:
         if httpx_response is None:
             msg = "httpx_response cannot be None"
             raise ValueError(msg)
 
+        if timing is None and (started_at is None or finished_at is None):
+            msg = "started_at and finished_at are required without timing"
+            raise ValueError(msg)
+
         self._response = httpx_response
         self._started_at = started_at
         self._finished_at = finished_at
+        self._timing = timing
+        self._elapsed_ms: int | None = None
+        self._json: Any = _UNSET
+
+    def copy(self) -> Response:
+        """
+        Create a new Response over the same httpx response
+
+        The copy shares the content, headers and timing of this response but
+        memoizes its own parsed JSON, so changes made to the value returned
+        by one response's json() are not seen through the other.
+
+        Returns:
+            Response: The new response
+        """
+        return Response(
+            self._response,
+            started_at=self._started_at,
+            finished_at=self._finished_at,
+            timing=self._timing,
+        )
 
     @property
     def status_code(self) -> int:
@@ -211,6 +298,17 @@ class Response:
         """
         return self._response.request
 
+    @property
+    def timing(self) -> Timings | None:
+        """
+        Get the monotonic timing of the request and its phases.
+
+        Returns:
+            Timings | None: The timing, or None if the response was created
+                from timestamps only.
+        """
+        return self._timing
+
     @property
     def started_at(self) -> str:
         """
@@ -219,6 +317,8 @@ class Response:
         Returns:
             str: ISO 8601 UTC timestamp of when the request was sent.
         """
+        if self._started_at is None:
+            self._started_at = _start_time(cast("Timings", self._timing)).isoformat()
         return self._started_at
 
     @property
@@ -226,9 +326,16 @@ class Response:
         """
         Get the UTC ISO 8601 timestamp when the response was received.
 
+        With timing, this is the start time plus the monotonic duration, so
+        wall-clock adjustments during the request do not affect it.
+
         Returns:
             str: ISO 8601 UTC timestamp of when the response was received.
         """
+        if self._finished_at is None:
+            timing = cast("Timings", self._timing)
+            elapsed = timedelta(microseconds=timing.elapsed_ns // 1_000)
+            self._finished_at = (_start_time(timing) + elapsed).isoformat()
         return self._finished_at
 
     @property
@@ -236,36 +343,74 @@ class Response:
         """
         Get the request duration in milliseconds.
 
-        Computed from the difference between finished_at and started_at.
-        Truncated to whole milliseconds (not rounded).
+        Taken from the monotonic timing when the response has one, and
+        otherwise computed from the difference between finished_at and
+        started_at the first time it is read. Truncated to whole
+        milliseconds (not rounded).
 
         Returns:
             int: Request duration in milliseconds.
         """
-        return int(
-            (
-                datetime.fromisoformat(self._finished_at)
-                - datetime.fromisoformat(self._started_at)
-            ).total_seconds()
-            * 1000
-        )
+        if self._timing is not None:
+            return self._timing.elapsed_ns // 1_000_000
+        if self._elapsed_ms is None:
+            self._elapsed_ms = int(
+                (
+                    datetime.fromisoformat(self.finished_at)
+                    - datetime.fromisoformat(self.started_at)
+                ).total_seconds()
+                * 1000
+            )
+        return self._elapsed_ms
 
-    @logging.trace
     def json(self) -> dict[str, Any]:
         """
         Parse the response content as JSON
 
+        The content is decoded with the active JSON codec (see ipsdk.codec)
+        rather than httpx's standard library decoder. It is parsed on the
+        first call only; later calls return the same object, so changes made
+        to it are seen by every caller.
+
         Returns:
             dict[str, Any]: The parsed JSON response
 
         Raises:
             ValueError: If the response content is not valid JSON
         """
-        try:
-            return self._response.json()
-        except Exception as exc:
-            msg = f"Failed to parse response as JSON: {exc!s}"
-            raise ValueError(msg) from exc
+        if self._json is _UNSET:
+            try:
+                self._json = codec.decode(self._response.content)
+            except Exception as exc:
+                msg = f"Failed to parse response as JSON: {exc!s}"
+                raise ValueError(msg) from exc
+        return self._json
+
+    def decode(self, type_: type[T]) -> T:
+        """
+        Decode the response content into a declared type
+
+        The type is usually a dataclass or a msgspec Struct describing the
+        response, with nested records declared the same way (see
+        ipsdk.schema). Keys without a field are skipped and missing or
+        mistyped values raise SchemaError. If json() was already called, its
+        parsed content is converted instead of parsing the content again.
+
+        Args:
+            type_ (type[T]): The type to decode into
+
+        Returns:
+            T: The decoded response
+
+        Raises:
+            IpsdkError: If the type is not supported
+            SerializationError: If the response content is not valid JSON
+            SchemaError: If the response content does not match the type
+        """
+        decoder = schema.decoder(type_)  # type: ignore[arg-type]
+        if self._json is not _UNSET:
+            return decoder.convert(self._json)
+        return decoder.decode(self._response.content)
 
     @logging.trace
     def raise_for_status(self) -> None:
@@ -277,7 +422,6 @@ class Response:
         """
         self._response.raise_for_status()
 
-    @logging.trace
     def is_success(self) -> bool:
         """
         Check if the response indicates success (2xx status code)
@@ -289,7 +433,6 @@ class Response:
             HTTPStatus.OK.value <= self.status_code < HTTPStatus.MULTIPLE_CHOICES.value
         )
 
-    @logging.trace
     def is_error(self) -> bool:
         """
         Check if the response indicates an error (4xx or 5xx status code)
@@ -308,3 +451,19 @@ class Response:
             str: A string representation of the response
         """
         return f"Response(status_code={self.status_code}, url='{self.url}')"
+
+
+def _start_time(timing: Timings) -> datetime:
+    """
+    Convert the wall-clock start of a timing to a datetime
+
+    Args:
+        timing (Timings): The timing of a request
+
+    Returns:
+        datetime: The UTC start time, with microsecond precision
+    """
+    seconds, nanoseconds = divmod(timing.start_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc) + timedelta(
+        microseconds=nanoseconds // 1_000
+    )
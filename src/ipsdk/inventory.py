@@ -0,0 +1,561 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""In-memory device inventory for Automation Gateway.
+
+This module provides inventories that load the device list from a Gateway
+once and keep it in memory, indexed by device name and by a configurable set
+of attributes, so resolving a device is a dictionary lookup instead of an
+HTTP request.
+
+The inventory is read page by page through :mod:`ipsdk.pagination` and is
+refreshed by change detection: every device document is fingerprinted and a
+refresh only re-indexes the devices that were added, changed or removed since
+the previous one. The whole listing is read before any change is applied, so
+lookups never see a half-refreshed inventory, and a failed refresh leaves the
+previous contents in place. Refreshes can run periodically in the background,
+in a daemon thread for Gateway or in a task for AsyncGateway.
+
+When the Gateway client has a response cache, unchanged pages are revalidated
+with conditional requests, which makes a refresh with no changes cheap.
+
+Components
+----------
+InventoryChanges:
+    The device names added, updated and removed by one refresh.
+
+Inventory:
+    Device inventory backed by a synchronous Gateway connection.
+
+AsyncInventory:
+    Device inventory backed by an AsyncGateway connection.
+
+Examples
+--------
+Resolving devices without a request per lookup::
+
+    from ipsdk import gateway_factory
+    from ipsdk.inventory import Inventory
+
+    gateway = gateway_factory(host="gateway.example.com")
+
+    with Inventory(gateway) as inventory:
+        inventory.start(interval=300)
+
+        device = inventory["core-router-1"]
+        ios = inventory.find("variables.ansible_network_os", "cisco.ios.ios")
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import threading
+import time
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+from .pagination import AsyncPaginator
+from .pagination import Paginator
+from .pagination import PaginatorBase
+from .pagination import extract
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+    from .pagination import Extractor
+
+# Attributes indexed by default, as dotted paths into a device document
+DEFAULT_INDEX: tuple[str, ...] = (
+    "variables.ansible_host",
+    "variables.ansible_network_os",
+)
+
+# Pagination options matching the Gateway /devices endpoint
+_PAGINATION: dict[str, Any] = {
+    "offset_param": "offset",
+    "items_key": "data",
+    "total_key": "meta.total_count",
+}
+
+# Scalar types that can be used as index values
+_INDEXABLE = (str, int, float, bool)
+
+
+class InventoryChanges:
+    """The device names added, updated and removed by one refresh.
+
+    Args:
+        added (list[str]): Names of devices that were not in the inventory.
+        updated (list[str]): Names of devices whose document changed.
+        removed (list[str]): Names of devices no longer listed.
+    """
+
+    __slots__ = ("added", "removed", "updated")
+
+    def __init__(
+        self,
+        added: list[str] | None = None,
+        updated: list[str] | None = None,
+        removed: list[str] | None = None,
+    ) -> None:
+        self.added = added or []
+        self.updated = updated or []
+        self.removed = removed or []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def __repr__(self) -> str:
+        return (
+            f"InventoryChanges(added={len(self.added)}, "
+            f"updated={len(self.updated)}, removed={len(self.removed)})"
+        )
+
+
+class InventoryBase:
+    """Shared index and change detection for the inventories.
+
+    Args:
+        path (str): The device list endpoint path. Defaults to ``"/devices"``.
+        params (dict): Additional query parameters for the listing, such as a
+            filter. Defaults to None.
+        name_key (str | Callable): Location of the device name in a device
+            document. Defaults to ``"name"``.
+        index (Iterable[str]): Dotted attribute paths to index for find().
+            Defaults to DEFAULT_INDEX.
+        **kwargs: Pagination options for the listing, see
+            :class:`ipsdk.pagination.PaginatorBase`. Defaults match the
+            Gateway ``/devices`` endpoint.
+
+    Attributes:
+        refreshes (int): Number of completed refreshes.
+        refreshed_at (float | None): Wall-clock time of the last completed
+            refresh, or None before the first one.
+
+    Raises:
+        IpsdkError: If a pagination option is invalid.
+    """
+
+    __slots__ = (
+        "_devices",
+        "_fingerprints",
+        "_indexed",
+        "_indexes",
+        "_lock",
+        "name_key",
+        "options",
+        "params",
+        "path",
+        "refreshed_at",
+        "refreshes",
+    )
+
+    def __init__(
+        self,
+        path: str = "/devices",
+        params: dict[str, Any] | None = None,
+        name_key: Extractor = "name",
+        index: Iterable[str] = DEFAULT_INDEX,
+        **kwargs: Any,
+    ) -> None:
+        self.path = path
+        self.params = dict(params or {})
+        self.name_key = name_key
+        self.options = {**_PAGINATION, **kwargs}
+        # Validate the pagination options up front
+        PaginatorBase(path, params, **self.options)
+
+        self._lock = threading.Lock()
+        self._devices: dict[str, Any] = {}
+        self._fingerprints: dict[str, bytes] = {}
+        self._indexes: dict[str, dict[Any, dict[str, None]]] = {
+            attribute: {} for attribute in index
+        }
+        # The index entries of each device, so they can be removed even if
+        # the caller changed the device document in place
+        self._indexed: dict[str, list[tuple[dict[Any, dict[str, None]], Any]]] = {}
+        self.refreshes = 0
+        self.refreshed_at: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Check whether the inventory has been loaded
+
+        Returns:
+            bool: True once a refresh has completed
+        """
+        return self.refreshed_at is not None
+
+    @property
+    def names(self) -> list[str]:
+        """
+        Get the names of all devices in the inventory
+
+        Returns:
+            list[str]: The device names
+        """
+        with self._lock:
+            return list(self._devices)
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._devices
+
+    def __getitem__(self, name: str) -> Any:
+        return self._devices[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Look up a device by name
+
+        Args:
+            name (str): The device name.
+            default (Any): Value returned if there is no such device.
+                Defaults to None.
+
+        Returns:
+            Any: The device document, or default
+        """
+        return self._devices.get(name, default)
+
+    def find(self, attribute: str, value: Any) -> list[Any]:
+        """
+        Look up the devices whose indexed attribute has a value
+
+        Args:
+            attribute (str): An indexed attribute path.
+            value (Any): The attribute value to match.
+
+        Returns:
+            list[Any]: The matching device documents
+
+        Raises:
+            IpsdkError: If the attribute is not indexed.
+        """
+        index = self._indexes.get(attribute)
+        if index is None:
+            msg = f"attribute {attribute!r} is not indexed"
+            raise exceptions.IpsdkError(msg)
+        with self._lock:
+            return [self._devices[name] for name in index.get(value, ())]
+
+    def _apply(self, devices: list[Any]) -> InventoryChanges:
+        """Apply a complete device listing to the inventory.
+
+        Only devices whose fingerprint changed are re-indexed.
+
+        Args:
+            devices (list[Any]): Every device document from the listing.
+
+        Returns:
+            InventoryChanges: The devices added, updated and removed.
+
+        Raises:
+            IpsdkError: If a device document has no name.
+        """
+        listing: dict[str, Any] = {}
+        for device in devices:
+            name = extract(device, self.name_key)
+            if name is None:
+                msg = f"device document without a name at {self.name_key!r}"
+                raise exceptions.IpsdkError(msg)
+            listing[name] = device
+
+        changes = InventoryChanges()
+        with self._lock:
+            for name in [name for name in self._devices if name not in listing]:
+                self._unindex(name)
+                del self._devices[name]
+                del self._fingerprints[name]
+                changes.removed.append(name)
+
+            for name, device in listing.items():
+                fingerprint = _fingerprint(device)
+                previous = self._fingerprints.get(name)
+                if previous == fingerprint:
+                    continue
+                if previous is None:
+                    changes.added.append(name)
+                else:
+                    self._unindex(name)
+                    changes.updated.append(name)
+                self._devices[name] = device
+                self._fingerprints[name] = fingerprint
+                self._index(name, device)
+
+            self.refreshes += 1
+            self.refreshed_at = time.time()
+
+        logging.debug(f"Inventory refreshed from {self.path}: {changes}")
+        return changes
+
+    def _index(self, name: str, device: Any) -> None:
+        """Add a device to the attribute indexes. Caller must hold the lock.
+
+        Args:
+            name (str): The device name.
+            device (Any): The device document.
+
+        Returns:
+            None
+        """
+        entries = []
+        for attribute, index in self._indexes.items():
+            value = extract(device, attribute)
+            if isinstance(value, _INDEXABLE):
+                index.setdefault(value, {})[name] = None
+                entries.append((index, value))
+        self._indexed[name] = entries
+
+    def _unindex(self, name: str) -> None:
+        """Remove a device from the attribute indexes. Caller must hold the lock.
+
+        Args:
+            name (str): The device name.
+
+        Returns:
+            None
+        """
+        for index, value in self._indexed.pop(name):
+            names = index[value]
+            del names[name]
+            if not names:
+                del index[value]
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(path='{self.path}', devices={len(self._devices)}, "
+            f"refreshes={self.refreshes})"
+        )
+
+
+def _fingerprint(device: Any) -> bytes:
+    """Compute a stable digest of a device document for change detection.
+
+    Args:
+        device (Any): The device document.
+
+    Returns:
+        bytes: The digest.
+    """
+    encoded = json.dumps(device, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class Inventory(InventoryBase):
+    """Device inventory backed by a synchronous Gateway connection.
+
+    Args:
+        connection (Connection): The Gateway connection used for the listing.
+        **kwargs: Inventory options, see InventoryBase.
+    """
+
+    __slots__ = ("_stop", "_thread", "connection")
+
+    def __init__(self, connection: Connection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @logging.trace
+    def refresh(self) -> InventoryChanges:
+        """Read the device listing and apply the changes.
+
+        Returns:
+            InventoryChanges: The devices added, updated and removed.
+
+        Raises:
+            IpsdkError: If a response or device document is malformed.
+            HTTPStatusError: If the server returns an error status.
+        """
+        paginator = Paginator(self.connection, self.path, self.params, **self.options)
+        return self._apply(list(paginator))
+
+    @logging.trace
+    def start(self, interval: float) -> None:
+        """Load the inventory and refresh it periodically in a daemon thread.
+
+        The first refresh runs in the calling thread so errors surface here.
+        Errors in background refreshes are logged and the previous contents
+        are kept.
+
+        Args:
+            interval (float): Seconds between refreshes.
+
+        Returns:
+            None
+
+        Raises:
+            IpsdkError: If interval is not positive or refreshing is running.
+        """
+        if interval <= 0:
+            msg = "interval must be a positive number"
+            raise exceptions.IpsdkError(msg)
+        if self._thread is not None:
+            msg = "background refresh is already running"
+            raise exceptions.IpsdkError(msg)
+
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="ipsdk-inventory", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        """Refresh the inventory until stop() is called.
+
+        Args:
+            interval (float): Seconds between refreshes.
+
+        Returns:
+            None
+        """
+        while not self._stop.wait(interval):
+            self._refresh_logged()
+
+    def _refresh_logged(self) -> None:
+        """Refresh the inventory, logging instead of raising errors.
+
+        Returns:
+            None
+        """
+        try:
+            self.refresh()
+        except Exception as exc:
+            logging.warning(f"Inventory refresh from {self.path} failed: {exc}")
+
+    @logging.trace
+    def stop(self) -> None:
+        """Stop the background refresh and wait for the thread to exit.
+
+        Returns:
+            None
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def __enter__(self) -> Inventory:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+class AsyncInventory(InventoryBase):
+    """Device inventory backed by an AsyncGateway connection.
+
+    Args:
+        connection (AsyncConnection): The Gateway connection used for the
+            listing.
+        **kwargs: Inventory options, see InventoryBase.
+    """
+
+    __slots__ = ("_task", "connection")
+
+    def __init__(self, connection: AsyncConnection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+        self._task: asyncio.Task[None] | None = None
+
+    @logging.trace
+    async def refresh(self) -> InventoryChanges:
+        """Read the device listing and apply the changes.
+
+        Returns:
+            InventoryChanges: The devices added, updated and removed.
+
+        Raises:
+            IpsdkError: If a response or device document is malformed.
+            HTTPStatusError: If the server returns an error status.
+        """
+        paginator = AsyncPaginator(
+            self.connection, self.path, self.params, **self.options
+        )
+        return self._apply([device async for device in paginator])
+
+    @logging.trace
+    async def start(self, interval: float) -> None:
+        """Load the inventory and refresh it periodically in a task.
+
+        The first refresh is awaited so errors surface here. Errors in
+        background refreshes are logged and the previous contents are kept.
+
+        Args:
+            interval (float): Seconds between refreshes.
+
+        Returns:
+            None
+
+        Raises:
+            IpsdkError: If interval is not positive or refreshing is running.
+        """
+        if interval <= 0:
+            msg = "interval must be a positive number"
+            raise exceptions.IpsdkError(msg)
+        if self._task is not None:
+            msg = "background refresh is already running"
+            raise exceptions.IpsdkError(msg)
+
+        await self.refresh()
+        self._task = asyncio.ensure_future(self._run(interval))
+
+    async def _run(self, interval: float) -> None:
+        """Refresh the inventory until stop() is called.
+
+        Args:
+            interval (float): Seconds between refreshes.
+
+        Returns:
+            None
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self._refresh_logged()
+
+    async def _refresh_logged(self) -> None:
+        """Refresh the inventory, logging instead of raising errors.
+
+        Returns:
+            None
+        """
+        try:
+            await self.refresh()
+        except Exception as exc:
+            logging.warning(f"Inventory refresh from {self.path} failed: {exc}")
+
+    @logging.trace
+    async def stop(self) -> None:
+        """Cancel the background refresh task and wait for it to finish.
+
+        Returns:
+            None
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def __aenter__(self) -> AsyncInventory:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
@@ -0,0 +1,633 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Waiting for Itential Platform jobs to finish.
+
+This module provides waiters that poll the job status endpoint until a job
+reaches a final status and then return the final job document. Polling is
+adaptive: the first polls are made quickly so short jobs are noticed with
+little delay, then the interval grows exponentially up to a cap so long jobs
+cost few requests. Each interval is randomized by a jitter factor so that
+many waiters started together do not poll in lockstep.
+
+Waits can be bounded by an overall timeout, which raises
+``exceptions.WaitTimeoutError``, and cancelled by the caller, which raises
+``exceptions.WaitCancelledError``. The synchronous waiter is cancelled with a
+``threading.Event``; the asynchronous waiter is cancelled like any other
+coroutine, by cancelling the task awaiting it, or with an ``asyncio.Event``.
+
+Components
+----------
+Backoff:
+    Generates the polling intervals: initial interval, growth factor, cap
+    and jitter.
+
+JobWaiter:
+    Waits for jobs using a synchronous Platform connection.
+
+AsyncJobWaiter:
+    Waits for jobs using an AsyncPlatform connection.
+
+JobWatcher:
+    Watches many jobs at once from an AsyncPlatform connection. Jobs are
+    polled with batched list queries filtered by job ID where the API
+    supports it, or individually under a shared concurrency cap otherwise,
+    and completions are delivered as an async stream or through a callback.
+
+Examples
+--------
+Starting a workflow and waiting for it::
+
+    from ipsdk import platform_factory
+    from ipsdk.jobs import JobWaiter
+
+    platform = platform_factory(host="platform.example.com")
+
+    res = platform.post("/operations-manager/jobs/start", json=body)
+    job_id = res.json()["data"]["_id"]
+
+    job = JobWaiter(platform).wait(job_id, timeout=600)
+    print(job["status"])
+
+Watching thousands of jobs with a few requests per polling round::
+
+    from ipsdk.jobs import JobWatcher
+
+    watcher = JobWatcher(async_platform, batch_size=100)
+
+    async for job_id, job in watcher.watch(job_ids, timeout=3600):
+        print(job_id, job["status"])
+"""
+
+import asyncio
+import inspect
+import random
+import time
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+from .pagination import extract
+from .paths import path_template
+
+if TYPE_CHECKING:
+    import threading
+
+    from collections.abc import AsyncIterator
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+    from .pagination import Extractor
+
+# Final statuses of Itential Platform jobs
+TERMINAL_STATUSES: frozenset[str] = frozenset({"complete", "canceled", "error"})
+
+
+class Backoff:
+    """Exponential polling intervals with a cap and jitter.
+
+    The n-th interval is ``initial * factor ** n`` capped at ``maximum`` and
+    then multiplied by a random factor in ``[1 - jitter, 1 + jitter]``.
+
+    Args:
+        initial (float): The first interval in seconds. Defaults to 0.25.
+        maximum (float): The largest interval in seconds before jitter.
+            Defaults to 10.
+        factor (float): Growth factor between intervals. Defaults to 2.
+        jitter (float): Relative amount of randomization, between 0 and 1.
+            Defaults to 0.1.
+
+    Raises:
+        IpsdkError: If an argument is out of range.
+    """
+
+    __slots__ = ("factor", "initial", "jitter", "maximum")
+
+    def __init__(
+        self,
+        initial: float = 0.25,
+        maximum: float = 10.0,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ) -> None:
+        if initial <= 0 or maximum < initial:
+            msg = "backoff intervals must be positive with maximum >= initial"
+            raise exceptions.IpsdkError(msg)
+
+        if factor < 1:
+            msg = "backoff factor must be at least 1"
+            raise exceptions.IpsdkError(msg)
+
+        if not 0 <= jitter < 1:
+            msg = "backoff jitter must be between 0 and 1"
+            raise exceptions.IpsdkError(msg)
+
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def intervals(self) -> Iterator[float]:
+        """Generate the polling intervals.
+
+        Yields:
+            float: The number of seconds to wait before the next poll.
+        """
+        interval = self.initial
+        while True:
+            if self.jitter:
+                # Jitter only spreads polls out, it is not used for security
+                yield interval * random.uniform(1 - self.jitter, 1 + self.jitter)  # noqa: S311
+            else:
+                yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+    def __repr__(self) -> str:
+        return (
+            f"Backoff(initial={self.initial:g}, maximum={self.maximum:g}, "
+            f"factor={self.factor:g}, jitter={self.jitter:g})"
+        )
+
+
+class JobWaiterBase:
+    """Shared configuration for the job waiters.
+
+    Args:
+        path (str): Job status endpoint, with a ``{job_id}`` placeholder.
+            Defaults to ``"/operations-manager/jobs/{job_id}"``.
+        document_key (str | Callable): Location of the job document in the
+            response body. Defaults to ``"data"``.
+        status_key (str | Callable): Location of the status in the job
+            document. Defaults to ``"status"``.
+        terminal (Iterable[str]): Statuses that end the wait. Defaults to
+            ``complete``, ``canceled`` and ``error``.
+        backoff (Backoff): Polling intervals. Defaults to Backoff().
+
+    Attributes:
+        polls (int): Number of status requests made by this waiter.
+    """
+
+    __slots__ = ("backoff", "document_key", "path", "polls", "status_key", "terminal")
+
+    def __init__(
+        self,
+        *,
+        path: str = "/operations-manager/jobs/{job_id}",
+        document_key: Extractor = "data",
+        status_key: Extractor = "status",
+        terminal: frozenset[str] | set[str] | tuple[str, ...] = TERMINAL_STATUSES,
+        backoff: Backoff | None = None,
+    ) -> None:
+        self.path = path
+        self.document_key = document_key
+        self.status_key = status_key
+        self.terminal = frozenset(terminal)
+        self.backoff = backoff or Backoff()
+        self.polls = 0
+
+    def _job_path(self, job_id: str) -> str:
+        """Build the status endpoint path for a job.
+
+        Args:
+            job_id (str): The job identifier.
+
+        Returns:
+            str: The request path, with the job ID percent-encoded.
+        """
+        return path_template(self.path).format(job_id=job_id)
+
+    def _document(self, body: Any) -> tuple[Any, bool]:
+        """Extract the job document from a response body.
+
+        Args:
+            body (Any): The decoded response body.
+
+        Returns:
+            tuple[Any, bool]: The job document and whether its status is
+                final.
+        """
+        document = extract(body, self.document_key)
+        if document is None:
+            document = body
+        status = extract(document, self.status_key)
+        return document, status in self.terminal
+
+    def _timeout_error(
+        self, job_id: str, timeout: float | None, document: Any
+    ) -> exceptions.WaitTimeoutError:
+        """Build the error raised when a wait times out.
+
+        Args:
+            job_id (str): The job identifier.
+            timeout (float | None): The timeout that was exceeded.
+            document (Any): The last job document received.
+
+        Returns:
+            WaitTimeoutError: The error to raise.
+        """
+        status = extract(document, self.status_key)
+        msg = f"job {job_id} did not finish within {timeout:g}s (status: {status})"
+        return exceptions.WaitTimeoutError(msg, document)
+
+
+class JobWaiter(JobWaiterBase):
+    """Wait for Platform jobs using a synchronous connection.
+
+    Args:
+        connection (Connection): The Platform connection used for polling.
+        **kwargs: Waiter options, see JobWaiterBase.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(self, connection: Connection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+
+    @logging.trace
+    def wait(
+        self,
+        job_id: str,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Any:
+        """Poll a job until it reaches a final status.
+
+        Args:
+            job_id (str): The job identifier.
+            timeout (float | None): Maximum number of seconds to wait.
+                Defaults to None (wait indefinitely).
+            cancel (threading.Event | None): Event that abandons the wait
+                when set. Defaults to None.
+
+        Returns:
+            Any: The final job document.
+
+        Raises:
+            WaitTimeoutError: If the job is not finished within timeout.
+            WaitCancelledError: If cancel is set before the job finishes.
+            HTTPStatusError: If the status request fails.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        path = self._job_path(job_id)
+        intervals = self.backoff.intervals()
+
+        while True:
+            self.polls += 1
+            document, done = self._document(self.connection.get(path).json())
+            if done:
+                return document
+
+            delay = next(intervals)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout_error(job_id, timeout, document)
+                delay = min(delay, remaining)
+
+            if cancel is None:
+                time.sleep(delay)
+            elif cancel.wait(delay):
+                msg = f"wait for job {job_id} was cancelled"
+                raise exceptions.WaitCancelledError(msg)
+
+
+class AsyncJobWaiter(JobWaiterBase):
+    """Wait for Platform jobs using an asynchronous connection.
+
+    Args:
+        connection (AsyncConnection): The AsyncPlatform connection used for
+            polling.
+        **kwargs: Waiter options, see JobWaiterBase.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(self, connection: AsyncConnection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+
+    @logging.trace
+    async def wait(
+        self,
+        job_id: str,
+        timeout: float | None = None,
+        cancel: asyncio.Event | None = None,
+    ) -> Any:
+        """Poll a job until it reaches a final status.
+
+        Cancelling the task awaiting this coroutine also abandons the wait.
+
+        Args:
+            job_id (str): The job identifier.
+            timeout (float | None): Maximum number of seconds to wait.
+                Defaults to None (wait indefinitely).
+            cancel (asyncio.Event | None): Event that abandons the wait when
+                set. Defaults to None.
+
+        Returns:
+            Any: The final job document.
+
+        Raises:
+            WaitTimeoutError: If the job is not finished within timeout.
+            WaitCancelledError: If cancel is set before the job finishes.
+            HTTPStatusError: If the status request fails.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        path = self._job_path(job_id)
+        intervals = self.backoff.intervals()
+
+        while True:
+            self.polls += 1
+            res = await self.connection.get(path)
+            document, done = self._document(res.json())
+            if done:
+                return document
+
+            delay = next(intervals)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise self._timeout_error(job_id, timeout, document)
+                delay = min(delay, remaining)
+
+            if cancel is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(cancel.wait(), delay)
+                except asyncio.TimeoutError:
+                    continue
+                msg = f"wait for job {job_id} was cancelled"
+                raise exceptions.WaitCancelledError(msg)
+
+
+class JobWatcher(JobWaiterBase):
+    """Watch many Platform jobs with a shared polling loop.
+
+    Every polling round requests the status of all unfinished jobs. With a
+    batch endpoint, job IDs are combined into list queries of up to
+    ``batch_size`` IDs each, so a round costs one request per batch instead
+    of one per job. Without one (``batch_path=None``) each job is requested
+    from the job status endpoint. In both cases at most ``max_concurrency``
+    requests are in flight at once. Rounds are spaced by the backoff
+    intervals.
+
+    Args:
+        connection (AsyncConnection): The AsyncPlatform connection used for
+            polling.
+        batch_path (str | None): List endpoint accepting an ID filter, or
+            None to poll jobs individually. Defaults to
+            ``"/operations-manager/jobs"``.
+        batch_param (str): Query parameter carrying the joined job IDs.
+            Defaults to ``"in[_id]"``.
+        batch_separator (str): Separator used to join job IDs.
+            Defaults to ``","``.
+        batch_size (int): Maximum number of job IDs per list query.
+            Defaults to 50.
+        limit_param (str | None): Query parameter carrying the batch size so
+            the list endpoint does not truncate the page, or None.
+            Defaults to ``"limit"``.
+        items_key (str | Callable): Location of the list of job documents in
+            a batch response. Defaults to ``"data"``.
+        id_key (str | Callable): Location of the job ID in a job document.
+            Defaults to ``"_id"``.
+        max_concurrency (int): Maximum number of status requests in flight.
+            Defaults to 10.
+        **kwargs: Waiter options, see JobWaiterBase.
+
+    Raises:
+        IpsdkError: If batch_size or max_concurrency is not positive.
+    """
+
+    __slots__ = (
+        "batch_param",
+        "batch_path",
+        "batch_separator",
+        "batch_size",
+        "connection",
+        "id_key",
+        "items_key",
+        "limit_param",
+        "max_concurrency",
+    )
+
+    def __init__(
+        self,
+        connection: AsyncConnection,
+        *,
+        batch_path: str | None = "/operations-manager/jobs",
+        batch_param: str = "in[_id]",
+        batch_separator: str = ",",
+        batch_size: int = 50,
+        limit_param: str | None = "limit",
+        items_key: Extractor = "data",
+        id_key: Extractor = "_id",
+        max_concurrency: int = 10,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if batch_size <= 0:
+            msg = "batch_size must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+
+        if max_concurrency <= 0:
+            msg = "max_concurrency must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+
+        self.connection = connection
+        self.batch_path = batch_path
+        self.batch_param = batch_param
+        self.batch_separator = batch_separator
+        self.batch_size = batch_size
+        self.limit_param = limit_param
+        self.items_key = items_key
+        self.id_key = id_key
+        self.max_concurrency = max_concurrency
+
+    async def watch(
+        self, job_ids: Iterable[str], timeout: float | None = None
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Yield jobs as they reach a final status.
+
+        Args:
+            job_ids (Iterable[str]): The jobs to watch.
+            timeout (float | None): Maximum number of seconds to watch.
+                Defaults to None (watch until every job has finished).
+
+        Yields:
+            tuple[str, Any]: The job ID and final job document of each job,
+                in order of completion.
+
+        Raises:
+            WaitTimeoutError: If jobs are still unfinished after timeout. The
+                error's ``document`` is the list of unfinished job IDs.
+            HTTPStatusError: If a status request fails.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        pending = dict.fromkeys(job_ids)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        intervals = self.backoff.intervals()
+
+        while pending:
+            for job_id, document in await self._poll(list(pending), semaphore):
+                if job_id in pending:
+                    del pending[job_id]
+                    yield job_id, document
+
+            if not pending:
+                return
+
+            delay = next(intervals)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    msg = f"{len(pending)} jobs did not finish within {timeout:g}s"
+                    raise exceptions.WaitTimeoutError(msg, list(pending))
+                delay = min(delay, remaining)
+
+            await asyncio.sleep(delay)
+
+    @logging.trace
+    async def run(
+        self,
+        job_ids: Iterable[str],
+        callback: Callable[[str, Any], Any] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Watch jobs until they all finish, invoking a callback per job.
+
+        Args:
+            job_ids (Iterable[str]): The jobs to watch.
+            callback (Callable | None): Called with the job ID and final job
+                document as each job finishes. Coroutine functions are
+                awaited. Defaults to None.
+            timeout (float | None): Maximum number of seconds to watch.
+                Defaults to None.
+
+        Returns:
+            dict[str, Any]: Final job documents keyed by job ID.
+
+        Raises:
+            WaitTimeoutError: If jobs are still unfinished after timeout.
+            HTTPStatusError: If a status request fails.
+        """
+        results = {}
+        async for job_id, document in self.watch(job_ids, timeout=timeout):
+            results[job_id] = document
+            if callback is not None:
+                result = callback(job_id, document)
+                if inspect.isawaitable(result):
+                    await result
+        return results
+
+    async def _poll(
+        self, job_ids: list[str], semaphore: asyncio.Semaphore
+    ) -> list[tuple[str, Any]]:
+        """Run one polling round.
+
+        Args:
+            job_ids (list[str]): The unfinished jobs.
+            semaphore (asyncio.Semaphore): Limits the requests in flight.
+
+        Returns:
+            list[tuple[str, Any]]: The jobs found in a final status.
+        """
+        if self.batch_path is None:
+            rounds = [self._poll_job(job_id, semaphore) for job_id in job_ids]
+        else:
+            rounds = [
+                self._poll_batch(job_ids[i : i + self.batch_size], semaphore)
+                for i in range(0, len(job_ids), self.batch_size)
+            ]
+
+        finished = []
+        for found in await asyncio.gather(*rounds):
+            finished.extend(found)
+        return finished
+
+    async def _poll_job(
+        self, job_id: str, semaphore: asyncio.Semaphore
+    ) -> list[tuple[str, Any]]:
+        """Request the status of a single job.
+
+        Args:
+            job_id (str): The job identifier.
+            semaphore (asyncio.Semaphore): Limits the requests in flight.
+
+        Returns:
+            list[tuple[str, Any]]: The job if it is in a final status.
+        """
+        async with semaphore:
+            self.polls += 1
+            res = await self.connection.get(self._job_path(job_id))
+
+        document, done = self._document(res.json())
+        return [(job_id, document)] if done else []
+
+    async def _poll_batch(
+        self, job_ids: list[str], semaphore: asyncio.Semaphore
+    ) -> list[tuple[str, Any]]:
+        """Request the status of a batch of jobs with one list query.
+
+        Jobs missing from the list response, such as deleted jobs, are
+        requested from the job status endpoint, so they finish or fail like
+        jobs polled individually instead of being polled until the timeout.
+
+        Args:
+            job_ids (list[str]): The job identifiers of the batch.
+            semaphore (asyncio.Semaphore): Limits the requests in flight.
+
+        Returns:
+            list[tuple[str, Any]]: The jobs of the batch in a final status.
+
+        Raises:
+            IpsdkError: If the response does not contain a list of jobs.
+            HTTPStatusError: If a job missing from the response cannot be
+                requested individually.
+        """
+        params: dict[str, Any] = {self.batch_param: self.batch_separator.join(job_ids)}
+        if self.limit_param is not None:
+            params[self.limit_param] = len(job_ids)
+
+        async with semaphore:
+            self.polls += 1
+            res = await self.connection.get(str(self.batch_path), params=params)
+
+        documents = extract(res.json(), self.items_key)
+        if not isinstance(documents, list):
+            msg = (
+                f"expected a list of jobs at {self.items_key!r} in the "
+                f"response from {self.batch_path}"
+            )
+            raise exceptions.IpsdkError(msg)
+
+        wanted = set(job_ids)
+        seen = set()
+        finished = []
+        for document in documents:
+            job_id = extract(document, self.id_key)
+            if job_id not in wanted:
+                continue
+            seen.add(job_id)
+            if extract(document, self.status_key) in self.terminal:
+                finished.append((job_id, document))
+
+        missing = [job_id for job_id in job_ids if job_id not in seen]
+        for found in await asyncio.gather(
+            *(self._poll_job(job_id, semaphore) for job_id in missing)
+        ):
+            finished.extend(found)
+        return finished
@@ -9,11 +9,16 @@ This module provides wrapper functions for JSON encoding and decoding operations
 with comprehensive error handling. All JSON operations raise SDK-specific
 exceptions and log errors for debugging.
 
+Decoding is done by the active JSON codec (see ``ipsdk.codec``), which is
+the standard library json module unless orjson, msgspec or ujson is selected
+with ``codec.set_codec``. Encoding always uses ``json.dumps`` so the output
+of dumps() does not depend on the codec.
+
 Functions
 ---------
 loads:
-    Parse a JSON formatted string into a Python dict or list object.
-    Wraps json.loads() with error handling and logging.
+    Parse a JSON formatted string or bytes into a Python dict or list object.
+    Wraps the codec's decode() with error handling and logging.
 
 dumps:
     Convert a Python dict or list object into a JSON formatted string.
@@ -97,10 +102,10 @@ Response parsing::
     platform = platform_factory()
     response = platform.get("/api/v2.0/workflows")
 
-    # Response.json() uses jsonutils internally
-    # But you can also parse response text manually
+    # Response.json() uses the same codec as jsonutils
+    # But you can also parse the response body manually
     try:
-        data = jsonutils.loads(response.text)
+        data = jsonutils.loads(response.content)
         print(f"Found {len(data)} workflows")
     except SerializationError as e:
         print(f"Invalid JSON response: {e}")
@@ -108,23 +113,32 @@ Response parsing::
 
 import json
 
+from . import codec
 from . import exceptions
 from . import logging
 
 
 @logging.trace
-def loads(s: str) -> dict | list:
+def loads(s: str | bytes) -> dict | list:
     """Convert a JSON formatted string to a dict or list object
 
     Args:
-        s (str): The JSON object represented as a string
+        s (str | bytes): The JSON object represented as a string or as
+            UTF-8 encoded bytes
 
     Returns:
         A dict or list object
     """
+    # Some codecs report a wrong input type as invalid JSON, so the type is
+    # checked here to raise the same error with every codec
+    if not isinstance(s, (str, bytes, bytearray)):
+        msg = f"Unexpected error parsing JSON: cannot parse `{type(s).__name__}`"
+        logging.error(msg)
+        raise exceptions.SerializationError(msg)
+
     try:
-        return json.loads(s)
-    except json.JSONDecodeError as exc:
+        return codec.decode(s)
+    except ValueError as exc:
         logging.exception(exc)
         msg = f"Failed to parse JSON: {exc!s}"
         raise exceptions.SerializationError(msg) from exc
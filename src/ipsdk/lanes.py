@@ -0,0 +1,271 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Priority lanes for requests sharing one connection.
+
+This module lets a single connection carry traffic of different priorities
+without low-priority work starving high-priority work. Each lane is a named
+concurrency share: a connection created with ``lanes={"bulk": 4}`` sends at
+most four requests at a time for code running in the ``bulk`` lane, and
+requests waiting for a bulk slot queue only behind other bulk requests.
+Requests outside any lane are not limited by the lanes, so interactive calls
+always find free connections in the pool as long as the lane shares leave
+room for them. Several lanes can be configured to split the pool between
+classes of traffic, for example ``{"interactive": 40, "bulk": 8}``.
+
+The lane of a request is taken from the context it is sent from. Code is put
+in a lane with the ``priority()`` context manager, which uses a context
+variable, so it applies to the current thread or asyncio task and to tasks
+created from it, and never leaks into concurrently running code.
+
+Components
+----------
+priority:
+    Context manager running the enclosed code in a lane.
+
+current_lane:
+    Returns the lane of the current context.
+
+LaneLimiter:
+    Thread-safe implementation used by the synchronous Connection.
+
+AsyncLaneLimiter:
+    asyncio implementation used by AsyncConnection.
+
+Both limiters keep per-lane ``active`` and ``waiting`` counters of the
+requests currently holding and waiting for a slot.
+
+Examples
+--------
+Keeping bulk synchronization from delaying interactive calls::
+
+    from ipsdk import platform_factory
+    from ipsdk.lanes import priority
+
+    platform = platform_factory(
+        host="platform.example.com", want_async=True, lanes={"bulk": 8}
+    )
+
+    async def sync_everything():
+        with priority("bulk"):
+            await asyncio.gather(*(platform.get(path) for path in paths))
+
+    # Elsewhere, not in any lane: never queues behind the bulk requests
+    await platform.get("/health/status")
+"""
+
+import asyncio
+import contextlib
+import threading
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Coroutine
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+_lane: ContextVar[str | None] = ContextVar("ipsdk_lane", default=None)
+
+
+@contextlib.contextmanager
+def priority(lane: str | None) -> Iterator[None]:
+    """Run the enclosed code in a lane.
+
+    Args:
+        lane (str | None): The lane name, or None to leave every lane.
+
+    Yields:
+        None
+    """
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str | None:
+    """Get the lane of the current context.
+
+    Returns:
+        str | None: The lane name, or None outside any lane.
+    """
+    return _lane.get()
+
+
+async def run_in_lane(lane: str | None, coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await a coroutine in a lane.
+
+    Used to carry the lane of the calling thread into coroutines scheduled
+    on another event loop.
+
+    Args:
+        lane (str | None): The lane name.
+        coro (Coroutine): The coroutine to await.
+
+    Returns:
+        Any: The value returned by the coroutine.
+    """
+    with priority(lane):
+        return await coro
+
+
+class LaneLimiterBase:
+    """Shared configuration and accounting for the lane limiters.
+
+    Args:
+        shares (Mapping[str, int]): Maximum number of concurrent requests
+            per lane name.
+
+    Attributes:
+        active (dict[str, int]): Requests holding a slot, per lane.
+        waiting (dict[str, int]): Requests waiting for a slot, per lane.
+
+    Raises:
+        IpsdkError: If no lane is given or a share is not positive.
+    """
+
+    __slots__ = ("active", "shares", "waiting")
+
+    def __init__(self, shares: Mapping[str, int]) -> None:
+        if not shares:
+            msg = "at least one lane must be configured"
+            raise exceptions.IpsdkError(msg)
+
+        for lane, share in shares.items():
+            if share <= 0:
+                msg = f"lane {lane!r} must have a positive share"
+                raise exceptions.IpsdkError(msg)
+
+        self.shares = dict(shares)
+        self.active = dict.fromkeys(self.shares, 0)
+        self.waiting = dict.fromkeys(self.shares, 0)
+
+    def _lane(self) -> str | None:
+        """Get the configured lane of the current context.
+
+        Returns:
+            str | None: The lane name, or None outside any lane.
+
+        Raises:
+            IpsdkError: If the current lane is not configured.
+        """
+        lane = _lane.get()
+        if lane is not None and lane not in self.shares:
+            msg = f"unknown lane {lane!r}, expected one of {sorted(self.shares)}"
+            raise exceptions.IpsdkError(msg)
+        return lane
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shares={self.shares})"
+
+
+class LaneLimiter(LaneLimiterBase):
+    """Limit concurrent requests per lane across threads.
+
+    Args:
+        shares (Mapping[str, int]): Maximum number of concurrent requests
+            per lane name.
+    """
+
+    __slots__ = ("_lock", "_semaphores")
+
+    def __init__(self, shares: Mapping[str, int]) -> None:
+        super().__init__(shares)
+        self._lock = threading.Lock()
+        self._semaphores = {
+            lane: threading.Semaphore(share) for lane, share in self.shares.items()
+        }
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[None]:
+        """Hold a slot in the current lane while the enclosed code runs.
+
+        Outside any lane the enclosed code runs without waiting.
+
+        Yields:
+            None
+
+        Raises:
+            IpsdkError: If the current lane is not configured.
+        """
+        lane = self._lane()
+        if lane is None:
+            yield
+            return
+
+        semaphore = self._semaphores[lane]
+        with self._lock:
+            self.waiting[lane] += 1
+        try:
+            semaphore.acquire()
+        finally:
+            with self._lock:
+                self.waiting[lane] -= 1
+        with self._lock:
+            self.active[lane] += 1
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active[lane] -= 1
+            semaphore.release()
+
+
+class AsyncLaneLimiter(LaneLimiterBase):
+    """Limit concurrent requests per lane across asyncio tasks.
+
+    Args:
+        shares (Mapping[str, int]): Maximum number of concurrent requests
+            per lane name.
+    """
+
+    __slots__ = ("_semaphores",)
+
+    def __init__(self, shares: Mapping[str, int]) -> None:
+        super().__init__(shares)
+        self._semaphores = {
+            lane: asyncio.Semaphore(share) for lane, share in self.shares.items()
+        }
+
+    @contextlib.asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """Hold a slot in the current lane while the enclosed code runs.
+
+        Outside any lane the enclosed code runs without waiting.
+
+        Yields:
+            None
+
+        Raises:
+            IpsdkError: If the current lane is not configured.
+        """
+        lane = self._lane()
+        if lane is None:
+            yield
+            return
+
+        semaphore = self._semaphores[lane]
+        self.waiting[lane] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting[lane] -= 1
+        self.active[lane] += 1
+
+        try:
+            yield
+        finally:
+            self.active[lane] -= 1
+            semaphore.release()
@@ -0,0 +1,634 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Lazy pagination over list endpoints for the Itential Python SDK.
+
+This module provides iterators that walk a paginated collection one page at a
+time and yield its items one by one. Only the current page is held in memory,
+so iterating over a collection of any size uses memory bounded by the page
+size.
+
+Two pagination styles are supported:
+
+offset:
+    Pages are requested with a page size and an offset parameter, for example
+    ``?limit=100&skip=200``. Iteration stops when a page is short or empty or
+    when the total count reported by the server has been reached. This is the
+    style used by most Itential Platform list endpoints.
+
+cursor:
+    Each response carries an opaque cursor for the next page, which is sent
+    back in a query parameter. Iteration stops when the response has no
+    cursor.
+
+With ``prefetch`` set to N, pages are read ahead concurrently: once the total
+count is known, up to N offset pages are requested in parallel, otherwise
+(cursor style, or no total reported) the next page is requested while the
+current one is being consumed. Pages are still yielded in order and at most
+N pages are buffered.
+
+Parameter names and the location of the items, total count and next cursor
+in the response body are configurable. Locations are dotted key paths such as
+``"data.items"`` or callables that receive the decoded body.
+
+Components
+----------
+Paginator:
+    Synchronous iterator built on Connection. Returned by
+    ``Connection.paginate()``.
+
+AsyncPaginator:
+    Asynchronous iterator built on AsyncConnection. Returned by
+    ``AsyncConnection.paginate()``.
+
+Examples
+--------
+Iterating over every workflow::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com")
+
+    for workflow in platform.paginate("/automation-studio/workflows"):
+        print(workflow["name"])
+
+Reading up to eight pages ahead::
+
+    for job in platform.paginate("/operations-manager/jobs", prefetch=8):
+        ...
+
+Cursor pagination with custom response keys::
+
+    async for job in platform.paginate(
+        "/jobs",
+        style="cursor",
+        items_key="data.jobs",
+        next_cursor_key="data.next",
+    ):
+        ...
+"""
+
+import asyncio
+import contextvars
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from concurrent.futures import Future
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+    from .http import Response
+
+    Extractor = str | Callable[[Any], Any]
+
+_STYLES: tuple[str, ...] = ("offset", "cursor")
+
+
+@logging.trace
+def extract(data: Any, location: Extractor | None) -> Any:
+    """Read a value from a decoded response body.
+
+    Args:
+        data (Any): The decoded response body.
+        location (str | Callable | None): A dotted key path such as
+            ``"data.items"``, a callable that receives the body, or None.
+            An empty string selects the body itself.
+
+    Returns:
+        Any: The value found, or None if a key along the path is missing or
+            location is None.
+    """
+    if location is None:
+        return None
+    if callable(location):
+        return location(data)
+    if not location:
+        return data
+
+    value = data
+    for part in location.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class PaginatorBase:
+    """Shared configuration and page handling for the paginators.
+
+    Args:
+        path (str): The list endpoint path.
+        params (dict): Additional query parameters sent with every page.
+            Defaults to None.
+        style (str): Pagination style, ``"offset"`` or ``"cursor"``.
+            Defaults to ``"offset"``.
+        page_size (int): Number of items requested per page. Defaults to 100.
+        limit_param (str): Query parameter carrying the page size.
+            Defaults to ``"limit"``.
+        offset_param (str): Query parameter carrying the offset in offset
+            style. Defaults to ``"skip"``.
+        cursor_param (str): Query parameter carrying the cursor in cursor
+            style. Defaults to ``"cursor"``.
+        items_key (str | Callable): Location of the list of items in the
+            response body. Defaults to ``"results"``.
+        total_key (str | Callable | None): Location of the total item count
+            in the response body, or None if the endpoint reports none.
+            Defaults to ``"total"``.
+        next_cursor_key (str | Callable): Location of the next cursor in the
+            response body in cursor style. Defaults to ``"next"``.
+        max_items (int | None): Stop after yielding this many items.
+            Defaults to None (no limit).
+        prefetch (int): Maximum number of pages requested ahead of the
+            consumer. Defaults to 0 (pages are requested one at a time).
+
+    Raises:
+        IpsdkError: If the style is unknown, page_size or max_items is not
+            positive or prefetch is negative.
+    """
+
+    __slots__ = (
+        "cursor_param",
+        "items_key",
+        "limit_param",
+        "max_items",
+        "next_cursor_key",
+        "offset_param",
+        "page_size",
+        "params",
+        "path",
+        "prefetch",
+        "style",
+        "total",
+        "total_key",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        *,
+        style: str = "offset",
+        page_size: int = 100,
+        limit_param: str = "limit",
+        offset_param: str = "skip",
+        cursor_param: str = "cursor",
+        items_key: Extractor = "results",
+        total_key: Extractor | None = "total",
+        next_cursor_key: Extractor = "next",
+        max_items: int | None = None,
+        prefetch: int = 0,
+    ) -> None:
+        if style not in _STYLES:
+            msg = f"unknown pagination style {style!r}, expected one of {_STYLES}"
+            raise exceptions.IpsdkError(msg)
+
+        if page_size <= 0:
+            msg = "page_size must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+
+        if max_items is not None and max_items <= 0:
+            msg = "max_items must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+
+        if prefetch < 0:
+            msg = "prefetch must not be negative"
+            raise exceptions.IpsdkError(msg)
+
+        self.path = path
+        self.params = dict(params or {})
+        self.style = style
+        self.page_size = page_size
+        self.limit_param = limit_param
+        self.offset_param = offset_param
+        self.cursor_param = cursor_param
+        self.items_key = items_key
+        self.total_key = total_key
+        self.next_cursor_key = next_cursor_key
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.total: int | None = None
+
+    def _page_params(self, position: int | str | None) -> dict[str, Any]:
+        """Build the query parameters for one page.
+
+        Args:
+            position (int | str | None): The offset in offset style, or the
+                cursor in cursor style (None for the first page).
+
+        Returns:
+            dict[str, Any]: The query parameters for the page request.
+        """
+        params = dict(self.params)
+        params[self.limit_param] = self.page_size
+        if self.style == "offset":
+            params[self.offset_param] = position or 0
+        elif position is not None:
+            params[self.cursor_param] = position
+        return params
+
+    def _parse(self, res: Response) -> tuple[list[Any], Any]:
+        """Extract the items and the next cursor from a page response.
+
+        Records the total count reported by the server, if any.
+
+        Args:
+            res (Response): The page response.
+
+        Returns:
+            tuple[list, Any]: The page items and the next cursor (None in
+                offset style or on the last page).
+
+        Raises:
+            IpsdkError: If the items location does not hold a list.
+        """
+        data = res.json()
+
+        items = extract(data, self.items_key)
+        if not isinstance(items, list):
+            msg = (
+                f"expected a list of items at {self.items_key!r} in the "
+                f"response from {self.path}, got {type(items).__name__}"
+            )
+            raise exceptions.IpsdkError(msg)
+
+        total = extract(data, self.total_key)
+        if isinstance(total, int) and not isinstance(total, bool):
+            self.total = total
+
+        cursor = None
+        if self.style == "cursor":
+            cursor = extract(data, self.next_cursor_key) or None
+
+        return items, cursor
+
+    def _is_last(self, items: list[Any], offset: int, cursor: Any) -> bool:
+        """Check whether a page is the last one of the collection.
+
+        Args:
+            items (list): The items of the page.
+            offset (int): The offset just after the page.
+            cursor (Any): The next cursor returned with the page.
+
+        Returns:
+            bool: True if no further page should be requested.
+        """
+        if not items:
+            return True
+        if self.max_items is not None and offset >= self.max_items:
+            return True
+        if self.style == "cursor":
+            return cursor is None
+        if self.total is not None:
+            return offset >= self.total
+        return len(items) < self.page_size
+
+    def _trim(self, items: list[Any], yielded: int) -> list[Any]:
+        """Drop items beyond max_items.
+
+        Args:
+            items (list): The items of a page.
+            yielded (int): Number of items already yielded.
+
+        Returns:
+            list: The items that may still be yielded.
+        """
+        if self.max_items is None:
+            return items
+        return items[: max(self.max_items - yielded, 0)]
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(path='{self.path}', style='{self.style}', "
+            f"page_size={self.page_size})"
+        )
+
+
+class ReadAhead:
+    """Decide which pages to request ahead of the consumer.
+
+    Offset pages are planned ``page_size`` apart. Up to ``prefetch`` pages
+    are planned once the total count is known and a single page otherwise.
+    In cursor style the next page can only be planned once the cursor of the
+    previous page is known, so at most one page is requested ahead.
+
+    Args:
+        paginator (PaginatorBase): The paginator being iterated.
+    """
+
+    __slots__ = ("cursor", "next_offset", "paginator", "step")
+
+    def __init__(self, paginator: PaginatorBase) -> None:
+        self.paginator = paginator
+        self.step = paginator.page_size
+        self.next_offset = paginator.page_size
+        self.cursor: Any = None
+
+    def positions(self, in_flight: int) -> list[Any]:
+        """Plan the pages to request now.
+
+        Args:
+            in_flight (int): Number of pages already requested and not yet
+                consumed.
+
+        Returns:
+            list: Offsets or cursors of the pages to request, in order.
+        """
+        p = self.paginator
+
+        if p.style == "cursor":
+            if in_flight or self.cursor is None:
+                return []
+            cursor, self.cursor = self.cursor, None
+            return [cursor]
+
+        window = p.prefetch if p.total is not None else 1
+        planned: list[Any] = []
+        while in_flight + len(planned) < window:
+            if p.total is not None and self.next_offset >= p.total:
+                break
+            if p.max_items is not None and self.next_offset >= p.max_items:
+                break
+            planned.append(self.next_offset)
+            self.next_offset += self.step
+        return planned
+
+    def replan(self, offset: int, step: int) -> None:
+        """Restart offset planning after a page shorter than expected.
+
+        Servers that cap the page size return fewer items than requested,
+        which would make the planned offsets skip items. Planning restarts at
+        the actual offset using the observed page length.
+
+        Args:
+            offset (int): The offset just after the short page.
+            step (int): The number of items the server returned per page.
+
+        Returns:
+            None
+        """
+        self.next_offset = offset
+        self.step = step
+
+    def is_short(self, items: list[Any]) -> bool:
+        """
+        Check whether an offset page returned fewer items than planned
+
+        Args:
+            items (list): The items of the page.
+
+        Returns:
+            bool: True if planned offsets must be recomputed
+        """
+        return self.paginator.style == "offset" and len(items) < self.step
+
+
+class Paginator(PaginatorBase):
+    """Lazily iterate over the items of a paginated collection.
+
+    Pages are requested with Connection.get() as iteration proceeds. The
+    paginator can be iterated more than once; each iteration starts again
+    from the first page.
+
+    Args:
+        connection (Connection): The connection used to request pages.
+        path (str): The list endpoint path.
+        params (dict): Additional query parameters. Defaults to None.
+        **kwargs: Pagination options, see PaginatorBase.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(
+        self,
+        connection: Connection,
+        path: str,
+        params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, params, **kwargs)
+        self.connection = connection
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            yield from page
+
+    def pages(self) -> Iterator[list[Any]]:
+        """Iterate over the collection one page at a time.
+
+        Yields:
+            list: The items of each page.
+
+        Raises:
+            IpsdkError: If a response does not contain a list of items.
+            HTTPStatusError: If the server returns an error status.
+        """
+        if self.prefetch:
+            yield from self._read_ahead()
+            return
+
+        offset = 0
+        cursor: Any = None
+        while True:
+            position = offset if self.style == "offset" else cursor
+            items, cursor = self._get_page(position)
+
+            page = self._trim(items, offset)
+            offset += len(items)
+            if page:
+                yield page
+
+            if self._is_last(items, offset, cursor):
+                return
+
+    def _read_ahead(self) -> Iterator[list[Any]]:
+        """Iterate over pages while requesting later pages in worker threads.
+
+        Yields:
+            list: The items of each page, in order.
+        """
+        plan = ReadAhead(self)
+        pending: deque[Future[tuple[list[Any], Any]]] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=self.prefetch, thread_name_prefix="ipsdk-prefetch"
+        )
+        try:
+            # Each page is requested in a copy of the caller's context, so
+            # prefetches run in the caller's priority lane
+            pending.append(
+                executor.submit(contextvars.copy_context().run, self._get_page, None)
+            )
+            offset = 0
+            while pending:
+                items, cursor = pending.popleft().result()
+
+                page = self._trim(items, offset)
+                offset += len(items)
+                if self._is_last(items, offset, cursor):
+                    if page:
+                        yield page
+                    return
+
+                plan.cursor = cursor
+                if plan.is_short(items):
+                    _cancel(pending)
+                    plan.replan(offset, len(items))
+
+                pending.extend(
+                    executor.submit(
+                        contextvars.copy_context().run, self._get_page, position
+                    )
+                    for position in plan.positions(len(pending))
+                )
+                yield page
+        finally:
+            _cancel(pending)
+            executor.shutdown(wait=True)
+
+    def _get_page(self, position: int | str | None) -> tuple[list[Any], Any]:
+        """Request and parse one page.
+
+        Args:
+            position (int | str | None): The offset or cursor of the page.
+
+        Returns:
+            tuple[list, Any]: The page items and the next cursor.
+        """
+        res = self.connection.get(self.path, params=self._page_params(position))
+        return self._parse(res)
+
+
+class AsyncPaginator(PaginatorBase):
+    """Lazily iterate over the items of a paginated collection from asyncio.
+
+    Pages are requested with AsyncConnection.get() as iteration proceeds.
+
+    Args:
+        connection (AsyncConnection): The connection used to request pages.
+        path (str): The list endpoint path.
+        params (dict): Additional query parameters. Defaults to None.
+        **kwargs: Pagination options, see PaginatorBase.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(
+        self,
+        connection: AsyncConnection,
+        path: str,
+        params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, params, **kwargs)
+        self.connection = connection
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for page in self.pages():
+            for item in page:
+                yield item
+
+    async def pages(self) -> AsyncIterator[list[Any]]:
+        """Iterate over the collection one page at a time.
+
+        Yields:
+            list: The items of each page.
+
+        Raises:
+            IpsdkError: If a response does not contain a list of items.
+            HTTPStatusError: If the server returns an error status.
+        """
+        if self.prefetch:
+            async for page in self._read_ahead():
+                yield page
+            return
+
+        offset = 0
+        cursor: Any = None
+        while True:
+            position = offset if self.style == "offset" else cursor
+            items, cursor = await self._get_page(position)
+
+            page = self._trim(items, offset)
+            offset += len(items)
+            if page:
+                yield page
+
+            if self._is_last(items, offset, cursor):
+                return
+
+    async def _read_ahead(self) -> AsyncIterator[list[Any]]:
+        """Iterate over pages while requesting later pages in tasks.
+
+        Yields:
+            list: The items of each page, in order.
+        """
+        plan = ReadAhead(self)
+        pending: deque[asyncio.Future[tuple[list[Any], Any]]] = deque()
+        try:
+            pending.append(asyncio.ensure_future(self._get_page(None)))
+            offset = 0
+            while pending:
+                items, cursor = await pending.popleft()
+
+                page = self._trim(items, offset)
+                offset += len(items)
+                if self._is_last(items, offset, cursor):
+                    if page:
+                        yield page
+                    return
+
+                plan.cursor = cursor
+                if plan.is_short(items):
+                    _cancel(pending)
+                    plan.replan(offset, len(items))
+
+                pending.extend(
+                    asyncio.ensure_future(self._get_page(position))
+                    for position in plan.positions(len(pending))
+                )
+                yield page
+        finally:
+            _cancel(pending)
+
+    async def _get_page(self, position: int | str | None) -> tuple[list[Any], Any]:
+        """Request and parse one page.
+
+        Args:
+            position (int | str | None): The offset or cursor of the page.
+
+        Returns:
+            tuple[list, Any]: The page items and the next cursor.
+        """
+        res = await self.connection.get(self.path, params=self._page_params(position))
+        return self._parse(res)
+
+
+def _cancel(pending: deque[Any]) -> None:
+    """Cancel and forget pages that were requested but not consumed.
+
+    Errors of pages that already completed are retrieved and discarded, as
+    those pages will never be yielded.
+
+    Args:
+        pending (deque): Futures or tasks of the requested pages.
+
+    Returns:
+        None
+    """
+    while pending:
+        future = pending.pop()
+        if not future.cancel() and not future.cancelled():
+            future.exception()
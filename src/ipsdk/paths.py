@@ -0,0 +1,152 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Path templates with safe, cached URL construction.
+
+Request paths that embed names or IDs, such as
+``/workflow_builder/workflows/{name}``, are built from templates with
+``{name}`` placeholders instead of f-strings. A template is parsed once and
+kept in a module-level cache, so formatting a path only joins the literal
+parts with the encoded variable values.
+
+Every variable value is converted to a string and percent-encoded as a
+single path segment: spaces, ``/``, ``?``, ``#``, ``%`` and non-ASCII
+characters are all escaped, so a value can never change the shape of the
+URL, add a query string or escape to another resource.
+
+Components
+----------
+PathTemplate:
+    A parsed path template.
+
+path_template:
+    Returns the cached PathTemplate for a template string.
+
+Examples
+--------
+Building paths through a connection::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com")
+
+    path = platform.path("/workflow_builder/workflows/{name}", name="Backup / Daily")
+    # "/workflow_builder/workflows/Backup%20%2F%20Daily"
+    platform.get(path)
+
+Using a template directly::
+
+    from ipsdk.paths import path_template
+
+    template = path_template("/devices/{device}/configuration")
+    template.format(device="core-1")
+"""
+
+import functools
+import string
+import urllib.parse
+
+from typing import Any
+
+from . import exceptions
+
+# Maximum number of parsed templates kept by path_template()
+_CACHE_SIZE = 512
+
+
+class PathTemplate:
+    """A path template parsed into literal text and variable names.
+
+    Args:
+        template (str): The path, with ``{name}`` placeholders. Names must be
+            Python identifiers; format specs, conversions and positional
+            fields are not supported. ``{{`` and ``}}`` are literal braces.
+
+    Attributes:
+        template (str): The template string.
+        fields (tuple[str, ...]): Names of the variables, in order.
+
+    Raises:
+        IpsdkError: If the template is not a string or has an invalid
+            placeholder.
+    """
+
+    __slots__ = ("_literal", "_segments", "fields", "template")
+
+    def __init__(self, template: str) -> None:
+        if not isinstance(template, str):
+            msg = "path template must be of type `str`"
+            raise exceptions.IpsdkError(msg)
+
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError as exc:
+            msg = f"invalid path template {template!r}: {exc}"
+            raise exceptions.IpsdkError(msg) from exc
+
+        segments: list[tuple[str, str | None]] = []
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                msg = f"invalid placeholder {{{field}}} in path template {template!r}"
+                raise exceptions.IpsdkError(msg)
+            segments.append((literal, field))
+
+        self.template = template
+        self._segments = tuple(segments)
+        self.fields = tuple(field for _, field in segments if field is not None)
+        # Templates without variables format to their unescaped literal text
+        self._literal = "".join(literal for literal, _ in segments)
+
+    def format(self, **variables: Any) -> str:
+        """
+        Fill in the template
+
+        Args:
+            **variables: Values of the variables. Extra names are ignored.
+
+        Returns:
+            str: The path with percent-encoded variable values
+
+        Raises:
+            IpsdkError: If a variable is missing.
+        """
+        if not self.fields:
+            return self._literal
+
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                try:
+                    value = variables[field]
+                except KeyError:
+                    msg = f"missing path variable {field!r} for {self.template}"
+                    raise exceptions.IpsdkError(msg) from None
+                parts.append(urllib.parse.quote(str(value), safe=""))
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"PathTemplate({self.template!r})"
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def path_template(template: str) -> PathTemplate:
+    """Return the parsed template for a template string.
+
+    Templates are cached, so calling this with the same string on every
+    request parses it only once.
+
+    Args:
+        template (str): The path, with ``{name}`` placeholders.
+
+    Returns:
+        PathTemplate: The parsed template.
+
+    Raises:
+        IpsdkError: If the template has an invalid placeholder.
+    """
+    return PathTemplate(template)
@@ -0,0 +1,376 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Streaming producer/consumer pipelines over asynchronous SDK calls.
+
+This module provides Pipeline, a small abstraction for ETL-style jobs that
+read items from one endpoint, transform them and write results back. A
+pipeline is built from a source followed by map, filter and sink stages:
+
+- the source is any iterable or async iterable, typically an
+  :class:`ipsdk.pagination.AsyncPaginator` returned by ``paginate()``
+- ``map(fn)`` replaces each item with ``fn(item)``
+- ``filter(fn)`` keeps the items for which ``fn(item)`` is true
+- ``sink(fn)`` calls ``fn(item)`` for each item and ends the pipeline
+
+Stage functions may be plain functions or coroutine functions, so they can
+call an AsyncPlatform or AsyncGateway connection directly.
+
+Each stage runs up to ``concurrency`` calls at the same time and stages are
+connected by bounded queues, so a slow stage applies backpressure all the way
+to the source and memory stays bounded by the queue sizes. Items flow through
+the stages in completion order, not source order, once a stage has a
+concurrency above one.
+
+Errors and cancellation are structured: the first exception raised by the
+source or a stage cancels every other task of the pipeline and is raised by
+``run()`` or by the ``async for`` loop consuming the pipeline, and cancelling
+the consumer cancels the whole pipeline. No task outlives the pipeline run.
+
+Components
+----------
+Stage:
+    One step of a pipeline with its function, concurrency and counter.
+
+Pipeline:
+    A source and its stages, run with run() or consumed with ``async for``.
+
+Examples
+--------
+Copying transformed workflows between two Platform instances::
+
+    from ipsdk.pipeline import Pipeline
+
+    pipeline = (
+        Pipeline(source.paginate("/automation-studio/workflows"), buffer=50)
+        .filter(lambda workflow: workflow["type"] == "automation")
+        .map(transform, concurrency=4)
+        .sink(lambda workflow: target.post("/workflows", json=workflow), concurrency=8)
+    )
+
+    written = await pipeline.run()
+"""
+
+import asyncio
+import inspect
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import logging
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+    from collections.abc import AsyncIterator
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+# Stage kinds
+_MAP = "map"
+_FILTER = "filter"
+_SINK = "sink"
+
+
+class _Done:
+    """End-of-stream marker passed between stages."""
+
+    __slots__ = ()
+
+
+class _Failed:
+    """Marker carrying the exception that stopped a pipeline."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_DONE = _Done()
+
+
+async def _call(fn: Callable[[Any], Any], item: Any) -> Any:
+    """Call a stage function, awaiting its result if it is awaitable.
+
+    Args:
+        fn (Callable): The stage function.
+        item (Any): The item to pass to the function.
+
+    Returns:
+        Any: The value returned by the function.
+    """
+    result = fn(item)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class Stage:
+    """One step of a pipeline.
+
+    Args:
+        kind (str): ``"map"``, ``"filter"`` or ``"sink"``.
+        fn (Callable): Function or coroutine function called with each item.
+        concurrency (int): Maximum number of concurrent calls of fn.
+
+    Attributes:
+        processed (int): Number of items passed to fn in the last run.
+
+    Raises:
+        IpsdkError: If concurrency is not positive.
+    """
+
+    __slots__ = ("concurrency", "fn", "kind", "processed")
+
+    def __init__(self, kind: str, fn: Callable[[Any], Any], concurrency: int) -> None:
+        if concurrency <= 0:
+            msg = "stage concurrency must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+        self.kind = kind
+        self.fn = fn
+        self.concurrency = concurrency
+        self.processed = 0
+
+    async def run(self, inbox: asyncio.Queue[Any], outbox: asyncio.Queue[Any]) -> None:
+        """Process items from inbox into outbox until the end of the stream.
+
+        Args:
+            inbox (asyncio.Queue): Queue of items from the previous step.
+            outbox (asyncio.Queue): Queue of items for the next step.
+
+        Returns:
+            None
+        """
+        self.processed = 0
+        await asyncio.gather(
+            *(self._work(inbox, outbox) for _ in range(self.concurrency))
+        )
+        await outbox.put(_DONE)
+
+    async def _work(
+        self, inbox: asyncio.Queue[Any], outbox: asyncio.Queue[Any]
+    ) -> None:
+        """Process items until the end-of-stream marker is received.
+
+        The marker is put back so the other workers of the stage see it.
+
+        Args:
+            inbox (asyncio.Queue): Queue of items from the previous step.
+            outbox (asyncio.Queue): Queue of items for the next step.
+
+        Returns:
+            None
+        """
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                inbox.put_nowait(_DONE)
+                return
+
+            self.processed += 1
+            result = await _call(self.fn, item)
+            if self.kind == _MAP:
+                await outbox.put(result)
+            elif self.kind == _FILTER:
+                if result:
+                    await outbox.put(item)
+            else:
+                await outbox.put(item)
+
+    def __repr__(self) -> str:
+        name = getattr(self.fn, "__name__", type(self.fn).__name__)
+        return f"Stage({self.kind} {name}, concurrency={self.concurrency})"
+
+
+class Pipeline:
+    """A source of items followed by map, filter and sink stages.
+
+    The stage methods return the pipeline so calls can be chained. A
+    pipeline only describes the work: nothing runs until run() is awaited or
+    the pipeline is iterated with ``async for``, and it can be run again if
+    its source can be iterated again.
+
+    Args:
+        source (Iterable | AsyncIterable): The items fed into the pipeline.
+        buffer (int): Capacity of the queue between two steps. Defaults
+            to 100.
+
+    Raises:
+        IpsdkError: If buffer is not positive.
+    """
+
+    __slots__ = ("buffer", "source", "stages")
+
+    def __init__(
+        self, source: Iterable[Any] | AsyncIterable[Any], buffer: int = 100
+    ) -> None:
+        if buffer <= 0:
+            msg = "buffer must be a positive integer"
+            raise exceptions.IpsdkError(msg)
+        self.source = source
+        self.buffer = buffer
+        self.stages: list[Stage] = []
+
+    def map(self, fn: Callable[[Any], Any], concurrency: int = 1) -> Pipeline:
+        """
+        Add a stage replacing each item with fn(item)
+
+        Args:
+            fn (Callable): Function or coroutine function.
+            concurrency (int): Maximum number of concurrent calls. Defaults
+                to 1.
+
+        Returns:
+            Pipeline: This pipeline
+
+        Raises:
+            IpsdkError: If the pipeline already ends with a sink.
+        """
+        return self._add(Stage(_MAP, fn, concurrency))
+
+    def filter(self, fn: Callable[[Any], Any], concurrency: int = 1) -> Pipeline:
+        """
+        Add a stage keeping the items for which fn(item) is true
+
+        Args:
+            fn (Callable): Predicate function or coroutine function.
+            concurrency (int): Maximum number of concurrent calls. Defaults
+                to 1.
+
+        Returns:
+            Pipeline: This pipeline
+
+        Raises:
+            IpsdkError: If the pipeline already ends with a sink.
+        """
+        return self._add(Stage(_FILTER, fn, concurrency))
+
+    def sink(self, fn: Callable[[Any], Any], concurrency: int = 1) -> Pipeline:
+        """
+        Add the final stage calling fn(item) for each item
+
+        The value returned by fn is discarded. Iterating a pipeline that
+        ends with a sink yields the items that were sunk.
+
+        Args:
+            fn (Callable): Function or coroutine function.
+            concurrency (int): Maximum number of concurrent calls. Defaults
+                to 1.
+
+        Returns:
+            Pipeline: This pipeline
+
+        Raises:
+            IpsdkError: If the pipeline already ends with a sink.
+        """
+        return self._add(Stage(_SINK, fn, concurrency))
+
+    def _add(self, stage: Stage) -> Pipeline:
+        """Append a stage to the pipeline.
+
+        Args:
+            stage (Stage): The stage to append.
+
+        Returns:
+            Pipeline: This pipeline.
+
+        Raises:
+            IpsdkError: If the pipeline already ends with a sink.
+        """
+        if self.stages and self.stages[-1].kind == _SINK:
+            msg = "no stage can be added after a sink"
+            raise exceptions.IpsdkError(msg)
+        self.stages.append(stage)
+        return self
+
+    @logging.trace
+    async def run(self) -> int:
+        """Run the pipeline to completion.
+
+        Returns:
+            int: Number of items that came out of the last stage.
+
+        Raises:
+            Exception: The first exception raised by the source or a stage.
+        """
+        count = 0
+        async for _ in self:
+            count += 1
+        return count
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        output: asyncio.Queue[Any] = asyncio.Queue(self.buffer)
+        supervisor = asyncio.ensure_future(self._supervise(output))
+        try:
+            while True:
+                item = await output.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failed):
+                    raise item.exc
+                yield item
+        finally:
+            supervisor.cancel()
+            await asyncio.gather(supervisor, return_exceptions=True)
+
+    async def _supervise(self, output: asyncio.Queue[Any]) -> None:
+        """Run the source and stage tasks, stopping them all on the first error.
+
+        On failure every task is cancelled, unread items are discarded and
+        the exception is passed to the consumer through the output queue.
+
+        Args:
+            output (asyncio.Queue): Queue read by the consumer.
+
+        Returns:
+            None
+        """
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(self.buffer) for _ in self.stages
+        ]
+        queues.append(output)
+
+        tasks = [asyncio.ensure_future(self._feed(queues[0]))]
+        tasks.extend(
+            asyncio.ensure_future(stage.run(queues[index], queues[index + 1]))
+            for index, stage in enumerate(self.stages)
+        )
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            exc = next((task.exception() for task in done if task.exception()), None)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if exc is not None:
+            logging.debug(f"Pipeline stopped: {exc!r}")
+            while not output.empty():
+                output.get_nowait()
+            output.put_nowait(_Failed(exc))
+
+    async def _feed(self, queue: asyncio.Queue[Any]) -> None:
+        """Put the source items into the first queue.
+
+        Args:
+            queue (asyncio.Queue): The queue of the first stage.
+
+        Returns:
+            None
+        """
+        if hasattr(self.source, "__aiter__"):
+            async for item in self.source:
+                await queue.put(item)
+        else:
+            for item in self.source:
+                await queue.put(item)
+        await queue.put(_DONE)
+
+    def __repr__(self) -> str:
+        return f"Pipeline(stages={self.stages!r}, buffer={self.buffer})"
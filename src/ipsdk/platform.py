@@ -32,6 +32,11 @@ AsyncPlatform:
     combining AsyncAuthMixin with AsyncConnection base class. Provides
     async/await support for non-blocking API requests with OAuth or basic auth.
 
+BackgroundConnection:
+    Returned by platform_factory when want_background=True. Runs an
+    AsyncPlatform on a dedicated event loop thread and exposes blocking
+    methods plus futures-returning submit_* methods to synchronous code.
+
 AuthMixin:
     Synchronous authentication mixin that implements both OAuth client
     credentials and basic username/password authentication for Platform.
@@ -226,11 +231,16 @@ from typing import TYPE_CHECKING
 
 import httpx
 
+from . import background
 from . import connection
 from . import exceptions
 from . import jsonutils
 from . import logging
 
+if TYPE_CHECKING:
+    from .cache import NegativeCache
+    from .cache import ResponseCache
+
 # OAuth constants
 _OAUTH_HEADERS: dict[str, str] = {"Content-Type": "application/x-www-form-urlencoded"}
 _OAUTH_PATH: str = "/oauth/token"
@@ -420,7 +430,7 @@ class AuthMixin:
             res.raise_for_status()
 
             # Parse the response to extract the token
-            response_data = jsonutils.loads(res.text)
+            response_data = jsonutils.loads(res.content)
             if isinstance(response_data, dict):
                 access_token = response_data.get("access_token")
             else:
@@ -576,7 +586,7 @@ class AsyncAuthMixin:
             res.raise_for_status()
 
             # Parse the response to extract the token
-            response_data = jsonutils.loads(res.text)
+            response_data = jsonutils.loads(res.content)
             if isinstance(response_data, dict):
                 access_token = response_data.get("access_token")
             else:
@@ -622,8 +632,14 @@ def platform_factory(
     client_secret: str | None = None,
     timeout: int = 30,
     ttl: int = 0,
+    coalesce: bool = False,
+    cache: ResponseCache | None = None,
+    negative_cache: NegativeCache | None = None,
+    lanes: dict[str, int] | None = None,
+    validation: str = "fast",
     want_async: bool = False,
-) -> Platform | AsyncPlatform:
+    want_background: bool = False,
+) -> Platform | AsyncPlatform | background.BackgroundConnection:
     """
     Create a new instance of a Platform connection.
 
@@ -667,23 +683,73 @@ def platform_factory(
         ttl (int): Time to live in seconds before forcing reauthentication. If 0,
             reauthentication is disabled. The default value is `0`.
 
+        coalesce (bool): When set to True, concurrent identical GET requests
+            share a single in-flight HTTP call and all receive its response.
+            The default value is False
+
+        cache (ResponseCache): Optional response cache for GET requests.  When
+            set, responses are stored according to their Cache-Control, Expires,
+            ETag and Last-Modified headers, fresh entries are served without a
+            network call and stale entries are revalidated with conditional
+            requests.  The default value is None
+
+        negative_cache (NegativeCache): Optional cache of 404 Not Found
+            responses.  When set, a GET for a path that recently returned 404
+            raises HTTPStatusError without a network call until the entry
+            expires or a write to an overlapping path invalidates it.  The
+            default value is None
+
+        lanes (dict): Optional priority lanes mapping a lane name to the
+            maximum number of concurrent requests sent from that lane.  Code
+            is put in a lane with `ipsdk.lanes.priority()`, and requests
+            outside any lane are not limited.  The default value is None
+
+        validation (str): How much request arguments are checked before each
+            request is sent: `strict` adds deep checks of params and JSON
+            bodies, `fast` checks argument types and `off` skips validation
+            for trusted hot paths.  See `ipsdk.validation`.  The default
+            value is `fast`
+
         want_async (bool): When set to True, the factory function will return
             an async connection object and when set to False the factory will
             return a connection object.
 
+        want_background (bool): When set to True, the factory function will
+            return a synchronous client that runs an AsyncPlatform connection
+            on a dedicated background event loop thread.  The default value
+            is False
+
     Returns:
         Platform: An initialized Platform connection instance.
+
+    Raises:
+        IpsdkError: If both want_async and want_background are True or the
+            validation level is unknown
     """
+    if want_async and want_background:
+        msg = "want_async and want_background are mutually exclusive"
+        raise exceptions.IpsdkError(msg)
+
+    kwargs = {
+        "host": host,
+        "port": port,
+        "use_tls": use_tls,
+        "verify": verify,
+        "user": user,
+        "password": password,
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "timeout": timeout,
+        "ttl": ttl,
+        "coalesce": coalesce,
+        "cache": cache,
+        "negative_cache": negative_cache,
+        "lanes": lanes,
+        "validation": validation,
+    }
+
+    if want_background:
+        return background.BackgroundConnection(AsyncPlatform(**kwargs))
+
     factory = AsyncPlatform if want_async else Platform
-    return factory(
-        host=host,
-        port=port,
-        use_tls=use_tls,
-        verify=verify,
-        user=user,
-        password=password,
-        client_id=client_id,
-        client_secret=client_secret,
-        timeout=timeout,
-        ttl=ttl,
-    )
+    return factory(**kwargs)
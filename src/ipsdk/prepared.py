@@ -0,0 +1,292 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Prepared request templates for hot request paths.
+
+This module provides prepared requests: the method, a path template and any
+static headers of a request are validated and processed once, when the
+request is prepared, and each call only fills in the path variables, query
+parameters and body. Compared with ``get()``/``post()``, a prepared request
+skips the per-call method and path validation and the merging of its static
+headers. Like every request, it takes the ``Authorization`` header from the
+connection's client, where it is installed when the token is set.
+
+Path templates use ``{name}`` placeholders and are parsed by
+:class:`ipsdk.paths.PathTemplate`, which percent-encodes each variable value
+as a single path segment. The template's base URL is captured when the
+request is prepared, so each call sends an absolute URL that httpx does not
+have to merge with its base URL.
+
+Prepared requests go through the same authentication, priority lanes,
+validation level and error handling as the other request methods. Writes
+invalidate the response and negative caches, and prepared GET requests are
+sent through the regular request path when a response cache, negative cache
+or request coalescing is enabled so that those features keep working.
+
+Components
+----------
+PreparedRequest:
+    Prepared request for a synchronous Connection.
+
+AsyncPreparedRequest:
+    Prepared request for an AsyncConnection.
+
+Examples
+--------
+Fetching many jobs with one prepared request::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com")
+
+    get_job = platform.prepare("GET", "/operations-manager/jobs/{job_id}")
+
+    for job_id in job_ids:
+        job = get_job.send(job_id=job_id).json()
+
+The microbenchmarks in ``scripts/benchmark_requests.py`` compare prepared
+requests with the regular request path.
+"""
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import exceptions
+from . import validation
+from .http import JSON_HEADERS
+from .http import HTTPMethod
+from .http import json_content
+from .paths import path_template
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+    from .http import Response
+
+# Keyword arguments of send() that cannot be used as path variables
+_RESERVED: frozenset[str] = frozenset({"params", "json"})
+
+
+class PreparedRequestBase:
+    """Shared template processing for the prepared requests.
+
+    Args:
+        connection (Connection | AsyncConnection): The connection sending the
+            request.
+        method (HTTPMethod | str): The HTTP method.
+        path (str): The path template, with ``{name}`` placeholders.
+        headers (dict[str, str] | None): Static headers sent with every call.
+            Defaults to None.
+
+    Attributes:
+        template (PathTemplate): The parsed path template.
+        fields (tuple[str, ...]): Names of the path variables, in order.
+        headers (dict[str, str]): The static headers.
+
+    Raises:
+        IpsdkError: If the method, path template or headers are invalid.
+    """
+
+    __slots__ = (
+        "_json_headers",
+        "_url_prefix",
+        "connection",
+        "fields",
+        "headers",
+        "method",
+        "path",
+        "template",
+    )
+
+    def __init__(
+        self,
+        connection: Any,
+        method: HTTPMethod | str,
+        path: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if isinstance(method, str) and not isinstance(method, HTTPMethod):
+            try:
+                method = HTTPMethod(method.upper())
+            except ValueError as exc:
+                msg = f"unsupported HTTP method {method!r}"
+                raise exceptions.IpsdkError(msg) from exc
+
+        if not isinstance(path, str):
+            msg = "path must be of type `str`"
+            raise exceptions.IpsdkError(msg)
+
+        if headers is not None and not all(
+            isinstance(name, str) and isinstance(value, str)
+            for name, value in headers.items()
+        ):
+            msg = "headers must be a `dict` of `str` names and values"
+            raise exceptions.IpsdkError(msg)
+
+        template = path_template(path)
+        reserved = _RESERVED.intersection(template.fields)
+        if reserved:
+            msg = f"path variables cannot be named {', '.join(sorted(reserved))}"
+            raise exceptions.IpsdkError(msg)
+
+        self.connection = connection
+        self.method = method
+        self.path = path
+        self.template = template
+        self.fields = template.fields
+        self._url_prefix = connection.base_url
+
+        self.headers = dict(headers or {})
+        self._json_headers = {**self.headers, **JSON_HEADERS}
+
+    def format_path(self, **variables: Any) -> str:
+        """
+        Fill in the path template
+
+        Args:
+            **variables: Values of the path variables.
+
+        Returns:
+            str: The request path with percent-encoded variable values
+
+        Raises:
+            IpsdkError: If a path variable is missing.
+        """
+        return self.template.format(**variables)
+
+    def build_request(
+        self,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+    ) -> httpx.Request:
+        """
+        Build the request for one call
+
+        Args:
+            path (str): The formatted request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (str | bytes | dict | list | None): Request body, serialized
+                with the active JSON codec when it is a dict or list and sent
+                unchanged when it is already serialized JSON. Defaults to None.
+
+        Returns:
+            httpx.Request: The request, ready to send
+
+        Raises:
+            IpsdkError: If params or json fails the connection's validation
+                level: with ``"fast"`` and ``"strict"``, params must be a dict
+                and json a dict, list, str or bytes, and ``"strict"`` also
+                checks their contents.
+        """
+        validation.check_arguments(self.connection.validation, params, json)
+
+        url = self._url_prefix + path if path[:1] == "/" else path
+        if json is None:
+            return self.connection.client.build_request(
+                method=self.method.value, url=url, params=params, headers=self.headers
+            )
+        return self.connection.client.build_request(
+            method=self.method.value,
+            url=url,
+            params=params,
+            headers=self._json_headers,
+            content=json_content(json),
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.method.value} {self.path})"
+
+
+class PreparedRequest(PreparedRequestBase):
+    """Prepared request for a synchronous Connection.
+
+    Args:
+        connection (Connection): The connection sending the request.
+        method (HTTPMethod | str): The HTTP method.
+        path (str): The path template, with ``{name}`` placeholders.
+        headers (dict[str, str] | None): Static headers sent with every call.
+            Defaults to None.
+    """
+
+    __slots__ = ()
+
+    connection: Connection
+
+    def send(
+        self,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+        **variables: Any,
+    ) -> Response:
+        """Send the request.
+
+        Args:
+            params (dict | None): Query string parameters. Defaults to None.
+            json (str | bytes | dict | list | None): Request body, serialized
+                with the active JSON codec when it is a dict or list and sent
+                unchanged when it is already serialized JSON. Defaults to None.
+            **variables: Values of the path variables.
+
+        Returns:
+            Response: The HTTP response.
+
+        Raises:
+            IpsdkError: If a path variable is missing or params or json has
+                the wrong type.
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return self.connection.send_prepared(
+            self, self.format_path(**variables), params, json
+        )
+
+
+class AsyncPreparedRequest(PreparedRequestBase):
+    """Prepared request for an AsyncConnection.
+
+    Args:
+        connection (AsyncConnection): The connection sending the request.
+        method (HTTPMethod | str): The HTTP method.
+        path (str): The path template, with ``{name}`` placeholders.
+        headers (dict[str, str] | None): Static headers sent with every call.
+            Defaults to None.
+    """
+
+    __slots__ = ()
+
+    connection: AsyncConnection
+
+    async def send(
+        self,
+        params: dict[str, Any | None] | None = None,
+        json: str | bytes | dict | list | None = None,
+        **variables: Any,
+    ) -> Response:
+        """Send the request.
+
+        Args:
+            params (dict | None): Query string parameters. Defaults to None.
+            json (str | bytes | dict | list | None): Request body, serialized
+                with the active JSON codec when it is a dict or list and sent
+                unchanged when it is already serialized JSON. Defaults to None.
+            **variables: Values of the path variables.
+
+        Returns:
+            Response: The HTTP response.
+
+        Raises:
+            IpsdkError: If a path variable is missing or params or json has
+                the wrong type.
+            RequestError: Network or connection errors occurred.
+            HTTPStatusError: Server returned an HTTP error status (4xx, 5xx).
+        """
+        return await self.connection.send_prepared(
+            self, self.format_path(**variables), params, json
+        )
@@ -0,0 +1,641 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Typed decoding of JSON responses into declared types.
+
+``Response.json()`` returns nested dicts and lists. For responses holding
+thousands of job or device records, decoding into declared types instead
+keeps one compact object per record, gives attribute access and checks the
+shape of every record up front. Declare the records as dataclasses, ideally
+with ``slots=True`` so each record has no instance dict, or as msgspec
+``Struct`` types::
+
+    @dataclass(slots=True)
+    class Device:
+        name: str
+        host: str
+        port: int = 22
+
+The supported types are dataclasses, msgspec Structs, ``str``, ``int``,
+``float`` (which also accepts integers), ``bool``, ``None``, ``Any``,
+``Enum`` and ``Literal`` types, ``list[T]``, ``tuple[T, ...]``,
+``dict[str, T]`` and unions such as ``T | None``.
+
+Decoding follows these rules:
+
+- Object keys are matched to field names. Keys without a field are skipped,
+  so records may gain fields without breaking decoding.
+- Fields without a default are required.
+- A missing required field or a value of the wrong type raises
+  ``SchemaError`` naming its location, for example
+  ``json['data'][3]['port']``.
+
+A decoder is compiled once per type and cached. When msgspec is installed
+it does the decoding: it parses the response body straight into the
+declared types without building intermediate dicts. Otherwise the body is
+parsed with the active JSON codec (see ``ipsdk.codec``) and converted by the
+compiled decoder.
+
+Components
+----------
+Decoder:
+    Decodes JSON into one declared type.
+
+decoder:
+    Returns the cached decoder of a type.
+
+decode:
+    Decodes a JSON document into a type.
+
+convert:
+    Converts already parsed JSON into a type.
+
+Examples
+--------
+Decoding a list response::
+
+    from dataclasses import dataclass
+
+    from ipsdk import gateway_factory
+
+    @dataclass(slots=True)
+    class Device:
+        name: str
+        host: str
+        port: int = 22
+
+    @dataclass(slots=True)
+    class DeviceList:
+        data: list[Device]
+        total: int
+
+    gateway = gateway_factory(host="gateway.example.com")
+    devices = gateway.get("/devices").decode(DeviceList)
+    devices.data[0].host
+"""
+
+import dataclasses
+import enum
+import functools
+import re
+import threading
+import types
+import typing
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Generic
+from typing import NoReturn
+from typing import TypeVar
+
+from . import codec
+from . import exceptions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:
+    msgspec = None
+
+T = TypeVar("T")
+
+# Maximum number of decoders kept by decoder()
+_CACHE_SIZE = 256
+
+# Converters of the types compiled so far, shared by all decoders so nested
+# types are compiled once. Compiling holds the lock, so a converter is never
+# used before its fields are filled in.
+_converters: dict[Any, Callable[[Any], Any]] = {}
+_compile_lock = threading.RLock()
+
+_NONE_TYPE = type(None)
+
+
+class _Invalid(Exception):
+    """A value that does not match its declared type.
+
+    Raised while converting and turned into SchemaError by the Decoder, after
+    the enclosing containers have added their keys.
+
+    Args:
+        message (str): What is wrong with the value.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+        self.keys: list[Any] = []
+
+
+class Decoder(Generic[T]):
+    """Decodes JSON into one declared type.
+
+    Use decoder() to get the cached decoder of a type instead of creating
+    one per call.
+
+    Args:
+        type_ (type[T]): The type to decode into.
+
+    Attributes:
+        type (type[T]): The type to decode into.
+
+    Raises:
+        IpsdkError: If the type, or a type it contains, is not supported.
+    """
+
+    __slots__ = ("_convert", "_native", "type")
+
+    def __init__(self, type_: type[T]) -> None:
+        self.type = type_
+        self._native: Any = None
+        self._convert: Callable[[Any], Any] | None = None
+
+        if msgspec is not None:
+            try:
+                self._native = msgspec.json.Decoder(type_)
+            except TypeError as exc:
+                msg = f"cannot decode JSON into {type_!r}: {exc}"
+                raise exceptions.IpsdkError(msg) from exc
+        else:
+            with _compile_lock:
+                self._convert = _converter(type_)
+
+    def decode(self, data: str | bytes) -> T:
+        """Decode a JSON document.
+
+        Args:
+            data (str | bytes): The JSON document.
+
+        Returns:
+            T: The decoded value.
+
+        Raises:
+            SerializationError: If the document is not valid JSON.
+            SchemaError: If the document does not match the type.
+        """
+        if self._native is not None:
+            try:
+                return self._native.decode(data)
+            except msgspec.ValidationError as exc:
+                raise _native_error(exc) from exc
+            except msgspec.DecodeError as exc:
+                msg = f"Failed to parse JSON: {exc!s}"
+                raise exceptions.SerializationError(msg) from exc
+
+        try:
+            value = codec.decode(data)
+        except ValueError as exc:
+            msg = f"Failed to parse JSON: {exc!s}"
+            raise exceptions.SerializationError(msg) from exc
+        return self.convert(value)
+
+    def convert(self, obj: Any) -> T:
+        """Convert already parsed JSON.
+
+        Args:
+            obj (Any): Parsed JSON, such as the value of Response.json().
+
+        Returns:
+            T: The converted value.
+
+        Raises:
+            SchemaError: If the value does not match the type.
+        """
+        if self._native is not None:
+            try:
+                return msgspec.convert(obj, self.type)
+            except msgspec.ValidationError as exc:
+                raise _native_error(exc) from exc
+
+        try:
+            return self._convert(obj)  # type: ignore[misc]
+        except _Invalid as exc:
+            location = "json" + "".join(f"[{key!r}]" for key in reversed(exc.keys))
+            msg = f"{location}: {exc.message}"
+            raise exceptions.SchemaError(msg, location) from None
+
+    def __repr__(self) -> str:
+        return f"Decoder({self.type!r})"
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def decoder(type_: type[T]) -> Decoder[T]:
+    """Return the cached decoder of a type.
+
+    Args:
+        type_ (type[T]): The type to decode into.
+
+    Returns:
+        Decoder[T]: The decoder, compiled on the first call for the type.
+
+    Raises:
+        IpsdkError: If the type, or a type it contains, is not supported.
+    """
+    return Decoder(type_)
+
+
+def decode(data: str | bytes, type_: type[T]) -> T:
+    """Decode a JSON document into a type.
+
+    Args:
+        data (str | bytes): The JSON document.
+        type_ (type[T]): The type to decode into.
+
+    Returns:
+        T: The decoded value.
+
+    Raises:
+        IpsdkError: If the type is not supported.
+        SerializationError: If the document is not valid JSON.
+        SchemaError: If the document does not match the type.
+    """
+    return decoder(type_).decode(data)  # type: ignore[arg-type]
+
+
+def convert(obj: Any, type_: type[T]) -> T:
+    """Convert already parsed JSON into a type.
+
+    Args:
+        obj (Any): Parsed JSON.
+        type_ (type[T]): The type to convert into.
+
+    Returns:
+        T: The converted value.
+
+    Raises:
+        IpsdkError: If the type is not supported.
+        SchemaError: If the value does not match the type.
+    """
+    return decoder(type_).convert(obj)  # type: ignore[arg-type]
+
+
+def _native_error(exc: Exception) -> exceptions.SchemaError:
+    """Convert a msgspec validation error to a SchemaError.
+
+    msgspec reports locations such as ``$.data[3].port``; they are rewritten
+    in the ``json['data'][3]['port']`` form used by the compiled decoders.
+
+    Args:
+        exc (Exception): The msgspec validation error.
+
+    Returns:
+        SchemaError: The error to raise.
+    """
+    message, _, path = str(exc).partition(" - at `")
+    if not path:
+        return exceptions.SchemaError(f"json: {message}", "json")
+    location = "json" + re.sub(
+        r"\.([^.\[]+)", lambda match: f"[{match.group(1)!r}]", path.rstrip("`")[1:]
+    )
+    return exceptions.SchemaError(f"{location}: {message}", location)
+
+
+# --------- Compiled converters ---------
+
+
+def _converter(tp: Any) -> Callable[[Any], Any]:
+    """Return the converter of a type, compiling it on first use.
+
+    Must be called with the compile lock held.
+
+    Args:
+        tp (Any): The type.
+
+    Returns:
+        Callable[[Any], Any]: Converts parsed JSON into the type, raising
+            _Invalid on mismatch.
+
+    Raises:
+        IpsdkError: If the type is not supported.
+    """
+    try:
+        return _converters[tp]
+    except KeyError:
+        pass
+    except TypeError as exc:
+        msg = f"cannot decode JSON into unhashable type {tp!r}"
+        raise exceptions.IpsdkError(msg) from exc
+
+    convert = _compile(tp)
+    _converters[tp] = convert
+    return convert
+
+
+def _compile(tp: Any) -> Callable[[Any], Any]:
+    """Compile the converter of a type.
+
+    Args:
+        tp (Any): The type.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+
+    Raises:
+        IpsdkError: If the type is not supported.
+    """
+    if tp is Any or tp is object:
+        return _identity
+    if tp is None or tp is _NONE_TYPE:
+        return _none
+    if tp in _SCALARS:
+        return _SCALARS[tp]
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+
+    if origin is typing.Union or origin is types.UnionType:
+        return _union(args)
+    if origin is typing.Literal:
+        return _literal(args)
+    if tp is list or origin is list:
+        return _sequence(_converter(args[0]) if args else _identity, list)
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:  # noqa: PLR2004
+        return _sequence(_converter(args[0]), tuple)
+    if (tp is dict or origin is dict) and (not args or args[0] is str):
+        return _mapping(_converter(args[1]) if args else _identity)
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return _enum(tp)
+    if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+        return _dataclass(tp)
+
+    msg = (
+        f"cannot decode JSON into {tp!r}; use a dataclass, str, int, float, "
+        "bool, None, Any, an Enum or Literal, list[T], tuple[T, ...], "
+        "dict[str, T] or a union of them"
+    )
+    raise exceptions.IpsdkError(msg)
+
+
+def _mismatch(name: str, value: Any) -> NoReturn:
+    """Raise the error of a value of the wrong type.
+
+    Args:
+        name (str): The expected type.
+        value (Any): The value.
+
+    Raises:
+        _Invalid: Always.
+    """
+    actual = "null" if value is None else type(value).__name__
+    msg = f"expected `{name}`, got `{actual}`"
+    raise _Invalid(msg)
+
+
+def _locate(
+    convert: Callable[[Any], Any], items: Iterable[tuple[Any, Any]]
+) -> NoReturn:
+    """Convert the items of a container one by one to locate a bad value.
+
+    Containers are converted with comprehensions, which do not track the
+    current key. When one fails, this runs again to find the key.
+
+    Args:
+        convert (Callable): The converter of the items.
+        items (Iterable[tuple[Any, Any]]): Keys or indexes and their values.
+
+    Raises:
+        _Invalid: The error of the first bad value, with its key.
+    """
+    for key, item in items:
+        try:
+            convert(item)
+        except _Invalid as exc:  # noqa: PERF203
+            exc.keys.append(key)
+            raise
+    msg = "value changed while it was converted"
+    raise _Invalid(msg)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _none(value: Any) -> None:
+    if value is not None:
+        _mismatch("null", value)
+
+
+def _str(value: Any) -> str:
+    if type(value) is str:
+        return value
+    _mismatch("str", value)
+
+
+def _int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    _mismatch("int", value)
+
+
+def _float(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    _mismatch("float", value)
+
+
+def _bool(value: Any) -> bool:
+    if type(value) is bool:
+        return value
+    _mismatch("bool", value)
+
+
+_SCALARS: dict[Any, Callable[[Any], Any]] = {
+    str: _str,
+    int: _int,
+    float: _float,
+    bool: _bool,
+}
+
+
+def _union(args: tuple[Any, ...]) -> Callable[[Any], Any]:
+    """Compile the converter of a union, trying its members in order.
+
+    Args:
+        args (tuple): The members of the union.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+    optional = _NONE_TYPE in args
+    members = [_converter(arg) for arg in args if arg is not _NONE_TYPE]
+    names = " | ".join(getattr(arg, "__name__", repr(arg)) for arg in args)
+
+    if optional and len(members) == 1:
+        member = members[0]
+
+        def convert_optional(value: Any) -> Any:
+            return None if value is None else member(value)
+
+        return convert_optional
+
+    def convert(value: Any) -> Any:
+        if value is None and optional:
+            return None
+        for member in members:
+            try:
+                return member(value)
+            except _Invalid:  # noqa: PERF203
+                continue
+        _mismatch(names, value)
+
+    return convert
+
+
+def _literal(args: tuple[Any, ...]) -> Callable[[Any], Any]:
+    """Compile the converter of a Literal type.
+
+    Args:
+        args (tuple): The allowed values.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+    # Values are matched with their type, since True == 1 in Python
+    allowed = {(type(arg), arg) for arg in args}
+
+    def convert(value: Any) -> Any:
+        if type(value) in (str, int, bool) and (type(value), value) in allowed:
+            return value
+        msg = f"expected one of {', '.join(map(repr, args))}, got {value!r}"
+        raise _Invalid(msg)
+
+    return convert
+
+
+def _sequence(item: Callable[[Any], Any], factory: type) -> Callable[[Any], Any]:
+    """Compile the converter of a list or variadic tuple.
+
+    Args:
+        item (Callable): The converter of the items.
+        factory (type): list or tuple.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+
+    def convert(value: Any) -> Any:
+        if type(value) is not list:
+            _mismatch("list", value)
+        if item is _identity:
+            return value if factory is list else tuple(value)
+        try:
+            result = [item(element) for element in value]
+        except _Invalid:
+            _locate(item, enumerate(value))
+        return result if factory is list else tuple(result)
+
+    return convert
+
+
+def _mapping(item: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Compile the converter of a dict with string keys.
+
+    Args:
+        item (Callable): The converter of the values.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+
+    def convert(value: Any) -> Any:
+        if type(value) is not dict:
+            _mismatch("object", value)
+        if item is _identity:
+            return value
+        try:
+            return {key: item(element) for key, element in value.items()}
+        except _Invalid:
+            _locate(item, value.items())
+
+    return convert
+
+
+def _enum(tp: type[enum.Enum]) -> Callable[[Any], Any]:
+    """Compile the converter of an Enum, looked up by value.
+
+    Args:
+        tp (type[Enum]): The enum.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+
+    def convert(value: Any) -> Any:
+        try:
+            return tp(value)
+        except (ValueError, TypeError):
+            msg = f"{value!r} is not a valid `{tp.__name__}`"
+            raise _Invalid(msg) from None
+
+    return convert
+
+
+def _dataclass(tp: type) -> Callable[[Any], Any]:
+    """Compile the converter of a dataclass.
+
+    The converter is registered before its fields are compiled, so
+    dataclasses that refer to themselves, such as a task with child tasks,
+    compile to converters that call themselves.
+
+    Args:
+        tp (type): The dataclass.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+
+    Raises:
+        IpsdkError: If the annotations cannot be resolved or a field type is
+            not supported.
+    """
+    fields: list[tuple[str, Callable[[Any], Any]]] = []
+    required: list[str] = []
+    required_keys: set[str] = set()
+
+    def convert(value: Any) -> Any:
+        if type(value) is not dict:
+            _mismatch("object", value)
+        if not value.keys() >= required_keys:
+            missing = next(name for name in required if name not in value)
+            msg = f"missing required field {missing!r}"
+            raise _Invalid(msg)
+        kwargs = {}
+        name = ""
+        try:
+            for name, field_convert in fields:
+                if name in value:
+                    kwargs[name] = field_convert(value[name])
+        except _Invalid as exc:
+            exc.keys.append(name)
+            raise
+        return tp(**kwargs)
+
+    _converters[tp] = convert
+    try:
+        hints = typing.get_type_hints(tp)
+        for field in dataclasses.fields(tp):
+            if not field.init:
+                continue
+            if (
+                field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+            ):
+                required.append(field.name)
+            fields.append((field.name, _converter(hints[field.name])))
+        required_keys.update(required)
+    except Exception as exc:
+        del _converters[tp]
+        if isinstance(exc, exceptions.IpsdkError):
+            raise
+        msg = f"cannot decode JSON into {tp!r}: {exc}"
+        raise exceptions.IpsdkError(msg) from exc
+
+    return convert
@@ -0,0 +1,217 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Single-flight request coalescing for the Itential Python SDK.
+
+This module provides helpers that collapse concurrent identical calls into a
+single execution. While a call for a given key is in flight, every other
+caller asking for the same key waits for that call and receives its result
+(or its exception) instead of starting a new one.
+
+The connection classes use these helpers to coalesce identical GET requests
+when created with ``coalesce=True``. The key used by the connections is built
+from the method, base URL, path, query parameters and authentication identity
+so that only truly identical requests are shared.
+
+Components
+----------
+SingleFlight:
+    Thread-safe implementation used by the synchronous Connection.
+
+AsyncSingleFlight:
+    asyncio implementation used by AsyncConnection. The shared call runs in
+    its own task so cancelling one waiter never cancels the request for the
+    others.
+
+Both classes keep two counters: ``requests`` is the number of calls made
+through the helper and ``saved`` is the number of calls that were served by
+another caller's in-flight execution.
+
+Examples
+--------
+Coalescing identical GET requests::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com", coalesce=True)
+
+    # Concurrent calls for the same path and params share one HTTP request
+    ...
+
+    print(platform.singleflight.requests, platform.singleflight.saved)
+"""
+
+import asyncio
+import threading
+
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls made from multiple threads.
+
+    The first caller for a key executes the function. Callers arriving while
+    it runs block until it finishes and receive the same result or exception.
+    Once the call completes the key is released, so later callers start a new
+    execution.
+
+    Attributes:
+        requests (int): Total number of calls made through do().
+        saved (int): Number of calls served by another caller's execution.
+    """
+
+    __slots__ = ("_calls", "_lock", "requests", "saved")
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.saved = 0
+
+    @logging.trace
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Execute fn once for all concurrent callers sharing key.
+
+        Args:
+            key (Hashable): Identifies calls that may share a result.
+            fn (Callable): Zero-argument callable executed by the first caller.
+
+        Returns:
+            Any: The value returned by fn.
+
+        Raises:
+            Exception: Any exception raised by fn is raised in every caller
+                that shared the call.
+        """
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = Future()
+                self._calls[key] = call
+            else:
+                self.saved += 1
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._release(key)
+            call.set_exception(exc)
+            raise
+
+        self._release(key)
+        call.set_result(result)
+        return result
+
+    def _release(self, key: Hashable) -> None:
+        """Remove the in-flight entry for key.
+
+        Args:
+            key (Hashable): The key to release.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Get the number of keys with a call currently in flight
+
+        Returns:
+            int: The number of in-flight calls
+        """
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical calls made from asyncio tasks.
+
+    The first caller for a key starts the coroutine in a new task. All callers,
+    including the first, await that task through asyncio.shield() so that a
+    cancelled caller does not cancel the request shared with the others.
+
+    Attributes:
+        requests (int): Total number of calls made through do().
+        saved (int): Number of calls served by another caller's execution.
+    """
+
+    __slots__ = ("_calls", "requests", "saved")
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.requests = 0
+        self.saved = 0
+
+    @logging.trace
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Execute fn once for all concurrent callers sharing key.
+
+        Args:
+            key (Hashable): Identifies calls that may share a result.
+            fn (Callable): Zero-argument callable returning an awaitable,
+                invoked by the first caller.
+
+        Returns:
+            Any: The value produced by the awaitable.
+
+        Raises:
+            Exception: Any exception raised by the awaitable is raised in every
+                caller that shared the call.
+        """
+        self.requests += 1
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.saved += 1
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Remove the in-flight entry for key once its task is done.
+
+        Args:
+            key (Hashable): The key to release.
+            task (asyncio.Task): The completed task.
+
+        Returns:
+            None
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Get the number of keys with a call currently in flight
+
+        Returns:
+            int: The number of in-flight calls
+        """
+        return len(self._calls)
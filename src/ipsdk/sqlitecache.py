@@ -0,0 +1,416 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Persistent SQLite backend for the HTTP response cache.
+
+This module provides SQLiteCache, a drop-in replacement for
+:class:`ipsdk.cache.ResponseCache` that keeps cached responses in a local
+SQLite database instead of process memory. Short-lived programs such as CLI
+tools and scheduled jobs start with a warm cache: fresh entries are served
+without a network call and stale entries carrying an ``ETag`` or
+``Last-Modified`` validator are revalidated with a conditional request, so an
+unchanged document costs a ``304 Not Modified`` round-trip instead of a full
+download.
+
+Entries are keyed by method, base URL (scheme, host and port), path, query
+parameters and the hashed credential identity of the connection, exactly like
+the in-memory cache. The database is bounded by the total size of the stored
+responses (least recently used entries are evicted first) and, optionally, by
+the age of each entry.
+
+The database is opened in WAL mode so several processes can share one cache
+file. The total size of the stored responses is kept in a one-row table,
+updated by triggers as rows are inserted, replaced and deleted, so storing a
+response never sums the whole table. The file holds authenticated response
+bodies and is created readable and writable by its owner only (mode 0600).
+SQLite is part of the Python standard library, so no extra dependency is
+required.
+
+Examples
+--------
+Sharing a cache between runs of a script::
+
+    from ipsdk import platform_factory
+    from ipsdk.sqlitecache import SQLiteCache
+
+    cache = SQLiteCache("~/.cache/ipsdk/responses.db", max_age=86400)
+    platform = platform_factory(host="platform.example.com", cache=cache)
+
+    platform.get("/adapters")
+
+    cache.close()
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import exceptions
+from . import logging
+from .cache import CacheEntry
+from .cache import CachePolicy
+from .cache import RequestKey
+from .cache import ResponseCache
+from .cache import paths_overlap
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .http import Response
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_path ON responses (base_url, path);
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses
+BEGIN
+    UPDATE meta SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses
+BEGIN
+    UPDATE meta SET total = total - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses
+BEGIN
+    UPDATE meta SET total = total - OLD.size;
+END;
+"""
+
+# Columns replaced when an entry is stored again for the same key
+_UPSERT = """
+INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    status_code = excluded.status_code,
+    headers = excluded.headers,
+    content = excluded.content,
+    size = excluded.size,
+    stored_at = excluded.stored_at,
+    expires_at = excluded.expires_at,
+    used_at = excluded.used_at
+"""
+
+
+class SQLiteCache(ResponseCache):
+    """HTTP response cache persisted in a SQLite database file.
+
+    SQLiteCache supports the same operations and counters as ResponseCache
+    and can be passed wherever a ResponseCache is accepted. The counters are
+    kept per instance and are not persisted.
+
+    Args:
+        path (str): Path of the database file. ``~`` is expanded and missing
+            parent directories are created. A new file is created with mode
+            0600. Use ``":memory:"`` for a temporary database.
+        max_bytes (int): Maximum total size of stored responses in bytes.
+            Defaults to 64 MiB.
+        max_age (float): Optional maximum age in seconds of a stored entry,
+            after which it is discarded even if it could be revalidated.
+            Defaults to None.
+        policy (CachePolicy): Optional time-to-live rules that override the
+            freshness lifetime from the response headers. Defaults to None.
+        max_stale (float): Number of seconds after expiry during which an
+            entry is still returned while it is revalidated in the background.
+            Defaults to 0.
+
+    Raises:
+        IpsdkError: If max_bytes or max_age is invalid or the database cannot
+            be opened.
+    """
+
+    __slots__ = ("_db", "max_age", "path")
+
+    @logging.trace
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float | None = None,
+        policy: CachePolicy | None = None,
+        max_stale: float = 0.0,
+    ) -> None:
+        super().__init__(max_bytes=max_bytes, policy=policy, max_stale=max_stale)
+
+        if max_age is not None and max_age <= 0:
+            msg = "max_age must be a positive number"
+            raise exceptions.IpsdkError(msg)
+
+        self.max_age = max_age
+        self.path = path if path == ":memory:" else str(Path(path).expanduser())
+
+        try:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                # Create the file before SQLite does so it is private; the
+                # WAL and shared memory files inherit its permissions
+                os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            self._db = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            # Seed the running total once, including rows stored before the
+            # meta table existed
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM responses "
+                "WHERE NOT EXISTS (SELECT 1 FROM meta)"
+            )
+        except (OSError, sqlite3.Error) as exc:
+            msg = f"unable to open response cache database {self.path}: {exc}"
+            raise exceptions.IpsdkError(msg) from exc
+
+        self._purge_expired()
+
+    @property
+    def size(self) -> int:
+        """
+        Get the number of bytes held by the database
+
+        Returns:
+            int: The total size of all stored entries
+        """
+        with self._lock:
+            return self._total()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @logging.trace
+    def get(self, key: RequestKey) -> CacheEntry | None:
+        """Look up the entry stored for a request key.
+
+        A successful lookup marks the entry as most recently used. Entries
+        older than max_age are removed and not returned.
+
+        Args:
+            key (RequestKey): The request key to look up.
+
+        Returns:
+            CacheEntry | None: The stored entry, or None if there is none.
+        """
+        row_key = _row_key(key)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status_code, headers, content, stored_at, expires_at "
+                "FROM responses WHERE key = ?",
+                (row_key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            status_code, headers, content, stored_at, expires_at = row
+            if self.max_age is not None and now - stored_at > self.max_age:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (row_key,))
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (now, row_key)
+            )
+
+        return CacheEntry(
+            key,
+            status_code,
+            [(name, value) for name, value in json.loads(headers)],
+            content,
+            expires_at,
+            stored_at=stored_at,
+        )
+
+    @logging.trace
+    def refresh(
+        self, entry: CacheEntry, response: httpx.Response | Response
+    ) -> CacheEntry:
+        """Update an entry from a 304 Not Modified response and persist it.
+
+        Args:
+            entry (CacheEntry): The entry that was revalidated.
+            response (httpx.Response | Response): The 304 response from the
+                server.
+
+        Returns:
+            CacheEntry: The refreshed entry.
+        """
+        entry = super().refresh(entry, response)
+        self._insert(entry)
+        return entry
+
+    @logging.trace
+    def invalidate(self, base_url: str, path: str) -> int:
+        """Remove every entry for paths overlapping a written path.
+
+        Args:
+            base_url (str): The base URL of the connection that wrote to path.
+            path (str): The request path that was modified.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            paths = [
+                (base_url, stored)
+                for (stored,) in self._db.execute(
+                    "SELECT DISTINCT path FROM responses WHERE base_url = ?",
+                    (base_url,),
+                )
+                if paths_overlap(stored, path)
+            ]
+            if not paths:
+                return 0
+            cursor = self._db.executemany(
+                "DELETE FROM responses WHERE base_url = ? AND path = ?", paths
+            )
+            return cursor.rowcount
+
+    @logging.trace
+    def clear(self) -> None:
+        """Remove every entry from the database.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    @logging.trace
+    def close(self) -> None:
+        """Close the database connection.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> SQLiteCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _insert(self, entry: CacheEntry) -> None:
+        """Insert or replace an entry and evict entries over the size limit.
+
+        Args:
+            entry (CacheEntry): The entry to insert.
+
+        Returns:
+            None
+        """
+        key = entry.key
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    _UPSERT,
+                    (
+                        _row_key(key),
+                        key.method,
+                        key.base_url,
+                        key.path,
+                        repr(key.params),
+                        key.identity,
+                        entry.status_code,
+                        json.dumps(entry.headers),
+                        entry.content,
+                        entry.size,
+                        entry.stored_at,
+                        entry.expires_at,
+                        time.time(),
+                    ),
+                )
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        """Delete least recently used rows until the size limit is met.
+
+        Caller must hold the lock and an open transaction.
+
+        Returns:
+            None
+        """
+        total = self._total()
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for row_key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY used_at"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((row_key,))
+            total -= size
+
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def _total(self) -> int:
+        """Read the running total size of the stored responses.
+
+        Caller must hold the lock.
+
+        Returns:
+            int: The total size in bytes
+        """
+        return self._db.execute("SELECT total FROM meta").fetchone()[0]
+
+    def _purge_expired(self) -> None:
+        """Delete rows older than max_age.
+
+        Returns:
+            None
+        """
+        if self.max_age is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM responses WHERE stored_at < ?",
+                (time.time() - self.max_age,),
+            )
+
+    def __repr__(self) -> str:
+        return f"SQLiteCache(path='{self.path}', max_bytes={self.max_bytes})"
+
+
+def _row_key(key: RequestKey) -> str:
+    """Serialize a request key into a database primary key.
+
+    Args:
+        key (RequestKey): The request key.
+
+    Returns:
+        str: A stable text representation of the key.
+    """
+    return repr(tuple(key))
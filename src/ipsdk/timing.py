@@ -0,0 +1,230 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Monotonic request timing with a per-phase breakdown.
+
+Every request sent by a connection is timed with ``time.perf_counter_ns``,
+which is unaffected by wall-clock adjustments. The wall clock is read once,
+to stamp when the request started.
+
+The time spent in each phase of the request is taken from the httpcore
+trace extension: a recorder is attached to the request, httpcore calls it
+at the start and end of each step of the connection and the exchange, and
+the recorder keeps a monotonic timestamp for each event. The phases are:
+
+- ``pool``: from sending the request to getting a connection to use, which
+  includes waiting for a free connection in the pool.
+- ``connect``: opening the TCP connection, including DNS resolution.
+- ``tls``: the TLS handshake.
+- ``ttfb``: time to first byte, from sending the request headers to receiving
+  the response headers.
+- ``download``: reading the response body after its headers.
+
+A phase is None when it did not happen, for example ``connect`` and ``tls``
+on a reused connection, or when the transport does not emit trace events,
+as with ``httpx.MockTransport``.
+
+Components
+----------
+Timings:
+    The duration of a request and of its phases.
+
+TraceRecorder:
+    Records httpcore trace events of a synchronous request.
+
+AsyncTraceRecorder:
+    Records httpcore trace events of an asynchronous request.
+
+Examples
+--------
+Inspecting where a request spent its time::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com")
+    res = platform.get("/health/status")
+
+    res.timing.elapsed_ns     # 48213456
+    res.timing.milliseconds()
+    # {"pool": 0.05, "connect": 1.2, "tls": 9.8, "ttfb": 35.6, "download": 0.4}
+"""
+
+import time
+
+from typing import Any
+
+# Phase names, in the order they happen
+PHASES: tuple[str, ...] = ("pool", "connect", "tls", "ttfb", "download")
+
+# httpcore events, without their "connection." or "http11." style prefix
+_CONNECT_STARTED = "connect_tcp.started"
+_CONNECT_COMPLETE = "connect_tcp.complete"
+_TLS_STARTED = "start_tls.started"
+_TLS_COMPLETE = "start_tls.complete"
+_HEADERS_SENT = "send_request_headers.started"
+_HEADERS_RECEIVED = "receive_response_headers.complete"
+_BODY_RECEIVED = "receive_response_body.complete"
+
+
+class Timings:
+    """The duration of a request and of its phases.
+
+    All durations are in nanoseconds, measured with a monotonic clock.
+
+    Args:
+        start_ns (int): Wall-clock time the request started, in nanoseconds
+            since the epoch.
+        elapsed_ns (int): Duration of the whole request. Defaults to 0.
+        pool (int | None): Time to get a connection. Defaults to None.
+        connect (int | None): Time to open the TCP connection. Defaults to
+            None.
+        tls (int | None): Time of the TLS handshake. Defaults to None.
+        ttfb (int | None): Time from sending the request headers to
+            receiving the response headers. Defaults to None.
+        download (int | None): Time to read the response body. Defaults to
+            None.
+
+    Attributes:
+        start_ns (int): Wall-clock start, in nanoseconds since the epoch.
+        elapsed_ns (int): Duration of the whole request.
+        pool (int | None): Time to get a connection.
+        connect (int | None): Time to open the TCP connection.
+        tls (int | None): Time of the TLS handshake.
+        ttfb (int | None): Time to first byte.
+        download (int | None): Time to read the response body.
+    """
+
+    __slots__ = (
+        "connect",
+        "download",
+        "elapsed_ns",
+        "pool",
+        "start_ns",
+        "tls",
+        "ttfb",
+    )
+
+    def __init__(
+        self,
+        start_ns: int,
+        elapsed_ns: int = 0,
+        *,
+        pool: int | None = None,
+        connect: int | None = None,
+        tls: int | None = None,
+        ttfb: int | None = None,
+        download: int | None = None,
+    ) -> None:
+        self.start_ns = start_ns
+        self.elapsed_ns = elapsed_ns
+        self.pool = pool
+        self.connect = connect
+        self.tls = tls
+        self.ttfb = ttfb
+        self.download = download
+
+    def milliseconds(self) -> dict[str, float | None]:
+        """Return the phase durations in milliseconds.
+
+        Returns:
+            dict[str, float | None]: Each phase name mapped to its duration,
+                or None if the phase did not happen.
+        """
+        phases: dict[str, float | None] = {}
+        for name in PHASES:
+            value = getattr(self, name)
+            phases[name] = None if value is None else value / 1_000_000
+        return phases
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{name}={value:.3f}ms"
+            for name, value in self.milliseconds().items()
+            if value is not None
+        )
+        elapsed = f"elapsed={self.elapsed_ns / 1_000_000:.3f}ms"
+        return f"Timings({elapsed}{', ' if phases else ''}{phases})"
+
+
+class TraceRecorder:
+    """Records the httpcore trace events of a synchronous request.
+
+    An instance is set as the ``trace`` extension of one request. Each event
+    is stored with the monotonic time it was received.
+
+    Attributes:
+        events (dict[str, int]): Event names, without their httpcore module
+            prefix, mapped to ``time.perf_counter_ns`` values.
+    """
+
+    __slots__ = ("events",)
+
+    def __init__(self) -> None:
+        self.events: dict[str, int] = {}
+
+    def __call__(self, name: str, _info: dict[str, Any]) -> None:
+        # Later events of the same name, such as a retried connection,
+        # replace earlier ones
+        self.events[name.partition(".")[2]] = time.perf_counter_ns()
+
+    def timings(self, start_ns: int, started: int, finished: int) -> Timings:
+        """Compute the timings of the recorded request.
+
+        Args:
+            start_ns (int): Wall-clock start, in nanoseconds since the epoch.
+            started (int): ``time.perf_counter_ns`` before sending.
+            finished (int): ``time.perf_counter_ns`` after the response body
+                was read.
+
+        Returns:
+            Timings: The duration of the request and of its phases.
+        """
+        events = self.events
+        timings = Timings(start_ns, finished - started)
+        if not events:
+            return timings
+
+        connect_started = events.get(_CONNECT_STARTED)
+        headers_sent = events.get(_HEADERS_SENT)
+        headers_received = events.get(_HEADERS_RECEIVED)
+
+        acquired = connect_started if connect_started is not None else headers_sent
+        if acquired is not None:
+            timings.pool = acquired - started
+        timings.connect = _span(connect_started, events.get(_CONNECT_COMPLETE))
+        timings.tls = _span(events.get(_TLS_STARTED), events.get(_TLS_COMPLETE))
+        timings.ttfb = _span(headers_sent, headers_received)
+        timings.download = _span(headers_received, events.get(_BODY_RECEIVED))
+        return timings
+
+
+class AsyncTraceRecorder(TraceRecorder):
+    """Records the httpcore trace events of an asynchronous request.
+
+    httpcore awaits the trace extension of asynchronous requests, so the
+    recorder is called as a coroutine.
+    """
+
+    __slots__ = ()
+
+    async def __call__(self, name: str, _info: dict[str, Any]) -> None:  # type: ignore[override]
+        self.events[name.partition(".")[2]] = time.perf_counter_ns()
+
+
+def _span(start: int | None, end: int | None) -> int | None:
+    """Return the time between two events, if both happened.
+
+    Args:
+        start (int | None): Time of the first event.
+        end (int | None): Time of the second event.
+
+    Returns:
+        int | None: The difference, or None if either event is missing.
+    """
+    if start is None or end is None:
+        return None
+    return end - start
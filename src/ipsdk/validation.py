@@ -0,0 +1,284 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Request argument validation levels.
+
+Every request checks its arguments before it is built. How much is checked
+is selected per connection with the ``validation`` option of the factories:
+
+- ``"strict"`` runs the ``"fast"`` checks and then walks the query parameters
+  and the JSON body, rejecting values that would be silently converted or
+  fail later in serialization: non-string keys, parameter values that are not
+  scalars or lists of scalars, and body values that are not JSON types
+  (including NaN and infinite floats). Errors name the offending location,
+  for example ``json['devices'][2]['port']``. A body passed as already
+  serialized ``str`` or ``bytes`` is parsed once to check that it is valid
+  JSON.
+- ``"fast"`` (the default) checks the types of the method, path, params and
+  json arguments.
+- ``"off"`` skips validation entirely. Invalid arguments then fail inside
+  httpx or the JSON encoder with their own exceptions, so it is meant for
+  trusted, benchmarked hot paths.
+
+The cost of each level is measured by ``scripts/benchmark_requests.py``.
+
+Components
+----------
+check_level:
+    Validates a validation level name.
+
+check_arguments:
+    Runs the checks of a level on the params and json arguments.
+
+validate_payload:
+    The deep checks added by the strict level.
+
+Examples
+--------
+Strict validation while developing, no validation in a trusted service::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com", validation="strict")
+    platform.post("/devices", json={"port": float("nan")})
+    # IpsdkError: json['port'] is not a finite number
+
+    fast = platform_factory(
+        host="platform.example.com", want_async=True, validation="off"
+    )
+"""
+
+import math
+
+from typing import Any
+
+from . import codec
+from . import exceptions
+
+STRICT = "strict"
+FAST = "fast"
+OFF = "off"
+
+LEVELS: tuple[str, ...] = (STRICT, FAST, OFF)
+
+# Accepted types of the json argument; str and bytes are serialized JSON
+JSON_TYPES = (dict, list, str, bytes)
+
+# Types sent as a single query parameter value
+_SCALARS = (str, int, float, bool)
+
+# Exact types of JSON body values that need no further checks
+_PLAIN = frozenset({str, int, bool})
+
+
+def check_level(level: str) -> str:
+    """Validate a validation level name.
+
+    Args:
+        level (str): One of ``"strict"``, ``"fast"`` or ``"off"``.
+
+    Returns:
+        str: The level.
+
+    Raises:
+        IpsdkError: If the level is unknown.
+    """
+    if level not in LEVELS:
+        msg = f"validation must be one of {', '.join(LEVELS)}, got {level!r}"
+        raise exceptions.IpsdkError(msg)
+    return level
+
+
+def check_arguments(
+    level: str,
+    params: dict[str, Any | None] | None = None,
+    json: str | bytes | dict | list | None = None,
+) -> None:
+    """Run the checks of a validation level on the params and json arguments.
+
+    Shared by the connections and the prepared requests, so both request
+    paths accept the same arguments.
+
+    Args:
+        level (str): The validation level.
+        params (dict | None): Query string parameters. Defaults to None.
+        json (str | bytes | dict | list | None): Request body. Defaults to
+            None.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: With ``"fast"`` and ``"strict"``, if params is not a dict
+            or json is not a dict, list, str or bytes; with ``"strict"``,
+            also if validate_payload() rejects their contents.
+    """
+    if level == OFF:
+        return
+
+    if params is not None and not isinstance(params, dict):
+        msg = "params must be of type `dict`"
+        raise exceptions.IpsdkError(msg)
+
+    if json is not None and not isinstance(json, JSON_TYPES):
+        msg = "json must be of type `dict`, `list`, `str` or `bytes`"
+        raise exceptions.IpsdkError(msg)
+
+    if level == STRICT:
+        validate_payload(params, json)
+
+
+def validate_payload(
+    params: dict[str, Any | None] | None = None,
+    json: str | bytes | dict | list | None = None,
+) -> None:
+    """Check query parameters and a JSON body in depth.
+
+    Args:
+        params (dict | None): Query string parameters. Defaults to None.
+        json (str | bytes | dict | list | None): Request body. Dict and list
+            bodies are walked; str and bytes bodies are parsed to check they
+            are valid JSON. Defaults to None.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: If a parameter or body value cannot be sent unchanged.
+    """
+    if params is not None:
+        _check_params(params)
+    if isinstance(json, (dict, list)):
+        _check_json(json)
+    elif isinstance(json, (str, bytes)):
+        _check_serialized(json)
+
+
+def _check_serialized(body: str | bytes) -> None:
+    """Check that an already serialized body is valid JSON.
+
+    Args:
+        body (str | bytes): The request body.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: If the body is not valid UTF-8 encoded JSON.
+    """
+    try:
+        codec.decode(body)
+    except ValueError as exc:
+        msg = f"json is not valid serialized JSON: {exc}"
+        raise exceptions.IpsdkError(msg) from exc
+
+
+def _check_params(params: dict[str, Any | None]) -> None:
+    """Check query parameter names and values.
+
+    Args:
+        params (dict): Query string parameters.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: If a name is not a string or a value is not a scalar,
+            None or a list or tuple of scalars.
+    """
+    for name, value in params.items():
+        if not isinstance(name, str):
+            msg = f"params key {name!r} must be of type `str`"
+            raise exceptions.IpsdkError(msg)
+
+        values = value if isinstance(value, (list, tuple)) else (value,)
+        for item in values:
+            if item is not None and not isinstance(item, _SCALARS):
+                msg = (
+                    f"params[{name!r}] has unsupported type "
+                    f"`{type(item).__name__}`; use str, int, float, bool, None "
+                    "or a list of them"
+                )
+                raise exceptions.IpsdkError(msg)
+
+
+def _check_json(body: dict | list) -> None:
+    """Check that every value of a JSON body is a JSON type.
+
+    Args:
+        body (dict | list): The request body.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: If a value is not a JSON type, a key is not a string, a
+            float is not finite or a container contains itself.
+    """
+    _check_container(body, [], set())
+
+
+def _check_container(value: Any, keys: list[Any], active: set[int]) -> None:
+    """Check a dict, list or tuple of a JSON body and its contents.
+
+    The location of a bad value is only formatted when an error is raised,
+    so valid bodies are checked without building any strings.
+
+    Args:
+        value (Any): The container to check.
+        keys (list): Keys and indexes leading from the body to value.
+        active (set[int]): Ids of the containers enclosing value, used to
+            detect circular references.
+
+    Returns:
+        None
+
+    Raises:
+        IpsdkError: If the container or one of its values is invalid.
+    """
+    if id(value) in active:
+        msg = f"{_location(keys)} is a circular reference"
+        raise exceptions.IpsdkError(msg)
+    active.add(id(value))
+
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, str):
+                msg = f"{_location(keys)} key {key!r} must be of type `str`"
+                raise exceptions.IpsdkError(msg)
+        items: Any = value.items()
+    else:
+        items = enumerate(value)
+
+    for key, item in items:
+        if item is None or type(item) in _PLAIN:
+            continue
+        keys.append(key)
+        if isinstance(item, (dict, list, tuple)):
+            _check_container(item, keys, active)
+        elif isinstance(item, float):
+            if not math.isfinite(item):
+                msg = f"{_location(keys)} is not a finite number"
+                raise exceptions.IpsdkError(msg)
+        elif not isinstance(item, (str, int)):
+            msg = f"{_location(keys)} has unsupported type `{type(item).__name__}`"
+            raise exceptions.IpsdkError(msg)
+        keys.pop()
+
+    active.discard(id(value))
+
+
+def _location(keys: list[Any]) -> str:
+    """Format the location of a value in a JSON body.
+
+    Args:
+        keys (list): Keys and indexes leading from the body to the value.
+
+    Returns:
+        str: The location, for example ``json['devices'][2]``.
+    """
+    return "json" + "".join(f"[{key!r}]" for key in keys)
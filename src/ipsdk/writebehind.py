@@ -0,0 +1,871 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from __future__ import annotations
+
+"""Write-behind queues for fire-and-forget requests.
+
+This module provides queues that accept write requests (status updates, audit
+records and other non-critical writes) into a bounded in-memory buffer and
+send them in the background, so the caller does not wait for the network.
+
+Writes are sent by a configurable number of workers, threads for Connection
+and tasks for AsyncConnection. A write that fails with a network error, a
+``429 Too Many Requests`` or a ``5xx`` status is retried with exponential
+backoff; other failures, and writes that exhaust their retries, are counted,
+logged and passed to an optional ``on_error`` callback. POST and PATCH are
+not idempotent, so they are only retried when the server cannot have applied
+them: after a network error raised before the request was sent (while
+connecting or waiting for a pooled connection), or a ``429`` or ``503``
+response. A timeout reading the response, or a ``500``, ``502`` or ``504``
+from a server that accepted a POST, would otherwise create the record twice.
+
+When the buffer is full the overflow policy decides what happens to a new
+write:
+
+- ``"block"``: wait for room, applying backpressure to the caller (default)
+- ``"drop"``: discard the new write
+- ``"drop_oldest"``: discard the oldest buffered write to make room
+- ``"raise"``: raise ``exceptions.QueueFullError``
+
+``flush()`` waits until every buffered write has been sent, and ``close()``
+flushes the queue and stops the workers. The queues are context managers that
+close on exit, so pending writes are not lost on a normal shutdown.
+
+Components
+----------
+PendingWrite:
+    A buffered write request.
+
+WriteBehind:
+    Write-behind queue for a synchronous Connection.
+
+AsyncWriteBehind:
+    Write-behind queue for an AsyncConnection.
+
+Examples
+--------
+Sending audit records off the hot path::
+
+    from ipsdk import platform_factory
+
+    platform = platform_factory(host="platform.example.com")
+
+    with platform.write_behind(max_pending=10000, concurrency=4) as writes:
+        for record in records:
+            writes.post("/audit/records", json=record)
+
+    print(writes.sent, writes.failed, writes.dropped)
+"""
+
+import asyncio
+import threading
+import time
+
+from collections import deque
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from typing import Any
+
+import httpx
+
+from . import exceptions
+from . import lanes
+from . import logging
+from .http import HTTPMethod
+from .jobs import Backoff
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .connection import AsyncConnection
+    from .connection import Connection
+
+# Supported overflow policies for a full buffer
+_OVERFLOW: tuple[str, ...] = ("block", "drop", "drop_oldest", "raise")
+
+# Methods that can be sent again without changing the result
+_IDEMPOTENT = frozenset((HTTPMethod.PUT, HTTPMethod.DELETE))
+
+# Statuses of requests the server refused without processing them
+_UNPROCESSED = frozenset((HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE))
+
+# Network errors raised before any part of the request reached the server
+_UNSENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PendingWrite:
+    """A buffered write request.
+
+    Args:
+        method (HTTPMethod): The HTTP method.
+        path (str): The request path.
+        params (dict | None): Query string parameters.
+        json (Any): The request body.
+        lane (str | None): The priority lane the write is sent in.
+            Defaults to None.
+
+    Attributes:
+        attempts (int): Number of times the write has been sent.
+    """
+
+    __slots__ = ("attempts", "json", "lane", "method", "params", "path")
+
+    def __init__(
+        self,
+        method: HTTPMethod,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: Any = None,
+        lane: str | None = None,
+    ) -> None:
+        self.method = method
+        self.path = path
+        self.params = params
+        self.json = json
+        self.lane = lane
+        self.attempts = 0
+
+    def __repr__(self) -> str:
+        return f"PendingWrite({self.method.value} {self.path})"
+
+
+def _is_retryable(write: PendingWrite, exc: Exception) -> bool:
+    """Check whether a failed write should be retried.
+
+    Args:
+        write (PendingWrite): The failed write.
+        exc (Exception): The exception raised by the write.
+
+    Returns:
+        bool: True for 429 and 503 responses, for other 5xx responses and
+            network errors on PUT and DELETE, and for network errors raised
+            before POST and PATCH requests were sent.
+    """
+    if isinstance(exc, exceptions.RequestError):
+        return write.method in _IDEMPOTENT or isinstance(exc.__cause__, _UNSENT)
+    if isinstance(exc, exceptions.HTTPStatusError) and exc.response is not None:
+        status = exc.response.status_code
+        if status in _UNPROCESSED:
+            return True
+        return (
+            write.method in _IDEMPOTENT and status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    return False
+
+
+def _send(connection: Any, write: PendingWrite) -> Any:
+    """Send a write through the matching public method of a connection.
+
+    Args:
+        connection (Connection | AsyncConnection): The connection.
+        write (PendingWrite): The write to send.
+
+    Returns:
+        Any: The Response, or a coroutine resolving to it for AsyncConnection.
+    """
+    send = getattr(connection, write.method.value.lower())
+    if write.method == HTTPMethod.DELETE:
+        return send(write.path, params=write.params)
+    return send(write.path, params=write.params, json=write.json)
+
+
+class WriteBehindBase:
+    """Shared configuration and accounting for the write-behind queues.
+
+    Args:
+        max_pending (int): Maximum number of buffered writes. Defaults to 1000.
+        concurrency (int): Number of writes sent at the same time.
+            Defaults to 4.
+        retries (int): Number of times a retryable failure is retried.
+            Defaults to 3.
+        backoff (Backoff): Delays between retries. Defaults to
+            Backoff(initial=0.5, maximum=30).
+        overflow (str): Policy applied when the buffer is full, one of
+            ``"block"``, ``"drop"``, ``"drop_oldest"`` or ``"raise"``.
+            Defaults to ``"block"``.
+        on_error (Callable | None): Called with the PendingWrite and the
+            exception when a write is given up. Defaults to None.
+
+    Attributes:
+        submitted (int): Writes accepted into the buffer.
+        sent (int): Writes sent successfully.
+        failed (int): Writes given up after an error.
+        retried (int): Retries made.
+        dropped (int): Writes discarded by the overflow policy.
+
+    Raises:
+        IpsdkError: If an argument is out of range.
+    """
+
+    __slots__ = (
+        "_closed",
+        "_inflight",
+        "_pending",
+        "backoff",
+        "concurrency",
+        "dropped",
+        "failed",
+        "max_pending",
+        "on_error",
+        "overflow",
+        "retried",
+        "retries",
+        "sent",
+        "submitted",
+    )
+
+    def __init__(
+        self,
+        max_pending: int = 1000,
+        concurrency: int = 4,
+        retries: int = 3,
+        backoff: Backoff | None = None,
+        overflow: str = "block",
+        on_error: Callable[[PendingWrite, Exception], Any] | None = None,
+    ) -> None:
+        if max_pending <= 0 or concurrency <= 0:
+            msg = "max_pending and concurrency must be positive integers"
+            raise exceptions.IpsdkError(msg)
+
+        if retries < 0:
+            msg = "retries must not be negative"
+            raise exceptions.IpsdkError(msg)
+
+        if overflow not in _OVERFLOW:
+            msg = f"unknown overflow policy {overflow!r}, expected one of {_OVERFLOW}"
+            raise exceptions.IpsdkError(msg)
+
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff or Backoff(initial=0.5, maximum=30.0)
+        self.overflow = overflow
+        self.on_error = on_error
+
+        self._pending: deque[PendingWrite] = deque()
+        self._inflight = 0
+        self._closed = False
+
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Get the number of writes not yet sent
+
+        Returns:
+            int: Buffered writes plus writes being sent
+        """
+        return len(self._pending) + self._inflight
+
+    def _make_write(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any | None] | None,
+        json: Any,
+    ) -> PendingWrite:
+        """Validate a write request and wrap it for the buffer.
+
+        The write keeps the priority lane of the caller, and the worker that
+        sends it enters that lane.
+
+        Args:
+            method (str): The HTTP method name.
+            path (str): The request path.
+            params (dict | None): Query string parameters.
+            json (Any): The request body.
+
+        Returns:
+            PendingWrite: The buffered write.
+
+        Raises:
+            IpsdkError: If the queue is closed or the method is not a write.
+        """
+        if self._closed:
+            msg = "write-behind queue is closed"
+            raise exceptions.IpsdkError(msg)
+
+        verb = method.upper()
+        if verb not in ("POST", "PUT", "PATCH", "DELETE"):
+            msg = f"unsupported write method {method!r}"
+            raise exceptions.IpsdkError(msg)
+        return PendingWrite(HTTPMethod(verb), path, params, json, lanes.current_lane())
+
+    def _overflow(self, write: PendingWrite) -> bool:
+        """Apply the non-blocking overflow policies to a full buffer.
+
+        Args:
+            write (PendingWrite): The write being submitted.
+
+        Returns:
+            bool: True if the write should be buffered, False if dropped.
+
+        Raises:
+            QueueFullError: If the overflow policy is ``"raise"``.
+        """
+        if self.overflow == "drop":
+            self.dropped += 1
+            logging.debug(f"Write-behind buffer full, dropping {write!r}")
+            return False
+
+        if self.overflow == "drop_oldest":
+            oldest = self._pending.popleft()
+            self.dropped += 1
+            logging.debug(f"Write-behind buffer full, dropping {oldest!r}")
+            return True
+
+        msg = f"write-behind buffer is full ({self.max_pending} pending writes)"
+        raise exceptions.QueueFullError(msg)
+
+    def _give_up(self, write: PendingWrite, exc: Exception) -> None:
+        """Record a write that will not be retried.
+
+        Args:
+            write (PendingWrite): The failed write.
+            exc (Exception): The last exception raised by the write.
+
+        Returns:
+            None
+        """
+        logging.warning(
+            f"Write-behind {write.method.value} {write.path} failed after "
+            f"{write.attempts} attempts: {exc}"
+        )
+        if self.on_error is not None:
+            try:
+                self.on_error(write, exc)
+            except Exception as callback_exc:
+                logging.exception(callback_exc)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(pending={self.pending}, sent={self.sent}, "
+            f"failed={self.failed}, dropped={self.dropped})"
+        )
+
+
+class WriteBehind(WriteBehindBase):
+    """Write-behind queue for a synchronous Connection.
+
+    The worker threads are started when the queue is created and stop when
+    it is closed.
+
+    Args:
+        connection (Connection): The connection that sends the writes.
+        **kwargs: Queue options, see WriteBehindBase.
+    """
+
+    __slots__ = ("_cond", "_threads", "connection")
+
+    def __init__(self, connection: Connection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, name="ipsdk-writebehind", daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @logging.trace
+    def submit(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: Any = None,
+        timeout: float | None = None,
+    ) -> bool:
+        """Buffer a write request to be sent in the background.
+
+        Args:
+            method (str): The HTTP method, one of POST, PUT, PATCH or DELETE.
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+            timeout (float | None): Maximum number of seconds to wait for room
+                with the ``"block"`` policy. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+
+        Raises:
+            IpsdkError: If the queue is closed or the method is not a write.
+            QueueFullError: If the buffer is full with the ``"raise"`` policy
+                or no room was made within timeout.
+        """
+        write = self._make_write(method, path, params, json)
+
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                if self.overflow != "block":
+                    if not self._overflow(write):
+                        return False
+                elif not self._cond.wait_for(
+                    lambda: len(self._pending) < self.max_pending or self._closed,
+                    timeout,
+                ):
+                    msg = f"no room in write-behind buffer after {timeout}s"
+                    raise exceptions.QueueFullError(msg)
+
+            if self._closed:
+                msg = "write-behind queue is closed"
+                raise exceptions.IpsdkError(msg)
+
+            self._pending.append(write)
+            self.submitted += 1
+            self._cond.notify_all()
+        return True
+
+    def post(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a POST request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return self.submit("POST", path, params=params, json=json)
+
+    def put(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a PUT request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return self.submit("PUT", path, params=params, json=json)
+
+    def patch(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a PATCH request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return self.submit("PATCH", path, params=params, json=json)
+
+    def delete(self, path: str, params: dict[str, Any | None] | None = None) -> bool:
+        """Buffer a DELETE request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return self.submit("DELETE", path, params=params)
+
+    @logging.trace
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every buffered write has been sent or given up.
+
+        Args:
+            timeout (float | None): Maximum number of seconds to wait.
+                Defaults to None (no limit).
+
+        Returns:
+            bool: True if the queue drained, False if timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._inflight == 0, timeout
+            )
+
+    @logging.trace
+    def close(self, timeout: float | None = None) -> bool:
+        """Flush the queue, then stop the worker threads.
+
+        New writes are refused once close() is called. If timeout expires
+        first, the workers keep sending the remaining writes in the
+        background as daemon threads.
+
+        Args:
+            timeout (float | None): Maximum number of seconds to wait for the
+                flush. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the queue drained, False if timeout expired first.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        drained = self.flush(timeout)
+        if drained:
+            for thread in self._threads:
+                thread.join()
+        return drained
+
+    def __enter__(self) -> WriteBehind:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        """Send buffered writes until the queue is closed and empty.
+
+        Returns:
+            None
+        """
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                write = self._pending.popleft()
+                self._inflight += 1
+                self._cond.notify_all()
+
+            try:
+                self._deliver(write)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+    def _deliver(self, write: PendingWrite) -> None:
+        """Send a write, retrying retryable failures with backoff.
+
+        Args:
+            write (PendingWrite): The write to send.
+
+        Returns:
+            None
+        """
+        intervals = self.backoff.intervals()
+        while True:
+            exc = self._attempt(write)
+            if exc is None:
+                with self._cond:
+                    self.sent += 1
+                return
+
+            if write.attempts > self.retries or not _is_retryable(write, exc):
+                with self._cond:
+                    self.failed += 1
+                self._give_up(write, exc)
+                return
+
+            with self._cond:
+                self.retried += 1
+            time.sleep(next(intervals))
+
+    def _attempt(self, write: PendingWrite) -> Exception | None:
+        """Send a write once.
+
+        Args:
+            write (PendingWrite): The write to send.
+
+        Returns:
+            Exception | None: The exception raised, or None on success.
+        """
+        write.attempts += 1
+        try:
+            with lanes.priority(write.lane):
+                _send(self.connection, write)
+        except Exception as exc:
+            return exc
+        return None
+
+
+class AsyncWriteBehind(WriteBehindBase):
+    """Write-behind queue for an AsyncConnection.
+
+    The worker tasks are started on the running event loop by the first
+    submit() and stop when the queue is closed.
+
+    Args:
+        connection (AsyncConnection): The connection that sends the writes.
+        **kwargs: Queue options, see WriteBehindBase.
+    """
+
+    __slots__ = ("_cond", "_tasks", "connection")
+
+    def __init__(self, connection: AsyncConnection, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connection = connection
+        self._cond: asyncio.Condition | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def _condition(self) -> asyncio.Condition:
+        """Get the condition guarding the buffer, starting the workers.
+
+        Returns:
+            asyncio.Condition: The condition.
+        """
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+            self._tasks = [
+                asyncio.ensure_future(self._work()) for _ in range(self.concurrency)
+            ]
+        return self._cond
+
+    @logging.trace
+    async def submit(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any | None] | None = None,
+        json: Any = None,
+        timeout: float | None = None,
+    ) -> bool:
+        """Buffer a write request to be sent in the background.
+
+        Args:
+            method (str): The HTTP method, one of POST, PUT, PATCH or DELETE.
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+            timeout (float | None): Maximum number of seconds to wait for room
+                with the ``"block"`` policy. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+
+        Raises:
+            IpsdkError: If the queue is closed or the method is not a write.
+            QueueFullError: If the buffer is full with the ``"raise"`` policy
+                or no room was made within timeout.
+        """
+        write = self._make_write(method, path, params, json)
+        cond = self._condition()
+
+        async with cond:
+            if len(self._pending) >= self.max_pending:
+                if self.overflow != "block":
+                    if not self._overflow(write):
+                        return False
+                else:
+                    try:
+                        await asyncio.wait_for(
+                            cond.wait_for(
+                                lambda: (
+                                    len(self._pending) < self.max_pending
+                                    or self._closed
+                                )
+                            ),
+                            timeout,
+                        )
+                    except asyncio.TimeoutError as exc:
+                        msg = f"no room in write-behind buffer after {timeout}s"
+                        raise exceptions.QueueFullError(msg) from exc
+
+            if self._closed:
+                msg = "write-behind queue is closed"
+                raise exceptions.IpsdkError(msg)
+
+            self._pending.append(write)
+            self.submitted += 1
+            cond.notify_all()
+        return True
+
+    async def post(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a POST request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return await self.submit("POST", path, params=params, json=json)
+
+    async def put(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a PUT request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return await self.submit("PUT", path, params=params, json=json)
+
+    async def patch(
+        self, path: str, params: dict[str, Any | None] | None = None, json: Any = None
+    ) -> bool:
+        """Buffer a PATCH request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+            json (Any): The request body. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return await self.submit("PATCH", path, params=params, json=json)
+
+    async def delete(
+        self, path: str, params: dict[str, Any | None] | None = None
+    ) -> bool:
+        """Buffer a DELETE request to be sent in the background.
+
+        Args:
+            path (str): The request path.
+            params (dict | None): Query string parameters. Defaults to None.
+
+        Returns:
+            bool: True if the write was buffered, False if it was dropped.
+        """
+        return await self.submit("DELETE", path, params=params)
+
+    @logging.trace
+    async def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every buffered write has been sent or given up.
+
+        Args:
+            timeout (float | None): Maximum number of seconds to wait.
+                Defaults to None (no limit).
+
+        Returns:
+            bool: True if the queue drained, False if timeout expired first.
+        """
+        if self._cond is None:
+            return True
+
+        cond = self._cond
+        async with cond:
+            try:
+                await asyncio.wait_for(
+                    cond.wait_for(lambda: not self._pending and self._inflight == 0),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    @logging.trace
+    async def aclose(self, timeout: float | None = None) -> bool:
+        """Flush the queue, then stop the worker tasks.
+
+        New writes are refused once aclose() is called. If timeout expires
+        first, the remaining writes are abandoned and the workers cancelled.
+
+        Args:
+            timeout (float | None): Maximum number of seconds to wait for the
+                flush. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the queue drained, False if timeout expired first.
+        """
+        self._closed = True
+        if self._cond is None:
+            return True
+
+        async with self._cond:
+            self._cond.notify_all()
+
+        drained = await self.flush(timeout)
+        if not drained:
+            for task in self._tasks:
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        return drained
+
+    async def __aenter__(self) -> AsyncWriteBehind:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def _work(self) -> None:
+        """Send buffered writes until the queue is closed and empty.
+
+        Returns:
+            None
+        """
+        cond = self._condition()
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: bool(self._pending) or self._closed)
+                if not self._pending:
+                    return
+                write = self._pending.popleft()
+                self._inflight += 1
+                cond.notify_all()
+
+            try:
+                await self._deliver(write)
+            finally:
+                async with cond:
+                    self._inflight -= 1
+                    cond.notify_all()
+
+    async def _deliver(self, write: PendingWrite) -> None:
+        """Send a write, retrying retryable failures with backoff.
+
+        Args:
+            write (PendingWrite): The write to send.
+
+        Returns:
+            None
+        """
+        intervals = self.backoff.intervals()
+        while True:
+            exc = await self._attempt(write)
+            if exc is None:
+                self.sent += 1
+                return
+
+            if write.attempts > self.retries or not _is_retryable(write, exc):
+                self.failed += 1
+                self._give_up(write, exc)
+                return
+
+            self.retried += 1
+            await asyncio.sleep(next(intervals))
+
+    async def _attempt(self, write: PendingWrite) -> Exception | None:
+        """Send a write once.
+
+        Args:
+            write (PendingWrite): The write to send.
+
+        Returns:
+            Exception | None: The exception raised, or None on success.
+        """
+        write.attempts += 1
+        try:
+            with lanes.priority(write.lane):
+                await _send(self.connection, write)
+        except Exception as exc:
+            return exc
+        return None
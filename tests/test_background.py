@@ -0,0 +1,203 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import threading
+
+from concurrent.futures import Future
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.background import BackgroundConnection
+from ipsdk.connection import AsyncConnection
+from ipsdk.gateway import AsyncGateway
+from ipsdk.gateway import gateway_factory
+from ipsdk.http import Response
+from ipsdk.platform import AsyncPlatform
+from ipsdk.platform import platform_factory
+
+
+class _AsyncTestConnection(AsyncConnection):
+    """AsyncConnection with a no-op authenticate for testing."""
+
+    async def authenticate(self):
+        self.auth_calls = getattr(self, "auth_calls", 0) + 1
+
+
+def _make_background(handler):
+    conn = _AsyncTestConnection("example.com")
+    conn.client = httpx.AsyncClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return BackgroundConnection(conn)
+
+
+def _echo_handler(request):
+    return httpx.Response(
+        200,
+        json={
+            "method": request.method,
+            "path": request.url.path,
+            "thread": threading.current_thread().name,
+        },
+    )
+
+
+# --------- Factory Tests ---------
+
+
+def test_platform_factory_want_background():
+    """Test platform_factory returns a BackgroundConnection."""
+    bg = platform_factory(want_background=True)
+    try:
+        assert isinstance(bg, BackgroundConnection)
+        assert isinstance(bg.connection, AsyncPlatform)
+    finally:
+        bg.close()
+
+
+def test_gateway_factory_want_background():
+    """Test gateway_factory returns a BackgroundConnection."""
+    bg = gateway_factory(want_background=True)
+    try:
+        assert isinstance(bg, BackgroundConnection)
+        assert isinstance(bg.connection, AsyncGateway)
+        assert str(bg.connection.client.base_url).endswith("/api/v2.0/")
+    finally:
+        bg.close()
+
+
+def test_factories_reject_async_and_background():
+    """Test want_async and want_background are mutually exclusive."""
+    with pytest.raises(exceptions.IpsdkError):
+        platform_factory(want_async=True, want_background=True)
+
+    with pytest.raises(exceptions.IpsdkError):
+        gateway_factory(want_async=True, want_background=True)
+
+
+# --------- Blocking API Tests ---------
+
+
+@pytest.mark.parametrize("method", ["get", "delete", "post", "put", "patch"])
+def test_blocking_methods(method):
+    """Test each blocking method runs on the background loop thread."""
+    with _make_background(_echo_handler) as bg:
+        res = getattr(bg, method)("/api/test")
+
+        assert isinstance(res, Response)
+        data = res.json()
+        assert data["method"] == method.upper()
+        assert data["path"] == "/api/test"
+        assert data["thread"] == "ipsdk-background"
+
+
+def test_blocking_post_sends_json():
+    """Test POST body is passed through to the async connection."""
+
+    def handler(request):
+        return httpx.Response(200, content=request.content)
+
+    with _make_background(handler) as bg:
+        res = bg.post("/api/test", json={"name": "value"})
+        assert res.json() == {"name": "value"}
+
+
+def test_blocking_errors_propagate():
+    """Test SDK exceptions raised on the loop are re-raised in the caller."""
+
+    def handler(request):
+        return httpx.Response(404, json={"error": "not found"})
+
+    with _make_background(handler) as bg, pytest.raises(exceptions.HTTPStatusError):
+        bg.get("/missing")
+
+
+# --------- Submit API Tests ---------
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["submit_get", "submit_delete", "submit_post", "submit_put", "submit_patch"],
+)
+def test_submit_methods_return_futures(method):
+    """Test submit_* methods return futures resolved with a Response."""
+    with _make_background(_echo_handler) as bg:
+        future = getattr(bg, method)("/api/test")
+
+        assert isinstance(future, Future)
+        res = future.result(timeout=5)
+        assert res.json()["method"] == method.removeprefix("submit_").upper()
+
+
+def test_submit_many_share_connection_and_auth():
+    """Test many in-flight requests share one connection and auth state."""
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    with _make_background(handler) as bg:
+        futures = [bg.submit_get(f"/items/{i}") for i in range(200)]
+        paths = [f.result(timeout=10).json()["path"] for f in futures]
+
+        assert paths == [f"/items/{i}" for i in range(200)]
+        assert bg.connection.auth_calls == 1
+
+
+def test_submit_generic_coroutine():
+    """Test submit() runs arbitrary coroutines on the loop."""
+    with _make_background(_echo_handler) as bg:
+
+        async def work():
+            return threading.current_thread().name
+
+        assert bg.submit(work()).result(timeout=5) == "ipsdk-background"
+        assert bg.run(work()) == "ipsdk-background"
+
+
+def test_run_from_loop_thread_raises():
+    """Test blocking calls from the loop thread are rejected."""
+    with _make_background(_echo_handler) as bg:
+
+        async def nested():
+            return bg.get("/api/test")
+
+        with pytest.raises(exceptions.IpsdkError):
+            bg.run(nested())
+
+
+# --------- Lifecycle Tests ---------
+
+
+def test_close_is_idempotent():
+    """Test close() stops the loop and may be called repeatedly."""
+    bg = _make_background(_echo_handler)
+    assert bg.closed is False
+
+    bg.close()
+    bg.close()
+
+    assert bg.closed is True
+    assert bg.connection.client.is_closed
+
+
+def test_submit_after_close_raises():
+    """Test submitting work after close() raises IpsdkError."""
+    bg = _make_background(_echo_handler)
+    bg.close()
+
+    with pytest.raises(exceptions.IpsdkError):
+        bg.submit_get("/api/test")
+
+
+def test_repr():
+    """Test BackgroundConnection string representation."""
+    with _make_background(_echo_handler) as bg:
+        assert repr(bg) == (
+            "BackgroundConnection(connection=_AsyncTestConnection, closed=False)"
+        )
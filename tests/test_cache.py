@@ -0,0 +1,347 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.cache import CacheEntry
+from ipsdk.cache import CachePolicy
+from ipsdk.cache import NegativeCache
+from ipsdk.cache import RequestKey
+from ipsdk.cache import ResponseCache
+from ipsdk.cache import freshness_lifetime
+from ipsdk.cache import parse_cache_control
+from ipsdk.cache import paths_overlap
+from ipsdk.gateway import gateway_factory
+from ipsdk.platform import platform_factory
+
+
+def _key(path="/items", params=()):
+    return RequestKey("GET", "https://example.com", path, params, "")
+
+
+def _response(status=200, headers=None, content=b"{}"):
+    return httpx.Response(status, headers=headers or {}, content=content)
+
+
+# --------- Header Parsing Tests ---------
+
+
+def test_parse_cache_control():
+    """Test Cache-Control directives are parsed and normalized."""
+    assert parse_cache_control(None) == {}
+    assert parse_cache_control('Max-Age=60, no-cache, private="x"') == {
+        "max-age": "60",
+        "no-cache": None,
+        "private": "x",
+    }
+    assert parse_cache_control(" , public") == {"public": None}
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, 0.0),
+        ({"cache-control": "max-age=60"}, 60.0),
+        ({"cache-control": "max-age=60, no-cache"}, 0.0),
+        ({"cache-control": "max-age=bogus"}, 0.0),
+        ({"cache-control": "max-age=-5"}, 0.0),
+        (
+            {
+                "date": "Mon, 01 Jan 2024 00:00:00 GMT",
+                "expires": "Mon, 01 Jan 2024 00:02:00 GMT",
+            },
+            120.0,
+        ),
+        ({"expires": "not a date"}, 0.0),
+        ({"expires": "Mon, 01 Jan 2001 00:00:00 GMT"}, 0.0),
+    ],
+)
+def test_freshness_lifetime(headers, expected):
+    """Test freshness lifetime from max-age, Expires/Date and no-cache."""
+    assert freshness_lifetime(httpx.Headers(headers)) == expected
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "expected"),
+    [
+        ("/devices", "/devices", True),
+        ("/devices/", "/devices", True),
+        ("/devices", "/devices/router1", True),
+        ("/devices/router1/config", "/devices", True),
+        ("/devices", "/devices2", False),
+        ("/devices/router1", "/devices/router2", False),
+        ("/adapters", "/devices", False),
+    ],
+)
+def test_paths_overlap(first, second, expected):
+    """Test paths overlap when equal or when one contains the other."""
+    assert paths_overlap(first, second) is expected
+
+
+# --------- CachePolicy Tests ---------
+
+
+def test_cache_policy_first_match_wins():
+    """Test rules are matched in order with shell-style wildcards."""
+    policy = CachePolicy({"/adapters": 300, "/applications/*": 60, "/*": 5})
+    assert policy.ttl_for("/adapters") == 300
+    assert policy.ttl_for("/applications/WorkFlowEngine") == 60
+    assert policy.ttl_for("/health/status") == 5
+    assert CachePolicy({"/adapters": 1}).ttl_for("/adapters/x") is None
+    assert repr(CachePolicy({"/a": 1.5})) == "CachePolicy({'/a': 1.5})"
+
+
+def test_cache_policy_negative_ttl():
+    """Test negative time-to-live values are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        CachePolicy({"/adapters": -1})
+
+
+# --------- CacheEntry Tests ---------
+
+
+def test_cache_entry_validators():
+    """Test entries expose conditional request headers."""
+    entry = CacheEntry(
+        _key(),
+        200,
+        [("ETag", '"v1"'), ("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")],
+        b"body",
+        time.time() + 60,
+    )
+    assert entry.validators() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert entry.is_fresh()
+    assert not entry.is_fresh(entry.expires_at)
+    assert entry.size > len(b"body")
+
+
+def test_cache_entry_to_httpx():
+    """Test entries rebuild an httpx.Response bound to a request."""
+    entry = CacheEntry(_key(), 200, [("X-Test", "1")], b"body", 0)
+    request = httpx.Request("GET", "https://example.com/items")
+    res = entry.to_httpx(request)
+    assert res.status_code == 200
+    assert res.headers["x-test"] == "1"
+    assert res.content == b"body"
+    assert res.request is request
+
+
+# --------- ResponseCache Tests ---------
+
+
+def test_response_cache_invalid_max_bytes():
+    """Test max_bytes must be positive."""
+    with pytest.raises(exceptions.IpsdkError):
+        ResponseCache(max_bytes=0)
+
+
+def test_response_cache_store_and_get():
+    """Test a cacheable response is stored and returned."""
+    cache = ResponseCache()
+    entry = cache.store(_key(), _response(headers={"cache-control": "max-age=60"}))
+
+    assert entry is not None
+    assert cache.get(_key()) is entry
+    assert entry.is_fresh()
+    assert len(cache) == 1
+    assert cache.size == entry.size
+
+
+@pytest.mark.parametrize(
+    ("status", "headers"),
+    [
+        (201, {"cache-control": "max-age=60"}),
+        (200, {"cache-control": "no-store, max-age=60"}),
+        (200, {"cache-control": "max-age=60", "vary": "*"}),
+        (200, {}),
+    ],
+)
+def test_response_cache_store_rejected(status, headers):
+    """Test uncacheable responses are not stored."""
+    cache = ResponseCache()
+    assert cache.store(_key(), _response(status, headers)) is None
+    assert len(cache) == 0
+
+
+def test_response_cache_store_validator_only():
+    """Test responses with only a validator are stored as stale entries."""
+    cache = ResponseCache()
+    entry = cache.store(_key(), _response(headers={"etag": '"v1"'}))
+    assert entry is not None
+    assert not entry.is_fresh()
+
+
+def test_response_cache_lru_eviction():
+    """Test least recently used entries are evicted over the size limit."""
+    headers = {"cache-control": "max-age=60"}
+    cache = ResponseCache(max_bytes=1000)
+    cache.store(_key("/a"), _response(headers=headers, content=b"x" * 200))
+    cache.store(_key("/b"), _response(headers=headers, content=b"x" * 200))
+    cache.get(_key("/a"))
+    cache.store(_key("/c"), _response(headers=headers, content=b"x" * 200))
+
+    assert cache.get(_key("/a")) is not None
+    assert cache.get(_key("/b")) is None
+    assert cache.get(_key("/c")) is not None
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+
+
+def test_response_cache_oversized_not_stored():
+    """Test responses larger than the cache are skipped."""
+    cache = ResponseCache(max_bytes=100)
+    res = _response(headers={"cache-control": "max-age=60"}, content=b"x" * 200)
+    assert cache.store(_key(), res) is None
+
+
+def test_response_cache_refresh():
+    """Test a 304 response refreshes freshness and validators."""
+    cache = ResponseCache()
+    entry = cache.store(_key(), _response(headers={"etag": '"v1"'}))
+
+    cache.refresh(
+        entry,
+        _response(304, headers={"etag": '"v2"', "cache-control": "max-age=60"}),
+    )
+
+    assert entry.is_fresh()
+    assert entry.etag == '"v2"'
+    assert entry.content == b"{}"
+    assert cache.revalidations == 1
+    assert cache.hits == 1
+    assert cache.size == entry.size
+
+
+def test_response_cache_invalidate():
+    """Test invalidation removes every entry for a path."""
+    headers = {"cache-control": "max-age=60"}
+    cache = ResponseCache()
+    cache.store(_key("/items", (("page", 1),)), _response(headers=headers))
+    cache.store(_key("/items", (("page", 2),)), _response(headers=headers))
+    cache.store(_key("/other"), _response(headers=headers))
+
+    assert cache.invalidate("https://example.com", "/items") == 2
+    assert cache.invalidate("https://example.com", "/items") == 0
+    assert len(cache) == 1
+    assert cache.get(_key("/other")) is not None
+
+
+def test_response_cache_invalidate_overlapping():
+    """Test invalidation also removes parent and child paths."""
+    headers = {"cache-control": "max-age=60"}
+    cache = ResponseCache()
+    for path in ("/devices", "/devices/r1", "/devices/r1/config", "/devices2"):
+        cache.store(_key(path), _response(headers=headers))
+
+    assert cache.invalidate("https://example.com", "/devices/r1") == 3
+    assert cache.get(_key("/devices2")) is not None
+    assert cache.invalidate("https://other.example.com", "/devices2") == 0
+
+
+def test_response_cache_policy_overrides_headers():
+    """Test policy time-to-live applies to responses without cache headers."""
+    cache = ResponseCache(policy=CachePolicy({"/adapters": 60, "/live": 0}))
+
+    entry = cache.store(_key("/adapters"), _response())
+    assert entry is not None
+    assert entry.is_fresh()
+    assert entry.expires_at - entry.stored_at == pytest.approx(60, abs=1)
+
+    assert cache.store(_key("/live"), _response()) is None
+    assert cache.store(_key("/other"), _response()) is None
+    res = _response(headers={"cache-control": "no-store"})
+    assert cache.store(_key("/adapters"), res) is None
+
+
+def test_response_cache_clear():
+    """Test clear() empties the cache."""
+    cache = ResponseCache()
+    cache.store(_key(), _response(headers={"cache-control": "max-age=60"}))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+    assert repr(cache) == "ResponseCache(entries=0, size=0, max_bytes=67108864)"
+
+
+def test_factories_pass_cache():
+    """Test the factories hand the cache to the connection."""
+    cache = ResponseCache()
+    assert platform_factory(cache=cache).cache is cache
+    assert gateway_factory(cache=cache, want_async=True).cache is cache
+
+
+# --------- NegativeCache Tests ---------
+
+
+def test_negative_cache_invalid_ttl():
+    """Test the negative cache requires a positive ttl."""
+    with pytest.raises(exceptions.IpsdkError):
+        NegativeCache(ttl=0)
+
+
+def test_negative_cache_stores_only_404():
+    """Test only 404 responses are remembered, for ttl seconds."""
+    cache = NegativeCache(ttl=5)
+    assert cache.store(_key(), _response(200)) is None
+    assert cache.store(_key(), _response(500)) is None
+
+    entry = cache.store(_key(), _response(404, {"cache-control": "no-store"}))
+    assert entry is not None
+    assert entry.is_fresh()
+    assert entry.expires_at - entry.stored_at == pytest.approx(5)
+    assert cache.get(_key()) is entry
+    assert repr(cache) == "NegativeCache(entries=1, ttl=5, max_bytes=1048576)"
+
+
+def test_negative_cache_bounded_and_invalidated():
+    """Test the negative cache evicts by size and invalidates by path."""
+    cache = NegativeCache(max_bytes=1000)
+    for i in range(10):
+        cache.store(_key(f"/devices/r{i}"), _response(404, content=b"x" * 100))
+    assert cache.size <= 1000
+    assert cache.evictions > 0
+
+    remaining = len(cache)
+    assert remaining > 0
+    assert cache.invalidate("https://example.com", "/devices") == remaining
+    assert len(cache) == 0
+
+
+# --------- Stale-While-Revalidate Tests ---------
+
+
+def test_response_cache_invalid_max_stale():
+    """Test max_stale must not be negative."""
+    with pytest.raises(exceptions.IpsdkError):
+        ResponseCache(max_stale=-1)
+
+
+def test_response_cache_is_servable_stale():
+    """Test stale entries are servable only within max_stale."""
+    entry = CacheEntry(_key(), 200, [], b"", expires_at=100.0)
+    assert not ResponseCache().is_servable_stale(entry, now=101.0)
+
+    cache = ResponseCache(max_stale=10)
+    assert cache.is_servable_stale(entry, now=101.0)
+    assert not cache.is_servable_stale(entry, now=111.0)
+
+
+def test_response_cache_refresh_claims_are_deduplicated():
+    """Test only one refresh can be claimed per key at a time."""
+    cache = ResponseCache(max_stale=10)
+    assert cache.begin_refresh(_key())
+    assert not cache.begin_refresh(_key())
+    assert cache.begin_refresh(_key("/other"))
+    assert cache.refreshing == 2
+
+    cache.end_refresh(_key())
+    assert cache.begin_refresh(_key())
@@ -0,0 +1,195 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import datetime as dt
+import importlib.util
+import json
+import sys
+import types
+
+import httpx
+import pytest
+
+from ipsdk import codec
+from ipsdk import exceptions
+from ipsdk.codec import JSONCodec
+from ipsdk.connection import Connection
+
+INSTALLED = [name for name in codec.BACKENDS if importlib.util.find_spec(name)]
+
+
+@pytest.fixture(autouse=True)
+def restore_codec():
+    """Restore the default codec after each test."""
+    yield
+    codec.set_codec()
+
+
+@pytest.fixture(params=INSTALLED)
+def backend(request):
+    """Each installed backend's codec."""
+    return codec.load_codec(request.param)
+
+
+# --------- Backends ---------
+
+
+def test_default_is_stdlib():
+    """Test the standard library is used until another backend is selected."""
+    assert codec.get_codec().name == "json"
+    assert repr(codec.get_codec()) == "JSONCodec('json')"
+    with pytest.raises(ValueError):
+        codec.encode({"value": float("nan")})
+
+
+def test_round_trip(backend):
+    """Test every backend encodes compact UTF-8 and decodes str and bytes."""
+    document = {"name": "café", "tasks": [{"id": 1, "ok": True, "x": None}]}
+    encoded = backend.encode(document)
+
+    assert encoded.decode() == '{"name":"café","tasks":[{"id":1,"ok":true,"x":null}]}'
+    assert backend.decode(encoded) == document
+    assert backend.decode(encoded.decode()) == document
+
+
+@pytest.mark.parametrize(
+    "value",
+    [object(), {1, 2}, b"bytes", dt.datetime.now(tz=dt.timezone.utc)],
+)
+def test_encode_errors(backend, value):
+    """Test values other than JSON types fail with TypeError or ValueError."""
+    if backend.name == "msgspec" and type(value) is not object:
+        pytest.skip("msgspec encodes sets, bytes and datetimes")
+    with pytest.raises((TypeError, ValueError)):
+        backend.encode({"value": value})
+
+
+@pytest.mark.parametrize("document", [b'{"a": ', "", "[1,]", b"\xff"])
+def test_decode_errors(backend, document):
+    """Test invalid documents fail with ValueError."""
+    with pytest.raises(ValueError):
+        backend.decode(document)
+
+
+def test_msgspec_errors_are_value_errors(monkeypatch):
+    """Test msgspec's EncodeError is raised as ValueError."""
+
+    class EncodeError(Exception):
+        pass
+
+    class Encoder:
+        def encode(self, obj):
+            if obj is None:
+                msg = "unsupported"
+                raise EncodeError(msg)
+            return json.dumps(obj).encode()
+
+    class Decoder:
+        def decode(self, data):
+            return json.loads(data)
+
+    msgspec = types.ModuleType("msgspec")
+    msgspec.EncodeError = EncodeError
+    msgspec.json = types.SimpleNamespace(Encoder=Encoder, Decoder=Decoder)
+    monkeypatch.setitem(sys.modules, "msgspec", msgspec)
+
+    backend = codec.load_codec("msgspec")
+
+    assert backend.name == "msgspec"
+    assert backend.encode([1]) == b"[1]"
+    assert backend.decode(b"[1]") == [1]
+    with pytest.raises(ValueError, match="unsupported") as info:
+        backend.encode(None)
+    assert isinstance(info.value.__cause__, EncodeError)
+
+
+def test_ujson_errors_are_value_errors(monkeypatch):
+    """Test ujson's OverflowError is raised as ValueError."""
+
+    def dumps(obj, ensure_ascii, escape_forward_slashes):
+        assert not ensure_ascii
+        assert not escape_forward_slashes
+        if obj is None:
+            msg = "Maximum recursion level reached"
+            raise OverflowError(msg)
+        return json.dumps(obj, ensure_ascii=False)
+
+    ujson = types.ModuleType("ujson")
+    ujson.dumps = dumps
+    ujson.loads = json.loads
+    monkeypatch.setitem(sys.modules, "ujson", ujson)
+
+    backend = codec.load_codec("ujson")
+
+    assert backend.name == "ujson"
+    assert backend.encode(["café"]) == '["café"]'.encode()
+    assert backend.decode("[1]") == [1]
+    with pytest.raises(ValueError, match="recursion") as info:
+        backend.encode(None)
+    assert isinstance(info.value.__cause__, OverflowError)
+
+
+# --------- Selection ---------
+
+
+def test_set_codec():
+    """Test selecting a backend by name, by codec and by detection."""
+    assert codec.set_codec("auto").name == INSTALLED[0]
+    assert codec.set_codec("json").name == "json"
+    assert codec.encode([1, "a"]) == b'[1,"a"]'
+
+    custom = JSONCodec("custom", lambda obj: b"{}", lambda data: {"custom": True})
+    assert codec.set_codec(custom) is custom
+    assert codec.decode("[]") == {"custom": True}
+
+    assert codec.set_codec().name == "json"
+
+
+def test_detect_falls_back_to_stdlib(monkeypatch):
+    """Test the standard library is used when no fast backend is installed."""
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    assert codec.set_codec("auto").name == "json"
+
+
+def test_load_codec_errors():
+    """Test unknown and missing backends are reported."""
+    with pytest.raises(
+        exceptions.IpsdkError, match="orjson, msgspec, ujson, json or auto"
+    ):
+        codec.load_codec("simplejson")
+
+    missing = [name for name in codec.BACKENDS if name not in INSTALLED]
+    if missing:
+        with pytest.raises(exceptions.IpsdkError, match="is not installed"):
+            codec.load_codec(missing[0])
+
+
+# --------- SDK ---------
+
+
+def test_connection_uses_active_codec():
+    """Test request bodies and responses go through the active codec."""
+    seen = []
+
+    def encode(obj):
+        seen.append(obj)
+        return b'{"encoded":true}'
+
+    codec.set_codec(JSONCodec("custom", encode, lambda data: {"decoded": data}))
+
+    def handler(request):
+        return httpx.Response(200, content=request.content)
+
+    conn = Connection("example.com")
+    conn.authenticated = True
+    conn.client = httpx.Client(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    res = conn.post("/devices", json={"name": "r1"})
+
+    assert seen == [{"name": "r1"}]
+    assert res.request.headers["Content-Type"] == "application/json"
+    assert res.json() == {"decoded": b'{"encoded":true}'}
@@ -3,7 +3,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
-import json
+import asyncio
+import threading
 import time
 
 from datetime import datetime
@@ -14,7 +15,11 @@ from unittest.mock import patch
 import httpx
 import pytest
 
+from ipsdk import codec
 from ipsdk import exceptions
+from ipsdk.cache import CachePolicy
+from ipsdk.cache import NegativeCache
+from ipsdk.cache import ResponseCache
 from ipsdk.connection import AsyncConnection
 from ipsdk.connection import Connection
 from ipsdk.connection import ConnectionBase
@@ -62,7 +67,7 @@ def connection_mock():
         conn = Connection("example.com")
         conn.authenticated = False
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
         yield conn
 
 
@@ -73,7 +78,7 @@ def async_connection_mock():
         conn = AsyncConnection("example.com")
         conn.authenticated = False
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
         conn.authenticate = AsyncMock()
         yield conn
 
@@ -204,7 +209,7 @@ def test_response_json_success(mock_httpx_response):
 def test_response_json_failure():
     """Test Response json method raises ValueError on parse error."""
     mock_response = Mock(spec=httpx.Response)
-    mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+    mock_response.content = b'{"key": '
 
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
     with pytest.raises(ValueError, match="Failed to parse response as JSON"):
@@ -302,17 +307,19 @@ def test_response_json_with_different_exceptions():
     """Test Response json method with different exception types."""
     mock_response = Mock(spec=httpx.Response)
 
-    # Test with JSONDecodeError
-    mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+    # Test with invalid JSON content
+    mock_response.content = b'{"invalid": json}'
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
     with pytest.raises(ValueError, match="Failed to parse response as JSON"):
         response.json()
 
     # Test with generic exception
-    mock_response.json.side_effect = RuntimeError("Generic error")
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
-    with pytest.raises(
-        ValueError, match="Failed to parse response as JSON: Generic error"
+    with (
+        patch("ipsdk.codec.decode", side_effect=RuntimeError("Generic error")),
+        pytest.raises(
+            ValueError, match="Failed to parse response as JSON: Generic error"
+        ),
     ):
         response.json()
 
@@ -392,6 +399,37 @@ def test_response_elapsed_ms_is_int():
     assert response.elapsed_ms == 1
 
 
+def test_response_derived_fields_are_memoized():
+    """Test the JSON body and elapsed time are computed only once."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = b"null"
+    response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
+
+    with patch("ipsdk.codec.decode", wraps=codec.decode) as decode:
+        assert response.json() is None
+        assert response.json() is None
+    assert decode.call_count == 1
+
+    with patch("ipsdk.http.datetime") as mock_datetime:
+        mock_datetime.fromisoformat.side_effect = datetime.fromisoformat
+        assert response.elapsed_ms == response.elapsed_ms
+    assert mock_datetime.fromisoformat.call_count == 2
+
+    # Slots only: no per-instance dict
+    assert not hasattr(response, "__dict__")
+
+
+def test_response_json_error_is_not_memoized():
+    """Test a failed parse is raised again on the next call."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = b"{"
+    response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Failed to parse response as JSON"):
+            response.json()
+
+
 # --------- ConnectionBase Tests ---------
 
 
@@ -459,7 +497,11 @@ class TestConnectionBase:
             request = conn._build_request(HTTPMethod.GET, "/api/test")
 
             conn.client.build_request.assert_called_once_with(
-                method="GET", url="/api/test", params=None, headers={}, json=None
+                method="GET",
+                url="https://example.com/api/test",
+                params=None,
+                headers=None,
+                content=None,
             )
             assert request == mock_request
 
@@ -482,17 +524,18 @@ class TestConnectionBase:
             }
             conn.client.build_request.assert_called_once_with(
                 method="POST",
-                url="/api/create",
+                url="https://example.com/api/create",
                 params=None,
                 headers=expected_headers,
-                json=json_data,
+                content=codec.encode(json_data),
             )
 
     def test_build_request_with_token(self):
-        """Test _build_request with authentication token."""
+        """Test the token is sent from the client default headers."""
         with patch.object(ConnectionBase, "__init_client__"):
             conn = ConnectionBase("example.com")
             conn.client = Mock()
+            conn.client.headers = httpx.Headers()
             conn.token = "test-token"
 
             mock_request = Mock()
@@ -500,15 +543,33 @@ class TestConnectionBase:
 
             conn._build_request(HTTPMethod.GET, "/api/test")
 
-            expected_headers = {"Authorization": "Bearer test-token"}
+            assert conn.client.headers["Authorization"] == "Bearer test-token"
             conn.client.build_request.assert_called_once_with(
                 method="GET",
-                url="/api/test",
+                url="https://example.com/api/test",
                 params=None,
-                headers=expected_headers,
-                json=None,
+                headers=None,
+                content=None,
             )
 
+    def test_token_installs_client_header(self):
+        """Test setting the token adds and clearing it removes Authorization."""
+        conn = Connection("example.com")
+        user_agent = conn.client.headers["User-Agent"]
+
+        conn.token = "first"
+        assert conn.client.headers["Authorization"] == "Bearer first"
+        request = conn._build_request(HTTPMethod.GET, "/api/test")
+        assert request.headers["Authorization"] == "Bearer first"
+
+        conn.token = "second"
+        assert conn.token == "second"
+        assert conn.client.headers.get_list("Authorization") == ["Bearer second"]
+
+        conn.token = None
+        assert "Authorization" not in conn.client.headers
+        assert conn.client.headers["User-Agent"] == user_agent
+
     def test_build_request_with_params(self):
         """Test _build_request with query parameters."""
         with patch.object(ConnectionBase, "__init_client__"):
@@ -523,7 +584,11 @@ class TestConnectionBase:
             conn._build_request(HTTPMethod.GET, "/api/test", params=params)
 
             conn.client.build_request.assert_called_once_with(
-                method="GET", url="/api/test", params=params, headers={}, json=None
+                method="GET",
+                url="https://example.com/api/test",
+                params=params,
+                headers=None,
+                content=None,
             )
 
     def test_initialization_with_all_params(self):
@@ -595,28 +660,33 @@ class TestConnectionBase:
             # Test with empty params dict
             conn._build_request(HTTPMethod.GET, "/api/test", params={})
             conn.client.build_request.assert_called_with(
-                method="GET", url="/api/test", params={}, headers={}, json=None
+                method="GET",
+                url="https://example.com/api/test",
+                params={},
+                headers=None,
+                content=None,
             )
 
             # Test with empty headers dict
             conn._build_request(HTTPMethod.GET, "/api/test", json=None)
 
             # Test with both token and json data
+            conn.client.headers = httpx.Headers()
             conn.token = "test-token"
             json_data = {"test": "data"}
             conn._build_request(HTTPMethod.POST, "/api/test", json=json_data)
 
+            assert conn.client.headers["Authorization"] == "Bearer test-token"
             expected_headers = {
-                "Authorization": "Bearer test-token",
                 "Content-Type": "application/json",
                 "Accept": "application/json",
             }
             conn.client.build_request.assert_called_with(
                 method="POST",
-                url="/api/test",
+                url="https://example.com/api/test",
                 params=None,
                 headers=expected_headers,
-                json=json_data,
+                content=codec.encode(json_data),
             )
 
 
@@ -651,7 +721,7 @@ class TestConnection:
             mock_response = Mock(spec=httpx.Response)
             mock_response.status_code = 200
             conn.client.send.return_value = mock_response
-            conn._build_request = Mock(return_value=Mock())
+            conn._build_request = Mock(return_value=Mock(extensions={}))
 
             result = conn._send_request(HTTPMethod.GET, "/api/test")
 
@@ -669,7 +739,7 @@ class TestConnection:
             mock_response = Mock(spec=httpx.Response)
             mock_response.status_code = 200
             conn.client.send.return_value = mock_response
-            conn._build_request = Mock(return_value=Mock())
+            conn._build_request = Mock(return_value=Mock(extensions={}))
 
             result = conn._send_request(HTTPMethod.GET, "/api/test")
 
@@ -681,7 +751,7 @@ class TestConnection:
         conn = Connection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         mock_request = Mock()
         mock_request.url = "https://example.com/api/test"
@@ -697,7 +767,7 @@ class TestConnection:
         conn = Connection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         mock_request = Mock()
         mock_request.url = "https://example.com/api/test"
@@ -717,7 +787,7 @@ class TestConnection:
         conn = Connection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         conn.client.send.side_effect = RuntimeError("Generic error")
 
@@ -789,7 +859,7 @@ class TestConnection:
             mock_response = Mock(spec=httpx.Response)
             mock_response.status_code = 200
             conn.client.send.return_value = mock_response
-            conn._build_request = Mock(return_value=Mock())
+            conn._build_request = Mock(return_value=Mock(extensions={}))
 
             # First request should trigger authentication
             conn._send_request(HTTPMethod.GET, "/api/test1")
@@ -850,7 +920,7 @@ class TestAsyncConnection:
         mock_response = Mock(spec=httpx.Response)
         mock_response.status_code = 200
         conn.client.send = AsyncMock(return_value=mock_response)
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
         conn.authenticate = AsyncMock()
 
         result = await conn._send_request(HTTPMethod.GET, "/api/test")
@@ -869,7 +939,7 @@ class TestAsyncConnection:
         mock_response = Mock(spec=httpx.Response)
         mock_response.status_code = 200
         conn.client.send = AsyncMock(return_value=mock_response)
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
         conn.authenticate = AsyncMock()
 
         result = await conn._send_request(HTTPMethod.GET, "/api/test")
@@ -883,7 +953,7 @@ class TestAsyncConnection:
         conn = AsyncConnection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         mock_request = Mock()
         mock_request.url = "https://example.com/api/test"
@@ -900,7 +970,7 @@ class TestAsyncConnection:
         conn = AsyncConnection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         mock_request = Mock()
         mock_request.url = "https://example.com/api/test"
@@ -921,7 +991,7 @@ class TestAsyncConnection:
         conn = AsyncConnection("example.com")
         conn.authenticated = True
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
 
         conn.client.send = AsyncMock(side_effect=RuntimeError("Generic error"))
 
@@ -1039,7 +1109,7 @@ class TestAsyncConnection:
         conn = AsyncConnection("example.com")
         conn.authenticated = False
         conn.client = Mock()
-        conn._build_request = Mock(return_value=Mock())
+        conn._build_request = Mock(return_value=Mock(extensions={}))
         conn.authenticate = AsyncMock()
 
         mock_response = Mock(spec=httpx.Response)
@@ -1082,7 +1152,7 @@ def test_connection_http_status_error_handling():
     conn = Connection("example.com")
     conn.authenticated = True
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_request = Mock()
     mock_request.url = "https://example.com/api/test"
@@ -1104,7 +1174,7 @@ def test_connection_server_error_handling():
     conn = Connection("example.com")
     conn.authenticated = True
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_request = Mock()
     mock_request.url = "https://example.com/api/test"
@@ -1127,7 +1197,7 @@ async def test_async_connection_http_error_handling():
     conn = AsyncConnection("example.com")
     conn.authenticated = True
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_request = Mock()
     mock_request.url = "https://example.com/api/test"
@@ -1196,17 +1266,17 @@ def test_response_json_with_non_dict_data():
     mock_response = Mock(spec=httpx.Response)
 
     # Test with JSON array
-    mock_response.json.return_value = [1, 2, 3]
+    mock_response.content = b"[1, 2, 3]"
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
     assert response.json() == [1, 2, 3]
 
     # Test with JSON string
-    mock_response.json.return_value = "test string"
+    mock_response.content = b'"test string"'
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
     assert response.json() == "test string"
 
     # Test with JSON number
-    mock_response.json.return_value = 42
+    mock_response.content = b"42"
     response = Response(mock_response, started_at=_STARTED_AT, finished_at=_FINISHED_AT)
     assert response.json() == 42
 
@@ -1272,7 +1342,9 @@ def test_validate_request_args_invalid_json_type():
     with pytest.raises(exceptions.IpsdkError) as exc_info:
         conn._validate_request_args(HTTPMethod.GET, "/test", json=123)
 
-    assert "json must be of type `dict` or `list`" in str(exc_info.value)
+    assert "json must be of type `dict`, `list`, `str` or `bytes`" in str(
+        exc_info.value
+    )
 
 
 def test_validate_request_args_invalid_path_type():
@@ -1534,7 +1606,7 @@ def test_send_request_sets_authenticated_to_true():
     conn.authenticated = False
     conn.authenticate = Mock()
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_response = Mock(spec=httpx.Response)
     mock_response.status_code = 200
@@ -1552,7 +1624,7 @@ async def test_async_send_request_sets_authenticated_to_true():
     conn.authenticated = False
     conn.authenticate = AsyncMock()
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_response = Mock(spec=httpx.Response)
     mock_response.status_code = 200
@@ -1688,6 +1760,7 @@ def test_connection_forces_reauthentication_when_ttl_exceeded():
         mock_client = Mock(spec=httpx.Client)
         mock_init.return_value = mock_client
         mock_client.headers = {}
+        mock_client.build_request.return_value = Mock(extensions={})
 
         conn = TestConnection("example.com", ttl=10)
 
@@ -1761,6 +1834,7 @@ def test_connection_reauthentication_resets_token():
         mock_client = Mock(spec=httpx.Client)
         mock_init.return_value = mock_client
         mock_client.headers = {}
+        mock_client.build_request.return_value = Mock(extensions={})
 
         conn = TestConnection("example.com", ttl=1)
 
@@ -1833,6 +1907,7 @@ def test_connection_ttl_reauthentication_with_multiple_requests():
         mock_client = Mock(spec=httpx.Client)
         mock_init.return_value = mock_client
         mock_client.headers = {}
+        mock_client.build_request.return_value = Mock(extensions={})
 
         conn = TestConnection("example.com", ttl=5)
 
@@ -1949,7 +2024,7 @@ def _make_sync_conn_with_mock_response():
     conn = Connection("example.com")
     conn.authenticated = True
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
 
     mock_response = Mock(spec=httpx.Response)
     mock_response.status_code = 200
@@ -1962,7 +2037,7 @@ def _make_async_conn_with_mock_response():
     conn = AsyncConnection("example.com")
     conn.authenticated = True
     conn.client = Mock()
-    conn._build_request = Mock(return_value=Mock())
+    conn._build_request = Mock(return_value=Mock(extensions={}))
     conn.authenticate = AsyncMock()
 
     mock_response = Mock(spec=httpx.Response)
@@ -1998,3 +2073,562 @@ async def test_async_send_request_timing_present_all_methods():
     _assert_timing_present(await conn.put("/test", json={"a": 1}))
     _assert_timing_present(await conn.patch("/test", json={"a": 1}))
     _assert_timing_present(await conn.delete("/test"))
+
+
+# --------- Request Coalescing Tests ---------
+
+
+def _make_mock_transport_conn(cls, handler, **kwargs):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com", **kwargs)
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+def test_coalesce_disabled_by_default():
+    """Test connections do not coalesce unless coalesce=True."""
+    assert Connection("example.com").singleflight is None
+    assert AsyncConnection("example.com").singleflight is None
+
+
+def test_request_key_normalizes_params():
+    """Test request keys ignore param order and include method and identity."""
+    conn = Connection("example.com", user="admin")
+    key1 = conn._request_key(HTTPMethod.GET, "/a", {"x": 1, "y": [1, 2]})
+    key2 = conn._request_key(HTTPMethod.GET, "/a", {"y": [1, 2], "x": 1})
+    assert key1 == key2
+    assert key1 != conn._request_key(HTTPMethod.DELETE, "/a", {"x": 1, "y": [1, 2]})
+    assert "admin" not in repr(key1)
+
+    other = Connection("example.com", user="other")
+    assert other._request_key(HTTPMethod.GET, "/a") != conn._request_key(
+        HTTPMethod.GET, "/a"
+    )
+
+    oauth = Connection("example.com", client_id="id", client_secret="secret")
+    anonymous = Connection("example.com")
+    assert oauth._identity != anonymous._identity
+
+
+def test_request_key_unhashable_params():
+    """Test request keys are None when params cannot be hashed."""
+    conn = Connection("example.com")
+    assert conn._request_key(HTTPMethod.GET, "/a", {"filter": {"a": 1}}) is None
+
+
+def test_sync_coalesce_identical_gets():
+    """Test concurrent identical GETs share one HTTP request."""
+    release = threading.Event()
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        release.wait(5)
+        return httpx.Response(200, json={"ok": True})
+
+    conn = _make_mock_transport_conn(Connection, handler, coalesce=True)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(conn.get("/workflows/a")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+
+    deadline = time.monotonic() + 5
+    while conn.singleflight.requests < 8 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(hits) == 1
+    assert len(results) == 8
+    assert len({id(r) for r in results}) == 8
+    assert all(r.content is results[0].content for r in results)
+    assert conn.singleflight.saved == 7
+
+    # Each caller memoizes its own parsed body
+    results[0].json()["ok"] = False
+    assert results[1].json() == {"ok": True}
+
+
+def test_sync_coalesce_skips_writes_and_unhashable_params():
+    """Test non-GET requests and unhashable params are never coalesced."""
+    hits = []
+
+    def handler(request):
+        hits.append(request.method)
+        return httpx.Response(200, json={})
+
+    conn = _make_mock_transport_conn(Connection, handler, coalesce=True)
+    conn.post("/a", json={"x": 1})
+    conn.get("/a", params={"filter": {"a": 1}})
+
+    assert hits == ["POST", "GET"]
+    assert conn.singleflight.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_async_coalesce_identical_gets():
+    """Test concurrent identical async GETs share one HTTP request."""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ok": True})
+
+    conn = _make_mock_transport_conn(AsyncConnection, handler, coalesce=True)
+    results = await asyncio.gather(
+        *(conn.get("/devices", params={"limit": 10}) for _ in range(8)),
+        conn.get("/devices", params={"limit": 20}),
+    )
+
+    assert len(hits) == 2
+    assert all(r is not results[0] for r in results[1:8])
+    assert all(r.content is results[0].content for r in results[:8])
+    results[0].json()["ok"] = False
+    assert results[1].json() == {"ok": True}
+    assert conn.singleflight.requests == 9
+    assert conn.singleflight.saved == 7
+
+
+@pytest.mark.asyncio
+async def test_async_coalesce_skips_writes():
+    """Test async non-GET requests are never coalesced."""
+
+    async def handler(request):
+        return httpx.Response(200, json={})
+
+    conn = _make_mock_transport_conn(AsyncConnection, handler, coalesce=True)
+    await asyncio.gather(conn.delete("/a"), conn.delete("/a"))
+    assert conn.singleflight.requests == 0
+
+
+# --------- Response Cache Tests ---------
+
+
+def _etag_handler(hits, headers=None):
+    """Return a handler serving a versioned resource with an ETag."""
+
+    def handler(request):
+        hits.append((request.method, request.headers.get("if-none-match")))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(
+            200, headers={"etag": '"v1"', **(headers or {})}, json={"v": 1}
+        )
+
+    return handler
+
+
+def test_cache_disabled_by_default():
+    """Test connections do not cache unless a cache is given."""
+    assert Connection("example.com").cache is None
+    assert AsyncConnection("example.com").cache is None
+
+
+def test_cache_fresh_hit_skips_network():
+    """Test fresh cached responses are served without a request."""
+    hits = []
+    cache = ResponseCache()
+    handler = _etag_handler(hits, {"cache-control": "max-age=60"})
+    conn = _make_mock_transport_conn(Connection, handler, cache=cache)
+
+    first = conn.get("/devices", params={"limit": 10})
+    second = conn.get("/devices", params={"limit": 10})
+
+    assert len(hits) == 1
+    assert second.json() == first.json() == {"v": 1}
+    assert str(second.url) == "https://example.com/devices?limit=10"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_revalidates_with_etag():
+    """Test stale entries are revalidated and a 304 serves the cached body."""
+    hits = []
+    cache = ResponseCache()
+    conn = _make_mock_transport_conn(Connection, _etag_handler(hits), cache=cache)
+
+    conn.get("/devices")
+    res = conn.get("/devices")
+
+    assert hits == [("GET", None), ("GET", '"v1"')]
+    assert res.status_code == 200
+    assert res.json() == {"v": 1}
+    assert cache.revalidations == 1
+
+
+def test_cache_no_store_not_cached():
+    """Test no-store responses are always fetched."""
+    hits = []
+    handler = _etag_handler(hits, {"cache-control": "no-store"})
+    conn = _make_mock_transport_conn(Connection, handler, cache=ResponseCache())
+
+    conn.get("/devices")
+    conn.get("/devices")
+
+    assert hits == [("GET", None), ("GET", None)]
+
+
+def test_cache_invalidated_by_write():
+    """Test successful writes drop cached entries for the path."""
+    hits = []
+    cache = ResponseCache()
+    handler = _etag_handler(hits, {"cache-control": "max-age=60"})
+    conn = _make_mock_transport_conn(Connection, handler, cache=cache)
+
+    conn.get("/devices")
+    conn.put("/devices", json={"v": 2})
+    conn.get("/devices")
+
+    assert [m for m, _ in hits] == ["GET", "PUT", "GET"]
+
+
+def test_cache_304_without_validators_raises():
+    """Test a 304 to an unconditional request is still an error."""
+
+    def handler(request):
+        return httpx.Response(304)
+
+    conn = _make_mock_transport_conn(Connection, handler, cache=ResponseCache())
+    with pytest.raises(exceptions.HTTPStatusError):
+        conn.get("/devices")
+
+
+@pytest.mark.asyncio
+async def test_async_cache_fresh_hit_and_revalidation():
+    """Test async connections serve fresh hits and revalidate stale entries."""
+    hits = []
+    sync_handler = _etag_handler(hits)
+
+    async def handler(request):
+        return sync_handler(request)
+
+    cache = ResponseCache()
+    conn = _make_mock_transport_conn(AsyncConnection, handler, cache=cache)
+
+    await conn.get("/devices")
+    res = await conn.get("/devices")
+    assert hits == [("GET", None), ("GET", '"v1"')]
+    assert res.json() == {"v": 1}
+
+    await conn.delete("/devices")
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_cache_with_coalesce():
+    """Test caching and coalescing combine for concurrent async GETs."""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, headers={"cache-control": "max-age=60"}, json={})
+
+    cache = ResponseCache()
+    conn = _make_mock_transport_conn(
+        AsyncConnection, handler, cache=cache, coalesce=True
+    )
+    await asyncio.gather(*(conn.get("/devices") for _ in range(5)))
+    await conn.get("/devices")
+
+    assert hits == ["/devices"]
+    assert conn.singleflight.saved == 4
+    assert cache.hits == 1
+
+
+def test_cache_policy_serves_without_headers():
+    """Test policy TTLs cache responses that have no caching headers."""
+    hits = []
+
+    def handler(request):
+        hits.append((request.method, request.url.path))
+        return httpx.Response(200, json={"path": request.url.path})
+
+    cache = ResponseCache(policy=CachePolicy({"/adapters*": 60}))
+    conn = _make_mock_transport_conn(Connection, handler, cache=cache)
+
+    conn.get("/adapters")
+    conn.get("/adapters/a1")
+    conn.get("/adapters")
+    conn.get("/applications")
+    conn.get("/applications")
+    assert len(hits) == 4
+
+    conn.put("/adapters/a1/restart")
+    conn.get("/adapters")
+    conn.get("/adapters/a1")
+    assert hits[-2:] == [("GET", "/adapters"), ("GET", "/adapters/a1")]
+
+
+# --------- Negative Cache Tests ---------
+
+
+def _not_found_handler(hits):
+    """Return a handler answering GET with 404 and writes with 201."""
+
+    def handler(request):
+        hits.append((request.method, request.url.path))
+        if request.method == "GET":
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(201, json={})
+
+    return handler
+
+
+def test_negative_cache_skips_repeated_probes():
+    """Test remembered 404s raise HTTPStatusError without a request."""
+    hits = []
+    negative = NegativeCache(ttl=60)
+    conn = _make_mock_transport_conn(
+        Connection, _not_found_handler(hits), negative_cache=negative
+    )
+
+    for _ in range(3):
+        with pytest.raises(exceptions.HTTPStatusError) as exc_info:
+            conn.get("/devices/r1")
+        assert exc_info.value.response.status_code == 404
+        assert exc_info.value.response.json() == {"error": "not found"}
+
+    assert hits == [("GET", "/devices/r1")]
+    assert negative.misses == 1
+    assert negative.hits == 2
+
+
+def test_negative_cache_invalidated_by_write():
+    """Test a write to an overlapping path forgets remembered 404s."""
+    hits = []
+    conn = _make_mock_transport_conn(
+        Connection, _not_found_handler(hits), negative_cache=NegativeCache()
+    )
+
+    with pytest.raises(exceptions.HTTPStatusError):
+        conn.get("/devices/r1")
+    conn.post("/devices", json={"name": "r1"})
+    with pytest.raises(exceptions.HTTPStatusError):
+        conn.get("/devices/r1")
+
+    assert [m for m, _ in hits] == ["GET", "POST", "GET"]
+
+
+def test_negative_cache_ignores_other_errors():
+    """Test errors other than 404 are not remembered."""
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        return httpx.Response(500)
+
+    conn = _make_mock_transport_conn(
+        Connection, handler, negative_cache=NegativeCache()
+    )
+    for _ in range(2):
+        with pytest.raises(exceptions.HTTPStatusError):
+            conn.get("/devices")
+
+    assert len(hits) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_negative_cache():
+    """Test async connections remember 404s and invalidate them on writes."""
+    hits = []
+    sync_handler = _not_found_handler(hits)
+
+    async def handler(request):
+        return sync_handler(request)
+
+    conn = _make_mock_transport_conn(
+        AsyncConnection, handler, negative_cache=NegativeCache()
+    )
+    for _ in range(2):
+        with pytest.raises(exceptions.HTTPStatusError):
+            await conn.get("/devices/r1")
+    await conn.delete("/devices/r1")
+    with pytest.raises(exceptions.HTTPStatusError):
+        await conn.get("/devices/r1")
+
+    assert [m for m, _ in hits] == ["GET", "DELETE", "GET"]
+
+
+# --------- Stale-While-Revalidate Tests ---------
+
+
+def _versioned_handler(hits, release=None):
+    """Return a handler serving an incrementing version with max-age=0."""
+
+    def handler(request):
+        if release is not None:
+            release.wait(5)
+        hits.append(request.headers.get("if-none-match"))
+        version = len(hits)
+        return httpx.Response(
+            200,
+            headers={"etag": f'"v{version}"', "cache-control": "max-age=0"},
+            json={"v": version},
+        )
+
+    return handler
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not met before timeout")
+        time.sleep(0.001)
+
+
+def test_stale_while_revalidate_serves_stale_immediately():
+    """Test stale entries are returned while one refresh runs per key."""
+    hits = []
+    release = threading.Event()
+    release.set()
+    cache = ResponseCache(max_stale=60)
+    conn = _make_mock_transport_conn(
+        Connection, _versioned_handler(hits, release), cache=cache
+    )
+
+    assert conn.get("/dashboard").json() == {"v": 1}
+
+    release.clear()
+    assert conn.get("/dashboard").json() == {"v": 1}
+    assert conn.get("/dashboard").json() == {"v": 1}
+    assert cache.stale_hits == 2
+    assert cache.refreshing == 1
+
+    release.set()
+    _wait_until(lambda: cache.refreshing == 0)
+    assert hits == [None, '"v1"']
+    assert conn.get("/dashboard").json() == {"v": 2}
+
+
+def test_stale_while_revalidate_disabled_by_default():
+    """Test stale entries are revalidated inline without max_stale."""
+    hits = []
+    cache = ResponseCache()
+    conn = _make_mock_transport_conn(Connection, _versioned_handler(hits), cache=cache)
+
+    conn.get("/dashboard")
+    assert conn.get("/dashboard").json() == {"v": 2}
+    assert cache.stale_hits == 0
+
+
+def test_stale_while_revalidate_refresh_failure_logged():
+    """Test a failed background refresh releases the key."""
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        if len(calls) > 1:
+            return httpx.Response(500)
+        return httpx.Response(
+            200, headers={"etag": '"v1"', "cache-control": "max-age=0"}, json={}
+        )
+
+    cache = ResponseCache(max_stale=60)
+    conn = _make_mock_transport_conn(Connection, handler, cache=cache)
+    conn.get("/dashboard")
+    conn.get("/dashboard")
+
+    _wait_until(lambda: cache.refreshing == 0 and len(calls) == 2)
+    assert conn.get("/dashboard").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_async_stale_while_revalidate():
+    """Test async connections refresh stale entries in a background task."""
+    hits = []
+    release = asyncio.Event()
+    release.set()
+
+    async def handler(request):
+        await release.wait()
+        hits.append(request.headers.get("if-none-match"))
+        return httpx.Response(
+            200,
+            headers={"etag": f'"v{len(hits)}"', "cache-control": "max-age=0"},
+            json={"v": len(hits)},
+        )
+
+    cache = ResponseCache(max_stale=60)
+    conn = _make_mock_transport_conn(AsyncConnection, handler, cache=cache)
+    await conn.get("/dashboard")
+
+    release.clear()
+    results = await asyncio.gather(*(conn.get("/dashboard") for _ in range(5)))
+    assert [r.json() for r in results] == [{"v": 1}] * 5
+    assert cache.refreshing == 1
+
+    release.set()
+    await asyncio.gather(*conn._refreshes)
+    assert hits == [None, '"v1"']
+    assert (await conn.get("/dashboard")).json() == {"v": 2}
+
+
+# --------- Pre-serialized Bodies ---------
+
+
+def _echo(received):
+    """Create a handler recording request bodies and content types."""
+
+    def handler(request):
+        received.append((request.content, request.headers.get("content-type")))
+        return httpx.Response(200, json={})
+
+    return handler
+
+
+@pytest.mark.parametrize("body", [b'{"name": "r1"}', '{"name": "r1"}'])
+def test_serialized_body_sent_unchanged(body):
+    """Test str and bytes bodies are sent as they are, typed as JSON."""
+    received = []
+    conn = _make_mock_transport_conn(Connection, _echo(received))
+
+    conn.post("/devices", json=body)
+    conn.prepare("PUT", "/devices/{name}").send(json=body, name="r1")
+
+    expected = (b'{"name": "r1"}', "application/json")
+    assert received == [expected, expected]
+
+
+def test_serialized_body_is_not_reserialized():
+    """Test a serialized body keeps its exact bytes instead of being re-dumped."""
+    received = []
+    conn = _make_mock_transport_conn(Connection, _echo(received))
+
+    conn.patch("/devices/r1", json=b'{"up":true,  "odd spacing": 1}')
+
+    assert received[0][0] == b'{"up":true,  "odd spacing": 1}'
+
+
+@pytest.mark.asyncio
+async def test_async_serialized_body_sent_unchanged():
+    """Test async connections send serialized bodies unchanged."""
+    received = []
+    conn = _make_mock_transport_conn(AsyncConnection, _echo(received))
+
+    await conn.put("/devices/r1", json=b"[1, 2]")
+    await conn.prepare("POST", "/devices").send(json="[3]")
+
+    assert received == [(b"[1, 2]", "application/json"), (b"[3]", "application/json")]
+
+
+def test_strict_validation_checks_serialized_body():
+    """Test the strict level rejects serialized bodies that are not JSON."""
+    conn = Connection("example.com", validation="strict")
+    with pytest.raises(exceptions.IpsdkError, match="not valid serialized JSON"):
+        conn._build_request(HTTPMethod.POST, "/devices", json=b"{'name': 'r1'}")
+    with pytest.raises(exceptions.IpsdkError, match="not valid serialized JSON"):
+        conn._build_request(HTTPMethod.POST, "/devices", json=b"\xff")
+
+    request = conn._build_request(HTTPMethod.POST, "/devices", json='{"a": 1}')
+    assert request.content == b'{"a": 1}'
@@ -229,6 +229,30 @@ class TestSerializationError:
             assert str(e) == "Test"
 
 
+class TestSchemaError:
+    """Test cases for SchemaError exception."""
+
+    def test_initialization_with_location(self):
+        """Test SchemaError keeps the location of the offending value."""
+        exc = exceptions.SchemaError(
+            "json['data'][3]['port']: expected `int`, got `str`",
+            "json['data'][3]['port']",
+        )
+        assert exc.location == "json['data'][3]['port']"
+        assert "expected `int`" in str(exc)
+
+    def test_location_defaults_to_none(self):
+        """Test SchemaError without a location."""
+        assert exceptions.SchemaError("Schema mismatch").location is None
+
+    def test_inheritance_chain(self):
+        """Test SchemaError is caught as SerializationError."""
+        exc = exceptions.SchemaError("Test error")
+
+        assert isinstance(exc, exceptions.IpsdkError)
+        assert isinstance(exc, exceptions.SerializationError)
+
+
 class TestExceptionHierarchy:
     """Test cases for the overall exception hierarchy."""
 
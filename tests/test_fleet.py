@@ -0,0 +1,416 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.fleet import AsyncFleet
+from ipsdk.fleet import Fleet
+from ipsdk.fleet import FleetBase
+from ipsdk.fleet import FleetResult
+from ipsdk.fleet import LatencyStats
+
+
+def _make_gateway(cls, handler):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com")
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+def _devices(name):
+    """Return a handler answering with the gateway name and request details."""
+
+    def handler(request):
+        if name == "broken":
+            return httpx.Response(500, json={"error": "boom"})
+        return httpx.Response(
+            200,
+            json={
+                "gateway": name,
+                "method": request.method,
+                "path": request.url.path,
+                "query": str(request.url.query, "ascii"),
+                "body": request.content.decode(),
+            },
+        )
+
+    return handler
+
+
+# --------- Results and stats ---------
+
+
+def test_fleet_result_ok_and_unwrap():
+    """Test results expose success and re-raise failures on unwrap."""
+    ok = FleetResult("gw1", value=1, elapsed=0.5)
+    assert ok.ok
+    assert ok.unwrap() == 1
+
+    failed = FleetResult("gw2", error=ValueError("boom"))
+    assert not failed.ok
+    with pytest.raises(ValueError, match="boom"):
+        failed.unwrap()
+    assert "ValueError" in repr(failed)
+
+
+def test_latency_stats():
+    """Test latency stats track counts, errors, extremes and percentiles."""
+    stats = LatencyStats()
+    assert stats.mean == 0.0
+    assert stats.percentile(50) == 0.0
+
+    for elapsed in (0.1, 0.2, 0.3, 0.4):
+        stats.record(elapsed)
+    stats.record(1.0, failed=True)
+
+    assert stats.count == 5
+    assert stats.errors == 1
+    assert stats.min == pytest.approx(0.1)
+    assert stats.max == pytest.approx(1.0)
+    assert stats.mean == pytest.approx(0.4)
+    assert stats.percentile(50) == pytest.approx(0.3)
+    assert stats.percentile(100) == pytest.approx(1.0)
+    assert repr(stats) == "LatencyStats(count=5, errors=1, mean=0.400, max=1.000)"
+
+
+# --------- Membership ---------
+
+
+def test_fleet_rejects_invalid_limits():
+    """Test non-positive concurrency limits are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        Fleet({}, max_concurrency=0)
+    with pytest.raises(exceptions.IpsdkError):
+        AsyncFleet({}, per_gateway=0)
+
+
+def test_fleet_base_is_abstract():
+    """Test the shared base cannot be used without a limit factory."""
+    with pytest.raises(TypeError, match="_make_limit"):
+        FleetBase({})
+
+
+def test_fleet_membership():
+    """Test gateways can be added, looked up and removed by name."""
+    gw1 = _make_gateway(Connection, _devices("gw1"))
+    gw2 = _make_gateway(Connection, _devices("gw2"))
+
+    with Fleet({"gw1": gw1}) as fleet:
+        fleet.add("gw2", gw2)
+        assert fleet.names == ["gw1", "gw2"]
+        assert len(fleet) == 2
+        assert fleet["gw2"] is gw2
+        assert set(fleet.stats) == {"gw1", "gw2"}
+
+        assert fleet.remove("gw1") is gw1
+        assert fleet.names == ["gw2"]
+        assert repr(fleet) == "Fleet(gateways=1, max_concurrency=16, per_gateway=4)"
+        with pytest.raises(exceptions.IpsdkError):
+            fleet.remove("gw1")
+
+
+# --------- Sync fleet ---------
+
+
+def test_fleet_request_all_gateways():
+    """Test a request is sent to every gateway and tagged by name."""
+    names = ["gw1", "gw2", "gw3"]
+    gateways = {name: _make_gateway(Connection, _devices(name)) for name in names}
+
+    with Fleet(gateways) as fleet:
+        results = list(fleet.request("get", "/devices", params={"limit": 5}))
+
+    assert sorted(result.name for result in results) == names
+    for result in results:
+        assert result.ok
+        body = result.value.json()
+        assert body["gateway"] == result.name
+        assert body["path"] == "/devices"
+        assert body["query"] == "limit=5"
+        assert fleet.stats[result.name].count == 1
+
+
+def test_fleet_request_selected_gateways_with_body():
+    """Test a request with a body is sent only to the selected gateways."""
+    gateways = {
+        name: _make_gateway(Connection, _devices(name)) for name in ("gw1", "gw2")
+    }
+
+    with Fleet(gateways) as fleet:
+        results = list(
+            fleet.request("POST", "/scripts/run", json={"x": 1}, names=["gw2"])
+        )
+
+    assert [result.name for result in results] == ["gw2"]
+    body = results[0].value.json()
+    assert body["method"] == "POST"
+    assert '"x"' in body["body"]
+
+
+def test_fleet_request_errors_are_results():
+    """Test a failing gateway yields an error result without stopping others."""
+    gateways = {
+        name: _make_gateway(Connection, _devices(name)) for name in ("gw1", "broken")
+    }
+
+    with Fleet(gateways) as fleet:
+        results = {result.name: result for result in fleet.request("get", "/x")}
+
+    assert results["gw1"].ok
+    assert isinstance(results["broken"].error, exceptions.HTTPStatusError)
+    assert fleet.stats["broken"].errors == 1
+    assert fleet.stats["gw1"].errors == 0
+
+
+def test_fleet_request_validation():
+    """Test unknown methods, bodies on GET and unknown names are rejected."""
+    with Fleet({"gw1": _make_gateway(Connection, _devices("gw1"))}) as fleet:
+        with pytest.raises(exceptions.IpsdkError):
+            fleet.request("head", "/x")
+        with pytest.raises(exceptions.IpsdkError):
+            fleet.request("get", "/x", json={"a": 1})
+        with pytest.raises(exceptions.IpsdkError):
+            fleet.request("get", "/x", names=["nope"])
+        with pytest.raises(exceptions.IpsdkError):
+            fleet.map(lambda gateway: gateway, names=["nope"])
+
+
+def test_fleet_streams_in_completion_order():
+    """Test results are yielded as soon as each gateway answers."""
+    delays = {"slow": 0.3, "fast": 0.0}
+
+    def call(gateway):
+        time.sleep(delays[gateway])
+        return gateway
+
+    fleet = Fleet({"slow": "slow", "fast": "fast"})
+    names = [result.name for result in fleet.map(call)]
+    fleet._executor.shutdown()
+
+    assert names == ["fast", "slow"]
+
+
+def test_fleet_enforces_concurrency_limits():
+    """Test the global and per-gateway limits bound calls in flight."""
+    lock = threading.Lock()
+    active = {"total": 0, "peak": 0, "gw": {}, "gw_peak": {}}
+
+    def call(gateway):
+        with lock:
+            active["total"] += 1
+            active["gw"][gateway] = active["gw"].get(gateway, 0) + 1
+            active["peak"] = max(active["peak"], active["total"])
+            active["gw_peak"][gateway] = max(
+                active["gw_peak"].get(gateway, 0), active["gw"][gateway]
+            )
+        time.sleep(0.05)
+        with lock:
+            active["total"] -= 1
+            active["gw"][gateway] -= 1
+
+    gateways = {f"gw{i}": f"gw{i}" for i in range(4)}
+    fleet = Fleet(gateways, max_concurrency=3, per_gateway=1)
+
+    # Two overlapping fan-outs share both limits
+    threads = [threading.Thread(target=lambda: list(fleet.map(call))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    fleet._executor.shutdown()
+
+    assert active["peak"] <= 3
+    assert max(active["gw_peak"].values()) == 1
+    assert sum(stats.count for stats in fleet.stats.values()) == 8
+
+
+def test_fleet_early_exit_cancels_queued_calls():
+    """Test leaving the iteration early cancels calls that have not started."""
+    calls = []
+    b_started = threading.Event()
+    release = threading.Event()
+
+    def call(gateway):
+        calls.append(gateway)
+        if gateway == "b":
+            b_started.set()
+            release.wait(5)
+        return gateway
+
+    fleet = Fleet({"a": "a", "b": "b", "c": "c"}, max_concurrency=1)
+    for result in fleet.map(call):
+        assert result.name == "a"
+        assert b_started.wait(5)
+        break
+    release.set()
+    fleet._executor.shutdown()
+
+    assert calls == ["a", "b"]
+
+
+def test_fleet_busy_gateway_does_not_hold_pool_threads():
+    """Test calls queued for a busy gateway leave threads for other gateways."""
+    release = threading.Event()
+
+    def call(gateway):
+        if gateway == "busy":
+            release.wait(5)
+        return gateway
+
+    fleet = Fleet({"busy": "busy", "other": "other"}, max_concurrency=2, per_gateway=1)
+    first = fleet.map(call, names=["busy"])
+    second = fleet.map(call, names=["busy"])
+
+    started = time.monotonic()
+    assert next(fleet.map(call, names=["other"])).value == "other"
+    assert time.monotonic() - started < 2
+
+    release.set()
+    assert [result.value for result in (*first, *second)] == ["busy", "busy"]
+    fleet._executor.shutdown()
+
+
+def test_fleet_closed_while_call_queued():
+    """Test a call still queued when the fleet closes fails instead of hanging."""
+    release = threading.Event()
+
+    def call(gateway):
+        release.wait(5)
+        return gateway
+
+    fleet = Fleet({"gw": "gw"}, per_gateway=1)
+    first = fleet.map(call)
+    second = fleet.map(call)
+    cancelled = fleet._submit("gw", call)
+    cancelled.cancel()
+    fleet._executor.shutdown(wait=False)
+    release.set()
+
+    assert next(first).value == "gw"
+    with pytest.raises(RuntimeError, match="shutdown"):
+        next(second)
+    assert cancelled.cancelled()
+
+
+def test_fleet_connect_builds_gateways():
+    """Test connect() creates one Gateway client per host."""
+    with Fleet.connect(["gw1.example.com", "gw2.example.com"]) as fleet:
+        assert fleet.names == ["gw1.example.com", "gw2.example.com"]
+        assert isinstance(fleet["gw1.example.com"], Connection)
+
+
+# --------- Async fleet ---------
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_request_all_gateways():
+    """Test an async request is sent to every gateway and tagged by name."""
+    gateways = {
+        name: _make_gateway(AsyncConnection, _devices(name))
+        for name in ("gw1", "gw2", "broken")
+    }
+
+    async with AsyncFleet(gateways) as fleet:
+        results = {result.name: result async for result in fleet.request("get", "/x")}
+
+    assert results["gw1"].value.json()["gateway"] == "gw1"
+    assert results["gw2"].ok
+    assert isinstance(results["broken"].error, exceptions.HTTPStatusError)
+    assert fleet.stats["broken"].errors == 1
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_enforces_concurrency_limits():
+    """Test the async global and per-gateway limits bound calls in flight."""
+    active = {"total": 0, "peak": 0}
+
+    async def call(gateway):
+        active["total"] += 1
+        active["peak"] = max(active["peak"], active["total"])
+        await asyncio.sleep(0.01)
+        active["total"] -= 1
+        return gateway
+
+    fleet = AsyncFleet({f"gw{i}": f"gw{i}" for i in range(6)}, max_concurrency=2)
+    results = [result async for result in fleet.map(call)]
+
+    assert len(results) == 6
+    assert all(result.value == result.name for result in results)
+    assert active["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_busy_gateway_does_not_hold_global_slots():
+    """Test async calls waiting for a busy gateway leave room for others."""
+    release = asyncio.Event()
+
+    async def call(gateway):
+        if gateway == "busy":
+            await release.wait()
+        return gateway
+
+    fleet = AsyncFleet({"busy": "busy", "other": "other"}, 2, per_gateway=1)
+    busy = [asyncio.ensure_future(_drain(fleet.map(call, ["busy"]))) for _ in "ab"]
+    await asyncio.sleep(0.01)
+
+    results = await asyncio.wait_for(_drain(fleet.map(call, ["other"])), 1)
+    assert [result.value for result in results] == ["other"]
+
+    release.set()
+    assert len(await asyncio.gather(*busy)) == 2
+
+
+async def _drain(stream):
+    return [result async for result in stream]
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_rejects_unknown_names_immediately():
+    """Test unknown names are rejected before the iteration starts."""
+    fleet = AsyncFleet({"gw1": "gw1"})
+    with pytest.raises(exceptions.IpsdkError, match="nope"):
+        fleet.request("get", "/x", names=["nope"])
+    assert repr(fleet) == "AsyncFleet(gateways=1, max_concurrency=16, per_gateway=4)"
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_connect_builds_gateways():
+    """Test connect() creates one AsyncGateway client per host."""
+    async with AsyncFleet.connect(["gw1.example.com"], per_gateway=2) as fleet:
+        assert fleet.names == ["gw1.example.com"]
+        assert isinstance(fleet["gw1.example.com"], AsyncConnection)
+        assert fleet.per_gateway == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_early_exit_cancels_pending():
+    """Test leaving the iteration early cancels calls still running."""
+    finished = []
+
+    async def call(gateway):
+        await asyncio.sleep(0 if gateway == "fast" else 5)
+        finished.append(gateway)
+
+    fleet = AsyncFleet({"fast": "fast", "slow": "slow"})
+    stream = fleet.map(call)
+    async for result in stream:
+        assert result.name == "fast"
+        break
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert finished == ["fast"]
@@ -0,0 +1,293 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.inventory import AsyncInventory
+from ipsdk.inventory import Inventory
+from ipsdk.inventory import InventoryChanges
+
+
+class _Devices:
+    """Stand-in for the Gateway /devices endpoint with offset pagination."""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.requests = 0
+        self.fail = False
+
+    def __call__(self, request):
+        self.requests += 1
+        if self.fail:
+            return httpx.Response(500, json={"error": "boom"})
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", 100))
+        return httpx.Response(
+            200,
+            json={
+                "data": self.devices[offset : offset + limit],
+                "meta": {"total_count": len(self.devices)},
+            },
+        )
+
+
+def _device(name, host, os="cisco.ios.ios"):
+    return {
+        "name": name,
+        "variables": {"ansible_host": host, "ansible_network_os": os},
+    }
+
+
+def _make_conn(cls, handler):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com")
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+def test_inventory_rejects_invalid_pagination_options():
+    """Test invalid pagination options are rejected at construction."""
+    with pytest.raises(exceptions.IpsdkError):
+        Inventory(Connection("example.com"), page_size=0)
+
+
+def test_inventory_refresh_loads_and_indexes():
+    """Test a refresh pages through the listing and indexes every device."""
+    server = _Devices(
+        [
+            _device("r1", "10.0.0.1"),
+            _device("r2", "10.0.0.2", os="arista.eos.eos"),
+            _device("r3", "10.0.0.3"),
+        ]
+    )
+    inventory = Inventory(_make_conn(Connection, server), page_size=2)
+    assert not inventory.loaded
+
+    changes = inventory.refresh()
+
+    assert server.requests == 2
+    assert sorted(changes.added) == ["r1", "r2", "r3"]
+    assert inventory.loaded
+    assert len(inventory) == 3
+    assert "r2" in inventory
+    assert inventory["r2"]["variables"]["ansible_host"] == "10.0.0.2"
+    assert inventory.get("missing") is None
+    assert inventory.names == ["r1", "r2", "r3"]
+
+    ios = inventory.find("variables.ansible_network_os", "cisco.ios.ios")
+    assert [device["name"] for device in ios] == ["r1", "r3"]
+    assert inventory.find("variables.ansible_host", "10.0.0.9") == []
+    with pytest.raises(exceptions.IpsdkError):
+        inventory.find("variables.site", "dc1")
+
+
+def test_inventory_refresh_applies_only_changes():
+    """Test a refresh reports and re-indexes only changed devices."""
+    server = _Devices([_device("r1", "10.0.0.1"), _device("r2", "10.0.0.2")])
+    inventory = Inventory(_make_conn(Connection, server))
+    inventory.refresh()
+
+    unchanged = inventory.refresh()
+    assert not unchanged
+    assert inventory.refreshes == 2
+
+    server.devices = [
+        _device("r1", "10.0.0.11"),
+        _device("r3", "10.0.0.3"),
+    ]
+    changes = inventory.refresh()
+
+    assert changes.added == ["r3"]
+    assert changes.updated == ["r1"]
+    assert changes.removed == ["r2"]
+    assert "r2" not in inventory
+    assert inventory.find("variables.ansible_host", "10.0.0.1") == []
+    assert inventory.find("variables.ansible_host", "10.0.0.11")[0]["name"] == "r1"
+    assert repr(changes) == "InventoryChanges(added=1, updated=1, removed=1)"
+
+
+def test_inventory_failed_refresh_keeps_contents():
+    """Test a failed refresh raises and leaves the inventory unchanged."""
+    server = _Devices([_device("r1", "10.0.0.1")])
+    inventory = Inventory(_make_conn(Connection, server))
+    inventory.refresh()
+
+    server.fail = True
+    with pytest.raises(exceptions.HTTPStatusError):
+        inventory.refresh()
+
+    assert inventory["r1"]["name"] == "r1"
+    assert inventory.refreshes == 1
+
+
+def test_inventory_requires_device_names():
+    """Test device documents without a name are rejected."""
+    server = _Devices([{"variables": {}}])
+    inventory = Inventory(_make_conn(Connection, server))
+
+    with pytest.raises(exceptions.IpsdkError):
+        inventory.refresh()
+
+
+def test_inventory_background_refresh():
+    """Test start() loads immediately and refreshes in the background."""
+    server = _Devices([_device("r1", "10.0.0.1")])
+    inventory = Inventory(_make_conn(Connection, server))
+
+    with inventory:
+        inventory.start(interval=0.01)
+        assert "r1" in inventory
+        with pytest.raises(exceptions.IpsdkError):
+            inventory.start(interval=0.01)
+
+        server.devices = [_device("r2", "10.0.0.2")]
+        deadline = time.monotonic() + 5
+        while "r2" not in inventory and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert "r2" in inventory
+    assert "r1" not in inventory
+    assert inventory._thread is None
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_inventory_background_failure_keeps_contents():
+    """Test a failed background refresh is logged and keeps the inventory."""
+    server = _Devices([_device("r1", "10.0.0.1")])
+    inventory = Inventory(_make_conn(Connection, server))
+
+    with inventory:
+        inventory.start(interval=0.01)
+        server.fail = True
+        failures = server.requests + 2
+        assert _wait_for(lambda: server.requests >= failures)
+
+        assert inventory.names == ["r1"]
+        assert inventory.find("variables.ansible_host", "10.0.0.1") == [
+            _device("r1", "10.0.0.1")
+        ]
+        assert inventory.refreshes == 1
+        assert inventory._thread.is_alive()
+
+        server.fail = False
+        server.devices = [_device("r2", "10.0.0.2")]
+        assert _wait_for(lambda: "r2" in inventory)
+
+
+def test_inventory_indexes_only_scalar_values():
+    """Test devices whose indexed value is not a scalar are not indexed."""
+    server = _Devices([{"name": "r1", "variables": {"ansible_host": ["a", "b"]}}])
+    inventory = Inventory(_make_conn(Connection, server))
+    inventory.refresh()
+
+    assert inventory.find("variables.ansible_host", "a") == []
+    assert repr(inventory) == "Inventory(path='/devices', devices=1, refreshes=1)"
+
+    server.devices = []
+    assert inventory.refresh().removed == ["r1"]
+
+
+def test_inventory_tolerates_mutated_devices():
+    """Test removing a device whose document was changed in place."""
+    server = _Devices([_device("r1", "10.0.0.1")])
+    inventory = Inventory(_make_conn(Connection, server))
+    inventory.refresh()
+    inventory["r1"]["variables"]["ansible_host"] = "10.0.0.9"
+
+    server.devices = []
+    assert inventory.refresh().removed == ["r1"]
+    assert inventory.find("variables.ansible_host", "10.0.0.1") == []
+
+
+def test_inventory_start_rejects_invalid_interval():
+    """Test start() rejects a non-positive interval."""
+    inventory = Inventory(Connection("example.com"))
+    with pytest.raises(exceptions.IpsdkError):
+        inventory.start(interval=0)
+    inventory.stop()
+
+
+def test_inventory_changes_defaults():
+    """Test an empty change set is falsy."""
+    assert not InventoryChanges()
+    assert InventoryChanges(added=["r1"])
+
+
+@pytest.mark.asyncio
+async def test_async_inventory_refresh_and_background():
+    """Test the async inventory refreshes on demand and in a task."""
+    server = _Devices([_device("r1", "10.0.0.1"), _device("r2", "10.0.0.2")])
+    inventory = AsyncInventory(_make_conn(AsyncConnection, server), page_size=1)
+
+    async with inventory:
+        await inventory.start(interval=0.01)
+        assert server.requests == 2
+        assert inventory.find("variables.ansible_host", "10.0.0.2")[0]["name"] == "r2"
+
+        server.devices = [_device("r2", "10.0.0.2")]
+        for _ in range(500):
+            if "r1" not in inventory:
+                break
+            await asyncio.sleep(0.01)
+
+    assert "r1" not in inventory
+    assert inventory._task is None
+
+
+@pytest.mark.asyncio
+async def test_async_inventory_background_failure_keeps_contents():
+    """Test a failed async background refresh is logged and keeps the inventory."""
+    server = _Devices([_device("r1", "10.0.0.1")])
+    inventory = AsyncInventory(_make_conn(AsyncConnection, server))
+
+    async with inventory:
+        await inventory.start(interval=0.01)
+        server.fail = True
+        failures = server.requests + 2
+        for _ in range(500):
+            if server.requests >= failures:
+                break
+            await asyncio.sleep(0.01)
+
+        assert server.requests >= failures
+        assert inventory.names == ["r1"]
+        assert inventory.find("variables.ansible_network_os", "cisco.ios.ios") == [
+            _device("r1", "10.0.0.1")
+        ]
+        assert inventory.refreshes == 1
+        assert not inventory._task.done()
+
+
+@pytest.mark.asyncio
+async def test_async_inventory_start_and_stop_checks():
+    """Test async start() validates its interval and stop() is idempotent."""
+    inventory = AsyncInventory(_make_conn(AsyncConnection, _Devices([])))
+    await inventory.stop()
+
+    with pytest.raises(exceptions.IpsdkError, match="positive"):
+        await inventory.start(interval=0)
+
+    await inventory.start(interval=60)
+    with pytest.raises(exceptions.IpsdkError, match="already running"):
+        await inventory.start(interval=60)
+    await inventory.stop()
+    assert inventory._task is None
@@ -0,0 +1,504 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.jobs import AsyncJobWaiter
+from ipsdk.jobs import Backoff
+from ipsdk.jobs import JobWaiter
+from ipsdk.jobs import JobWatcher
+
+# --------- Stand-in Platform Server ---------
+
+
+class _JobServer(ThreadingHTTPServer):
+    """Local stand-in for the Platform job status endpoint.
+
+    Each job reports "running" until its duration has elapsed since the
+    first poll and "complete" afterwards. Polls are counted per job.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _JobHandler)
+        self.durations = {}
+        self.started = {}
+        self.polls = {}
+        self.lock = threading.Lock()
+
+    def add_job(self, job_id, duration, status="complete"):
+        self.durations[job_id] = (duration, status)
+
+    def job(self, job_id):
+        with self.lock:
+            now = time.monotonic()
+            started = self.started.setdefault(job_id, now)
+            self.polls[job_id] = self.polls.get(job_id, 0) + 1
+        duration, final = self.durations[job_id]
+        status = final if now - started >= duration else "running"
+        return {"_id": job_id, "status": status}
+
+
+class _JobHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        job_id = self.path.rsplit("/", 1)[-1]
+        if job_id not in self.server.durations:
+            self._send(404, {"message": "not found"})
+        else:
+            self._send(200, {"message": "ok", "data": self.server.job(job_id)})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = _JobServer()
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _connect(cls, server):
+    return cls("127.0.0.1", port=server.server_address[1], use_tls=False)
+
+
+# --------- Backoff Tests ---------
+
+
+def test_backoff_intervals_grow_to_cap():
+    """Test intervals grow exponentially and stop at the cap."""
+    intervals = Backoff(initial=0.1, maximum=1, factor=2, jitter=0).intervals()
+    assert [round(next(intervals), 3) for _ in range(6)] == [
+        0.1,
+        0.2,
+        0.4,
+        0.8,
+        1.0,
+        1.0,
+    ]
+
+
+def test_backoff_jitter_bounds():
+    """Test jitter keeps intervals within the configured range."""
+    intervals = Backoff(initial=1, maximum=1, jitter=0.2).intervals()
+    values = [next(intervals) for _ in range(200)]
+    assert all(0.8 <= v <= 1.2 for v in values)
+    assert len(set(values)) > 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"initial": 0},
+        {"initial": 2, "maximum": 1},
+        {"factor": 0.5},
+        {"jitter": 1},
+        {"jitter": -0.1},
+    ],
+)
+def test_backoff_invalid(kwargs):
+    """Test invalid backoff settings are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        Backoff(**kwargs)
+
+
+def test_backoff_repr():
+    """Test Backoff string representation."""
+    assert repr(Backoff()) == "Backoff(initial=0.25, maximum=10, factor=2, jitter=0.1)"
+
+
+# --------- JobWaiter Tests ---------
+
+
+def test_job_waiter_encodes_job_id():
+    """Test job IDs are percent-encoded into the status path."""
+    waiter = JobWaiter(Connection("example.com"))
+    assert waiter._job_path("a/b c") == "/operations-manager/jobs/a%2Fb%20c"
+
+
+def test_job_waiter_returns_final_document(server):
+    """Test the waiter returns the final job document."""
+    server.add_job("job1", 0)
+    waiter = JobWaiter(_connect(Connection, server))
+
+    assert waiter.wait("job1") == {"_id": "job1", "status": "complete"}
+    assert waiter.polls == 1
+
+
+def test_job_waiter_polling_is_efficient(server):
+    """Test adaptive polling uses few requests and notices completion quickly."""
+    server.add_job("job1", 0.6)
+    backoff = Backoff(initial=0.02, maximum=0.2, jitter=0)
+    waiter = JobWaiter(_connect(Connection, server), backoff=backoff)
+
+    started = time.monotonic()
+    job = waiter.wait("job1", timeout=5)
+    elapsed = time.monotonic() - started
+
+    assert job["status"] == "complete"
+    # Fixed 20ms polling would need about 30 requests
+    assert server.polls["job1"] <= 10
+    assert elapsed < 0.6 + 0.2 + 0.2
+
+
+def test_job_waiter_error_status_is_final(server):
+    """Test error and canceled statuses end the wait."""
+    server.add_job("job1", 0, status="error")
+    waiter = JobWaiter(_connect(Connection, server))
+    assert waiter.wait("job1")["status"] == "error"
+
+
+def test_job_waiter_timeout(server):
+    """Test a wait exceeding its timeout raises WaitTimeoutError."""
+    server.add_job("job1", 60)
+    backoff = Backoff(initial=0.02, maximum=0.05)
+    waiter = JobWaiter(_connect(Connection, server), backoff=backoff)
+
+    started = time.monotonic()
+    with pytest.raises(exceptions.WaitTimeoutError) as exc_info:
+        waiter.wait("job1", timeout=0.2)
+
+    assert time.monotonic() - started < 1
+    assert exc_info.value.document["status"] == "running"
+    assert "running" in str(exc_info.value)
+
+
+def test_job_waiter_cancel(server):
+    """Test setting the cancel event abandons the wait promptly."""
+    server.add_job("job1", 60)
+    waiter = JobWaiter(_connect(Connection, server), backoff=Backoff(initial=5))
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+
+    started = time.monotonic()
+    with pytest.raises(exceptions.WaitCancelledError):
+        waiter.wait("job1", cancel=cancel)
+    assert time.monotonic() - started < 2
+
+
+def test_job_waiter_custom_locations(server):
+    """Test custom paths, document and status locations."""
+    server.add_job("job1", 0)
+    waiter = JobWaiter(
+        _connect(Connection, server),
+        path="/custom/{job_id}",
+        document_key="",
+        status_key="data.status",
+        terminal={"complete"},
+    )
+    assert waiter.wait("job1")["data"]["status"] == "complete"
+
+
+def test_job_waiter_uses_body_without_document_key(server):
+    """Test the whole body is the job document when document_key is absent."""
+    server.add_job("job1", 0)
+    waiter = JobWaiter(
+        _connect(Connection, server), document_key="job", status_key="data.status"
+    )
+    assert waiter.wait("job1") == {
+        "message": "ok",
+        "data": {"_id": "job1", "status": "complete"},
+    }
+
+
+def test_job_waiter_unset_cancel_keeps_polling(server):
+    """Test a cancel event that is never set does not end the wait."""
+    server.add_job("job1", 0.1)
+    backoff = Backoff(initial=0.02, maximum=0.05, jitter=0)
+    waiter = JobWaiter(_connect(Connection, server), backoff=backoff)
+
+    job = waiter.wait("job1", timeout=5, cancel=threading.Event())
+
+    assert job["status"] == "complete"
+    assert waiter.polls > 1
+
+
+def test_job_waiter_http_errors_propagate(server):
+    """Test status request failures are raised."""
+    waiter = JobWaiter(_connect(Connection, server))
+    with pytest.raises(exceptions.HTTPStatusError):
+        waiter.wait("missing")
+
+
+# --------- AsyncJobWaiter Tests ---------
+
+
+@pytest.mark.asyncio
+async def test_async_job_waiter(server):
+    """Test the async waiter polls adaptively until completion."""
+    server.add_job("job1", 0.3)
+    backoff = Backoff(initial=0.02, maximum=0.2, jitter=0)
+    waiter = AsyncJobWaiter(_connect(AsyncConnection, server), backoff=backoff)
+
+    job = await waiter.wait("job1", timeout=5)
+
+    assert job["status"] == "complete"
+    assert server.polls["job1"] <= 8
+
+
+@pytest.mark.asyncio
+async def test_async_job_waiter_timeout(server):
+    """Test the async waiter raises WaitTimeoutError."""
+    server.add_job("job1", 60)
+    waiter = AsyncJobWaiter(
+        _connect(AsyncConnection, server), backoff=Backoff(initial=0.02, maximum=0.05)
+    )
+    with pytest.raises(exceptions.WaitTimeoutError):
+        await waiter.wait("job1", timeout=0.2)
+
+
+@pytest.mark.asyncio
+async def test_async_job_waiter_cancel_event(server):
+    """Test setting the cancel event abandons the async wait."""
+    server.add_job("job1", 60)
+    waiter = AsyncJobWaiter(
+        _connect(AsyncConnection, server), backoff=Backoff(initial=5)
+    )
+    cancel = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.1, cancel.set)
+
+    with pytest.raises(exceptions.WaitCancelledError):
+        await asyncio.wait_for(waiter.wait("job1", cancel=cancel), 2)
+
+
+@pytest.mark.asyncio
+async def test_async_job_waiter_unset_cancel_keeps_polling(server):
+    """Test an async cancel event that is never set does not end the wait."""
+    server.add_job("job1", 0.1)
+    backoff = Backoff(initial=0.02, maximum=0.05, jitter=0)
+    waiter = AsyncJobWaiter(_connect(AsyncConnection, server), backoff=backoff)
+
+    job = await waiter.wait("job1", timeout=5, cancel=asyncio.Event())
+
+    assert job["status"] == "complete"
+    assert waiter.polls > 1
+
+
+@pytest.mark.asyncio
+async def test_async_job_waiter_task_cancel(server):
+    """Test cancelling the awaiting task stops the wait."""
+    server.add_job("job1", 60)
+    waiter = AsyncJobWaiter(
+        _connect(AsyncConnection, server), backoff=Backoff(initial=5)
+    )
+    task = asyncio.ensure_future(waiter.wait("job1"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+# --------- JobWatcher Tests ---------
+
+
+def _watcher_conn(handler):
+    conn = AsyncConnection("example.com")
+    conn.authenticated = True
+    conn.client = httpx.AsyncClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+def _fast_backoff():
+    return Backoff(initial=0.001, maximum=0.005, jitter=0)
+
+
+class _FakeJobs:
+    """Jobs finishing after a number of status lookups."""
+
+    def __init__(self, count):
+        self.remaining = {f"job{i}": i % 4 for i in range(count)}
+        self.requests = []
+
+    def document(self, job_id):
+        left = self.remaining[job_id]
+        self.remaining[job_id] = max(left - 1, 0)
+        return {"_id": job_id, "status": "running" if left else "complete"}
+
+    async def batch_handler(self, request):
+        ids = request.url.params["in[_id]"].split(",")
+        self.requests.append(len(ids))
+        assert int(request.url.params["limit"]) == len(ids)
+        return httpx.Response(
+            200, json={"data": [self.document(i) for i in ids], "metadata": {}}
+        )
+
+    async def job_handler(self, request):
+        self.requests.append(1)
+        job_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"data": self.document(job_id)})
+
+
+def test_job_watcher_invalid_options():
+    """Test invalid watcher options are rejected."""
+    conn = AsyncConnection("example.com")
+    with pytest.raises(exceptions.IpsdkError):
+        JobWatcher(conn, batch_size=0)
+    with pytest.raises(exceptions.IpsdkError):
+        JobWatcher(conn, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_batches_requests():
+    """Test jobs are polled with batched list queries."""
+    jobs = _FakeJobs(250)
+    watcher = JobWatcher(
+        _watcher_conn(jobs.batch_handler), batch_size=100, backoff=_fast_backoff()
+    )
+
+    finished = [job_id async for job_id, _ in watcher.watch(jobs.remaining)]
+
+    assert sorted(finished) == sorted(jobs.remaining)
+    # Four rounds with a shrinking number of unfinished jobs
+    assert jobs.requests[:3] == [100, 100, 50]
+    assert watcher.polls == len(jobs.requests) <= 12
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_individual_polling_with_cap():
+    """Test jobs are polled individually under the concurrency cap."""
+    jobs = _FakeJobs(40)
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return await jobs.job_handler(request)
+
+    watcher = JobWatcher(
+        _watcher_conn(handler),
+        batch_path=None,
+        max_concurrency=5,
+        backoff=_fast_backoff(),
+    )
+    results = await watcher.run(jobs.remaining)
+
+    assert set(results) == set(jobs.remaining)
+    assert all(doc["status"] == "complete" for doc in results.values())
+    assert peak <= 5
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_callbacks():
+    """Test sync and async callbacks are invoked for every completion."""
+    jobs = _FakeJobs(10)
+    watcher = JobWatcher(_watcher_conn(jobs.batch_handler), backoff=_fast_backoff())
+    seen = []
+
+    async def on_complete(job_id, document):
+        seen.append(job_id)
+
+    await watcher.run(jobs.remaining, on_complete)
+    assert sorted(seen) == sorted(jobs.remaining)
+
+    seen.clear()
+    jobs = _FakeJobs(3)
+    watcher.connection = _watcher_conn(jobs.batch_handler)
+    await watcher.run(jobs.remaining, lambda job_id, _: seen.append(job_id))
+    assert sorted(seen) == sorted(jobs.remaining)
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_timeout_reports_pending():
+    """Test the timeout error lists the unfinished jobs."""
+
+    async def handler(request):
+        ids = request.url.params["in[_id]"].split(",")
+        return httpx.Response(
+            200, json={"data": [{"_id": i, "status": "running"} for i in ids]}
+        )
+
+    watcher = JobWatcher(_watcher_conn(handler), backoff=_fast_backoff())
+    with pytest.raises(exceptions.WaitTimeoutError) as exc_info:
+        await watcher.run(["a", "b"], timeout=0.05)
+    assert exc_info.value.document == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_rejects_non_list():
+    """Test a batch response without a job list raises IpsdkError."""
+
+    async def handler(request):
+        return httpx.Response(200, json={"data": {}})
+
+    watcher = JobWatcher(_watcher_conn(handler))
+    with pytest.raises(exceptions.IpsdkError):
+        await watcher.run(["a"])
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_polls_jobs_missing_from_batch():
+    """Test jobs missing from a batch response are requested individually."""
+    paths = []
+
+    async def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/operations-manager/jobs":
+            return httpx.Response(
+                200, json={"data": [{"_id": "a", "status": "running"}]}
+            )
+        job_id = request.url.path.rsplit("/", 1)[-1]
+        if job_id == "gone":
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"data": {"_id": job_id, "status": "error"}})
+
+    watcher = JobWatcher(_watcher_conn(handler), backoff=_fast_backoff())
+    watch = watcher.watch(["a", "b"])
+    assert await anext(watch) == ("b", {"_id": "b", "status": "error"})
+    assert paths == ["/operations-manager/jobs", "/operations-manager/jobs/b"]
+    await watch.aclose()
+
+    with pytest.raises(exceptions.HTTPStatusError):
+        await asyncio.wait_for(watcher.run(["a", "gone"]), 2)
+
+
+@pytest.mark.asyncio
+async def test_job_watcher_ignores_unrequested_and_repeated_jobs():
+    """Test batch documents for other or repeated job IDs are skipped."""
+    queries = []
+
+    async def handler(request):
+        queries.append(dict(request.url.params))
+        done = {"_id": "a", "status": "complete"}
+        other = {"_id": "z", "status": "complete"}
+        return httpx.Response(200, json={"data": [done, other, done]})
+
+    watcher = JobWatcher(_watcher_conn(handler), limit_param=None)
+
+    assert await watcher.run(["a"]) == {"a": {"_id": "a", "status": "complete"}}
+    assert await watcher.run([]) == {}
+    assert queries == [{"in[_id]": "a"}]
@@ -10,6 +10,7 @@ import unittest.mock
 
 import pytest
 
+from ipsdk import codec
 from ipsdk import exceptions
 from ipsdk import jsonutils
 
@@ -117,6 +118,18 @@ def test_dumps_valid_dict():
     assert parsed == data
 
 
+@pytest.mark.parametrize("backend", ["json", "auto"])
+def test_dumps_matches_json_dumps(backend):
+    """Test dumps output is the same as json.dumps whichever codec is active."""
+    codec.set_codec(backend)
+    try:
+        data = {"a": "\u00e9", "b": [1, 2], "x": float("nan")}
+        assert jsonutils.dumps(data) == json.dumps(data)
+        assert jsonutils.dumps(data).startswith('{"a": "\\u00e9", "b": [1, 2]')
+    finally:
+        codec.set_codec()
+
+
 def test_dumps_valid_list():
     """Test dumping a valid list to JSON."""
     data = [1, 2, 3, 4]
@@ -369,6 +382,17 @@ def test_dumps_unexpected_error():
         assert "Unexpected error serializing JSON" in str(exc_info.value)
 
 
+def test_loads_unexpected_error():
+    """Test loads reports codec errors other than ValueError."""
+    with unittest.mock.patch("ipsdk.codec.decode") as mock_loads:
+        mock_loads.side_effect = RuntimeError("Unexpected error during parsing")
+
+        with pytest.raises(exceptions.SerializationError) as exc_info:
+            jsonutils.loads('{"test": "data"}')
+
+        assert "Unexpected error parsing JSON" in str(exc_info.value)
+
+
 def test_loads_very_long_string():
     """Test loading JSON with very long string values."""
     long_string = "x" * 10000
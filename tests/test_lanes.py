@@ -0,0 +1,305 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.background import BackgroundConnection
+from ipsdk.cache import ResponseCache
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.fleet import Fleet
+from ipsdk.lanes import AsyncLaneLimiter
+from ipsdk.lanes import LaneLimiter
+from ipsdk.lanes import current_lane
+from ipsdk.lanes import priority
+from ipsdk.lanes import run_in_lane
+
+
+def _make_conn(cls, handler, **kwargs):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com", **kwargs)
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+# --------- Context ---------
+
+
+def test_priority_sets_and_restores_lane():
+    """Test priority() sets the lane for the enclosed code only."""
+    assert current_lane() is None
+    with priority("bulk"):
+        assert current_lane() == "bulk"
+        with priority(None):
+            assert current_lane() is None
+        assert current_lane() == "bulk"
+    assert current_lane() is None
+
+
+def test_priority_is_per_thread():
+    """Test a lane set in one thread does not leak into another."""
+    seen = []
+    with priority("bulk"):
+        thread = threading.Thread(target=lambda: seen.append(current_lane()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+@pytest.mark.asyncio
+async def test_run_in_lane():
+    """Test run_in_lane() awaits a coroutine in the given lane."""
+
+    async def lane():
+        return current_lane()
+
+    assert await run_in_lane("bulk", lane()) == "bulk"
+    assert current_lane() is None
+
+
+# --------- Limiters ---------
+
+
+def test_limiter_rejects_invalid_shares():
+    """Test empty lane maps and non-positive shares are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        LaneLimiter({})
+    with pytest.raises(exceptions.IpsdkError):
+        AsyncLaneLimiter({"bulk": 0})
+
+
+def test_limiter_rejects_unknown_lane():
+    """Test holding a slot in an unconfigured lane raises IpsdkError."""
+    limiter = LaneLimiter({"bulk": 1})
+    with priority("other"), pytest.raises(exceptions.IpsdkError), limiter.hold():
+        pass
+
+
+def test_limiter_bounds_lane_and_skips_unlaned():
+    """Test a lane is capped at its share while unlaned calls never wait."""
+    limiter = LaneLimiter({"bulk": 2})
+    lock = threading.Lock()
+    peak = {"active": 0, "max": 0}
+
+    def bulk_call():
+        with priority("bulk"), limiter.hold():
+            with lock:
+                peak["active"] += 1
+                peak["max"] = max(peak["max"], peak["active"])
+            time.sleep(0.05)
+            with lock:
+                peak["active"] -= 1
+
+    threads = [threading.Thread(target=bulk_call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    time.sleep(0.01)
+
+    started = time.monotonic()
+    with limiter.hold():
+        unlaned = time.monotonic() - started
+    assert limiter.active["bulk"] == 2
+    assert limiter.waiting["bulk"] == 4
+
+    for t in threads:
+        t.join()
+
+    assert peak["max"] == 2
+    assert unlaned < 0.05
+    assert limiter.active == {"bulk": 0}
+    assert limiter.waiting == {"bulk": 0}
+
+
+# --------- Connections ---------
+
+
+def test_connection_without_lanes():
+    """Test connections have no lane limiter unless lanes are configured."""
+    assert Connection("example.com").lanes is None
+    assert isinstance(Connection("example.com", lanes={"a": 1}).lanes, LaneLimiter)
+    assert isinstance(
+        AsyncConnection("example.com", lanes={"a": 1}).lanes, AsyncLaneLimiter
+    )
+
+
+def test_sync_connection_limits_lane():
+    """Test a sync connection sends at most the lane share concurrently."""
+    lock = threading.Lock()
+    inflight = {"now": 0, "max": 0}
+
+    def handler(request):
+        with lock:
+            inflight["now"] += 1
+            inflight["max"] = max(inflight["max"], inflight["now"])
+        time.sleep(0.02)
+        with lock:
+            inflight["now"] -= 1
+        return httpx.Response(200, json={})
+
+    conn = _make_conn(Connection, handler, lanes={"bulk": 2})
+
+    def bulk_get():
+        with priority("bulk"):
+            conn.get("/x")
+
+    threads = [threading.Thread(target=bulk_get) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert inflight["max"] == 2
+
+    with priority("missing"), pytest.raises(exceptions.IpsdkError):
+        conn.get("/x")
+
+
+@pytest.mark.asyncio
+async def test_async_connection_interactive_bypasses_bulk_queue():
+    """Test unlaned requests complete while the bulk lane is saturated."""
+    release = asyncio.Event()
+    order = []
+
+    async def handler(request):
+        if request.url.path == "/bulk":
+            await release.wait()
+        order.append(request.url.path)
+        return httpx.Response(200, json={})
+
+    conn = _make_conn(AsyncConnection, handler, lanes={"bulk": 2})
+
+    async def bulk_get():
+        with priority("bulk"):
+            await conn.get("/bulk")
+
+    bulk = [asyncio.ensure_future(bulk_get()) for _ in range(10)]
+    await asyncio.sleep(0.01)
+    assert conn.lanes.active["bulk"] == 2
+    assert conn.lanes.waiting["bulk"] == 8
+
+    await asyncio.wait_for(conn.get("/interactive"), timeout=1)
+    assert order == ["/interactive"]
+
+    release.set()
+    await asyncio.gather(*bulk)
+    assert order.count("/bulk") == 10
+    assert conn.lanes.active["bulk"] == 0
+
+
+def test_background_connection_carries_lane():
+    """Test submitted requests run in the lane of the calling thread."""
+    seen = []
+
+    async def handler(request):
+        seen.append(current_lane())
+        return httpx.Response(200, json={})
+
+    engine = BackgroundConnection(
+        _make_conn(AsyncConnection, handler, lanes={"bulk": 1})
+    )
+    try:
+        with priority("bulk"):
+            engine.get("/x")
+        engine.get("/y")
+    finally:
+        engine.close()
+
+    assert seen == ["bulk", None]
+
+
+# --------- Background work ---------
+
+
+def _lane_handler(seen):
+    """Return a handler recording the lane of each request by path."""
+
+    def handler(request):
+        seen.append((request.url.path, current_lane()))
+        params = request.url.params
+        if "skip" in params:
+            skip = int(params["skip"])
+            return httpx.Response(200, json={"results": [skip], "total": 3})
+        return httpx.Response(
+            200, headers={"etag": '"v1"', "cache-control": "max-age=0"}, json={}
+        )
+
+    return handler
+
+
+def test_prefetched_pages_run_in_caller_lane():
+    """Test pages read ahead in worker threads keep the caller's lane."""
+    seen = []
+    conn = _make_conn(Connection, _lane_handler(seen), lanes={"bulk": 2})
+
+    with priority("bulk"):
+        items = list(conn.paginate("/items", page_size=1, prefetch=2))
+
+    assert items == [0, 1, 2]
+    assert {lane for _, lane in seen} == {"bulk"}
+
+
+def test_write_behind_sends_in_submitter_lane():
+    """Test buffered writes are sent in the lane they were submitted from."""
+    seen = []
+    conn = _make_conn(Connection, _lane_handler(seen), lanes={"bulk": 1})
+
+    with conn.write_behind(concurrency=2) as writes:
+        with priority("bulk"):
+            writes.post("/bulk")
+        writes.post("/interactive")
+
+    assert sorted(seen) == [("/bulk", "bulk"), ("/interactive", None)]
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_sends_in_submitter_lane():
+    """Test async buffered writes are sent in the lane they were submitted from."""
+    seen = []
+    conn = _make_conn(AsyncConnection, _lane_handler(seen), lanes={"bulk": 1})
+
+    writes = conn.write_behind()
+    with priority("bulk"):
+        await writes.post("/bulk")
+    await writes.post("/interactive")
+    await writes.aclose()
+
+    assert sorted(seen) == [("/bulk", "bulk"), ("/interactive", None)]
+
+
+def test_stale_refresh_runs_in_caller_lane():
+    """Test a background revalidation keeps the lane of the stale read."""
+    seen = []
+    cache = ResponseCache(max_stale=60)
+    conn = _make_conn(Connection, _lane_handler(seen), cache=cache)
+    conn.get("/dashboard")
+
+    with priority("bulk"):
+        conn.get("/dashboard")
+
+    deadline = time.monotonic() + 5
+    while (len(seen) < 2 or cache.refreshing) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert seen == [("/dashboard", None), ("/dashboard", "bulk")]
+
+
+def test_fleet_calls_run_in_caller_lane():
+    """Test fleet calls in worker threads keep the caller's lane."""
+    seen = []
+    gateway = _make_conn(Connection, _lane_handler(seen))
+
+    with Fleet({"gw1": gateway}) as fleet, priority("bulk"):
+        list(fleet.request("GET", "/devices"))
+
+    assert seen == [("/devices", "bulk")]
@@ -0,0 +1,421 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.pagination import AsyncPaginator
+from ipsdk.pagination import Paginator
+from ipsdk.pagination import extract
+
+ITEMS = [{"id": i} for i in range(25)]
+
+
+def _make_conn(cls, handler):
+    conn = cls("example.com")
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+def _offset_handler(requests, total=True, items=ITEMS):
+    def handler(request):
+        params = request.url.params
+        requests.append(dict(params))
+        limit = int(params["limit"])
+        skip = int(params["skip"])
+        body = {"results": items[skip : skip + limit]}
+        if total:
+            body["total"] = len(items)
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def _cursor_handler(requests):
+    def handler(request):
+        params = request.url.params
+        requests.append(dict(params))
+        start = int(params.get("after", 0))
+        limit = int(params["limit"])
+        page = ITEMS[start : start + limit]
+        following = start + limit
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "items": page,
+                    "next": str(following) if following < len(ITEMS) else None,
+                }
+            },
+        )
+
+    return handler
+
+
+# --------- extract Tests ---------
+
+
+def test_extract():
+    """Test values are read by dotted path or callable."""
+    data = {"a": {"b": [1, 2]}, "total": 3}
+    assert extract(data, "a.b") == [1, 2]
+    assert extract(data, "a.missing.c") is None
+    assert extract(data, "") is data
+    assert extract(data, None) is None
+    assert extract(data, lambda d: d["total"] * 2) == 6
+    assert extract([1, 2], "a") is None
+
+
+# --------- Paginator Tests ---------
+
+
+def test_paginator_invalid_options():
+    """Test invalid pagination options raise IpsdkError."""
+    conn = Connection("example.com")
+    with pytest.raises(exceptions.IpsdkError):
+        Paginator(conn, "/items", style="page")
+    with pytest.raises(exceptions.IpsdkError):
+        Paginator(conn, "/items", page_size=0)
+    with pytest.raises(exceptions.IpsdkError):
+        Paginator(conn, "/items", max_items=0)
+
+
+def test_paginator_offset_with_total():
+    """Test offset pagination stops once the reported total is reached."""
+    requests = []
+    conn = _make_conn(Connection, _offset_handler(requests))
+    paginator = conn.paginate("/items", params={"sort": "id"}, page_size=10)
+
+    assert isinstance(paginator, Paginator)
+    assert list(paginator) == ITEMS
+    assert paginator.total == 25
+    assert requests == [
+        {"sort": "id", "limit": "10", "skip": "0"},
+        {"sort": "id", "limit": "10", "skip": "10"},
+        {"sort": "id", "limit": "10", "skip": "20"},
+    ]
+
+
+def test_paginator_offset_without_total():
+    """Test offset pagination stops at the first short page."""
+    requests = []
+    handler = _offset_handler(requests, total=False, items=ITEMS[:20])
+    conn = _make_conn(Connection, handler)
+
+    assert list(conn.paginate("/items", page_size=10)) == ITEMS[:20]
+    assert len(requests) == 3
+
+
+def test_paginator_custom_parameter_names():
+    """Test parameter names and item locations are configurable."""
+    requests = []
+
+    def handler(request):
+        requests.append(dict(request.url.params))
+        return httpx.Response(200, json=[{"id": 1}])
+
+    conn = _make_conn(Connection, handler)
+    items = list(
+        conn.paginate(
+            "/items",
+            limit_param="pageSize",
+            offset_param="offset",
+            items_key="",
+            total_key=None,
+            page_size=5,
+        )
+    )
+
+    assert items == [{"id": 1}]
+    assert requests == [{"pageSize": "5", "offset": "0"}]
+
+
+def test_paginator_cursor():
+    """Test cursor pagination follows the next cursor until it is missing."""
+    requests = []
+    conn = _make_conn(Connection, _cursor_handler(requests))
+    paginator = conn.paginate(
+        "/items",
+        style="cursor",
+        cursor_param="after",
+        items_key="data.items",
+        next_cursor_key="data.next",
+        page_size=10,
+    )
+
+    assert list(paginator) == ITEMS
+    assert [r.get("after") for r in requests] == [None, "10", "20"]
+
+
+def test_paginator_pages_and_max_items():
+    """Test pages() yields lists and max_items stops early."""
+    requests = []
+    conn = _make_conn(Connection, _offset_handler(requests))
+
+    pages = list(conn.paginate("/items", page_size=10).pages())
+    assert [len(p) for p in pages] == [10, 10, 5]
+
+    requests.clear()
+    assert list(conn.paginate("/items", page_size=10, max_items=12)) == ITEMS[:12]
+    assert len(requests) == 2
+
+
+def test_paginator_is_lazy():
+    """Test pages are only requested as iteration proceeds."""
+    requests = []
+    conn = _make_conn(Connection, _offset_handler(requests))
+    iterator = iter(conn.paginate("/items", page_size=10))
+
+    assert requests == []
+    next(iterator)
+    assert len(requests) == 1
+
+
+def test_paginator_rejects_non_list_items():
+    """Test a response without a list of items raises IpsdkError."""
+
+    def handler(request):
+        return httpx.Response(200, json={"results": {"id": 1}})
+
+    conn = _make_conn(Connection, handler)
+    with pytest.raises(exceptions.IpsdkError):
+        list(conn.paginate("/items"))
+
+
+def test_paginator_repr():
+    """Test paginator string representation."""
+    paginator = Paginator(Connection("example.com"), "/items", page_size=5)
+    assert repr(paginator) == "Paginator(path='/items', style='offset', page_size=5)"
+
+
+# --------- AsyncPaginator Tests ---------
+
+
+@pytest.mark.asyncio
+async def test_async_paginator_offset():
+    """Test async offset pagination yields every item in order."""
+    requests = []
+    sync_handler = _offset_handler(requests)
+
+    async def handler(request):
+        return sync_handler(request)
+
+    conn = _make_conn(AsyncConnection, handler)
+    paginator = conn.paginate("/items", page_size=10)
+
+    assert isinstance(paginator, AsyncPaginator)
+    assert [item async for item in paginator] == ITEMS
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_paginator_cursor_pages():
+    """Test async cursor pagination yields pages."""
+    requests = []
+    sync_handler = _cursor_handler(requests)
+
+    async def handler(request):
+        return sync_handler(request)
+
+    conn = _make_conn(AsyncConnection, handler)
+    paginator = conn.paginate(
+        "/items",
+        style="cursor",
+        cursor_param="after",
+        items_key="data.items",
+        next_cursor_key="data.next",
+        page_size=10,
+    )
+
+    pages = [page async for page in paginator.pages()]
+    assert [len(p) for p in pages] == [10, 10, 5]
+
+
+# --------- Read-Ahead Tests ---------
+
+
+class _ConcurrencyTracker:
+    """Record the peak number of concurrent page requests."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.skips = []
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.active -= 1
+
+
+def _slow_offset_handler(tracker, items, total=True, cap=None, delay=0.01):
+    def handler(request):
+        with tracker:
+            params = request.url.params
+            limit = int(params["limit"])
+            if cap is not None:
+                limit = min(limit, cap)
+            skip = int(params["skip"])
+            tracker.skips.append(skip)
+            time.sleep(delay)
+            body = {"results": items[skip : skip + limit]}
+            if total:
+                body["total"] = len(items)
+            return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_paginator_invalid_prefetch():
+    """Test prefetch must not be negative."""
+    with pytest.raises(exceptions.IpsdkError):
+        Paginator(Connection("example.com"), "/items", prefetch=-1)
+
+
+def test_paginator_prefetch_parallel_and_ordered():
+    """Test pages are fetched concurrently once the total is known."""
+    items = [{"id": i} for i in range(200)]
+    tracker = _ConcurrencyTracker()
+    conn = _make_conn(Connection, _slow_offset_handler(tracker, items))
+
+    result = list(conn.paginate("/items", page_size=10, prefetch=4))
+
+    assert result == items
+    assert 1 < tracker.peak <= 4
+    assert sorted(tracker.skips) == list(range(0, 200, 10))
+
+
+def test_paginator_prefetch_without_total_reads_one_ahead():
+    """Test only one page is read ahead when no total is reported."""
+    items = [{"id": i} for i in range(45)]
+    tracker = _ConcurrencyTracker()
+    handler = _slow_offset_handler(tracker, items, total=False)
+    conn = _make_conn(Connection, handler)
+
+    assert list(conn.paginate("/items", page_size=10, prefetch=4)) == items
+    assert tracker.peak == 1
+    assert tracker.skips == [0, 10, 20, 30, 40]
+
+
+def test_paginator_prefetch_replans_capped_pages():
+    """Test a server capping the page size does not cause skipped items."""
+    items = [{"id": i} for i in range(50)]
+    tracker = _ConcurrencyTracker()
+    handler = _slow_offset_handler(tracker, items, cap=5, delay=0)
+    conn = _make_conn(Connection, handler)
+
+    assert list(conn.paginate("/items", page_size=10, prefetch=3)) == items
+
+
+def test_paginator_prefetch_cursor():
+    """Test cursor pagination with read-ahead yields every item in order."""
+    requests = []
+    conn = _make_conn(Connection, _cursor_handler(requests))
+    paginator = conn.paginate(
+        "/items",
+        style="cursor",
+        cursor_param="after",
+        items_key="data.items",
+        next_cursor_key="data.next",
+        page_size=10,
+        prefetch=2,
+    )
+
+    assert list(paginator) == ITEMS
+    assert [r.get("after") for r in requests] == [None, "10", "20"]
+
+
+def test_paginator_prefetch_max_items_and_early_exit():
+    """Test read-ahead respects max_items and stops when iteration ends."""
+    items = [{"id": i} for i in range(100)]
+    tracker = _ConcurrencyTracker()
+    conn = _make_conn(Connection, _slow_offset_handler(tracker, items, delay=0))
+
+    result = list(conn.paginate("/items", page_size=10, prefetch=4, max_items=25))
+    assert result == items[:25]
+    assert max(tracker.skips) < 30
+
+    tracker.skips.clear()
+    iterator = iter(conn.paginate("/items", page_size=10, prefetch=2))
+    assert next(iterator) == items[0]
+    iterator.close()
+    assert len(tracker.skips) <= 3
+
+
+def test_paginator_prefetch_error_propagates():
+    """Test a failed page request is raised in order."""
+
+    def handler(request):
+        skip = int(request.url.params["skip"])
+        if skip == 20:
+            return httpx.Response(500)
+        return httpx.Response(
+            200, json={"results": ITEMS[skip : skip + 10], "total": len(ITEMS)}
+        )
+
+    conn = _make_conn(Connection, handler)
+    seen = []
+    with pytest.raises(exceptions.HTTPStatusError):
+        seen.extend(conn.paginate("/items", page_size=10, prefetch=3))
+    assert seen == ITEMS[:20]
+
+
+@pytest.mark.asyncio
+async def test_async_paginator_prefetch():
+    """Test async read-ahead fetches pages concurrently and in order."""
+    items = [{"id": i} for i in range(100)]
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        skip = int(request.url.params["skip"])
+        return httpx.Response(
+            200, json={"results": items[skip : skip + 10], "total": len(items)}
+        )
+
+    conn = _make_conn(AsyncConnection, handler)
+    result = [item async for item in conn.paginate("/items", page_size=10, prefetch=5)]
+
+    assert result == items
+    assert 1 < peak <= 5
+
+
+@pytest.mark.asyncio
+async def test_async_paginator_prefetch_early_exit():
+    """Test closing an async read-ahead iteration cancels pending pages."""
+    requests = []
+    sync_handler = _offset_handler(requests)
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return sync_handler(request)
+
+    conn = _make_conn(AsyncConnection, handler)
+    pages = conn.paginate("/items", page_size=5, prefetch=3).pages()
+    assert await pages.__anext__() == ITEMS[:5]
+    await pages.aclose()
+    await asyncio.sleep(0.05)
+    assert len(requests) <= 4
@@ -0,0 +1,116 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import Connection
+from ipsdk.http import HTTPMethod
+from ipsdk.paths import PathTemplate
+from ipsdk.paths import path_template
+
+# --------- Templates ---------
+
+
+def test_template_fields_and_repr():
+    """Test placeholders are parsed into ordered field names."""
+    template = PathTemplate("/devices/{device}/groups/{group}")
+    assert template.fields == ("device", "group")
+    assert repr(template) == "PathTemplate('/devices/{device}/groups/{group}')"
+
+
+@pytest.mark.parametrize(
+    "template",
+    ["/a/{id", "/a/}", "/a/{}", "/a/{0}", "/a/{id:d}", "/a/{id!r}", "/a/{x.y}", 7],
+)
+def test_template_rejects_invalid_placeholders(template):
+    """Test malformed, positional and formatted placeholders are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        PathTemplate(template)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("Backup / Daily", "Backup%20%2F%20Daily"),
+        ("a?b#c&d=e", "a%3Fb%23c%26d%3De"),
+        ("100%", "100%25"),
+        ("..", ".."),
+        ("café", "caf%C3%A9"),
+        (42, "42"),
+    ],
+)
+def test_format_encodes_single_segment(value, expected):
+    """Test values are percent-encoded as one path segment."""
+    template = path_template("/workflow_builder/workflows/{name}/export")
+    assert template.format(name=value) == (
+        f"/workflow_builder/workflows/{expected}/export"
+    )
+
+
+def test_format_missing_and_literal_braces():
+    """Test missing variables raise and doubled braces are literal."""
+    with pytest.raises(exceptions.IpsdkError, match="'name'"):
+        path_template("/workflows/{name}").format(other=1)
+
+    assert path_template("/search/{{raw}}").format() == "/search/{raw}"
+    assert path_template("/a/{{b}}/{c}").format(c="d") == "/a/{b}/d"
+
+
+def test_path_template_is_cached():
+    """Test the same template string is parsed only once."""
+    assert path_template("/cached/{id}") is path_template("/cached/{id}")
+
+
+# --------- Connections ---------
+
+
+def test_connection_path():
+    """Test connections build encoded paths from cached templates."""
+    conn = Connection("example.com")
+    path = conn.path("/workflow_builder/workflows/{name}", name="a b/c")
+    assert path == "/workflow_builder/workflows/a%20b%2Fc"
+
+    # The template argument is positional-only, so it can be a variable name
+    assert conn.path("/templates/{template}", template="t1") == "/templates/t1"
+
+
+@pytest.mark.parametrize(
+    ("base_path", "path", "expected"),
+    [
+        (None, "/devices", "https://example.com/devices"),
+        ("/api/v2.0", "/devices", "https://example.com/api/v2.0/devices"),
+        ("/api/v2.0/", "/devices", "https://example.com/api/v2.0/devices"),
+        ("/api/v2.0", "devices", "https://example.com/api/v2.0/devices"),
+        ("/api/v2.0", "/devices?limit=5", "https://example.com/api/v2.0/devices"),
+    ],
+)
+def test_build_request_joins_base_path(base_path, path, expected):
+    """Test paths are joined to the base path, with or without a slash."""
+    conn = Connection("example.com", base_path=base_path)
+    request = conn._build_request(HTTPMethod.GET, path, params={"q": "x"})
+
+    assert str(request.url.copy_with(query=None)) == expected
+    assert request.url.params["q"] == "x"
+    assert conn.base_url == expected.rsplit("/devices", 1)[0]
+
+
+def test_encoded_path_reaches_server():
+    """Test an encoded path is sent without being decoded or re-encoded."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.raw_path)
+        return httpx.Response(200, json={})
+
+    conn = Connection("example.com", base_path="/api")
+    conn.authenticated = True
+    conn.client = httpx.Client(
+        base_url="https://example.com/api", transport=httpx.MockTransport(handler)
+    )
+    conn.get(conn.path("/workflows/{name}", name="a/b c%"))
+
+    assert seen == [b"/api/workflows/a%2Fb%20c%25"]
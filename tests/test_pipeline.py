@@ -0,0 +1,215 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.pipeline import Pipeline
+
+
+def _make_conn(handler):
+    """Create an authenticated async connection using a MockTransport."""
+    conn = AsyncConnection("example.com")
+    conn.authenticated = True
+    conn.client = httpx.AsyncClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+# --------- Configuration ---------
+
+
+def test_pipeline_rejects_invalid_options():
+    """Test invalid buffer and concurrency values are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        Pipeline([], buffer=0)
+    with pytest.raises(exceptions.IpsdkError):
+        Pipeline([]).map(str, concurrency=0)
+
+
+def test_pipeline_rejects_stage_after_sink():
+    """Test no stage can be added after a sink."""
+    pipeline = Pipeline([]).sink(print)
+    with pytest.raises(exceptions.IpsdkError):
+        pipeline.map(str)
+    assert "sink print" in repr(pipeline)
+
+
+# --------- Running ---------
+
+
+@pytest.mark.asyncio
+async def test_pipeline_map_filter_iterate():
+    """Test map and filter stages with sync and async functions."""
+
+    async def double(item):
+        await asyncio.sleep(0)
+        return item * 2
+
+    pipeline = (
+        Pipeline(range(10), buffer=2)
+        .map(double, concurrency=3)
+        .filter(lambda item: item % 4 == 0)
+    )
+
+    assert sorted([item async for item in pipeline]) == [0, 4, 8, 12, 16]
+    assert [stage.processed for stage in pipeline.stages] == [10, 10]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_without_stages_and_async_source():
+    """Test a pipeline without stages yields its async source in order."""
+    assert [item async for item in Pipeline(_aiter("abc"))] == ["a", "b", "c"]
+    assert await Pipeline([]).run() == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sink_runs_to_completion():
+    """Test run() drives the sink and returns the number of sunk items."""
+    sunk = []
+
+    async def sink(item):
+        sunk.append(item)
+
+    count = await Pipeline(range(5)).map(str).sink(sink, concurrency=2).run()
+
+    assert count == 5
+    assert sorted(sunk) == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stage_concurrency_is_bounded():
+    """Test a stage never runs more calls than its concurrency."""
+    active = {"now": 0, "max": 0}
+
+    async def slow(item):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.005)
+        active["now"] -= 1
+        return item
+
+    assert await Pipeline(range(20)).map(slow, concurrency=4).run() == 20
+    assert active["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_pipeline_backpressure_bounds_source_reads():
+    """Test bounded queues stop the source from running ahead of a slow sink."""
+    produced = []
+    release = asyncio.Event()
+
+    async def source():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    async def sink(item):
+        await release.wait()
+
+    task = asyncio.ensure_future(Pipeline(source(), buffer=2).sink(sink).run())
+    await asyncio.sleep(0.05)
+
+    # One item in the sink, two buffered before it, one waiting to be put
+    assert len(produced) <= 5
+
+    release.set()
+    assert await task == 100
+
+
+@pytest.mark.asyncio
+async def test_pipeline_error_cancels_everything():
+    """Test the first stage error is raised and other tasks are cancelled."""
+    cancelled = []
+
+    async def slow(item):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    def fail(item):
+        if item == 3:
+            msg = "bad item"
+            raise ValueError(msg)
+        return item
+
+    pipeline = Pipeline(range(10)).map(fail).map(slow, concurrency=2)
+    with pytest.raises(ValueError, match="bad item"):
+        await asyncio.wait_for(pipeline.run(), timeout=5)
+
+    assert sorted(cancelled) == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_source_error_is_raised():
+    """Test an exception raised by the source stops the pipeline."""
+
+    async def source():
+        yield 1
+        msg = "source failed"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        await Pipeline(source()).map(str).run()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_consumer_cancellation_stops_tasks():
+    """Test cancelling the consumer cancels the stage tasks."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow(item):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    task = asyncio.ensure_future(Pipeline(range(3)).sink(slow).run())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_over_connection():
+    """Test an ETL pipeline reading pages and writing results back."""
+    written = []
+
+    def handler(request):
+        if request.method == "GET":
+            skip = int(request.url.params["skip"])
+            items = [{"id": i} for i in range(skip, min(skip + 2, 5))]
+            return httpx.Response(200, json={"results": items, "total": 5})
+        written.append(request.content)
+        return httpx.Response(200, json={})
+
+    conn = _make_conn(handler)
+    pipeline = (
+        Pipeline(conn.paginate("/items", page_size=2))
+        .filter(lambda item: item["id"] != 2)
+        .map(lambda item: {"id": item["id"], "copied": True})
+        .sink(lambda item: conn.post("/copies", json=item), concurrency=3)
+    )
+
+    assert await pipeline.run() == 4
+    assert len(written) == 4
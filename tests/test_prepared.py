@@ -0,0 +1,241 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import json
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.cache import NegativeCache
+from ipsdk.cache import ResponseCache
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.http import HTTPMethod
+from ipsdk.prepared import AsyncPreparedRequest
+from ipsdk.prepared import PreparedRequest
+
+
+def _make_conn(cls, handler, **kwargs):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com", **kwargs)
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+class _Recorder:
+    """Mock handler recording requests and answering with a JSON body."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        return httpx.Response(
+            self.status,
+            json={"n": len(self.requests)},
+            headers={"cache-control": "max-age=60"},
+        )
+
+
+# --------- Templates ---------
+
+
+def test_prepare_accepts_method_strings():
+    """Test the method may be an HTTPMethod or a case-insensitive string."""
+    conn = Connection("example.com")
+    assert conn.prepare("get", "/a").method is HTTPMethod.GET
+    assert conn.prepare(HTTPMethod.PATCH, "/a").method is HTTPMethod.PATCH
+    assert repr(conn.prepare("post", "/jobs")) == "PreparedRequest(POST /jobs)"
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "headers"),
+    [
+        ("FETCH", "/a", None),
+        ("GET", 42, None),
+        ("GET", "/a", {"X-Count": 1}),
+        ("GET", "/a/{id", None),
+        ("GET", "/a/{0}", None),
+        ("GET", "/a/{id:d}", None),
+        ("GET", "/a/{id!r}", None),
+        ("GET", "/a/{json}", None),
+    ],
+)
+def test_prepare_rejects_invalid_templates(method, path, headers):
+    """Test invalid methods, paths, placeholders and headers are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        Connection("example.com").prepare(method, path, headers)
+
+
+def test_format_path_quotes_variables():
+    """Test variables are percent-encoded as single path segments."""
+    prepared = Connection("example.com").prepare("GET", "/devices/{name}/{field}/raw")
+
+    assert prepared.fields == ("name", "field")
+    assert prepared.format_path(name="core 1/a?b#c", field=7) == (
+        "/devices/core%201%2Fa%3Fb%23c/7/raw"
+    )
+    with pytest.raises(exceptions.IpsdkError, match="field"):
+        prepared.format_path(name="core1")
+
+
+def test_format_path_without_variables():
+    """Test a template without placeholders is returned unchanged."""
+    prepared = Connection("example.com").prepare("GET", "/health/status")
+    assert prepared.fields == ()
+    assert prepared.format_path(unused=1) == "/health/status"
+
+
+def test_build_request_validates_arguments():
+    """Test params and json are still type checked on every call."""
+    prepared = Connection("example.com").prepare("POST", "/jobs")
+    with pytest.raises(exceptions.IpsdkError):
+        prepared.build_request("/jobs", params=["a"])
+    with pytest.raises(exceptions.IpsdkError):
+        prepared.build_request("/jobs", json=1)
+
+
+def test_build_request_headers():
+    """Test static, JSON and client default headers are all sent."""
+    conn = Connection("example.com")
+    prepared = conn.prepare("POST", "/jobs", headers={"X-Trace": "1"})
+
+    request = prepared.build_request("/jobs", json={"a": 1})
+    assert "authorization" not in request.headers
+    assert request.headers["content-type"] == "application/json"
+    assert request.headers["x-trace"] == "1"
+
+    conn.token = "first"
+    request = prepared.build_request("/jobs")
+    assert request.headers["authorization"] == "Bearer first"
+    assert "content-type" not in request.headers
+    assert request.headers["x-trace"] == "1"
+
+
+# --------- Sync sending ---------
+
+
+def test_prepared_send_matches_regular_request():
+    """Test a prepared request sends the same request as the regular path."""
+    recorder = _Recorder()
+    conn = _make_conn(Connection, recorder)
+    conn.token = "abc"
+
+    conn.patch("/jobs/1", params={"force": "true"}, json={"state": "done"})
+    res = conn.prepare("PATCH", "/jobs/{job_id}").send(
+        params={"force": "true"}, json={"state": "done"}, job_id=1
+    )
+
+    regular, prepared = recorder.requests
+    assert res.json() == {"n": 2}
+    assert prepared.url == regular.url
+    assert prepared.method == regular.method
+    assert json.loads(prepared.content) == json.loads(regular.content)
+    for name in ("authorization", "content-type", "accept"):
+        assert prepared.headers[name] == regular.headers[name]
+
+
+def test_prepared_send_authenticates_and_raises():
+    """Test the first call authenticates and HTTP errors are raised."""
+    recorder = _Recorder(status=404)
+    conn = _make_conn(Connection, recorder)
+    conn.authenticated = False
+    calls = []
+    conn.authenticate = lambda: calls.append(1)
+
+    with pytest.raises(exceptions.HTTPStatusError):
+        conn.prepare("GET", "/jobs/{job_id}").send(job_id=1)
+    assert calls == [1]
+    assert conn.authenticated is True
+
+
+def test_prepared_get_uses_response_cache():
+    """Test prepared GETs are served from the cache and writes invalidate it."""
+    recorder = _Recorder()
+    conn = _make_conn(Connection, recorder, cache=ResponseCache())
+    get_job = conn.prepare("GET", "/jobs/{job_id}")
+
+    assert get_job.send(job_id=1).json() == {"n": 1}
+    assert get_job.send(job_id=1).json() == {"n": 1}
+    assert len(recorder.requests) == 1
+
+    conn.prepare("PUT", "/jobs/{job_id}").send(json={}, job_id=1)
+    assert get_job.send(job_id=1).json() == {"n": 3}
+
+
+def test_prepared_get_with_headers_bypasses_cache():
+    """Test prepared GETs with static headers are always sent."""
+    recorder = _Recorder()
+    conn = _make_conn(Connection, recorder, negative_cache=NegativeCache(ttl=60))
+    prepared = conn.prepare("GET", "/jobs", headers={"X-Trace": "1"})
+
+    prepared.send()
+    prepared.send()
+    assert len(recorder.requests) == 2
+    assert recorder.requests[0].headers["x-trace"] == "1"
+
+
+def test_prepared_post_without_cache():
+    """Test writes are sent directly when no cache is configured."""
+    recorder = _Recorder()
+    conn = _make_conn(Connection, recorder)
+    prepared = conn.prepare("POST", "/jobs")
+
+    assert isinstance(prepared, PreparedRequest)
+    assert prepared.send(json={"a": 1}).status_code == 200
+    assert recorder.requests[0].url.path == "/jobs"
+
+
+# --------- Async sending ---------
+
+
+@pytest.mark.asyncio
+async def test_async_prepared_send():
+    """Test the async prepared request sends, authenticates and raises."""
+    recorder = _Recorder()
+    conn = _make_conn(AsyncConnection, recorder)
+    conn.authenticated = False
+    calls = []
+
+    async def authenticate():
+        calls.append(1)
+        conn.token = "abc"
+
+    conn.authenticate = authenticate
+    prepared = conn.prepare("DELETE", "/jobs/{job_id}")
+
+    assert isinstance(prepared, AsyncPreparedRequest)
+    res = await prepared.send(job_id="a b")
+    assert res.status_code == 200
+    assert calls == [1]
+    assert recorder.requests[0].url.raw_path == b"/jobs/a%20b"
+    assert recorder.requests[0].headers["authorization"] == "Bearer abc"
+
+    recorder.status = 500
+    with pytest.raises(exceptions.HTTPStatusError):
+        await prepared.send(job_id=1)
+
+
+@pytest.mark.asyncio
+async def test_async_prepared_uses_caches():
+    """Test async prepared GETs use the cache and writes invalidate it."""
+    recorder = _Recorder()
+    conn = _make_conn(AsyncConnection, recorder, cache=ResponseCache())
+    get_job = conn.prepare("GET", "/jobs/{job_id}")
+
+    assert (await get_job.send(job_id=1)).json() == {"n": 1}
+    assert (await get_job.send(job_id=1)).json() == {"n": 1}
+
+    await conn.prepare("POST", "/jobs/{job_id}").send(json={}, job_id=1)
+    assert (await get_job.send(job_id=1)).json() == {"n": 3}
+
+    traced = conn.prepare("GET", "/jobs/{job_id}", headers={"X-Trace": "1"})
+    assert (await traced.send(job_id=1)).json() == {"n": 4}
@@ -0,0 +1,390 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import enum
+import json
+import types
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Literal
+from typing import Optional
+from typing import Union
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk import schema
+from ipsdk.connection import Connection
+
+
+class Status(enum.Enum):
+    RUNNING = "running"
+    COMPLETE = "complete"
+
+
+@dataclass(slots=True)
+class Device:
+    name: str
+    host: str
+    port: int = 22
+    groups: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DeviceList:
+    data: list[Device]
+    total: int
+
+
+@dataclass(slots=True)
+class Task:
+    name: str
+    status: Status
+    children: list["Task"] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Job:
+    _id: str
+    tasks: dict[str, Task]
+    description: str | None = None
+    progress: float = 0.0
+    kind: Literal["automatic", "manual"] = "automatic"
+    variables: Any = None
+
+
+DEVICES = {
+    "total": 2,
+    "data": [
+        {"name": "r1", "host": "10.0.0.1", "os": "junos"},
+        {"name": "r2", "host": "10.0.0.2", "port": 830, "groups": ["core"]},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def compiled(monkeypatch):
+    """Decode with the compiled converters, even if msgspec is installed."""
+    monkeypatch.setattr(schema, "msgspec", None)
+    schema.decoder.cache_clear()
+    yield
+    schema.decoder.cache_clear()
+
+
+# --------- Decoding ---------
+
+
+def test_decode_nested_dataclasses():
+    """Test nested records decode into slotted dataclasses."""
+    devices = schema.convert(DEVICES, DeviceList)
+
+    assert devices == DeviceList(
+        data=[
+            Device("r1", "10.0.0.1"),
+            Device("r2", "10.0.0.2", 830, ["core"]),
+        ],
+        total=2,
+    )
+    assert not hasattr(devices.data[0], "__dict__")
+
+
+def test_unknown_fields_are_skipped():
+    """Test keys without a field, such as "os", are ignored."""
+    device = schema.decode(b'{"name": "r1", "host": "h", "os": "junos"}', Device)
+
+    assert device == Device("r1", "h")
+
+
+def test_decode_recursive_enum_optional_and_literal():
+    """Test self-referencing records, enums, optionals and literals."""
+    document = (
+        '{"_id": "j1", "progress": 1, "kind": "manual", "variables": {"a": [1]},'
+        ' "tasks": {"t1": {"name": "root", "status": "complete",'
+        ' "children": [{"name": "leaf", "status": "running"}]}}}'
+    )
+    job = schema.decode(document, Job)
+
+    assert job.tasks["t1"].children[0] == Task("leaf", Status.RUNNING)
+    assert job.tasks["t1"].status is Status.COMPLETE
+    assert job.description is None
+    assert job.progress == 1.0
+    assert job.kind == "manual"
+    assert job.variables == {"a": [1]}
+
+
+@dataclass
+class Node:
+    name: str
+    parent: "Node | None" = None
+    visits: int = field(default=0, init=False)
+
+
+class Level(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+@pytest.mark.parametrize(
+    ("document", "type_", "expected"),
+    [
+        (None, None, None),
+        (None, type(None), None),
+        (1.5, float, 1.5),
+        (2, float, 2.0),
+        (True, bool, True),
+        ("x", object, "x"),
+        (None, Optional[int], None),  # noqa: UP045
+        (3, Union[int, str], 3),  # noqa: UP007
+        (None, int | str | None, None),
+        ("a", int | str | None, "a"),
+        (1, Literal[1, "a"], 1),
+        (2, Level, Level.HIGH),
+        ([1, "a"], tuple[Any, ...], (1, "a")),
+        ([], list, []),
+        ({"a": [1]}, dict, {"a": [1]}),
+        ({"a": {"b": 1}}, dict[str, dict[str, int]], {"a": {"b": 1}}),
+    ],
+)
+def test_convert_types(document, type_, expected):
+    """Test each supported type converts matching values."""
+    result = schema.convert(document, type_)
+
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_convert_self_referencing_dataclass():
+    """Test a dataclass that refers to itself and has an init=False field."""
+    node = schema.convert(
+        {"name": "leaf", "parent": {"name": "root"}, "visits": 5}, Node
+    )
+
+    assert node == Node("leaf", Node("root"))
+    assert node.visits == 0
+
+
+def test_decode_containers_and_unions():
+    """Test top-level containers and unions tried in order."""
+    assert schema.convert([1, 2], tuple[int, ...]) == (1, 2)
+    assert schema.convert({"a": None}, dict[str, int | None]) == {"a": None}
+    assert schema.convert(["a", 1], list[int | str]) == ["a", 1]
+    assert schema.convert([{"x": 1}], list) == [{"x": 1}]
+
+
+@pytest.mark.parametrize(
+    ("document", "type_", "location", "message"),
+    [
+        (
+            {"total": 1, "data": [{"name": "r1", "host": "h", "port": "22"}]},
+            DeviceList,
+            "json['data'][0]['port']",
+            "expected `int`, got `str`",
+        ),
+        (
+            {"total": 1, "data": [{"name": "r1"}]},
+            DeviceList,
+            "json['data'][0]",
+            "missing required field 'host'",
+        ),
+        (
+            {"_id": "j1", "tasks": {"t1": {"name": "a", "status": "lost"}}},
+            Job,
+            "json['tasks']['t1']['status']",
+            "'lost' is not a valid `Status`",
+        ),
+        ({"name": "r1", "host": None}, Device, "json['host']", "got `null`"),
+        ([1, True], list[int], "json[1]", "expected `int`, got `bool`"),
+        ("r1", Device, "json", "expected `object`, got `str`"),
+        ([1.5], list[int | str], "json[0]", "expected `int | str`"),
+        ({"_id": "j1", "tasks": {}, "kind": "x"}, Job, "json['kind']", "one of"),
+        (1, None, "json", "expected `null`, got `int`"),
+        ("1.5", float, "json", "expected `float`, got `str`"),
+        (1, bool, "json", "expected `bool`, got `int`"),
+        ({"a": 1}, list[int], "json", "expected `list`, got `dict`"),
+        ([1, "2"], tuple[int, ...], "json[1]", "expected `int`, got `str`"),
+        ([1], dict[str, int], "json", "expected `object`, got `list`"),
+        ({"a": 1, "b": "2"}, dict[str, int], "json['b']", "expected `int`"),
+        (True, Literal[1, "a"], "json", "expected one of 1, 'a', got True"),
+        ([1], Level, "json", "is not a valid `Level`"),
+        ("x", int | None, "json", "expected `int`, got `str`"),
+        (1.5, int | str | None, "json", "expected `int | str | NoneType`"),
+        (
+            {"name": "a", "parent": {"name": 1}},
+            Node,
+            "json['parent']['name']",
+            "expected `str`, got `int`",
+        ),
+    ],
+)
+def test_schema_drift_fails_fast(document, type_, location, message):
+    """Test mismatches raise SchemaError naming the offending value."""
+    with pytest.raises(exceptions.SchemaError, match=message) as info:
+        schema.convert(document, type_)
+
+    assert info.value.location == location
+    assert str(info.value).startswith(f"{location}: ")
+
+
+def test_invalid_json():
+    """Test invalid documents raise SerializationError."""
+    with pytest.raises(exceptions.SerializationError, match="Failed to parse JSON"):
+        schema.decode(b'{"name": ', Device)
+
+
+def test_unsupported_types():
+    """Test types that cannot be decoded are rejected when compiled."""
+
+    @dataclass
+    class Bad:
+        value: set[int]
+
+    with pytest.raises(exceptions.IpsdkError, match="cannot decode JSON into"):
+        schema.decoder(Bad)
+    with pytest.raises(exceptions.IpsdkError, match="cannot decode JSON into"):
+        schema.decoder(dict[int, str])
+    with pytest.raises(exceptions.IpsdkError, match="cannot decode JSON into"):
+        schema.decoder(tuple[int, str])
+    with pytest.raises(exceptions.IpsdkError, match="unhashable type"):
+        schema.Decoder(list[[int]])
+
+    @dataclass
+    class Unresolved:
+        value: "Missing"  # noqa: F821
+
+    with pytest.raises(exceptions.IpsdkError, match="Missing") as info:
+        schema.decoder(Unresolved)
+    assert isinstance(info.value.__cause__, NameError)
+    assert Unresolved not in schema._converters
+
+
+def test_locate_reports_values_that_changed():
+    """Test a container that converts on the second pass is still an error."""
+    with pytest.raises(schema._Invalid, match="value changed"):
+        schema._locate(schema._int, enumerate([1, 2]))
+
+
+def test_decoder_is_cached():
+    """Test each type is compiled once."""
+    decoder = schema.decoder(DeviceList)
+
+    assert schema.decoder(DeviceList) is decoder
+    assert decoder.type is DeviceList
+    assert repr(decoder) == f"Decoder({DeviceList!r})"
+
+
+# --------- Responses ---------
+
+
+def _connection(content):
+    conn = Connection("example.com")
+    conn.authenticated = True
+    conn.client = httpx.Client(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=content)
+        ),
+    )
+    return conn
+
+
+def test_response_decode():
+    """Test a response decodes into a type, reusing parsed JSON if present."""
+    conn = _connection(schema.codec.encode(DEVICES))
+
+    assert conn.get("/devices").decode(DeviceList).data[1].port == 830
+
+    res = conn.get("/devices")
+    res.json()["total"] = 5
+    assert res.decode(DeviceList).total == 5
+
+
+# --------- msgspec ---------
+
+
+@pytest.fixture
+def stub_msgspec(monkeypatch):
+    """A stand-in for msgspec that decodes with the standard library."""
+
+    class ValidationError(ValueError):
+        pass
+
+    class DecodeError(ValueError):
+        pass
+
+    class Decoder:
+        def __init__(self, type_):
+            if type_ is set:
+                msg = "Type 'set' is not supported"
+                raise TypeError(msg)
+            self.type = type_
+
+        def decode(self, data):
+            try:
+                value = json.loads(data)
+            except ValueError as exc:
+                raise DecodeError(str(exc)) from exc
+            return convert(value, self.type)
+
+    def convert(obj, type_):
+        if type(obj) is not type_:
+            msg = f"Expected `{type_.__name__}`, got `{type(obj).__name__}`"
+            if type(obj) is dict:
+                msg += " - at `$.data[3].port`"
+            raise ValidationError(msg)
+        return obj
+
+    stub = types.SimpleNamespace(
+        ValidationError=ValidationError,
+        DecodeError=DecodeError,
+        convert=convert,
+        json=types.SimpleNamespace(Decoder=Decoder),
+    )
+    monkeypatch.setattr(schema, "msgspec", stub)
+    return stub
+
+
+def test_msgspec_path(stub_msgspec):
+    """Test decoding through msgspec and rewriting its error locations."""
+    assert schema.decode(b"[1]", list) == [1]
+    assert schema.convert([1], list) == [1]
+
+    with pytest.raises(exceptions.SchemaError) as info:
+        schema.decode(b'"r1"', list)
+    assert info.value.location == "json"
+    assert str(info.value) == "json: Expected `list`, got `str`"
+
+    with pytest.raises(exceptions.SchemaError) as info:
+        schema.convert({}, list)
+    assert info.value.location == "json['data'][3]['port']"
+    assert str(info.value).startswith("json['data'][3]['port']: Expected `list`")
+
+    with pytest.raises(exceptions.SerializationError, match="Failed to parse JSON"):
+        schema.decode(b"[", list)
+    with pytest.raises(exceptions.IpsdkError, match="is not supported"):
+        schema.decoder(set)
+
+
+def test_msgspec_structs(monkeypatch):
+    """Test msgspec decodes Structs and its errors become SchemaError."""
+    msgspec = pytest.importorskip("msgspec")
+    monkeypatch.setattr(schema, "msgspec", msgspec)
+
+    class Host(msgspec.Struct):
+        name: str
+        port: int = 22
+
+    hosts = schema.decode(b'[{"name": "r1", "os": "junos"}]', list[Host])
+    assert hosts == [Host("r1")]
+    assert schema.convert(DEVICES, DeviceList).data[0] == Device("r1", "10.0.0.1")
+
+    with pytest.raises(exceptions.SchemaError) as info:
+        schema.decode(b'[{"name": "r1", "port": "22"}]', list[Host])
+    assert info.value.location == "json[0]['port']"
+
+    with pytest.raises(exceptions.SerializationError, match="Failed to parse JSON"):
+        schema.decode(b"[", list[Host])
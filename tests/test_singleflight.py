@@ -0,0 +1,188 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ipsdk.singleflight import AsyncSingleFlight
+from ipsdk.singleflight import SingleFlight
+
+# --------- SingleFlight Tests ---------
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not met before timeout")
+        time.sleep(0.001)
+
+
+def test_singleflight_single_caller():
+    """Test a lone call executes the function and counts one request."""
+    sf = SingleFlight()
+    assert sf.do("key", lambda: 42) == 42
+    assert sf.requests == 1
+    assert sf.saved == 0
+    assert sf.in_flight == 0
+
+
+def test_singleflight_coalesces_concurrent_callers():
+    """Test concurrent callers for one key share a single execution."""
+    sf = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        release.wait(5)
+        return "result"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(sf.do("key", fn)))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+
+    _wait_for(lambda: sf.requests == 10)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert results == ["result"] * 10
+    assert len(executions) == 1
+    assert sf.saved == 9
+    assert sf.in_flight == 0
+
+
+def test_singleflight_different_keys_not_shared():
+    """Test calls with different keys execute independently."""
+    sf = SingleFlight()
+    assert sf.do("a", lambda: 1) == 1
+    assert sf.do("b", lambda: 2) == 2
+    assert sf.saved == 0
+
+
+def test_singleflight_sequential_calls_not_shared():
+    """Test a key is released after completion so later calls re-execute."""
+    sf = SingleFlight()
+    calls = []
+    sf.do("key", lambda: calls.append(1))
+    sf.do("key", lambda: calls.append(1))
+    assert len(calls) == 2
+    assert sf.saved == 0
+
+
+def test_singleflight_exception_shared():
+    """Test an exception raised by the leader is raised in every caller."""
+    sf = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        msg = "boom"
+        raise ValueError(msg)
+
+    errors = []
+
+    def call():
+        try:
+            sf.do("key", fn)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+
+    _wait_for(lambda: sf.requests == 5)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 5
+    assert sf.in_flight == 0
+
+
+# --------- AsyncSingleFlight Tests ---------
+
+
+@pytest.mark.asyncio
+async def test_async_singleflight_coalesces_concurrent_callers():
+    """Test concurrent tasks for one key share a single execution."""
+    sf = AsyncSingleFlight()
+    executions = []
+
+    async def fn():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(sf.do("key", fn) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert len(executions) == 1
+    assert sf.requests == 10
+    assert sf.saved == 9
+    assert sf.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_singleflight_exception_shared():
+    """Test an exception is raised in every task sharing the call."""
+    sf = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        msg = "boom"
+        raise ValueError(msg)
+
+    results = await asyncio.gather(
+        *(sf.do("key", fn) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert sf.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_singleflight_cancelled_waiter_does_not_cancel_others():
+    """Test cancelling one waiter leaves the shared call running."""
+    sf = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    first = asyncio.ensure_future(sf.do("key", fn))
+    second = asyncio.ensure_future(sf.do("key", fn))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == "result"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_async_singleflight_all_waiters_cancelled():
+    """Test a failing call is cleaned up even if every waiter was cancelled."""
+    sf = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        msg = "boom"
+        raise ValueError(msg)
+
+    waiter = asyncio.ensure_future(sf.do("key", fn))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.sleep(0.05)
+    assert sf.in_flight == 0
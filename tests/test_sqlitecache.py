@@ -0,0 +1,200 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import time
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.cache import CachePolicy
+from ipsdk.cache import RequestKey
+from ipsdk.connection import Connection
+from ipsdk.sqlitecache import SQLiteCache
+
+
+def _key(path="/items", params=()):
+    return RequestKey("GET", "https://example.com", path, params, "abc")
+
+
+def _response(status=200, headers=None, content=b"{}"):
+    return httpx.Response(status, headers=headers or {}, content=content)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "responses.db")
+
+
+def test_sqlite_cache_invalid_arguments(db_path):
+    """Test invalid limits are rejected."""
+    with pytest.raises(exceptions.IpsdkError):
+        SQLiteCache(db_path, max_age=0)
+    with pytest.raises(exceptions.IpsdkError):
+        SQLiteCache(db_path, max_bytes=0)
+
+
+def test_sqlite_cache_open_failure(tmp_path):
+    """Test an unusable database path raises IpsdkError."""
+    with pytest.raises(exceptions.IpsdkError):
+        SQLiteCache(str(tmp_path))
+
+
+def test_sqlite_cache_store_and_get(db_path):
+    """Test a stored response is returned with its headers and body."""
+    with SQLiteCache(db_path) as cache:
+        headers = {"cache-control": "max-age=60", "etag": '"v1"'}
+        stored = cache.store(_key(), _response(headers=headers, content=b"body"))
+
+        entry = cache.get(_key())
+        assert entry.content == b"body"
+        assert entry.etag == '"v1"'
+        assert entry.is_fresh()
+        assert entry.expires_at == stored.expires_at
+        assert len(cache) == 1
+        assert cache.size == entry.size
+        assert cache.get(_key("/other")) is None
+
+
+def test_sqlite_cache_persists_across_instances(db_path):
+    """Test entries survive closing and reopening the database."""
+    with SQLiteCache(db_path) as cache:
+        cache.store(_key(), _response(headers={"cache-control": "max-age=60"}))
+
+    with SQLiteCache(db_path) as cache:
+        entry = cache.get(_key())
+        assert entry is not None
+        assert entry.is_fresh()
+
+
+def test_sqlite_cache_max_age(db_path):
+    """Test entries older than max_age are discarded."""
+    with SQLiteCache(db_path) as cache:
+        cache.store(_key(), _response(headers={"etag": '"v1"'}))
+
+    with SQLiteCache(db_path, max_age=60) as cache:
+        entry = cache.get(_key())
+        assert entry is not None
+
+        cache.max_age = 1e-6
+        time.sleep(0.01)
+        assert cache.get(_key()) is None
+        assert len(cache) == 0
+
+
+def test_sqlite_cache_lru_eviction(db_path):
+    """Test least recently used rows are evicted over the size limit."""
+    headers = {"cache-control": "max-age=60"}
+    with SQLiteCache(db_path, max_bytes=1000) as cache:
+        cache.store(_key("/a"), _response(headers=headers, content=b"x" * 200))
+        cache.store(_key("/b"), _response(headers=headers, content=b"x" * 200))
+        cache.get(_key("/a"))
+        cache.store(_key("/c"), _response(headers=headers, content=b"x" * 200))
+
+        assert cache.get(_key("/a")) is not None
+        assert cache.get(_key("/b")) is None
+        assert cache.evictions == 1
+        assert cache.size <= cache.max_bytes
+
+
+def test_sqlite_cache_running_total(db_path):
+    """Test the stored size is tracked through replaces, deletes and reopening."""
+    headers = {"cache-control": "max-age=60", "etag": '"v1"'}
+
+    def table_size(cache):
+        return cache._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses")
+
+    with SQLiteCache(db_path) as cache:
+        cache.store(_key("/a"), _response(headers=headers, content=b"x" * 100))
+        cache.store(_key("/a/1"), _response(headers=headers, content=b"x" * 50))
+        cache.store(_key("/a"), _response(headers=headers, content=b"x" * 10))
+        assert cache.size == table_size(cache).fetchone()[0]
+        assert len(cache) == 2
+
+        cache.invalidate("https://example.com", "/a/1")
+        assert cache.size == 0
+
+        cache.store(_key("/b"), _response(headers=headers))
+        size = cache.size
+        # Databases written before the running total existed are seeded
+        cache._db.execute("DROP TABLE meta")
+
+    with SQLiteCache(db_path) as cache:
+        assert cache.size == size
+        cache.clear()
+        assert cache.size == 0
+
+
+def test_sqlite_cache_file_is_private(db_path):
+    """Test a new database file is only accessible by its owner."""
+    with SQLiteCache(db_path):
+        pass
+
+    assert Path(db_path).stat().st_mode & 0o777 == 0o600
+
+
+def test_sqlite_cache_refresh_persists(db_path):
+    """Test 304 refreshes are written back to the database."""
+    with SQLiteCache(db_path) as cache:
+        cache.store(_key(), _response(headers={"etag": '"v1"'}))
+        entry = cache.get(_key())
+        assert not entry.is_fresh()
+
+        cache.refresh(entry, _response(304, {"cache-control": "max-age=60"}))
+        assert cache.get(_key()).is_fresh()
+        assert cache.revalidations == 1
+
+
+def test_sqlite_cache_invalidate_and_clear(db_path):
+    """Test overlapping invalidation and clear() delete rows."""
+    headers = {"cache-control": "max-age=60"}
+    with SQLiteCache(db_path) as cache:
+        for path in ("/devices", "/devices/r1", "/devices2"):
+            cache.store(_key(path), _response(headers=headers))
+
+        assert cache.invalidate("https://example.com", "/devices/r1") == 2
+        assert cache.invalidate("https://example.com", "/missing") == 0
+        assert len(cache) == 1
+
+        cache.clear()
+        assert len(cache) == 0
+
+
+def test_sqlite_cache_policy(db_path):
+    """Test policy TTLs apply to the SQLite backend."""
+    with SQLiteCache(db_path, policy=CachePolicy({"/adapters": 60})) as cache:
+        assert cache.store(_key("/adapters"), _response()) is not None
+        assert cache.get(_key("/adapters")).is_fresh()
+
+
+def test_sqlite_cache_warm_start(db_path):
+    """Test a new connection revalidates a persisted entry with its ETag."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"etag": '"v1"'}, json={"v": 1})
+
+    for _ in range(2):
+        with SQLiteCache(db_path) as cache:
+            conn = Connection("example.com", cache=cache)
+            conn.authenticated = True
+            conn.client = httpx.Client(
+                base_url="https://example.com",
+                transport=httpx.MockTransport(handler),
+            )
+            assert conn.get("/adapters").json() == {"v": 1}
+
+    assert requests == [None, '"v1"']
+
+
+def test_sqlite_cache_repr(db_path):
+    """Test SQLiteCache string representation."""
+    with SQLiteCache(":memory:", max_bytes=10) as cache:
+        assert repr(cache) == "SQLiteCache(path=':memory:', max_bytes=10)"
@@ -0,0 +1,182 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import threading
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.http import Response
+from ipsdk.timing import Timings
+from ipsdk.timing import TraceRecorder
+
+# --------- Local Server ---------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the connection open between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        payload = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _connect(cls, server):
+    conn = cls("127.0.0.1", port=server.server_address[1], use_tls=False)
+    conn.authenticated = True
+    return conn
+
+
+def _assert_phases(first, second):
+    """Check a request on a new connection and one on the reused connection."""
+    for phase in ("pool", "connect", "ttfb", "download"):
+        assert getattr(first, phase) >= 0
+    assert first.tls is None
+    assert first.pool + first.connect + first.ttfb <= first.elapsed_ns
+
+    assert second.connect is None
+    assert second.ttfb is not None
+    assert second.download is not None
+
+
+# --------- Timings ---------
+
+
+def test_recorder_computes_phases():
+    """Test phases are the spans between recorded httpcore events."""
+    recorder = TraceRecorder()
+    recorder.events = {
+        "connect_tcp.started": 110,
+        "connect_tcp.complete": 150,
+        "start_tls.started": 150,
+        "start_tls.complete": 250,
+        "send_request_headers.started": 260,
+        "receive_response_headers.complete": 700,
+        "receive_response_body.complete": 900,
+    }
+    timings = recorder.timings(5, 100, 1000)
+
+    assert timings.start_ns == 5
+    assert timings.elapsed_ns == 900
+    assert (timings.pool, timings.connect, timings.tls) == (10, 40, 100)
+    assert (timings.ttfb, timings.download) == (440, 200)
+
+
+def test_recorder_strips_event_prefix():
+    """Test event names are recorded without the httpcore module prefix."""
+    recorder = TraceRecorder()
+    recorder("http11.send_request_headers.started", {})
+    recorder("http2.receive_response_headers.complete", {})
+
+    assert set(recorder.events) == {
+        "send_request_headers.started",
+        "receive_response_headers.complete",
+    }
+    assert recorder.timings(0, 0, 1).connect is None
+
+
+def test_timings_milliseconds_and_repr():
+    """Test phase durations are reported in milliseconds."""
+    timings = Timings(0, 3_500_000, pool=500_000, ttfb=2_000_000)
+
+    assert timings.milliseconds() == {
+        "pool": 0.5,
+        "connect": None,
+        "tls": None,
+        "ttfb": 2.0,
+        "download": None,
+    }
+    assert repr(timings) == "Timings(elapsed=3.500ms, pool=0.500ms, ttfb=2.000ms)"
+    assert repr(Timings(0)) == "Timings(elapsed=0.000ms)"
+
+
+# --------- Responses ---------
+
+
+def test_response_timestamps_from_timing():
+    """Test timestamps derive from the wall-clock start and monotonic duration."""
+    start_ns = 1_704_067_200_123_456_789  # 2024-01-01T00:00:00.123456789Z
+    response = Response(Mock(spec=httpx.Response), timing=Timings(start_ns, 2_500_000))
+
+    assert response.started_at == "2024-01-01T00:00:00.123456+00:00"
+    assert response.finished_at == "2024-01-01T00:00:00.125956+00:00"
+    assert response.elapsed_ms == 2
+    assert response.timing.elapsed_ns == 2_500_000
+
+
+def test_response_requires_timing_or_timestamps():
+    """Test a response without timing needs both timestamps."""
+    with pytest.raises(ValueError, match="required without timing"):
+        Response(Mock(spec=httpx.Response), started_at="2024-01-01T00:00:00")
+
+
+def test_mock_transport_has_no_phases():
+    """Test transports without trace events report only the duration."""
+    conn = Connection("example.com")
+    conn.authenticated = True
+    conn.client = httpx.Client(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+    )
+    timing = conn.get("/status").timing
+
+    assert timing.elapsed_ns > 0
+    assert all(value is None for value in timing.milliseconds().values())
+
+
+# --------- Connections ---------
+
+
+def test_sync_request_phases(server):
+    """Test a sync connection reports the phases of real requests."""
+    conn = _connect(Connection, server)
+
+    first = conn.get("/status")
+    second = conn.get("/status")
+
+    _assert_phases(first.timing, second.timing)
+    started = datetime.fromisoformat(first.started_at)
+    assert started <= datetime.fromisoformat(first.finished_at)
+    assert first.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_async_request_phases(server):
+    """Test an async connection reports the phases of real requests."""
+    conn = _connect(AsyncConnection, server)
+
+    first = await conn.get("/status")
+    second = await conn.get("/status")
+
+    _assert_phases(first.timing, second.timing)
+    assert first.elapsed_ms == first.timing.elapsed_ns // 1_000_000
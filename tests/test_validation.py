@@ -0,0 +1,151 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import Connection
+from ipsdk.gateway import gateway_factory
+from ipsdk.http import HTTPMethod
+from ipsdk.platform import platform_factory
+from ipsdk.validation import check_arguments
+from ipsdk.validation import check_level
+from ipsdk.validation import validate_payload
+
+# --------- Levels ---------
+
+
+def test_check_level():
+    """Test known levels are accepted and unknown levels rejected."""
+    assert check_level("strict") == "strict"
+    with pytest.raises(exceptions.IpsdkError, match="strict, fast, off"):
+        check_level("paranoid")
+
+
+def test_factories_pass_validation_level():
+    """Test both factories configure the validation level."""
+    assert platform_factory(validation="off").validation == "off"
+    assert gateway_factory(validation="strict", want_async=True).validation == (
+        "strict"
+    )
+    assert Connection("example.com").validation == "fast"
+    with pytest.raises(exceptions.IpsdkError):
+        Connection("example.com", validation="none")
+
+
+@pytest.mark.parametrize(
+    ("params", "json", "levels"),
+    [
+        ([("a", "b")], None, ("strict", "fast")),
+        (None, 1, ("strict", "fast")),
+        ({"a": object()}, None, ("strict",)),
+        (None, b"{", ("strict",)),
+    ],
+)
+def test_check_arguments(params, json, levels):
+    """Test the argument checks shared by connections and prepared requests."""
+    for level in ("strict", "fast", "off"):
+        if level in levels:
+            with pytest.raises(exceptions.IpsdkError):
+                check_arguments(level, params, json)
+        else:
+            check_arguments(level, params, json)
+
+
+# --------- Strict checks ---------
+
+
+def test_validate_payload_accepts_json_values():
+    """Test valid params and nested JSON bodies pass."""
+    validate_payload(
+        {"name": "r1", "limit": 10, "ratio": 0.5, "all": True, "tag": ["a", 1]},
+        {"devices": [{"name": "r1", "port": 22, "up": None, "load": 1.5}], "n": ()},
+    )
+    validate_payload(None, '{"raw": true}')
+    validate_payload(json={"status": HTTPStatus.OK, "method": HTTPMethod.GET})
+
+    shared = {"a": 1}
+    validate_payload(json=[shared, shared])
+
+
+@pytest.mark.parametrize(
+    ("params", "match"),
+    [
+        ({1: "a"}, "params key 1"),
+        ({"since": object()}, r"params\['since'\] has unsupported type `object`"),
+        ({"ids": [1, {"id": 2}]}, r"params\['ids'\] has unsupported type `dict`"),
+    ],
+)
+def test_validate_payload_rejects_params(params, match):
+    """Test non-string keys and non-scalar values are rejected."""
+    with pytest.raises(exceptions.IpsdkError, match=match):
+        validate_payload(params)
+
+
+@pytest.mark.parametrize(
+    ("body", "match"),
+    [
+        ({"devices": [{"port": float("nan")}]}, r"json\['devices'\]\[0\]\['port'\]"),
+        ([1, float("inf")], r"json\[1\] is not a finite number"),
+        ({"when": {1, 2}}, r"json\['when'\] has unsupported type `set`"),
+        ({"a": {2: "b"}}, r"json\['a'\] key 2 must be of type `str`"),
+        ({"raw": b"bytes"}, "unsupported type `bytes`"),
+    ],
+)
+def test_validate_payload_rejects_json(body, match):
+    """Test non-JSON values are rejected with their location."""
+    with pytest.raises(exceptions.IpsdkError, match=match):
+        validate_payload(json=body)
+
+
+def test_validate_payload_rejects_circular_reference():
+    """Test a container containing itself is reported."""
+    body = {"a": []}
+    body["a"].append(body)
+    with pytest.raises(exceptions.IpsdkError, match=r"json\['a'\]\[0\] is a circ"):
+        validate_payload(json=body)
+
+
+# --------- Connections ---------
+
+
+def test_connection_levels():
+    """Test each level's checks when building requests."""
+    strict = Connection("example.com", validation="strict")
+    fast = Connection("example.com", validation="fast")
+    off = Connection("example.com", validation="off")
+    body = {"port": float("nan")}
+
+    with pytest.raises(exceptions.IpsdkError, match="finite"):
+        strict._build_request(HTTPMethod.POST, "/devices", json=body)
+    with pytest.raises(exceptions.IpsdkError, match="json must be"):
+        strict._build_request(HTTPMethod.POST, "/devices", json=1)
+
+    assert fast._build_request(HTTPMethod.POST, "/devices", params={"a": object()})
+    with pytest.raises(exceptions.IpsdkError):
+        fast._build_request("POST", "/devices")
+
+    request = off._build_request(HTTPMethod.GET, "/devices", params={"a": "b"})
+    assert request.url.params["a"] == "b"
+    with pytest.raises(AttributeError):
+        off._build_request("GET", "/devices")
+
+
+def test_prepared_request_levels():
+    """Test prepared requests follow the connection's level."""
+    strict = Connection("example.com", validation="strict").prepare("POST", "/d")
+    off = Connection("example.com", validation="off").prepare("POST", "/d")
+
+    with pytest.raises(exceptions.IpsdkError, match=r"json\['when'\]"):
+        strict.build_request("/d", json={"when": {1}})
+    with pytest.raises(exceptions.IpsdkError, match="params must be"):
+        strict.build_request("/d", params=[("a", "b")])
+
+    request = off.build_request("/d", params=[("a", "b")])
+    assert isinstance(request, httpx.Request)
+    assert request.url.params["a"] == "b"
@@ -0,0 +1,470 @@
+# Copyright (C) Itential, Inc
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from ipsdk import exceptions
+from ipsdk.connection import AsyncConnection
+from ipsdk.connection import Connection
+from ipsdk.http import HTTPMethod
+from ipsdk.jobs import Backoff
+from ipsdk.writebehind import AsyncWriteBehind
+from ipsdk.writebehind import PendingWrite
+from ipsdk.writebehind import WriteBehind
+from ipsdk.writebehind import _is_retryable
+
+_FAST = Backoff(initial=0.001, maximum=0.001, jitter=0)
+
+
+def _make_conn(cls, handler):
+    """Create an authenticated connection whose client uses a MockTransport."""
+    conn = cls("example.com")
+    conn.authenticated = True
+    client_cls = httpx.AsyncClient if cls is AsyncConnection else httpx.Client
+    conn.client = client_cls(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    return conn
+
+
+class _Recorder:
+    """Mock handler recording writes, optionally failing the first attempts."""
+
+    def __init__(self, failures=0, status=503):
+        self.failures = failures
+        self.status = status
+        self.received = []
+        self.attempts = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        self.gate.wait()
+        with self.lock:
+            self.attempts += 1
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(self.status, json={})
+            body = json.loads(request.content) if request.content else None
+            self.received.append((request.method, request.url.path, body))
+        return httpx.Response(200, json={})
+
+
+# --------- Configuration ---------
+
+
+def test_write_behind_rejects_invalid_options():
+    """Test out-of-range options are rejected."""
+    conn = Connection("example.com")
+    with pytest.raises(exceptions.IpsdkError):
+        WriteBehind(conn, max_pending=0)
+    with pytest.raises(exceptions.IpsdkError):
+        AsyncWriteBehind(conn, retries=-1)
+    with pytest.raises(exceptions.IpsdkError):
+        AsyncWriteBehind(conn, overflow="spill")
+
+
+def test_submit_rejects_reads():
+    """Test only write methods can be submitted."""
+    with (
+        Connection("example.com").write_behind() as writes,
+        pytest.raises(exceptions.IpsdkError),
+    ):
+        writes.submit("GET", "/x")
+    assert writes.submitted == 0
+
+
+def test_pending_write_repr():
+    """Test a pending write shows its method and path."""
+    write = PendingWrite(HTTPMethod.POST, "/audit", json={"i": 1})
+    assert repr(write) == "PendingWrite(POST /audit)"
+    assert write.attempts == 0
+
+
+# --------- Sync queue ---------
+
+
+def test_write_behind_sends_writes():
+    """Test buffered writes are all sent and close() flushes them."""
+    recorder = _Recorder()
+    conn = _make_conn(Connection, recorder)
+
+    with conn.write_behind(concurrency=3) as writes:
+        for i in range(20):
+            assert writes.post("/audit", json={"i": i})
+        writes.put("/status/1", json={"ok": True})
+        writes.patch("/status/2", json={"ok": False})
+        writes.delete("/status/3")
+
+    assert writes.sent == 23
+    assert writes.submitted == 23
+    assert writes.pending == 0
+    assert sorted(
+        body["i"] for method, _, body in recorder.received if body and "i" in body
+    ) == list(range(20))
+    methods = {method for method, _, _ in recorder.received}
+    assert methods == {"POST", "PUT", "PATCH", "DELETE"}
+    with pytest.raises(exceptions.IpsdkError):
+        writes.post("/audit", json={})
+
+
+def test_write_behind_retries_retryable_failures():
+    """Test 5xx failures are retried until the write succeeds."""
+    recorder = _Recorder(failures=2)
+    conn = _make_conn(Connection, recorder)
+
+    with conn.write_behind(concurrency=1, retries=3, backoff=_FAST) as writes:
+        writes.post("/audit", json={"i": 1})
+
+    assert writes.sent == 1
+    assert writes.retried == 2
+    assert recorder.attempts == 3
+
+
+@pytest.mark.parametrize(
+    ("method", "error", "attempts"),
+    [
+        ("POST", httpx.ReadTimeout, 1),
+        ("PATCH", httpx.RemoteProtocolError, 1),
+        ("POST", httpx.ConnectError, 3),
+        ("POST", httpx.PoolTimeout, 3),
+        ("PUT", httpx.ReadTimeout, 3),
+        ("DELETE", httpx.ReadError, 3),
+    ],
+)
+def test_write_behind_retries_network_errors_safely(method, error, attempts):
+    """Test non-idempotent writes are only retried if they were never sent."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        msg = "failed"
+        raise error(msg, request=request)
+
+    conn = _make_conn(Connection, handler)
+    with conn.write_behind(concurrency=1, retries=2, backoff=_FAST) as writes:
+        writes.submit(method, "/records", json={"i": 1})
+
+    assert calls == [method] * attempts
+    assert writes.failed == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "status", "attempts"),
+    [
+        ("POST", 500, 1),
+        ("POST", 502, 1),
+        ("PATCH", 504, 1),
+        ("POST", 429, 3),
+        ("PATCH", 503, 3),
+        ("PUT", 500, 3),
+        ("DELETE", 502, 3),
+    ],
+)
+def test_write_behind_retries_statuses_safely(method, status, attempts):
+    """Test non-idempotent writes are only retried on 429 and 503."""
+    recorder = _Recorder(failures=10, status=status)
+    conn = _make_conn(Connection, recorder)
+
+    with conn.write_behind(concurrency=1, retries=2, backoff=_FAST) as writes:
+        writes.submit(method, "/records", json={"i": 1})
+
+    assert recorder.attempts == attempts
+    assert writes.failed == 1
+
+
+def test_other_errors_are_not_retried():
+    """Test errors without a response or from outside httpx are not retried."""
+    write = PendingWrite(HTTPMethod.PUT, "/records")
+
+    assert not _is_retryable(write, ValueError("bad"))
+    assert not _is_retryable(
+        write, exceptions.HTTPStatusError(httpx.HTTPError("no response"))
+    )
+
+
+def test_write_behind_gives_up_and_reports():
+    """Test non-retryable and exhausted writes are failed and reported."""
+    errors = []
+    recorder = _Recorder(failures=10, status=400)
+    conn = _make_conn(Connection, recorder)
+
+    with conn.write_behind(
+        concurrency=1,
+        backoff=_FAST,
+        on_error=lambda write, exc: errors.append((write, exc)),
+    ) as writes:
+        writes.post("/audit", json={"i": 1})
+
+    assert writes.failed == 1
+    assert writes.retried == 0
+    assert errors[0][0].path == "/audit"
+    assert isinstance(errors[0][1], exceptions.HTTPStatusError)
+
+    recorder = _Recorder(failures=10, status=503)
+    conn = _make_conn(Connection, recorder)
+    with conn.write_behind(concurrency=1, retries=2, backoff=_FAST) as writes:
+        writes.post("/audit", json={"i": 1})
+
+    assert writes.failed == 1
+    assert writes.retried == 2
+    assert recorder.attempts == 3
+
+
+def test_write_behind_on_error_failures_are_logged():
+    """Test an on_error callback that raises does not stop the queue."""
+
+    def on_error(write, exc):
+        msg = "callback failed"
+        raise RuntimeError(msg)
+
+    conn = _make_conn(Connection, _Recorder(failures=10, status=400))
+    with conn.write_behind(concurrency=1, on_error=on_error) as writes:
+        writes.post("/audit", json={"i": 1})
+        writes.post("/audit", json={"i": 2})
+
+    assert writes.failed == 2
+    assert repr(writes) == "WriteBehind(pending=0, sent=0, failed=2, dropped=0)"
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expected"),
+    [("drop", [0, 1]), ("drop_oldest", [0, 2])],
+)
+def test_write_behind_drop_policies(overflow, expected):
+    """Test drop policies discard the new or the oldest buffered write."""
+    recorder = _Recorder()
+    recorder.gate.clear()
+    conn = _make_conn(Connection, recorder)
+
+    writes = conn.write_behind(concurrency=1, max_pending=1, overflow=overflow)
+    writes.post("/audit", json={"i": 0})
+    while writes._inflight == 0:
+        pass
+    writes.post("/audit", json={"i": 1})
+    accepted = writes.post("/audit", json={"i": 2})
+
+    assert accepted is (overflow == "drop_oldest")
+    assert writes.dropped == 1
+
+    recorder.gate.set()
+    assert writes.close(timeout=5)
+    assert [body["i"] for _, _, body in recorder.received] == expected
+
+
+def test_write_behind_raise_and_block_timeout():
+    """Test the raise policy and a blocking submit timeout raise QueueFullError."""
+    recorder = _Recorder()
+    recorder.gate.clear()
+    conn = _make_conn(Connection, recorder)
+
+    for overflow in ("raise", "block"):
+        writes = conn.write_behind(concurrency=1, max_pending=1, overflow=overflow)
+        writes.post("/audit", json={"i": 0})
+        while writes._inflight == 0:
+            pass
+        writes.post("/audit", json={"i": 1})
+        with pytest.raises(exceptions.QueueFullError):
+            writes.submit("POST", "/audit", json={"i": 2}, timeout=0.05)
+        assert not writes.flush(timeout=0.01)
+
+        recorder.gate.set()
+        assert writes.close(timeout=5)
+        recorder.gate.clear()
+
+
+def test_write_behind_close_wakes_blocked_submit():
+    """Test a submit blocked on a full buffer is refused when the queue closes."""
+    recorder = _Recorder()
+    recorder.gate.clear()
+    conn = _make_conn(Connection, recorder)
+
+    writes = conn.write_behind(concurrency=1, max_pending=1)
+    writes.post("/audit", json={"i": 0})
+    while writes._inflight == 0:
+        pass
+    writes.post("/audit", json={"i": 1})
+
+    errors = []
+
+    def submit():
+        try:
+            writes.post("/audit", json={"i": 2})
+        except exceptions.IpsdkError as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    time.sleep(0.05)
+    assert not writes.close(timeout=0.01)
+    thread.join(5)
+
+    assert "closed" in str(errors[0])
+    recorder.gate.set()
+    assert writes.close(timeout=5)
+    assert writes.sent == 2
+
+
+def test_write_behind_block_applies_backpressure():
+    """Test a blocking submit waits for room and then buffers the write."""
+    recorder = _Recorder()
+    recorder.gate.clear()
+    conn = _make_conn(Connection, recorder)
+
+    writes = conn.write_behind(concurrency=1, max_pending=1)
+    writes.post("/audit", json={"i": 0})
+    writes.post("/audit", json={"i": 1})
+
+    threading.Timer(0.05, recorder.gate.set).start()
+    assert writes.post("/audit", json={"i": 2})
+    assert writes.close(timeout=5)
+    assert writes.sent == 3
+
+
+# --------- Async queue ---------
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_sends_and_retries():
+    """Test the async queue sends, retries and flushes on close."""
+    recorder = _Recorder(failures=1)
+    conn = _make_conn(AsyncConnection, recorder)
+
+    async with conn.write_behind(concurrency=2, backoff=_FAST) as writes:
+        for i in range(10):
+            await writes.post("/audit", json={"i": i})
+        await writes.delete("/audit/1")
+        assert await writes.flush(timeout=5)
+
+    assert writes.sent == 11
+    assert writes.retried == 1
+    assert writes.pending == 0
+    with pytest.raises(exceptions.IpsdkError):
+        await writes.put("/audit", json={})
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_gives_up_and_reports():
+    """Test the async queue fails non-retryable writes and reports them."""
+    errors = []
+    recorder = _Recorder(failures=10, status=502)
+    conn = _make_conn(AsyncConnection, recorder)
+
+    async with conn.write_behind(
+        concurrency=1,
+        backoff=_FAST,
+        on_error=lambda write, exc: errors.append(write.method),
+    ) as writes:
+        await writes.patch("/status/1", json={"ok": True})
+
+    assert writes.failed == 1
+    assert writes.retried == 0
+    assert recorder.attempts == 1
+    assert errors == [HTTPMethod.PATCH]
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_overflow():
+    """Test async drop and raise policies on a full buffer."""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    conn = _make_conn(AsyncConnection, handler)
+
+    writes = conn.write_behind(concurrency=1, max_pending=1, overflow="drop")
+    await writes.post("/a")
+    await asyncio.sleep(0.01)
+    await writes.post("/b")
+    assert await writes.post("/c") is False
+    assert writes.dropped == 1
+
+    raising = conn.write_behind(concurrency=1, max_pending=1, overflow="raise")
+    await raising.post("/a")
+    await asyncio.sleep(0.01)
+    await raising.post("/b")
+    with pytest.raises(exceptions.QueueFullError):
+        await raising.post("/c")
+
+    blocking = conn.write_behind(concurrency=1, max_pending=1)
+    await blocking.post("/a")
+    await asyncio.sleep(0.01)
+    await blocking.post("/b")
+    with pytest.raises(exceptions.QueueFullError):
+        await blocking.submit("PATCH", "/c", timeout=0.01)
+
+    assert not await blocking.flush(timeout=0.01)
+
+    oldest = conn.write_behind(concurrency=1, max_pending=1, overflow="drop_oldest")
+    await oldest.post("/a")
+    await asyncio.sleep(0.01)
+    await oldest.post("/b")
+    assert await oldest.post("/c")
+    assert oldest.dropped == 1
+
+    release.set()
+    assert await writes.aclose()
+    assert await raising.aclose()
+    assert await blocking.aclose()
+    assert await oldest.aclose()
+    assert writes.sent == 2
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_close_wakes_blocked_submit():
+    """Test an async submit blocked on a full buffer is refused on close."""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    writes = AsyncWriteBehind(
+        _make_conn(AsyncConnection, handler), concurrency=1, max_pending=1
+    )
+    await writes.post("/a")
+    await asyncio.sleep(0.01)
+    await writes.post("/b")
+
+    blocked = asyncio.ensure_future(writes.post("/c"))
+    await asyncio.sleep(0.01)
+    assert not await writes.aclose(timeout=0.01)
+
+    with pytest.raises(exceptions.IpsdkError, match="closed"):
+        await blocked
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_close_timeout_cancels_workers():
+    """Test aclose() abandons remaining writes when its timeout expires."""
+
+    async def handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    writes = AsyncWriteBehind(_make_conn(AsyncConnection, handler), concurrency=1)
+    await writes.post("/a")
+    await writes.post("/b")
+
+    assert not await writes.aclose(timeout=0.05)
+    assert all(task.done() for task in writes._tasks)
+
+
+@pytest.mark.asyncio
+async def test_async_write_behind_close_without_writes():
+    """Test closing an unused async queue does not start workers."""
+    writes = AsyncWriteBehind(AsyncConnection("example.com"))
+    assert await writes.flush()
+    assert await writes.aclose()
+    assert writes._tasks == []